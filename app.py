@@ -1,11 +1,23 @@
 import decimal
 import datetime
 
+import click
+
 from flask.json    import JSONEncoder
 from flask         import Flask
 from flask_cors    import CORS
 
 from view import create_endpoints
+from utils.connection import init_pool, init_replicas, init_unit_of_work, unit_of_work
+from utils.const      import (
+    STOCK_RESERVATION_RELEASE_BATCH_SIZE,
+    IDEMPOTENCY_KEY_PURGE_BATCH_SIZE,
+    VOLUME_COUNTER_FOLD_BATCH_SIZE
+)
+from utils.metrics    import init_metrics
+from utils.query_budget import init_query_budget
+from utils.serializer   import get_json_encoder
+from utils.http_cache   import init_http_cache
 
 from model   import OrderDao, OrderDetailDao, EnquiryDao
 from service import OrderService, EnquiryService
@@ -29,6 +41,7 @@ from service import (
     EventService,
     ProductListService,
     StoreOrderService,
+    VolumeCounterService,
     CategoryListService,
     SellerShopService,
     BookmarkService,
@@ -64,7 +77,6 @@ class ManageProductService:
 def create_app(test_config=None):
     app = Flask(__name__)
     app.debug = True
-    app.json_encoder = CustomJSONEncoder
     app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024
     
     # By default, submission of cookies across domains is disabled due to the security implications.
@@ -75,8 +87,25 @@ def create_app(test_config=None):
     else:
         app.config.update(test_config)
     
+    # JSON_ENCODER: fast(기본값) / legacy(CustomJSONEncoder)
+    app.json_encoder = get_json_encoder(app.config.get('JSON_ENCODER'), CustomJSONEncoder)
+    
     database = app.config['DB']
     
+    # connection pool
+    init_pool(database)
+    init_replicas(database, app.config.get('DB_REPLICAS'))
+    init_unit_of_work(app)
+    
+    # request metrics (/metrics)
+    init_metrics(app)
+    
+    # query count budget (QUERY_BUDGET_MODE)
+    init_query_budget(app)
+    
+    # ETag / Cache-Control / gzip, brotli 압축
+    init_http_cache(app)
+    
     # persistence Layer
     destination_dao  = DestinationDao()
     cart_item_dao    = CartItemDao()
@@ -100,6 +129,7 @@ def create_app(test_config=None):
     services.store_order_service   = StoreOrderService(store_order_dao)
     services.product_list_service  = ProductListService()
     services.category_list_service = CategoryListService()
+    services.volume_counter_service = VolumeCounterService()
 
     services.event_list_service           = EventListService()
     services.sender_service               = SenderService(sender_dao)
@@ -124,4 +154,58 @@ def create_app(test_config=None):
     # presentation Layer
     create_endpoints(app, services, database)
     
+    # 만료된 재고 예약 해제 (cron 등으로 주기 실행: flask release-stock-reservations)
+    @app.cli.command('release-stock-reservations')
+    def release_stock_reservations():
+        now = datetime.datetime.now()
+        total = 0
+        
+        # 예약 row 잠금이 길어지지 않도록 STOCK_RESERVATION_RELEASE_BATCH_SIZE 개씩 나누어 커밋한다.
+        while True:
+            with unit_of_work(database, read_only=False) as connection:
+                released = services.store_order_service.release_expired_stock_reservations_service(
+                    connection,
+                    {'now': now, 'limit': STOCK_RESERVATION_RELEASE_BATCH_SIZE}
+                )
+            total += released
+            if released < STOCK_RESERVATION_RELEASE_BATCH_SIZE:
+                break
+        
+        click.echo('released {} stock reservations'.format(total))
+    
+    # 보관 기간이 지난 Idempotency-Key 삭제 (cron 등으로 주기 실행: flask purge-idempotency-keys)
+    @app.cli.command('purge-idempotency-keys')
+    def purge_idempotency_keys():
+        total = 0
+        
+        while True:
+            with unit_of_work(database, read_only=False) as connection:
+                purged = services.store_order_service.purge_expired_idempotency_keys_service(
+                    connection,
+                    {'limit': IDEMPOTENCY_KEY_PURGE_BATCH_SIZE}
+                )
+            total += purged
+            if purged < IDEMPOTENCY_KEY_PURGE_BATCH_SIZE:
+                break
+        
+        click.echo('purged {} idempotency keys'.format(total))
+    
+    # 슬롯에 누적된 판매량 / 북마크 수를 집계 컬럼에 반영 (cron 등으로 주기 실행: flask fold-volume-counters)
+    @app.cli.command('fold-volume-counters')
+    def fold_volume_counters():
+        total = 0
+        
+        # 슬롯 잠금(누적하려는 요청이 기다림)이 길어지지 않도록 상품 VOLUME_COUNTER_FOLD_BATCH_SIZE 개씩 나누어 커밋한다.
+        while True:
+            with unit_of_work(database, read_only=False) as connection:
+                folded = services.volume_counter_service.fold_volume_counters_service(
+                    connection,
+                    {'limit': VOLUME_COUNTER_FOLD_BATCH_SIZE}
+                )
+            total += folded
+            if folded < VOLUME_COUNTER_FOLD_BATCH_SIZE:
+                break
+        
+        click.echo('folded volume counters of {} products'.format(total))
+    
     return app
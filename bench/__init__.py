@@ -0,0 +1,58 @@
+""" 성능 측정 도구
+
+로컬 MySQL 컨테이너에 재현 가능한 데이터를 적재하고, create_endpoints 에 등록된 엔드포인트를 호출해
+처리량과 응답 시간(p50/p95/p99)을 측정한다. 외부 서비스(S3, 구글 로그인 등)는 사용하지 않는다.
+
+    bench/docker-compose.yml : 로컬 MySQL 8 컨테이너
+    bench/seed.py            : 규모별 테스트 데이터 생성
+    bench/scenarios.py       : 엔드포인트별 요청 시나리오
+    bench/run.py             : 시나리오 실행 및 결과 보고
+    bench/serializer.py      : JSON 직렬화 성능 비교
+    bench/product_detail.py  : 상품 상세 조회 쿼리 4번 / 1번 비교
+    bench/stock_oversell.py  : 핫 재고 동시 차감 시 재고 초과 판매 여부 검증
+
+기본적인 사용 예시:
+    docker compose -f bench/docker-compose.yml up -d
+    mysql -h 127.0.0.1 -P 3307 -u root -pbench brandi < <프로젝트 스키마 덤프>
+    python -m bench.seed --scale small
+    python -m bench.run --duration 10 --concurrency 8
+    python -m bench.run --target http://127.0.0.1:8000 --duration 30 --concurrency 32
+
+Notes:
+    seed/run 은 저장소 루트의 config.py 의 DB 를 사용하며, --host 등의 옵션으로 덮어쓸 수 있다.
+    스키마는 저장소에 포함되어 있지 않으므로 팀 모델링에서 내려받은 DDL 을 먼저 적재해야 한다.
+    menus, 카테고리, 색상, 사이즈 등 코드성 테이블은 스키마 덤프의 값을 그대로 사용한다.
+"""
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+if ROOT not in sys.path:
+    sys.path.append(ROOT)
+
+
+def load_database(args=None):
+    """ config.DB 에 명령행 옵션(--host, --port, --user, --password, --database)을 덮어쓴 접속 정보
+
+        Args:
+            args : argparse 결과 (없으면 config.DB 그대로)
+
+        Returns:
+            app.config['DB'] 형식의 dict
+    """
+
+    try:
+        import config
+        database = dict(config.DB)
+    except ImportError:
+        database = {'host': '127.0.0.1', 'port': 3307, 'user': 'root', 'password': 'bench', 'name': 'brandi'}
+
+    database.setdefault('charset', 'utf8mb4')
+
+    if args is not None:
+        for option, key in (('host', 'host'), ('port', 'port'), ('user', 'user'), ('password', 'password'), ('database', 'name')):
+            if getattr(args, option, None) is not None:
+                database[key] = getattr(args, option)
+
+    return database
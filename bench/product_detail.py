@@ -0,0 +1,167 @@
+""" 상품 상세 조회 성능 비교 (쿼리 4번 / 1번)
+
+기존 상품 상세 조회(get_product_image_dao, get_product_size_dao, get_product_color_dao, get_product_detail_dao)와
+한 번의 쿼리로 합친 get_product_detail_bundle_dao 의 결과가 같은지 확인하고 응답 시간을 비교한다.
+
+기본적인 사용 예시:
+    python -m bench.product_detail
+    python -m bench.product_detail --products 200 --repeat 5 --rtt 1.0
+
+Notes:
+    로컬 MySQL 은 왕복 시간이 거의 없으므로 --rtt 로 쿼리마다 네트워크 왕복 지연(ms)을 더해
+    원격 데이터베이스에서의 차이를 가늠할 수 있다.
+"""
+import argparse
+import random
+import sys
+import time
+
+import pymysql
+
+from bench import load_database
+from bench.run import percentile
+
+from model import ProductListDao
+
+
+class DelayedConnection:
+    """ 쿼리마다 왕복 지연을 더하는 커넥션 """
+
+    def __init__(self, connection, rtt):
+        self.connection = connection
+        self.rtt = rtt
+
+    def cursor(self, *args, **kwargs):
+        return DelayedCursor(self.connection.cursor(*args, **kwargs), self.rtt)
+
+
+class DelayedCursor:
+    def __init__(self, cursor, rtt):
+        self.cursor = cursor
+        self.rtt = rtt
+
+    def __getattr__(self, name):
+        return getattr(self.cursor, name)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.cursor.close()
+
+    def execute(self, query, args=None):
+        time.sleep(self.rtt)
+        return self.cursor.execute(query, args)
+
+
+def legacy_detail(dao, connection, data):
+    """ 기존 ProductListService.product_detail_service 의 조회 순서 """
+
+    images = dao.get_product_image_dao(connection, data)
+    sizes = dao.get_product_size_dao(connection, data)
+    colors = dao.get_product_color_dao(connection, data)
+    product = dao.get_product_detail_dao(connection, data)
+    product['colors'] = colors
+    product['sizes'] = sizes
+    product['images'] = images
+    return product
+
+
+def bundle_detail(dao, connection, data):
+    return dao.get_product_detail_bundle_dao(connection, data)
+
+
+def normalize(product):
+    """ 비교용 (옵션 목록의 순서는 보장되지 않는다.) """
+
+    result = dict(product)
+    for key in ('images', 'colors', 'sizes'):
+        result[key] = sorted(sorted(item.items()) for item in product[key])
+    return result
+
+
+def sample_products(connection, size, seed):
+    with connection.cursor() as cursor:
+        cursor.execute("""
+            SELECT DISTINCT product.id
+            FROM products AS product
+            INNER JOIN stocks AS stock ON stock.product_id = product.id
+            WHERE product.is_deleted = 0
+        """)
+        product_ids = [row[0] for row in cursor.fetchall()]
+
+    random.Random(seed).shuffle(product_ids)
+    return product_ids[:size]
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='상품 상세 조회 성능 비교')
+    parser.add_argument('--products', type=int, default=100, help='조회할 상품 수')
+    parser.add_argument('--repeat', type=int, default=3, help='상품별 반복 횟수')
+    parser.add_argument('--rtt', type=float, default=0.0, help='쿼리마다 더할 왕복 지연 (ms)')
+    parser.add_argument('--account-id', type=int, help='북마크 여부를 함께 조회할 유저 id')
+    parser.add_argument('--seed', type=int, default=14)
+
+    parser.add_argument('--host')
+    parser.add_argument('--port', type=int)
+    parser.add_argument('--user')
+    parser.add_argument('--password')
+    parser.add_argument('--database')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    database = load_database(args)
+
+    raw = pymysql.connect(
+        host       = database['host'],
+        port       = database.get('port', 3306),
+        user       = database['user'],
+        password   = database['password'],
+        db         = database['name'],
+        charset    = database.get('charset', 'utf8mb4'),
+        autocommit = True
+    )
+    connection = DelayedConnection(raw, args.rtt / 1000) if args.rtt else raw
+    dao = ProductListDao()
+
+    try:
+        product_ids = sample_products(raw, args.products, args.seed)
+        if not product_ids:
+            print('재고가 있는 상품이 없습니다. (python -m bench.seed)')
+            return 1
+
+        timings = {'legacy': [], 'bundle': []}
+
+        for product_id in product_ids:
+            data = {'product_id': product_id}
+            if args.account_id:
+                data['account_id'] = args.account_id
+
+            if normalize(legacy_detail(dao, connection, dict(data))) != normalize(bundle_detail(dao, connection, dict(data))):
+                print('product {}: result differs'.format(product_id))
+                return 1
+
+            for _ in range(args.repeat):
+                for name, fetch in (('legacy', legacy_detail), ('bundle', bundle_detail)):
+                    start = time.perf_counter()
+                    fetch(dao, connection, dict(data))
+                    timings[name].append(time.perf_counter() - start)
+    finally:
+        raw.close()
+
+    line = '{:<8} {:>8} {:>10} {:>10} {:>10}'
+    print(line.format('path', 'queries', 'p50(ms)', 'p95(ms)', 'p99(ms)'))
+    for name, queries in (('legacy', 4), ('bundle', 1)):
+        values = timings[name] = sorted(timings[name])
+        print(line.format(name, queries, *('{:.2f}'.format(percentile(values, rank) * 1000) for rank in (50, 95, 99))))
+
+    legacy_p50 = percentile(timings['legacy'], 50)
+    bundle_p50 = percentile(timings['bundle'], 50)
+    print('p50 speedup: {:.2f}x'.format(legacy_p50 / bundle_p50))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,310 @@
+""" 시나리오 실행 및 결과 보고
+
+--concurrency 개의 스레드가 --duration 초(또는 --requests 회) 동안 시나리오를 무작위로 골라 실행하고,
+엔드포인트별 처리량(rps)과 응답 시간 분포(p50/p95/p99/max)를 출력한다.
+
+대상 (--target):
+    client          : create_app() 의 test client 로 프로세스 안에서 호출 (네트워크 / WSGI 서버 비용 제외)
+    http://host:port : 실행 중인 서버에 requests 로 호출
+
+기본적인 사용 예시:
+    python -m bench.run --duration 10 --concurrency 8
+    python -m bench.run --routes /products --routes /admin/orders --json result.json
+    python -m bench.run --target http://127.0.0.1:8000 --include-writes --duration 60 --concurrency 32
+
+Notes:
+    시나리오가 호출하지 않는 url rule 은 보고서 마지막에 목록으로 출력한다.
+"""
+import argparse
+import json
+import math
+import random
+import sys
+import threading
+import time
+
+from collections import defaultdict
+
+from bench     import load_database
+from bench     import scenarios as registry
+from bench.scenarios import Fixtures
+
+
+class Recorder:
+    """ 요청 이름별 응답 시간 / 오류 수 집계 (스레드 안전) """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.latencies = defaultdict(list)
+        self.errors = defaultdict(int)
+        self.statuses = defaultdict(lambda: defaultdict(int))
+
+    def add(self, name, elapsed, status, error):
+        with self.lock:
+            self.latencies[name].append(elapsed)
+            self.statuses[name][status] += 1
+            if error:
+                self.errors[name] += 1
+
+    def reset(self):
+        with self.lock:
+            self.latencies.clear()
+            self.errors.clear()
+            self.statuses.clear()
+
+
+def percentile(values, rank):
+    """ nearest-rank 백분위수 (values 는 정렬된 list) """
+
+    if not values:
+        return 0.0
+
+    index = max(0, min(len(values) - 1, math.ceil(rank / 100.0 * len(values)) - 1))
+    return values[index]
+
+
+class ClientTarget:
+    """ Flask test client 로 호출 (스레드마다 client 생성) """
+
+    def __init__(self, app):
+        self.app = app
+        self.local = threading.local()
+
+    def call(self, request):
+        if not hasattr(self.local, 'client'):
+            self.local.client = self.app.test_client()
+
+        headers = {'Authorization': request.token} if request.token else {}
+        response = self.local.client.open(
+            request.path, method=request.method, query_string=request.params, json=request.json, headers=headers
+        )
+        return response.status_code, response.get_json(silent=True)
+
+
+class HttpTarget:
+    """ 실행 중인 서버에 requests 로 호출 (스레드마다 세션 생성) """
+
+    def __init__(self, base_url):
+        import requests
+
+        self.requests = requests
+        self.base_url = base_url.rstrip('/')
+        self.local = threading.local()
+
+    def call(self, request):
+        if not hasattr(self.local, 'session'):
+            self.local.session = self.requests.Session()
+
+        headers = {'Authorization': request.token} if request.token else {}
+        response = self.local.session.request(
+            request.method, self.base_url + request.path, params=request.params, json=request.json, headers=headers
+        )
+
+        try:
+            body = response.json()
+        except ValueError:
+            body = None
+
+        return response.status_code, body
+
+
+def run_scenario(target, item, fixtures, rng, recorder):
+    """ 시나리오 하나를 끝까지 실행 (중간 요청이 실패하면 나머지 요청은 실행하지 않는다.) """
+
+    flow = item.function(fixtures, rng)
+    body = None
+
+    try:
+        request = next(flow)
+        while True:
+            name = request.name or item.name
+            start = time.perf_counter()
+
+            try:
+                status, body = target.call(request)
+            except Exception as e:
+                recorder.add(name, time.perf_counter() - start, type(e).__name__, True)
+                return
+
+            failed = status >= 400
+            recorder.add(name, time.perf_counter() - start, status, failed)
+
+            if failed:
+                return
+
+            request = flow.send(body)
+    except StopIteration:
+        pass
+    except (KeyError, TypeError):
+        # 이전 응답에서 필요한 값을 찾지 못한 경우
+        recorder.add(item.name + ' (flow)', 0.0, 'flow', True)
+
+
+def worker(target, items, fixtures, seed, recorder, deadline, budget):
+    rng = random.Random(seed)
+
+    while time.perf_counter() < deadline and budget.take():
+        run_scenario(target, rng.choice(items), fixtures, rng, recorder)
+
+
+class Budget:
+    """ --requests 로 지정한 시나리오 실행 횟수 (None 이면 무제한) """
+
+    def __init__(self, total):
+        self.total = total
+        self.lock = threading.Lock()
+
+    def take(self):
+        if self.total is None:
+            return True
+
+        with self.lock:
+            if self.total <= 0:
+                return False
+            self.total -= 1
+            return True
+
+
+def execute(target, items, fixtures, args, recorder, duration, total, seed):
+    deadline = time.perf_counter() + (duration if duration else float('inf'))
+    budget = Budget(total)
+    threads = [
+        threading.Thread(target=worker, args=(target, items, fixtures, seed + index, recorder, deadline, budget))
+        for index in range(args.concurrency)
+    ]
+
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    return time.perf_counter() - start
+
+
+def summarize(recorder, elapsed):
+    rows = []
+
+    for name in sorted(recorder.latencies):
+        values = sorted(recorder.latencies[name])
+        rows.append({
+            'name'    : name,
+            'count'   : len(values),
+            'errors'  : recorder.errors.get(name, 0),
+            'statuses': {str(key): value for key, value in recorder.statuses[name].items()},
+            'rps'     : len(values) / elapsed if elapsed else 0.0,
+            'p50_ms'  : percentile(values, 50) * 1000,
+            'p95_ms'  : percentile(values, 95) * 1000,
+            'p99_ms'  : percentile(values, 99) * 1000,
+            'max_ms'  : values[-1] * 1000
+        })
+
+    return rows
+
+
+def uncovered_rules(app, items):
+    """ 시나리오가 호출하지 않는 url rule """
+
+    if app is None:
+        return []
+
+    covered = {rule for item in items for rule in item.rules}
+    return sorted(
+        rule.rule for rule in app.url_map.iter_rules()
+        if rule.endpoint != 'static' and rule.rule not in covered
+    )
+
+
+def print_report(rows, elapsed, uncovered):
+    line = '{:<55} {:>7} {:>6} {:>8} {:>9} {:>9} {:>9} {:>9}'
+    print(line.format('endpoint', 'count', 'errors', 'rps', 'p50(ms)', 'p95(ms)', 'p99(ms)', 'max(ms)'))
+
+    for row in rows:
+        print(line.format(
+            row['name'][:55], row['count'], row['errors'], '{:.1f}'.format(row['rps']),
+            '{:.1f}'.format(row['p50_ms']), '{:.1f}'.format(row['p95_ms']),
+            '{:.1f}'.format(row['p99_ms']), '{:.1f}'.format(row['max_ms'])
+        ))
+
+    total = sum(row['count'] for row in rows)
+    print('\n{} requests in {:.1f}s ({:.1f} rps)'.format(total, elapsed, total / elapsed if elapsed else 0.0))
+
+    if uncovered:
+        print('\nnot covered by any scenario:')
+        for rule in uncovered:
+            print('    ' + rule)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='엔드포인트 처리량 / 응답 시간 측정')
+    parser.add_argument('--target', default='client', help="'client' 또는 http://host:port")
+    parser.add_argument('--duration', type=float, default=10.0, help='측정 시간 (초)')
+    parser.add_argument('--requests', type=int, help='시나리오 실행 횟수 (지정하면 --duration 대신 사용)')
+    parser.add_argument('--concurrency', type=int, default=4)
+    parser.add_argument('--warmup', type=float, default=2.0, help='측정 전 워밍업 시간 (초)')
+    parser.add_argument('--include-writes', action='store_true', help='데이터를 변경하는 시나리오도 실행')
+    parser.add_argument('--routes', action='append', help='이름에 포함된 문자열로 시나리오 선택 (여러 번 지정 가능)')
+    parser.add_argument('--seed', type=int, default=14)
+    parser.add_argument('--json', help='결과를 저장할 JSON 파일 경로')
+
+    parser.add_argument('--host')
+    parser.add_argument('--port', type=int)
+    parser.add_argument('--user')
+    parser.add_argument('--password')
+    parser.add_argument('--database')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    database = load_database(args)
+
+    items = list(registry.READ) + (list(registry.WRITE) if args.include_writes else [])
+    if args.routes:
+        items = [item for item in items if any(route in item.name for route in args.routes)]
+
+    if not items:
+        print('no scenario selected')
+        return 1
+
+    app = None
+    if args.target == 'client':
+        import config
+        from app import create_app
+
+        test_config = {key: getattr(config, key) for key in dir(config) if key.isupper()}
+        test_config['DB'] = database
+        app = create_app(test_config)
+        target = ClientTarget(app)
+        jwt_config = (app.config['JWT_SECRET_KEY'], app.config['JWT_ALGORITHM'])
+    else:
+        import config
+
+        target = HttpTarget(args.target)
+        jwt_config = (config.JWT_SECRET_KEY, config.JWT_ALGORITHM)
+
+    fixtures = Fixtures(database, jwt_config)
+    recorder = Recorder()
+
+    if args.warmup:
+        execute(target, items, fixtures, args, recorder, args.warmup, None, args.seed)
+        recorder.reset()
+
+    if args.requests:
+        elapsed = execute(target, items, fixtures, args, recorder, None, args.requests, args.seed)
+    else:
+        elapsed = execute(target, items, fixtures, args, recorder, args.duration, None, args.seed)
+
+    rows = summarize(recorder, elapsed)
+    uncovered = uncovered_rules(app, items)
+    print_report(rows, elapsed, uncovered)
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({'elapsed': elapsed, 'concurrency': args.concurrency, 'routes': rows, 'uncovered': uncovered}, f, indent=2)
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,392 @@
+""" 엔드포인트별 요청 시나리오
+
+시나리오는 Request 를 차례로 yield 하는 generator 함수다. 러너는 yield 된 Request 를 실행한 뒤
+응답 JSON 을 generator 에 다시 넘겨주므로, 장바구니 추가 -> 결제 -> 주문 조회처럼 이전 응답을 사용하는
+흐름도 하나의 시나리오로 작성할 수 있다. 응답 시간은 Request.name 별로 집계한다.
+
+    READ  : 조회만 하는 시나리오 (기본 실행 대상)
+    WRITE : 데이터를 변경하는 시나리오 (--include-writes 일 때만 실행)
+
+기본적인 사용 예시:
+    @scenario('GET /products')
+    def product_list(fixtures, rng):
+        yield Request('GET', '/products', params={'offset': rng.randrange(0, 300, 30), 'limit': 30})
+"""
+import datetime
+
+from collections import namedtuple
+
+import jwt
+import pymysql
+
+from bench.seed import PASSWORD, WORDS
+
+Scenario = namedtuple('Scenario', ['name', 'function', 'write', 'rules'])
+
+READ = []
+WRITE = []
+
+
+class Request:
+    """ 러너가 실행할 HTTP 요청
+
+        Args:
+            method : HTTP method
+            path   : URL 경로
+            params : 쿼리스트링
+            json   : JSON 본문
+            token  : Authorization 헤더 값
+            name   : 집계 이름 (기본 'METHOD 시나리오 이름')
+    """
+
+    def __init__(self, method, path, params=None, json=None, token=None, name=None):
+        self.method = method
+        self.path = path
+        self.params = params
+        self.json = json
+        self.token = token
+        self.name = name
+
+
+def scenario(name, write=False, rules=()):
+    """ 시나리오 등록 데코레이터
+
+        Args:
+            name  : 보고서에 표시할 이름
+            write : True 이면 --include-writes 일 때만 실행
+            rules : 시나리오가 호출하는 url rule (커버리지 확인용, 기본은 name 의 경로)
+    """
+
+    def real_decorator(func):
+        target = WRITE if write else READ
+        target.append(Scenario(name, func, write, tuple(rules) or (name.split(' ', 1)[1],)))
+        return func
+    return real_decorator
+
+
+class Fixtures:
+    """ 시나리오에 사용할 id 목록 (bench.seed 로 적재한 데이터에서 표본 추출)
+
+        Args:
+            database   : app.config['DB'] 형식의 dict
+            jwt_config : (JWT_SECRET_KEY, JWT_ALGORITHM)
+            sample     : 테이블별 표본 크기
+    """
+
+    def __init__(self, database, jwt_config, sample=1000):
+        self.secret, self.algorithm = jwt_config
+        connection = pymysql.connect(
+            host     = database['host'],
+            port     = database.get('port', 3306),
+            user     = database['user'],
+            password = database['password'],
+            db       = database['name'],
+            charset  = database.get('charset', 'utf8mb4')
+        )
+
+        try:
+            self.products = self._column(connection, 'SELECT id FROM products WHERE is_deleted = 0 ORDER BY RAND() LIMIT %s', sample)
+            self.sellers = self._column(connection, 'SELECT account_id FROM sellers ORDER BY RAND() LIMIT %s', sample)
+            self.events = self._column(connection, 'SELECT id FROM events WHERE is_deleted = 0 ORDER BY RAND() LIMIT %s', sample)
+            self.order_items = self._column(connection, 'SELECT id FROM order_items ORDER BY RAND() LIMIT %s', sample)
+            self.enquiries = self._column(connection, 'SELECT id FROM enquiries WHERE is_deleted = 0 ORDER BY RAND() LIMIT %s', sample)
+            self.orders = self._rows(connection, 'SELECT id, user_id FROM orders ORDER BY RAND() LIMIT %s', sample)
+            self.stocks = self._rows(
+                connection,
+                """
+                SELECT stock.id, stock.product_id, product.origin_price, product.discounted_price, product.discount_rate
+                FROM stocks AS stock
+                    INNER JOIN products AS product ON product.id = stock.product_id
+                WHERE stock.remain > 100 AND stock.is_deleted = 0
+                ORDER BY RAND() LIMIT %s
+                """,
+                sample
+            )
+            self.users = self._rows(connection, "SELECT id, username FROM accounts WHERE username LIKE 'bench\\_user\\_%%' ORDER BY RAND() LIMIT %s", sample)
+            self.seller_accounts = self._rows(connection, "SELECT id, username FROM accounts WHERE username LIKE 'bench\\_seller\\_%%' LIMIT %s", sample)
+            self.admin = self._rows(connection, "SELECT id, username FROM accounts WHERE username = 'bench_admin'", None)[0]
+        finally:
+            connection.close()
+
+    def _rows(self, connection, sql, sample):
+        with connection.cursor() as cursor:
+            cursor.execute(sql, (sample,) if sample is not None else None)
+            return cursor.fetchall()
+
+    def _column(self, connection, sql, sample):
+        return [row[0] for row in self._rows(connection, sql, sample)]
+
+    def token(self, account, permission_type_id):
+        """ signin_decorator 가 해석하는 access token """
+
+        account_id, username = account
+        token = jwt.encode(
+            {
+                'account_id'        : account_id,
+                'username'          : username,
+                'permission_type_id': permission_type_id,
+                'exp'               : datetime.datetime.utcnow() + datetime.timedelta(hours=5)
+            },
+            self.secret,
+            self.algorithm
+        )
+        return token.decode('utf-8') if isinstance(token, bytes) else token
+
+    def user_token(self, rng):
+        return self.token(rng.choice(self.users), 3)
+
+    def admin_token(self):
+        return self.token(self.admin, 1)
+
+
+# ----------------------------------------------------------------------------------------------------------------------
+# 서비스
+# ----------------------------------------------------------------------------------------------------------------------
+@scenario('GET /products')
+def product_list(fixtures, rng):
+    yield Request('GET', '/products', params={'offset': rng.randrange(0, 300, 30), 'limit': 30})
+
+
+@scenario('GET /products/search')
+def product_search(fixtures, rng):
+    yield Request('GET', '/products/search', params={
+        'q': rng.choice(WORDS), 'limit': 30, 'sort_type': rng.choice('123')
+    })
+
+
+@scenario('GET /products/<product_id>')
+def product_detail(fixtures, rng):
+    yield Request('GET', '/products/{}'.format(rng.choice(fixtures.products)), token=fixtures.user_token(rng))
+
+
+@scenario('GET /products/<int:product_id>/enquiries')
+def product_enquiries(fixtures, rng):
+    yield Request('GET', '/products/{}/enquiries'.format(rng.choice(fixtures.products)),
+                  params={'offset': 0, 'limit': 5, 'type': 'all'})
+
+
+@scenario('GET /users/my-page/enquiries')
+def my_page_enquiries(fixtures, rng):
+    yield Request('GET', '/users/my-page/enquiries', params={'type': 'all'}, token=fixtures.user_token(rng))
+
+
+@scenario('GET /categories')
+def categories(fixtures, rng):
+    yield Request('GET', '/categories')
+
+
+@scenario('GET /event-list')
+def event_banner_list(fixtures, rng):
+    yield Request('GET', '/event-list', params={'offset': 0, 'limit': 30, 'is_proceeding': rng.choice((0, 1))})
+
+
+@scenario('GET /event-list/<int:event_id>')
+def event_product_list(fixtures, rng):
+    yield Request('GET', '/event-list/{}'.format(rng.choice(fixtures.events)), params={'offset': 0, 'limit': 30})
+
+
+@scenario('GET /event-list/<int:event_id>/information')
+def event_information(fixtures, rng):
+    yield Request('GET', '/event-list/{}/information'.format(rng.choice(fixtures.events)))
+
+
+@scenario('GET /event-list/<int:event_id>/buttons')
+def event_buttons(fixtures, rng):
+    yield Request('GET', '/event-list/{}/buttons'.format(rng.choice(fixtures.events)))
+
+
+@scenario('GET /shops/<int:seller_id>')
+def seller_shop(fixtures, rng):
+    yield Request('GET', '/shops/{}'.format(rng.choice(fixtures.sellers)))
+
+
+@scenario('GET /shops/<int:seller_id>/search')
+def seller_shop_search(fixtures, rng):
+    yield Request('GET', '/shops/{}/search'.format(rng.choice(fixtures.sellers)), params={'keyword': rng.choice(WORDS)})
+
+
+@scenario('GET /shops/<int:seller_id>/category')
+def seller_shop_category(fixtures, rng):
+    yield Request('GET', '/shops/{}/category'.format(rng.choice(fixtures.sellers)))
+
+
+@scenario('GET /shops/<int:seller_id>/products')
+def seller_shop_products(fixtures, rng):
+    yield Request('GET', '/shops/{}/products'.format(rng.choice(fixtures.sellers)),
+                  params={'type': rng.choice(('latest', 'popular'))})
+
+
+@scenario('GET /destination')
+def destinations(fixtures, rng):
+    yield Request('GET', '/destination', token=fixtures.user_token(rng))
+
+
+@scenario('GET /checkout/sender')
+def sender(fixtures, rng):
+    yield Request('GET', '/checkout/sender', token=fixtures.user_token(rng))
+
+
+@scenario('GET /checkout/<int:order_id>')
+def order_confirmation(fixtures, rng):
+    order_id, user_id = rng.choice(fixtures.orders)
+    yield Request('GET', '/checkout/{}'.format(order_id), token=fixtures.token((user_id, 'bench_user_{}'.format(user_id)), 3))
+
+
+# ----------------------------------------------------------------------------------------------------------------------
+# 어드민
+# ----------------------------------------------------------------------------------------------------------------------
+@scenario('GET /admin/orders')
+def admin_orders(fixtures, rng):
+    yield Request('GET', '/admin/orders', params={
+        'status': rng.choice((1, 2, 3, 8)), 'page': rng.randint(1, 10), 'length': rng.choice((10, 50, 100))
+    }, token=fixtures.admin_token())
+
+
+@scenario('GET /admin/orders (cursor)', rules=('/admin/orders',))
+def admin_orders_cursor(fixtures, rng):
+    """ nextCursor 로 최대 10 페이지까지 이어서 조회 (깊은 페이지의 응답 시간 비교) """
+
+    params = {
+        'status'    : rng.choice((1, 2, 3, 8)),
+        'start_date': '2000-01-01',
+        'end_date'  : '2100-12-31',
+        'length'    : 50,
+        'count'     : rng.choice(('cached', 'estimate'))
+    }
+
+    page = yield Request('GET', '/admin/orders', params=params, token=fixtures.admin_token(), name='GET /admin/orders (cursor)')
+
+    for _ in range(rng.randint(1, 10)):
+        if not page.get('nextCursor'):
+            return
+        page = yield Request(
+            'GET', '/admin/orders', params=dict(params, cursor=page['nextCursor']), token=fixtures.admin_token(),
+            name='GET /admin/orders (cursor)'
+        )
+
+
+@scenario('GET /admin/orders/detail/<int:order_item_id>')
+def admin_order_detail(fixtures, rng):
+    yield Request('GET', '/admin/orders/detail/{}'.format(rng.choice(fixtures.order_items)), token=fixtures.admin_token())
+
+
+@scenario('GET /enquiries')
+def admin_enquiries(fixtures, rng):
+    yield Request('GET', '/enquiries', json={'page': rng.randint(1, 10), 'length': 10}, token=fixtures.admin_token())
+
+
+@scenario('GET /answer/<int:enquiry_id>')
+def admin_answer(fixtures, rng):
+    yield Request('GET', '/answer/{}'.format(rng.choice(fixtures.enquiries)), token=fixtures.admin_token())
+
+
+@scenario('GET /events')
+def admin_events(fixtures, rng):
+    yield Request('GET', '/events', params={'page': 1, 'length': 10}, token=fixtures.admin_token())
+
+
+@scenario('GET /event/<int:event_id>')
+def admin_event_detail(fixtures, rng):
+    yield Request('GET', '/event/{}'.format(rng.choice(fixtures.events)), token=fixtures.admin_token())
+
+
+@scenario('GET /event/products/category')
+def admin_event_product_category(fixtures, rng):
+    yield Request('GET', '/event/products/category', json={'filter': 'none'}, token=fixtures.admin_token())
+
+
+@scenario('GET /event/products')
+def admin_event_products(fixtures, rng):
+    yield Request('GET', '/event/products', params={'page': rng.randint(1, 10), 'length': 10}, token=fixtures.admin_token())
+
+
+@scenario('GET /admin/sellers')
+def admin_sellers(fixtures, rng):
+    yield Request('GET', '/admin/sellers', params={'offset': rng.randrange(0, 100, 10)}, token=fixtures.admin_token())
+
+
+@scenario('GET /admin/search')
+def admin_seller_search(fixtures, rng):
+    yield Request('GET', '/admin/search', params={'page': rng.randint(1, 10), 'page_view': 10}, token=fixtures.admin_token())
+
+
+@scenario('GET /admin/<int:account_id>')
+def admin_seller_info(fixtures, rng):
+    yield Request('GET', '/admin/{}'.format(rng.choice(fixtures.sellers)), token=fixtures.admin_token())
+
+
+@scenario('GET /admin/<int:account_id>/history')
+def admin_seller_history(fixtures, rng):
+    yield Request('GET', '/admin/{}/history'.format(rng.choice(fixtures.sellers)), token=fixtures.admin_token())
+
+
+@scenario('GET /admin/product/productRegist')
+def admin_product_regist(fixtures, rng):
+    yield Request('GET', '/admin/product/productRegist', token=fixtures.admin_token())
+
+
+# ----------------------------------------------------------------------------------------------------------------------
+# 쓰기 (--include-writes)
+# ----------------------------------------------------------------------------------------------------------------------
+@scenario('POST /users/signin', write=True)
+def user_sign_in(fixtures, rng):
+    yield Request('POST', '/users/signin', json={'username': rng.choice(fixtures.users)[1], 'password': PASSWORD})
+
+
+@scenario('POST /admin/signin', write=True)
+def seller_sign_in(fixtures, rng):
+    yield Request('POST', '/admin/signin', json={'username': rng.choice(fixtures.seller_accounts)[1], 'password': PASSWORD})
+
+
+@scenario('POST /products/<int:product_id>/bookmarks', write=True)
+def bookmark(fixtures, rng):
+    token = fixtures.user_token(rng)
+    path = '/products/{}/bookmarks'.format(rng.choice(fixtures.products))
+
+    yield Request('POST', path, token=token)
+    yield Request('DELETE', path, token=token, name='DELETE /products/<int:product_id>/bookmarks')
+
+
+@scenario('POST /checkout', write=True, rules=('/checkout/cart', '/checkout/cart/<int:cart_id>', '/checkout', '/checkout/<int:order_id>'))
+def checkout(fixtures, rng):
+    """ 장바구니 추가 -> 장바구니 조회 -> 결제 -> 주문 완료 조회 """
+
+    token = fixtures.user_token(rng)
+    stock_id, product_id, origin_price, discounted_price, discount_rate = rng.choice(fixtures.stocks)
+    quantity = rng.randint(1, 2)
+
+    cart = yield Request('POST', '/checkout/cart', json={
+        'productId'      : product_id,
+        'stockId'        : stock_id,
+        'quantity'       : quantity,
+        'originalPrice'  : str(origin_price),
+        'sale'           : str(discount_rate),
+        'discountedPrice': str(discounted_price)
+    }, token=token, name='POST /checkout/cart')
+    cart_id = cart['result']['cart_id']
+
+    yield Request('GET', '/checkout/cart/{}'.format(cart_id), token=token, name='GET /checkout/cart/<int:cart_id>')
+
+    order = yield Request('POST', '/checkout', json={
+        'cartId'         : cart_id,
+        'productId'      : product_id,
+        'stockId'        : stock_id,
+        'quantity'       : quantity,
+        'originalPrice'  : int(origin_price),
+        'sale'           : str(discount_rate),
+        'discountedPrice': int(discounted_price),
+        'totalPrice'     : int(discounted_price) * quantity,
+        'soldOut'        : False,
+        'senderName'     : 'bench',
+        'senderPhone'    : '01012345678',
+        'senderEmail'    : 'bench@example.com',
+        'recipientName'  : 'bench',
+        'recipientPhone' : '01012345678',
+        'address1'       : '서울시 강남구',
+        'address2'       : '벤치빌딩',
+        'postNumber'     : '12345678',
+        'deliveryId'     : 1
+    }, token=token)
+
+    yield Request('GET', '/checkout/{}'.format(order['result']['order_id']), token=token,
+                  name='GET /checkout/<int:order_id> (after write)')
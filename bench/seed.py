@@ -0,0 +1,507 @@
+""" 성능 측정용 데이터 생성
+
+같은 --seed 로 실행하면 항상 같은 데이터를 생성한다. 각 테이블의 현재 MAX(id) 다음 번호부터 id 를 직접 지정해
+적재하므로 기존 데이터와 섞이지 않고, 여러 번 실행하면 데이터가 누적된다. (--truncate 로 비우고 시작)
+
+기본적인 사용 예시:
+    python -m bench.seed --scale small
+    python -m bench.seed --scale large --batch-size 20000
+    python -m bench.seed --products 50000 --order-items 2000000 --host 127.0.0.1 --port 3307
+
+규모 (--scale):
+    tiny   : 상품 1천,   주문 상품 1만
+    small  : 상품 1만,   주문 상품 10만
+    medium : 상품 10만,  주문 상품 100만
+    large  : 상품 100만, 주문 상품 1000만
+"""
+import argparse
+import datetime
+import random
+import sys
+import time
+
+import bcrypt
+import pymysql
+
+from bench import load_database
+
+# 로그인에 사용할 공통 비밀번호 (bench.run 이 signin 시나리오에 사용한다.)
+PASSWORD = 'Bench1234!'
+
+SCALES = {
+    'tiny'  : {'sellers': 20,    'users': 1000,    'products': 1000,    'order_items': 10000,    'events': 20},
+    'small' : {'sellers': 100,   'users': 10000,   'products': 10000,   'order_items': 100000,   'events': 50},
+    'medium': {'sellers': 1000,  'users': 100000,  'products': 100000,  'order_items': 1000000,  'events': 200},
+    'large' : {'sellers': 5000,  'users': 1000000, 'products': 1000000, 'order_items': 10000000, 'events': 500},
+}
+
+# 생성 순서 (--truncate 시에는 역순으로 비운다.)
+TABLES = (
+    'accounts', 'sellers', 'seller_histories', 'users',
+    'products', 'product_images', 'stocks', 'product_sales_volumes', 'bookmark_volumes',
+    'orders', 'order_items', 'order_item_histories',
+    'events', 'event_buttons', 'events_products',
+    'bookmarks', 'enquiries',
+)
+
+WORDS = (
+    '루즈핏', '오버', '크롭', '와이드', '슬림', '데일리', '베이직', '니트', '셔츠', '블라우스', '원피스', '자켓',
+    '코트', '슬랙스', '데님', '스커트', '가디건', '후드', '맨투맨', '티셔츠', '린넨', '울', '캐시미어', '체크',
+    '스트라이프', '플라워', '빈티지', '미니', '롱', '하이웨스트',
+)
+BRANDS = ('브랜디', '하이버', '마켓', '스튜디오', '라운지', '아뜰리에', '클로젯', '하우스', '룸', '피팅')
+
+
+def report(table, total, elapsed):
+    print('{:<24}{:>12,} rows {:>8.1f}s'.format(table, total, elapsed), flush=True)
+
+
+class Seeder:
+    """ 테이블별 데이터 생성기
+
+        Args:
+            connection : pymysql connection 객체
+            counts     : 테이블별 생성 개수 (SCALES 참조)
+            seed       : 난수 seed
+            batch_size : executemany 한 번에 적재할 row 수
+    """
+
+    def __init__(self, connection, counts, seed, batch_size):
+        self.connection = connection
+        self.counts = counts
+        self.random = random.Random(seed)
+        self.batch_size = batch_size
+        self.now = datetime.datetime(2021, 1, 1)
+        self.password = bcrypt.hashpw(PASSWORD.encode('utf-8'), bcrypt.gensalt(rounds=4)).decode('utf-8')
+
+    def ids(self, table):
+        """ 코드성 테이블의 id 목록 (스키마 덤프에 포함된 값) """
+
+        sql = 'SELECT id FROM `{}`'.format(table)
+
+        if self._has_column(table, 'is_deleted'):
+            sql += ' WHERE is_deleted = 0'
+
+        with self.connection.cursor() as cursor:
+            cursor.execute(sql)
+            return [row[0] for row in cursor.fetchall()]
+
+    def _has_column(self, table, column):
+        with self.connection.cursor() as cursor:
+            cursor.execute(
+                """
+                SELECT COUNT(*) FROM information_schema.columns
+                WHERE table_schema = DATABASE() AND table_name = %s AND column_name = %s
+                """,
+                (table, column)
+            )
+            return cursor.fetchone()[0] > 0
+
+    def next_id(self, table):
+        with self.connection.cursor() as cursor:
+            cursor.execute('SELECT COALESCE(MAX(id), 0) + 1 FROM `{}`'.format(table))
+            return cursor.fetchone()[0]
+
+    def insert(self, table, columns, rows):
+        """ rows 이터레이터를 batch_size 단위로 적재
+
+            Returns:
+                적재한 row 수
+        """
+
+        start = time.perf_counter()
+        total = 0
+        batch = []
+
+        for row in rows:
+            batch.append(row)
+
+            if len(batch) >= self.batch_size:
+                total += self.insert_batch(table, columns, batch)
+                batch = []
+
+        if batch:
+            total += self.insert_batch(table, columns, batch)
+
+        report(table, total, time.perf_counter() - start)
+        return total
+
+    def insert_batch(self, table, columns, batch):
+        sql = 'INSERT INTO `{}` ({}) VALUES ({})'.format(
+            table,
+            ', '.join('`{}`'.format(column) for column in columns),
+            ', '.join(['%s'] * len(columns))
+        )
+
+        with self.connection.cursor() as cursor:
+            cursor.executemany(sql, batch)
+
+        self.connection.commit()
+        return len(batch)
+
+    def timestamp(self, days=365):
+        return self.now - datetime.timedelta(seconds=self.random.randrange(days * 86400))
+
+    def phone(self):
+        return '010{:08d}'.format(self.random.randrange(10 ** 8))
+
+    def name(self, count=3):
+        return ' '.join(self.random.choice(WORDS) for _ in range(count))
+
+    def run(self):
+        colors = self.ids('colors')
+        sizes = self.ids('sizes')
+        sub_categories = self._sub_categories()
+        event_types = self.ids('event_types')
+        event_kinds = self.ids('event_kinds')
+        enquiry_types = self.ids('enquiry_types')
+        status_types = self.ids('order_item_status_types')
+        origin_types = self.ids('product_origin_types')
+        delivery_memos = self.ids('delivery_memo_types') or [None]
+
+        sellers = self.seed_accounts()
+        users = self.seed_users()
+        products = self.seed_products(sellers, sub_categories, origin_types, colors, sizes)
+        self.seed_orders(users, products, status_types, delivery_memos)
+        self.seed_events(products, event_types, event_kinds)
+        self.seed_bookmarks(users, products)
+        self.seed_enquiries(users, products, enquiry_types)
+
+    def _sub_categories(self):
+        with self.connection.cursor() as cursor:
+            cursor.execute('SELECT id, main_category_id FROM sub_categories')
+            return cursor.fetchall()
+
+    def seed_accounts(self):
+        """ 셀러 계정 (bench_seller_<n>) 및 관리자 계정 (bench_admin) """
+
+        first = self.next_id('accounts')
+        accounts = list(range(first, first + self.counts['sellers'] + 1))
+
+        self.insert('accounts', ('id', 'username', 'password', 'permission_type_id'), (
+            [(first, 'bench_admin', self.password, 1)]
+            + [(account_id, 'bench_seller_{}'.format(account_id), self.password, 2) for account_id in accounts[1:]]
+        ))
+
+        sellers = accounts[1:]
+
+        self.insert('sellers', (
+            'account_id', 'seller_attribute_type_id', 'name', 'english_name', 'contact_phone', 'service_center_number'
+        ), (
+            (
+                account_id,
+                self.random.randint(1, 7),
+                '{} {}'.format(self.random.choice(BRANDS), account_id),
+                'bench seller {}'.format(account_id),
+                self.phone(),
+                self.phone()
+            )
+            for account_id in sellers
+        ))
+
+        self.insert('seller_histories', ('seller_id', 'seller_status_type_id', 'updater_id'), (
+            (account_id, 2, first) for account_id in sellers
+        ))
+
+        return sellers
+
+    def seed_users(self):
+        """ 일반 유저 계정 (bench_user_<n>) """
+
+        first = self.next_id('accounts')
+        users = range(first, first + self.counts['users'])
+
+        self.insert('accounts', ('id', 'username', 'password', 'permission_type_id'), (
+            (account_id, 'bench_user_{}'.format(account_id), self.password, 3) for account_id in users
+        ))
+
+        self.insert('users', ('account_id', 'phone', 'email'), (
+            (account_id, self.phone(), 'bench{}@example.com'.format(account_id)) for account_id in users
+        ))
+
+        return list(users)
+
+    def seed_products(self, sellers, sub_categories, origin_types, colors, sizes):
+        first = self.next_id('products')
+        count = self.counts['products']
+        products = []
+
+        def product_rows():
+            for product_id in range(first, first + count):
+                sub_category_id, main_category_id = self.random.choice(sub_categories)
+                seller_id = self.random.choice(sellers)
+                origin_price = self.random.randrange(5000, 200000, 100)
+                discount_rate = self.random.choice((0, 0, 0, 5, 10, 20, 30, 50))
+                discounted_price = origin_price * (100 - discount_rate) // 100
+                created_at = self.timestamp()
+                products.append((product_id, seller_id, origin_price, discount_rate, discounted_price))
+
+                yield (
+                    product_id, 'P{:012d}'.format(product_id), 1, 1, main_category_id, sub_category_id, 0,
+                    self.random.choice(origin_types) if origin_types else None,
+                    self.name(), self.name(6), '<p>{}</p>'.format(self.name(20)),
+                    origin_price, discount_rate, discounted_price, 1, 20,
+                    seller_id, seller_id, created_at, created_at
+                )
+
+        self.insert('products', (
+            'id', 'product_code', 'is_display', 'is_sale', 'main_category_id', 'sub_category_id', 'is_product_notice',
+            'product_origin_type_id', 'name', 'description', 'detail_information',
+            'origin_price', 'discount_rate', 'discounted_price', 'minimum_quantity', 'maximum_quantity',
+            'seller_id', 'account_id', 'created_at', 'updated_at'
+        ), product_rows())
+
+        self.insert('product_images', ('image_url', 'product_id', 'order_index'), (
+            ('https://bench.local/images/{}/{}.jpg'.format(product_id, index), product_id, index)
+            for product_id, *_ in products
+            for index in range(1, self.random.randint(2, 5))
+        ))
+
+        stock_first = self.next_id('stocks')
+        stocks = []
+
+        def stock_rows():
+            stock_id = stock_first
+
+            for index, (product_id, *_) in enumerate(products):
+                first = stock_id
+
+                for color_id in self.random.sample(colors, min(len(colors), 2)):
+                    for size_id in self.random.sample(sizes, min(len(sizes), 3)):
+                        yield (
+                            stock_id, 'P{:012d}{:02d}{:02d}'.format(product_id, color_id, size_id), 1,
+                            self.random.randint(0, 500), color_id, size_id, product_id
+                        )
+                        stock_id += 1
+
+                stocks.append(range(first, stock_id))
+
+        self.insert('stocks', (
+            'id', 'product_option_code', 'is_stock_manage', 'remain', 'color_id', 'size_id', 'product_id'
+        ), stock_rows())
+
+        # products 의 각 원소: (product_id, seller_id, origin_price, discount_rate, discounted_price, stock_ids)
+        products[:] = [product + (stock_ids,) for product, stock_ids in zip(products, stocks)]
+
+        self.insert('product_sales_volumes', ('product_id', 'sales_count'), (
+            (product_id, 0) for product_id, *_ in products
+        ))
+
+        self.insert('bookmark_volumes', ('product_id', 'bookmark_count'), (
+            (product_id, 0) for product_id, *_ in products
+        ))
+
+        return products
+
+    def seed_orders(self, users, products, status_types, delivery_memos):
+        """ 주문 1건당 주문 상품 1~3개
+
+            Notes:
+                주문 상품 1000만 건도 메모리에 올리지 않도록 batch_size 단위로 주문/주문 상품/이력을 함께 적재한다.
+        """
+
+        order_columns = (
+            'id', 'order_number', 'sender_name', 'sender_phone', 'sender_email', 'recipient_name', 'recipient_phone',
+            'address1', 'address2', 'post_number', 'user_id', 'delivery_memo_type_id', 'total_price',
+            'created_at', 'updated_at'
+        )
+        item_columns = (
+            'id', 'product_id', 'stock_id', 'quantity', 'order_id', 'order_detail_number', 'order_item_status_type_id',
+            'original_price', 'discounted_price', 'sale', 'created_at', 'updated_at'
+        )
+        history_columns = ('order_item_id', 'order_item_status_type_id', 'updater_id', 'created_at')
+
+        start = time.perf_counter()
+        item_first = self.next_id('order_items')
+        target = self.counts['order_items']
+        order_id = self.next_id('orders')
+        item_id = item_first
+        totals = {'orders': 0, 'order_items': 0, 'order_item_histories': 0}
+
+        while item_id - item_first < target:
+            orders, items, histories = [], [], []
+
+            while len(items) < self.batch_size and item_id - item_first < target:
+                created_at = self.timestamp()
+                user_id = self.random.choice(users)
+                total = 0
+
+                for index in range(min(self.random.randint(1, 3), target - (item_id - item_first))):
+                    product_id, seller_id, origin_price, discount_rate, discounted_price, stock_ids = \
+                        self.random.choice(products)
+                    quantity = self.random.randint(1, 3)
+                    status_type_id = self.random.choice(status_types)
+                    total += discounted_price * quantity
+
+                    items.append((
+                        item_id, product_id, self.random.choice(stock_ids), quantity, order_id,
+                        'B{}{:06d}{:03d}'.format(created_at.strftime('%Y%m%d'), order_id % 10 ** 6, index + 1),
+                        status_type_id, origin_price, discounted_price, discount_rate, created_at, created_at
+                    ))
+                    histories.append((item_id, status_type_id, user_id, created_at))
+                    item_id += 1
+
+                orders.append((
+                    order_id, '{}{:06d}000'.format(created_at.strftime('%Y%m%d'), order_id % 10 ** 6),
+                    'bench', self.phone(), 'bench@example.com', 'bench', self.phone(),
+                    '서울시 강남구', '벤치빌딩 {}층'.format(order_id % 30), '12345678', user_id,
+                    self.random.choice(delivery_memos), total, created_at, created_at
+                ))
+                order_id += 1
+
+            totals['orders'] += self.insert_batch('orders', order_columns, orders)
+            totals['order_items'] += self.insert_batch('order_items', item_columns, items)
+            totals['order_item_histories'] += self.insert_batch('order_item_histories', history_columns, histories)
+
+        elapsed = time.perf_counter() - start
+        for table, total in totals.items():
+            report(table, total, elapsed)
+
+    def seed_events(self, products, event_types, event_kinds):
+        first = self.next_id('events')
+        events = range(first, first + self.counts['events'])
+        schedule = dict()
+
+        def event_rows():
+            for event_id in events:
+                start = self.timestamp(180)
+                end = start + datetime.timedelta(days=self.random.randint(7, 365))
+                schedule[event_id] = self.random.choice(event_kinds)
+                yield (
+                    event_id, 'bench event {}'.format(event_id), start, end,
+                    'https://bench.local/events/{}/banner.jpg'.format(event_id),
+                    'https://bench.local/events/{}/detail.jpg'.format(event_id),
+                    self.random.choice(event_types), schedule[event_id], 1
+                )
+
+        self.insert('events', (
+            'id', 'name', 'start_date', 'end_date', 'banner_image', 'detail_image', 'event_type_id', 'event_kind_id',
+            'is_display'
+        ), event_rows())
+
+        button_first = self.next_id('event_buttons')
+        buttons = dict()
+        button_id = button_first
+
+        for event_id in events:
+            buttons[event_id] = list(range(button_id, button_id + 3))
+            button_id += 3
+
+        self.insert('event_buttons', ('id', 'name', 'order_index', 'event_id'), (
+            (button, '버튼 {}'.format(index + 1), index + 1, event_id)
+            for event_id, event_buttons in buttons.items()
+            for index, button in enumerate(event_buttons)
+        ))
+
+        self.insert('events_products', ('event_id', 'product_id', 'event_button_id'), (
+            (event_id, product[0], self.random.choice(buttons[event_id]))
+            for event_id in events
+            for product in self.random.sample(products, min(len(products), 60))
+        ))
+
+    def seed_bookmarks(self, users, products):
+        count = min(len(users) * len(products), self.counts['order_items'] // 10)
+        pairs = set()
+
+        while len(pairs) < count:
+            pairs.add((self.random.choice(users), self.random.choice(products)[0]))
+
+        self.insert('bookmarks', ('account_id', 'product_id'), sorted(pairs))
+
+        with self.connection.cursor() as cursor:
+            cursor.execute(
+                """
+                UPDATE bookmark_volumes AS bookmark_volume
+                    INNER JOIN (
+                        SELECT product_id, COUNT(*) AS bookmark_count FROM bookmarks GROUP BY product_id
+                    ) AS counted
+                        ON counted.product_id = bookmark_volume.product_id
+                SET bookmark_volume.bookmark_count = counted.bookmark_count
+                """
+            )
+            cursor.execute(
+                """
+                UPDATE product_sales_volumes AS sales_volume
+                    INNER JOIN (
+                        SELECT product_id, SUM(quantity) AS sales_count FROM order_items GROUP BY product_id
+                    ) AS counted
+                        ON counted.product_id = sales_volume.product_id
+                SET sales_volume.sales_count = counted.sales_count
+                """
+            )
+        self.connection.commit()
+
+    def seed_enquiries(self, users, products, enquiry_types):
+        count = self.counts['order_items'] // 20
+
+        self.insert('enquiries', (
+            'product_id', 'user_id', 'content', 'enquiry_type_id', 'is_secret', 'is_completed', 'created_at'
+        ), (
+            (
+                self.random.choice(products)[0], self.random.choice(users), self.name(8),
+                self.random.choice(enquiry_types), self.random.randint(0, 1), 0, self.timestamp()
+            )
+            for _ in range(count)
+        ))
+
+
+def truncate(connection):
+    with connection.cursor() as cursor:
+        for table in reversed(TABLES):
+            cursor.execute('TRUNCATE `{}`'.format(table))
+    connection.commit()
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='성능 측정용 데이터 생성')
+    parser.add_argument('--scale', choices=sorted(SCALES), default='tiny')
+    parser.add_argument('--seed', type=int, default=14)
+    parser.add_argument('--batch-size', type=int, default=5000)
+    parser.add_argument('--truncate', action='store_true', help='생성 전 대상 테이블을 비운다.')
+
+    for key in SCALES['tiny']:
+        parser.add_argument('--' + key.replace('_', '-'), type=int, dest=key, help='{} 생성 개수'.format(key))
+
+    parser.add_argument('--host')
+    parser.add_argument('--port', type=int)
+    parser.add_argument('--user')
+    parser.add_argument('--password')
+    parser.add_argument('--database')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    database = load_database(args)
+    counts = dict(SCALES[args.scale])
+
+    for key in counts:
+        if getattr(args, key) is not None:
+            counts[key] = getattr(args, key)
+
+    connection = pymysql.connect(
+        host     = database['host'],
+        port     = database.get('port', 3306),
+        user     = database['user'],
+        password = database['password'],
+        db       = database['name'],
+        charset  = database.get('charset', 'utf8mb4')
+    )
+
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute('SET SESSION foreign_key_checks = 0')
+            cursor.execute('SET SESSION unique_checks = 0')
+
+        if args.truncate:
+            truncate(connection)
+
+        start = time.perf_counter()
+        Seeder(connection, counts, args.seed, args.batch_size).run()
+        print('done in {:.1f}s (password for bench accounts: {})'.format(time.perf_counter() - start, PASSWORD))
+    finally:
+        connection.close()
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,161 @@
+""" JSON 직렬화 성능 비교 (CustomJSONEncoder / FastJSONEncoder)
+
+실제 DAO 조회 결과를 jsonify 와 같은 옵션으로 직렬화해 두 인코더의 출력이 같은지 확인하고 소요 시간을 비교한다.
+
+기본적인 사용 예시:
+    python -m bench.serializer
+    python -m bench.serializer --rows 1000 --repeat 50
+    python -m bench.serializer --synthetic 5000
+
+Notes:
+    --synthetic 을 지정하면 DB 없이 상품 리스트와 같은 형태의 row 를 생성해 비교한다.
+"""
+import argparse
+import datetime
+import decimal
+import json
+import random
+import sys
+import time
+
+import pymysql
+
+from bench import load_database
+
+from app              import CustomJSONEncoder
+from model            import OrderDao, ProductListDao, SellerDao, EventListDao
+from utils.serializer import FastJSONEncoder
+
+# jsonify 옵션 (app.debug = True 이므로 들여쓰기 출력)
+PRETTY  = {'indent': 2, 'separators': (', ', ': '), 'sort_keys': True, 'ensure_ascii': True}
+COMPACT = {'indent': None, 'separators': (',', ':'), 'sort_keys': True, 'ensure_ascii': True}
+
+
+def load_result_sets(database, rows):
+    """ 목록 엔드포인트의 DAO 조회 결과 {이름: 결과} """
+
+    connection = pymysql.connect(
+        host     = database['host'],
+        port     = database.get('port', 3306),
+        user     = database['user'],
+        password = database['password'],
+        db       = database['name'],
+        charset  = database.get('charset', 'utf8mb4')
+    )
+
+    try:
+        return {
+            'ProductListDao.get_search_products_dao': ProductListDao().get_search_products_dao(
+                connection, {'search': '', 'sort_type': 3, 'limit': rows}
+            ),
+            'EventListDao.get_event_banner_list': EventListDao().get_event_banner_list(
+                connection, {'is_proceeding': 1, 'offset': 0, 'limit': rows}
+            ),
+            'SellerDao.get_seller_list': SellerDao().get_seller_list(connection, rows),
+            'OrderDao.get_order_list_dao': OrderDao().get_order_list_dao(connection, {
+                'permission'   : 1,
+                'account'      : None,
+                'status'       : 1,
+                'number'       : None,
+                'detail_number': None,
+                'sender_name'  : None,
+                'sender_phone' : None,
+                'seller_name'  : None,
+                'product_name' : None,
+                'start_date'   : '2000-01-01',
+                'end_date'     : '2100-12-31',
+                'attributes'   : None,
+                'order_by'     : 'recent',
+                'page'         : 0,
+                'length'       : rows
+            }),
+        }
+    finally:
+        connection.close()
+
+
+def synthetic_result_set(rows, seed):
+    """ 상품 리스트 / 주문 리스트와 같은 타입 구성의 row """
+
+    rng = random.Random(seed)
+    now = datetime.datetime(2021, 1, 1, 12, 0, 0)
+
+    return {
+        'synthetic': [
+            {
+                'image'           : 'https://brandi-intern.s3.amazonaws.com/product/{}.jpg'.format(index),
+                'seller_id'       : rng.randint(1, 1000),
+                'seller_name'     : '브랜디셀러{}'.format(index % 100),
+                'product_id'      : index,
+                'product_name'    : '데일리 니트 {}'.format(index),
+                'origin_price'    : decimal.Decimal('{}.00'.format(rng.randrange(10000, 90000, 100))),
+                'discount_rate'   : decimal.Decimal('0.{}'.format(rng.randint(0, 50))),
+                'discounted_price': decimal.Decimal('{}.00'.format(rng.randrange(5000, 50000, 100))),
+                'sales_count'     : rng.randint(0, 10000),
+                'is_display'      : rng.random() < 0.9,
+                'created_at'      : now - datetime.timedelta(minutes=index),
+                'start_date'      : (now - datetime.timedelta(days=index % 30)).date(),
+            }
+            for index in range(rows)
+        ]
+    }
+
+
+def measure(encoder, data, options, repeat):
+    best = float('inf')
+
+    for _ in range(repeat):
+        start = time.perf_counter()
+        json.dumps(data, cls=encoder, **options)
+        best = min(best, time.perf_counter() - start)
+
+    return best
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='JSON 직렬화 성능 비교')
+    parser.add_argument('--rows', type=int, default=500, help='DAO 조회 row 수')
+    parser.add_argument('--repeat', type=int, default=20, help='반복 횟수 (최솟값을 사용)')
+    parser.add_argument('--synthetic', type=int, help='DB 대신 생성한 row 수')
+    parser.add_argument('--seed', type=int, default=14)
+
+    parser.add_argument('--host')
+    parser.add_argument('--port', type=int)
+    parser.add_argument('--user')
+    parser.add_argument('--password')
+    parser.add_argument('--database')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    if args.synthetic:
+        result_sets = synthetic_result_set(args.synthetic, args.seed)
+    else:
+        result_sets = load_result_sets(load_database(args), args.rows)
+
+    line = '{:<42} {:>8} {:>12} {:>12} {:>8}'
+    print(line.format('result set', 'format', 'legacy(ms)', 'fast(ms)', 'speedup'))
+
+    for name, data in result_sets.items():
+        for label, options in (('pretty', PRETTY), ('compact', COMPACT)):
+            legacy = json.dumps(data, cls=CustomJSONEncoder, **options)
+            fast = json.dumps(data, cls=FastJSONEncoder, **options)
+
+            if legacy != fast:
+                print('{} ({}): output differs'.format(name, label))
+                return 1
+
+            legacy_time = measure(CustomJSONEncoder, data, options, args.repeat)
+            fast_time = measure(FastJSONEncoder, data, options, args.repeat)
+            print(line.format(
+                name[:42], label, '{:.2f}'.format(legacy_time * 1000), '{:.2f}'.format(fast_time * 1000),
+                '{:.2f}x'.format(legacy_time / fast_time)
+            ))
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
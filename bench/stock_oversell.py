@@ -0,0 +1,295 @@
+""" 핫 재고 동시 차감 부하 테스트 (oversell 검증)
+
+stocks row 하나의 remain 을 --stock 으로 맞춘 뒤 --concurrency 개의 스레드가 --duration 초 동안
+1 ~ --max-quantity 개씩 동시에 차감하고, 판매한 수량이 재고를 넘지 않았는지 확인한다.
+
+방식 (--mode):
+    legacy      : 재고 조회 후 remain = remain - 수량 (기존 order_product_soldout_dao + patch_product_remain_dao)
+                  조회와 차감 사이(--gap ms, 주문 / 주문 상품 추가 시간)에 다른 요청이 같은 재고를 통과시킬 수 있다.
+    conditional : StockReservationDao.patch_stock_remains_dao (remain >= 수량 인 경우에만 차감)
+    reservation : 예약(조건부 차감 + stock_reservations 추가) 후 --release-ratio 비율만큼 예약 해제, 나머지는 주문 처리
+
+기본적인 사용 예시:
+    python -m bench.stock_oversell --mode legacy --mode conditional --mode reservation
+    python -m bench.stock_oversell --mode conditional --stock 1000 --concurrency 64 --duration 10
+
+Notes:
+    migrations/002_stock_reservations.sql 이 적용되어 있어야 한다. (reservation)
+    실행이 끝나면 stocks.remain 을 원래 값으로 되돌리고, 테스트 중 만든 예약을 삭제한다.
+    stocks.remain 이 UNSIGNED 이면 legacy 의 초과 차감은 oversold 대신 errors(out of range)로 집계된다.
+    conditional / reservation 에서 판매량이 재고를 넘거나 remain 이 예상과 다르면 종료 코드 1 을 반환한다.
+"""
+import argparse
+import contextlib
+import datetime
+import os
+import random
+import sys
+import threading
+import time
+
+import pymysql
+
+from flask import Flask
+
+from bench import load_database
+from bench.run import percentile
+
+from model import StockReservationDao
+from utils.custom_exceptions import NotEnoughProduct
+
+MODES = ('legacy', 'conditional', 'reservation')
+
+# 테스트용 예약의 cart_id 시작 값 (실제 장바구니 상품과 겹치지 않도록 큰 값 사용)
+CART_ID_BASE = 2000000000
+
+
+class Result:
+    """ 방식별 집계 (스레드 안전) """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.latencies = []
+        self.sold = 0
+        self.released = 0
+        self.rejected = 0
+        self.errors = 0
+
+    def add(self, elapsed, sold=0, released=0, rejected=False, error=False):
+        with self.lock:
+            self.latencies.append(elapsed)
+            self.sold += sold
+            self.released += released
+            self.rejected += rejected
+            self.errors += error
+
+
+def legacy(dao, connection, stock_id, quantity, gap, context):
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT remain FROM stocks WHERE id = %s", stock_id)
+        if cursor.fetchone()[0] < quantity:
+            raise NotEnoughProduct('Not as many in stock as quantity')
+
+        time.sleep(gap)
+        cursor.execute("UPDATE stocks SET remain = remain - %s WHERE id = %s", (quantity, stock_id))
+
+    connection.commit()
+    return quantity, 0
+
+
+def conditional(dao, connection, stock_id, quantity, gap, context):
+    dao.patch_stock_remains_dao(connection, {'quantities': {stock_id: quantity}, 'product_ids': ()})
+    time.sleep(gap)
+    connection.commit()
+    return quantity, 0
+
+
+def reservation(dao, connection, stock_id, quantity, gap, context):
+    cart_id = context['next_cart_id']()
+
+    dao.patch_stock_remains_dao(connection, {'quantities': {stock_id: quantity}, 'product_ids': ()})
+    dao.post_reservations_dao(connection, {'reservations': [{
+        'cart_id': cart_id,
+        'stock_id': stock_id,
+        'user_id': 0,
+        'quantity': quantity,
+        'expires_at': datetime.datetime.now() + datetime.timedelta(minutes=10)
+    }]})
+    connection.commit()
+
+    time.sleep(gap)
+
+    reservations = dao.get_reservations_dao(connection, {
+        'user_id': None, 'cart_ids': (cart_id,), 'expired_before': None, 'limit': 1
+    })
+
+    # 결제 취소: 재고를 되돌리고 예약 삭제 / 주문: 예약만 삭제 (차감한 재고는 판매)
+    if context['random'].random() < context['release_ratio']:
+        dao.patch_stock_remains_dao(connection, {'quantities': {stock_id: -quantity}, 'product_ids': ()})
+        sold, released = 0, quantity
+    else:
+        sold, released = quantity, 0
+
+    dao.delete_reservations_dao(connection, {'reservation_ids': tuple(row['id'] for row in reservations)})
+    connection.commit()
+    return sold, released
+
+
+ATTEMPTS = {'legacy': legacy, 'conditional': conditional, 'reservation': reservation}
+
+
+def worker(app, database, mode, stock_id, args, deadline, result, seed, next_cart_id):
+    connection = pymysql.connect(
+        host       = database['host'],
+        port       = database.get('port', 3306),
+        user       = database['user'],
+        password   = database['password'],
+        db         = database['name'],
+        charset    = database.get('charset', 'utf8mb4'),
+        autocommit = False,
+        cursorclass = pymysql.cursors.DictCursor if mode == 'reservation' else pymysql.cursors.Cursor
+    )
+    dao = StockReservationDao()
+    rng = random.Random(seed)
+    context = {'random': rng, 'release_ratio': args.release_ratio, 'next_cart_id': next_cart_id}
+    attempt = ATTEMPTS[mode]
+
+    try:
+        # patch_stock_remains_dao 의 캐시 무효화(utils.cache)가 app.config 를 사용한다.
+        with app.app_context():
+            while time.monotonic() < deadline:
+                quantity = rng.randint(1, args.max_quantity)
+                start = time.perf_counter()
+                try:
+                    sold, released = attempt(dao, connection, stock_id, quantity, args.gap / 1000, context)
+                    result.add(time.perf_counter() - start, sold=sold, released=released)
+                except NotEnoughProduct:
+                    connection.rollback()
+                    result.add(time.perf_counter() - start, rejected=True)
+                except Exception:
+                    connection.rollback()
+                    result.add(time.perf_counter() - start, error=True)
+    finally:
+        connection.close()
+
+
+def read_remain(connection, stock_id):
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT remain FROM stocks WHERE id = %s", stock_id)
+        return cursor.fetchone()[0]
+
+
+def set_remain(connection, stock_id, remain):
+    with connection.cursor() as cursor:
+        cursor.execute("UPDATE stocks SET remain = %s WHERE id = %s", (remain, stock_id))
+
+
+def run_mode(app, database, raw, mode, stock_id, args):
+    set_remain(raw, stock_id, args.stock)
+
+    counter = iter(range(CART_ID_BASE, CART_ID_BASE + 10 ** 9))
+    counter_lock = threading.Lock()
+
+    def next_cart_id():
+        with counter_lock:
+            return next(counter)
+
+    result = Result()
+    deadline = time.monotonic() + args.duration
+    threads = [
+        threading.Thread(
+            target=worker,
+            args=(app, database, mode, stock_id, args, deadline, result, args.seed + index, next_cart_id)
+        )
+        for index in range(args.concurrency)
+    ]
+
+    # DAO 는 재고 부족(NotEnoughProduct)마다 traceback 을 출력하므로 측정 중에는 stderr 를 버린다.
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stderr(devnull):
+        started = time.monotonic()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.monotonic() - started
+
+    remain = read_remain(raw, stock_id)
+    latencies = sorted(result.latencies)
+    oversold = max(0, result.sold - args.stock)
+    consistent = remain == args.stock - result.sold and remain >= 0
+
+    return {
+        'mode': mode,
+        'attempts': len(result.latencies),
+        'rps': len(result.latencies) / elapsed,
+        'sold': result.sold,
+        'released': result.released,
+        'rejected': result.rejected,
+        'errors': result.errors,
+        'remain': remain,
+        'oversold': oversold,
+        'consistent': consistent,
+        'p50': percentile(latencies, 50) * 1000,
+        'p99': percentile(latencies, 99) * 1000,
+    }
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='핫 재고 동시 차감 부하 테스트')
+    parser.add_argument('--mode', action='append', choices=MODES, help='차감 방식 (여러 번 지정 가능, 기본 전체)')
+    parser.add_argument('--stock-id', type=int, help='사용할 stocks.id (기본: 가장 작은 id)')
+    parser.add_argument('--stock', type=int, default=100, help='시작 재고')
+    parser.add_argument('--max-quantity', type=int, default=3, help='요청당 최대 주문 수량')
+    parser.add_argument('--concurrency', type=int, default=32)
+    parser.add_argument('--duration', type=float, default=5.0, help='방식별 실행 시간 (초)')
+    parser.add_argument('--gap', type=float, default=2.0, help='조회 / 차감 이후 트랜잭션이 이어지는 시간 (ms)')
+    parser.add_argument('--release-ratio', type=float, default=0.3, help='reservation: 예약을 해제하는 비율')
+    parser.add_argument('--seed', type=int, default=14)
+
+    parser.add_argument('--host')
+    parser.add_argument('--port', type=int)
+    parser.add_argument('--user')
+    parser.add_argument('--password')
+    parser.add_argument('--database')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    database = load_database(args)
+    app = Flask(__name__)
+
+    raw = pymysql.connect(
+        host       = database['host'],
+        port       = database.get('port', 3306),
+        user       = database['user'],
+        password   = database['password'],
+        db         = database['name'],
+        charset    = database.get('charset', 'utf8mb4'),
+        autocommit = True
+    )
+
+    try:
+        stock_id = args.stock_id
+        if stock_id is None:
+            with raw.cursor() as cursor:
+                cursor.execute("SELECT MIN(id) FROM stocks")
+                stock_id = cursor.fetchone()[0]
+        if stock_id is None:
+            print('재고가 없습니다. (python -m bench.seed)')
+            return 1
+
+        original = read_remain(raw, stock_id)
+        reports = []
+
+        try:
+            for mode in args.mode or MODES:
+                reports.append(run_mode(app, database, raw, mode, stock_id, args))
+        finally:
+            set_remain(raw, stock_id, original)
+            with raw.cursor() as cursor:
+                cursor.execute("DELETE FROM stock_reservations WHERE cart_id >= %s", CART_ID_BASE)
+    finally:
+        raw.close()
+
+    print('stock {} remain {} x {} threads x {}s'.format(stock_id, args.stock, args.concurrency, args.duration))
+    line = '{:<12} {:>9} {:>9} {:>6} {:>9} {:>9} {:>7} {:>7} {:>9} {:>9} {:>9}'
+    print(line.format('mode', 'attempts', 'rps', 'sold', 'released', 'rejected', 'errors', 'remain', 'oversold',
+                      'p50(ms)', 'p99(ms)'))
+    for report in reports:
+        print(line.format(
+            report['mode'], report['attempts'], '{:.0f}'.format(report['rps']), report['sold'], report['released'],
+            report['rejected'], report['errors'], report['remain'], report['oversold'],
+            '{:.2f}'.format(report['p50']), '{:.2f}'.format(report['p99'])
+        ))
+
+    failed = [report['mode'] for report in reports
+              if report['mode'] != 'legacy' and (report['oversold'] or not report['consistent'])]
+    if failed:
+        print('oversold: {}'.format(', '.join(failed)))
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
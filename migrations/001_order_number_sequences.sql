@@ -0,0 +1,9 @@
+-- 주문번호 채번용 시퀀스 (utils.sequence)
+-- name       : 시퀀스 이름 (예: order:20210105, 날짜별로 새로 시작한다.)
+-- next_value : 다음에 할당할 값 (워커가 블록 단위로 미리 가져간다.)
+CREATE TABLE IF NOT EXISTS order_number_sequences (
+    name       VARCHAR(50)     NOT NULL,
+    next_value BIGINT UNSIGNED NOT NULL,
+    updated_at DATETIME        NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+    PRIMARY KEY (name)
+) ENGINE = InnoDB DEFAULT CHARSET = utf8mb4;
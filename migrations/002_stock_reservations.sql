@@ -0,0 +1,19 @@
+-- 결제 진행 중인 장바구니 상품의 재고 예약 (StockReservationDao)
+-- 예약하는 순간 stocks.remain 에서 quantity 만큼 차감하고, 주문하면 예약을 삭제한다.
+-- 주문하지 않고 expires_at 이 지난 예약은 flask release-stock-reservations 가 재고를 되돌리고 삭제한다.
+-- cart_id    : 장바구니 상품 id (장바구니 상품당 예약 하나, 다시 예약하면 expires_at 만 연장한다.)
+-- quantity   : 예약할 때 차감한 수량
+-- expires_at : 예약 만료 시각 (STOCK_RESERVATION_TTL)
+CREATE TABLE IF NOT EXISTS stock_reservations (
+    id         BIGINT UNSIGNED NOT NULL AUTO_INCREMENT,
+    cart_id    INT             NOT NULL,
+    stock_id   INT             NOT NULL,
+    user_id    INT             NOT NULL,
+    quantity   INT UNSIGNED    NOT NULL,
+    expires_at DATETIME        NOT NULL,
+    created_at DATETIME        NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (id),
+    UNIQUE KEY uk_stock_reservations_cart_id (cart_id),
+    KEY ix_stock_reservations_expires_at (expires_at),
+    KEY ix_stock_reservations_user_id (user_id)
+) ENGINE = InnoDB DEFAULT CHARSET = utf8mb4;
@@ -0,0 +1,18 @@
+-- POST /checkout 의 Idempotency-Key (StoreOrderService.post_idempotent_order_service)
+-- 같은 유저가 같은 키로 다시 요청하면 주문을 다시 처리하지 않고 저장한 응답을 반환한다.
+-- request_hash : 요청 body 의 sha256 (같은 키로 다른 요청을 보내면 거부한다.)
+-- order_id     : 생성한 주문 id
+-- status_code  : 응답 status code
+-- response     : 응답 result (JSON)
+-- IDEMPOTENCY_KEY_TTL 이 지난 키는 flask purge-idempotency-keys 가 삭제한다.
+CREATE TABLE IF NOT EXISTS idempotency_keys (
+    user_id         INT           NOT NULL,
+    idempotency_key VARCHAR(64)   NOT NULL,
+    request_hash    CHAR(64)      NOT NULL,
+    order_id        INT           NULL,
+    status_code     SMALLINT      NULL,
+    response        VARCHAR(1024) NULL,
+    created_at      DATETIME      NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (user_id, idempotency_key),
+    KEY ix_idempotency_keys_created_at (created_at)
+) ENGINE = InnoDB DEFAULT CHARSET = utf8mb4;
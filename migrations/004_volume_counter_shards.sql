@@ -0,0 +1,13 @@
+-- 판매량 / 북마크 수 증감 슬롯 (utils.volume_counter)
+-- 쓰기 요청은 상품당 VOLUME_COUNTER_SLOTS 개의 슬롯 중 하나에 증감만 누적하고,
+-- flask fold-volume-counters 가 주기적으로 bookmark_volumes.bookmark_count / product_sales_volumes.sales_count 에 반영 후 삭제한다.
+-- name  : 카운터 이름 (bookmark, sales)
+-- slot  : 0 ~ VOLUME_COUNTER_SLOTS - 1
+-- delta : 반영되지 않은 증감 (음수 가능)
+CREATE TABLE IF NOT EXISTS volume_counter_shards (
+    name       VARCHAR(20) NOT NULL,
+    product_id INT         NOT NULL,
+    slot       SMALLINT    NOT NULL,
+    delta      INT         NOT NULL,
+    PRIMARY KEY (name, product_id, slot)
+) ENGINE = InnoDB DEFAULT CHARSET = utf8mb4;
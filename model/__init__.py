@@ -19,6 +19,8 @@ from .store.destination_dao import DestinationDao
 from .store.cart_item_dao import CartItemDao
 from .store.sender_dao import SenderDao
 from .store.store_order_dao import StoreOrderDao
+from .store.stock_reservation_dao import StockReservationDao
+from .store.volume_counter_dao import VolumeCounterDao
 from .store.bookmark_dao import BookmarkDao
 from .store.event_list_dao import EventListDao
 from .store.seller_shop_dao import SellerShopDao
@@ -5,6 +5,9 @@ from utils.custom_exceptions import (OrderDoesNotExist,
                                      DoesNotOrderDetail,
                                      DeniedUpdate,
                                      )
+from utils.pagination import next_cursor
+from utils.row_count import count_rows, STRATEGY_ESTIMATE
+from utils.streaming import iter_unbuffered
 
 class OrderDao:
     """ Persistence Layer
@@ -21,7 +24,9 @@ class OrderDao:
     """
 
 
-    def get_order_list_dao(self, connection, data):
+    def _get_order_list_sql(self, data):
+        """ 주문 리스트 조회 sql / 전체 개수 sql 생성 (get_order_list_dao, stream_order_list_dao 공통) """
+
         # 카운트 sql
         total_count_sql = """
                     SELECT COUNT(*) AS total_count
@@ -128,33 +133,95 @@ class OrderDao:
         if data['attributes']:
             extra_sql += " AND sellers.seller_attribute_type_id IN %(attributes)s"
 
-        # 정렬 조건
+        # 전체 개수는 커서 / 정렬 / 페이지 조건 없이 조회한다.
+        total_count_sql += extra_sql
+        sql += extra_sql
+
+        # 정렬 조건 (커서는 상품 준비 상태이면 [order_items.id], 아니면 [updated_at, order_items.id])
+        direction = "DESC" if data['order_by'] == 'recent' else "ASC"
+        seek = "<" if direction == "DESC" else ">"
+
         if data['status'] == 1:
-            if data['order_by'] == 'recent':
-                extra_sql += " ORDER BY order_items.id DESC"
-            else:
-                extra_sql += " ORDER BY order_items.id ASC"
+            if data.get('cursor'):
+                data['cursor_id'] = data['cursor'][0]
+                sql += " AND order_items.id {} %(cursor_id)s".format(seek)
+
+            sql += " ORDER BY order_items.id {}".format(direction)
         else:
-            if data['order_by'] == 'recent':
-                extra_sql += " ORDER BY order_items.updated_at DESC"
-            else:
-                extra_sql += " ORDER BY order_items.updated_at ASC"
+            if data.get('cursor'):
+                data['cursor_updated_at'], data['cursor_id'] = data['cursor']
+                sql += """ AND (
+                    order_items.updated_at {seek} %(cursor_updated_at)s
+                    OR (order_items.updated_at = %(cursor_updated_at)s AND order_items.id {seek} %(cursor_id)s)
+                )""".format(seek=seek)
+
+            sql += " ORDER BY order_items.updated_at {direction}, order_items.id {direction}".format(direction=direction)
+
+        # 페이지 조건 (커서가 있으면 offset 없이 조회)
+        if data.get('cursor'):
+            sql += " LIMIT %(length)s;"
+        else:
+            sql += " LIMIT %(page)s, %(length)s;"
 
-        total_count_sql += extra_sql
-        sql += extra_sql
+        return sql, total_count_sql
+
+    @staticmethod
+    def order_list_cursor(row, status):
+        """ 주문 리스트 row 의 다음 페이지 커서 값 (_get_order_list_sql 의 정렬 조건과 같은 순서) """
 
-        # 페이지 조건
-        sql += " LIMIT %(page)s, %(length)s;"
+        if status == 1:
+            return [row['id']]
+
+        return [str(row['updated_at_date']), row['id']]
+
+    def get_order_list_dao(self, connection, data):
+        sql, total_count_sql = self._get_order_list_sql(data)
 
         with connection.cursor(pymysql.cursors.DictCursor) as cursor:
             cursor.execute(sql, data)
             list = cursor.fetchall()
-            if not list:
+            # 커서로 조회한 경우 직전 페이지가 마지막 페이지였을 수 있다.
+            if not list and not data.get('cursor'):
                 raise OrderDoesNotExist('주문 내역이 없습니다.')
-            cursor.execute(total_count_sql, data)
-            count = cursor.fetchone()
 
-            return {'total_count': count['total_count'], 'order_lists': list}
+        total_count, count_strategy = count_rows(connection, total_count_sql, data, data.get('count_strategy'))
+
+        return {
+            'total_count'   : total_count,
+            'count_strategy': count_strategy,
+            'order_lists'   : list,
+            'next_cursor'   : next_cursor(list, data['length'], lambda row: self.order_list_cursor(row, data['status']))
+        }
+
+    def stream_order_list_dao(self, connection, data):
+        """ 주문 리스트 조회 (server-side cursor)
+
+            Args:
+                connection : 데이터베이스 연결 객체
+                data       : 서비스에서 넘겨 받은 dict
+
+            Returns:
+                {'total_count': 전체 개수, 'count_strategy': 개수 조회 전략, 'order_lists': 주문 row generator}
+
+            Raises:
+                400, {'message': 'order_does_not_exist', 'errorMessage': '주문 내역이 없습니다.'} : 주문 리스트 없음
+
+            Notes:
+                server-side cursor 를 연 뒤에는 다른 쿼리를 실행할 수 없으므로 전체 개수를 먼저 조회한다.
+        """
+
+        sql, total_count_sql = self._get_order_list_sql(data)
+
+        total_count, count_strategy = count_rows(connection, total_count_sql, data, data.get('count_strategy'))
+
+        if not total_count and count_strategy != STRATEGY_ESTIMATE:
+            raise OrderDoesNotExist('주문 내역이 없습니다.')
+
+        return {
+            'total_count'   : total_count,
+            'count_strategy': count_strategy,
+            'order_lists'   : iter_unbuffered(connection, sql, data)
+        }
 
 
     def update_order_status_dao(self, connection, data):
@@ -17,6 +17,7 @@ from utils.custom_exceptions import (
     MainCategoryNotExist,
     SubCategoryNotExist
 )
+from utils.streaming import iter_unbuffered
 
 
 class ProductManageDao:
@@ -717,12 +718,13 @@ class ProductManageDao:
             result = cursor.fetchone()
             return result
     
-    def search_products(self, connection, data):
+    def search_products(self, connection, data, stream=False):
         """상품 리스트 검색
         
             Args:
                 connection: 데이터베이스 연결 객체
                 data      : 비지니스 레이어에서 넘겨 받은 딕셔너리 객체
+                stream    : True 이면 server-side cursor row generator 반환
             
             Author: 심원두
             
@@ -770,6 +772,10 @@ class ProductManageDao:
         
         sql += order_by + limit
         
+        # server-side cursor 로 한 건씩 읽는다. (utils.streaming)
+        if stream:
+            return iter_unbuffered(connection, sql, data)
+        
         with connection.cursor(pymysql.cursors.DictCursor) as cursor:
             cursor.execute(sql, data)
             result = cursor.fetchall()
@@ -8,6 +8,7 @@ from utils.custom_exceptions import (
     SellerNotExist,
     SellerUpdateDenied
 )
+from utils.streaming         import iter_unbuffered
 
 
 class SellerDao:
@@ -213,7 +214,53 @@ class SellerDao:
 
 
     def get_seller_list(self, connection, offset):
-        sql = """
+        sql = self._get_seller_list_sql()
+
+        with connection.cursor(pymysql.cursors.DictCursor) as cursor:
+            cursor.execute(sql, offset)
+            sellers = cursor.fetchall()
+            if not sellers:
+                raise SellerNotExist('seller does not exist')
+
+            return sellers
+
+    def stream_seller_list(self, connection, offset):
+        """ 셀러 리스트 조회 (server-side cursor)
+
+            Args:
+                connection : 데이터베이스 연결 객체
+                offset     : 조회할 셀러 수
+
+            Returns:
+                {'total_count': 삭제되지 않은 전체 셀러 수, 'seller_list': 셀러 row generator}
+
+            Raises:
+                400, {'message': 'seller_not_exist'} : 셀러 없음
+        """
+
+        total_count_sql = """
+            SELECT
+                COUNT(*) AS total_count
+            FROM
+                sellers AS seller
+            WHERE
+                seller.is_deleted = 0
+        """
+
+        with connection.cursor(pymysql.cursors.DictCursor) as cursor:
+            cursor.execute(total_count_sql)
+            count = cursor.fetchone()
+
+        if not count['total_count']:
+            raise SellerNotExist('seller does not exist')
+
+        return {
+            'total_count': count['total_count'],
+            'seller_list': iter_unbuffered(connection, self._get_seller_list_sql(), offset)
+        }
+
+    def _get_seller_list_sql(self):
+        return """
             SELECT
                 account.id AS account_id
                 ,account.username AS username
@@ -241,13 +288,6 @@ class SellerDao:
             ORDER BY account.id DESC 
             LIMIT 0, %s
         """
-        with connection.cursor(pymysql.cursors.DictCursor) as cursor:
-            cursor.execute(sql, offset)
-            sellers = cursor.fetchall()
-            if not sellers:
-                raise SellerNotExist('seller does not exist')
-
-            return sellers
     
     def get_seller_list_by_name(self, connection, data):
         """셀러 정보 취득 (전후방 일치 검색)
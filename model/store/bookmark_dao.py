@@ -96,6 +96,39 @@ class BookmarkDao:
         except Exception:
             raise DatabaseError('서버에 알 수 없는 에러가 발생했습니다.')
 
+    def get_bookmarked_product_ids(self, connection, data):
+        """ 상품 목록 중 해당 유저가 북마크 한 상품 조회
+
+        Args:
+            connection : 데이터베이스 연결 객체
+            data       : 서비스에서 넘겨 받은 dict ( product_ids, account_id )
+
+        Returns:
+            북마크 한 상품 id set
+
+        Raises:
+            500, {'message': 'database_error', 'errorMessage': '서버에 알 수 없는 에러가 발생했습니다.'} : 데이터베이스 에러
+        """
+
+        sql = """
+            SELECT
+                product_id
+            FROM
+                bookmarks
+            WHERE
+                account_id = %(account_id)s
+                AND product_id IN %(product_ids)s
+                AND is_deleted = 0;
+        """
+
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute(sql, data)
+                return {row[0] for row in cursor.fetchall()}
+
+        except Exception:
+            raise DatabaseError('서버에 알 수 없는 에러가 발생했습니다.')
+
     def create_bookmark(self, connection, data):
         """ 상품 북마크 추가
 
@@ -175,45 +208,3 @@ class BookmarkDao:
 
         except Exception:
             raise DatabaseError('서버에 알 수 없는 에러가 발생했습니다.')
-
-    def update_bookmark_volume_count(self, connection, data):
-        """ 상품 북마크 수 업데이트
-
-        Args:
-            connection : 데이터베이스 연결 객체
-            data       : 서비스에서 넘겨 받은 dict ( product_id, account_id, count )
-
-        Returns:
-            None
-
-        Raises:
-            500, {'message': 'database_error', 'errorMessage': '서버에 알 수 없는 에러가 발생했습니다.'}           : 데이터베이스 에러
-            500, {'message': 'data_manipulation_fail', 'error_message': '북마크 추가 혹은 삭제를 실패하였습니다.'} : 데이터 조작 에러
-
-        History:
-            2021-01-02(김민구): 초기 생성
-
-        Notes:
-            bookmark_count는 unsigned가 걸려있음
-            만약 0인 상태에서 -1이 연산된다면 데이터 입력이 실패하게 된다.
-            이 때 에러를 발생시키지 않고 success로 넘긴다.
-            데이터베이스의 unsigned error 번호는 1690이므로 1690에 대한 에러가 뜬다면 None을 리턴시킨다.
-        """
-
-        sql = """
-            UPDATE
-                bookmark_volumes
-            SET 
-                bookmark_count = bookmark_count + %(count)s
-            WHERE
-                product_id = %(product_id)s
-        """
-
-        try:
-            with connection.cursor() as cursor:
-                cursor.execute(sql, data)
-
-        except Exception as e:
-            if '1690' in e.__str__():
-                return None
-            raise DatabaseError('서버에 알 수 없는 에러가 발생했습니다.')
@@ -19,7 +19,7 @@ class EventListDao:
 
             Args:
                 connection : 데이터베이스 연결 객체
-                data       : 서비스에서 넘겨 받은 dict (offset, limit, is_proceeding)
+                data       : 서비스에서 넘겨 받은 dict (offset, limit, is_proceeding, cursor)
 
             Returns: 해당 기획전 배너 30개 반환
                 [
@@ -54,10 +54,23 @@ class EventListDao:
                     now() > `event`.end_date,
                     now() < `event`.end_date
                 )
+        """
+
+        # 커서가 있으면 이전 페이지 마지막 id 다음부터 조회한다. (utils.pagination)
+        if data.get('cursor'):
+            data['cursor_id'] = data['cursor'][0]
+            sql += """
+                AND `event`.id > %(cursor_id)s
+            ORDER BY 
+                `event`.id ASC  
+            LIMIT %(limit)s; 
+            """
+        else:
+            sql += """
             ORDER BY 
                 `event`.id ASC  
             LIMIT %(offset)s, %(limit)s; 
-        """
+            """
 
         try:
             with connection.cursor(pymysql.cursors.DictCursor) as cursor:
@@ -68,6 +81,42 @@ class EventListDao:
         except Exception:
             raise DatabaseError('서버에 알 수 없는 에러가 발생했습니다.')
 
+    def get_next_event_end_seconds(self, connection):
+        """ 진행 중인 기획전 중 가장 먼저 종료되는 기획전의 종료까지 남은 시간 조회
+
+            Args:
+                connection : 데이터베이스 연결 객체
+
+            Returns:
+                종료까지 남은 시간 (초, 진행 중인 기획전이 없으면 None)
+
+            Raises:
+                500, {'message': 'database_error', 'error_message': '서버에 알 수 없는 에러가 발생했습니다.'} : 데이터베이스 에러
+
+            Notes:
+                배너 리스트 캐시의 만료 시점 계산에 사용한다. 데이터베이스의 now() 기준으로 계산하므로
+                서버와 데이터베이스의 시간대가 달라도 된다.
+        """
+
+        sql = """
+            SELECT
+                TIMESTAMPDIFF(SECOND, now(), MIN(`event`.end_date)) AS seconds
+            FROM
+                `events` AS `event`
+            WHERE
+                `event`.is_display = 1
+                AND `event`.is_deleted = 0
+                AND `event`.end_date > now();
+        """
+
+        try:
+            with connection.cursor(pymysql.cursors.DictCursor) as cursor:
+                cursor.execute(sql)
+                return cursor.fetchone()['seconds']
+
+        except Exception:
+            raise DatabaseError('서버에 알 수 없는 에러가 발생했습니다.')
+
     def get_event_information(self, connection, event_id):
         """ 기획전의 정보를 조회
 
@@ -232,7 +281,7 @@ class EventListDao:
 
             Args:
                 connection : 데이터베이스 연결 객체
-                data       : 서비스에서 넘겨 받은 dict ( offset, limit, event_id )
+                data       : 서비스에서 넘겨 받은 dict ( offset, limit, event_id, cursor )
 
             Returns: 30개의 상품을 반환
                 [
@@ -284,10 +333,23 @@ class EventListDao:
                 events_product.event_id = %(event_id)s
                 AND product.is_deleted = 0
                 AND product.is_display = 1
+        """
+
+        # 커서가 있으면 이전 페이지 마지막 상품 id 보다 작은 상품부터 조회한다. (utils.pagination)
+        if data.get('cursor'):
+            data['cursor_id'] = data['cursor'][0]
+            sql += """
+                AND product.id < %(cursor_id)s
+            ORDER BY
+                product.id DESC
+            LIMIT %(limit)s;
+            """
+        else:
+            sql += """
             ORDER BY
                 product.id DESC
             LIMIT %(offset)s, %(limit)s;
-        """
+            """
 
         try:
             with connection.cursor(pymysql.cursors.DictCursor) as cursor:
@@ -303,7 +365,7 @@ class EventListDao:
 
             Args:
                 connection : 데이터베이스 연결 객체
-                data       : 서비스에서 넘겨 받은 dict ( offset, limit, event_id )
+                data       : 서비스에서 넘겨 받은 dict ( offset, limit, event_id, cursor )
 
             Returns: 30개의 상품을 반환
                 [
@@ -353,10 +415,23 @@ class EventListDao:
                 events_product.event_id = %(event_id)s
                 AND product.is_deleted = 0
                 AND product.is_display = 1
+        """
+
+        # 커서가 있으면 이전 페이지 마지막 상품 id 보다 작은 상품부터 조회한다. (utils.pagination)
+        if data.get('cursor'):
+            data['cursor_id'] = data['cursor'][0]
+            sql += """
+                AND product.id < %(cursor_id)s
+            ORDER BY
+                product.id DESC
+            LIMIT %(limit)s;
+            """
+        else:
+            sql += """
             ORDER BY
                 product.id DESC
             LIMIT %(offset)s, %(limit)s;
-        """
+            """
 
         try:
             with connection.cursor(pymysql.cursors.DictCursor) as cursor:
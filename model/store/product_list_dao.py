@@ -1,6 +1,22 @@
+import json
+
 import pymysql
 
 from utils.custom_exceptions import DatabaseError
+from utils.streaming import iter_unbuffered
+
+
+def _iter_rows(connection, sql, args=None):
+    """ iter_unbuffered 와 같지만 데이터베이스 에러를 DatabaseError 로 변환한다.
+
+        Notes:
+            쿼리는 첫 row 를 요청할 때 실행되므로, DAO 메소드의 try 가 아니라 generator 안에서 에러를 변환해야 한다.
+    """
+
+    try:
+        yield from iter_unbuffered(connection, sql, args)
+    except Exception:
+        raise DatabaseError('서버에 알 수 없는 에러가 발생했습니다.')
 
 
 class ProductListDao:
@@ -71,7 +87,7 @@ class ProductListDao:
         INNER JOIN bookmark_volumes AS bookmark
             ON bookmark.product_id = product.id
         WHERE
-            product.name LIKE %(search)s
+            (product.name LIKE %(search)s OR seller.name LIKE %(search)s)
             AND product.is_deleted=0
         ORDER BY
              (CASE WHEN %(sort_type)s=1 THEN bookmark_count END) DESC
@@ -90,6 +106,151 @@ class ProductListDao:
         except Exception:
             raise DatabaseError('서버에 알 수 없는 에러가 발생했습니다.')
 
+    def get_search_products_by_ids_dao(self, connection, data):
+        """ 검색 색인으로 찾은 상품 조회 및 정렬
+
+            get_search_products_dao 와 같은 결과를 상품 id 목록으로 조회한다. (utils.search_index)
+
+            Args:
+                connection : 데이터베이스 연결 객체
+                data       : {'product_ids': 상품 id tuple, 'sort_type': 정렬 기준, 'limit': 개수}
+
+            Returns:
+                get_search_products_dao 와 같은 형태의 리스트
+
+            Raises:
+                500, {'message': 'database_error', 'error_message': '서버에 알 수 없는 에러가 발생했습니다.'} : 데이터베이스 에러
+        """
+
+        sql = """
+        SELECT
+            product_image.image_url AS image
+            , product.name AS product_name
+            , product.seller_id AS seller_id
+            , seller.name AS seller_name
+            , product.id AS product_id
+            , product.origin_price
+            , product.discounted_price
+            , product_sales_volume.sales_count
+            , bookmark.bookmark_count
+        FROM
+            products AS product
+        INNER JOIN product_images AS product_image
+            ON product_image.product_id = product.id
+            AND product_image.order_index = 1
+        INNER JOIN sellers AS seller
+            ON seller.account_id = product.seller_id
+        INNER JOIN product_sales_volumes AS product_sales_volume
+            ON product_sales_volume.product_id = product.id
+        INNER JOIN bookmark_volumes AS bookmark
+            ON bookmark.product_id = product.id
+        WHERE
+            product.id IN %(product_ids)s
+            AND product.is_deleted=0
+        ORDER BY
+             (CASE WHEN %(sort_type)s=1 THEN bookmark_count END) DESC
+            , (CASE WHEN %(sort_type)s=2 THEN sales_count END) DESC
+            , (CASE WHEN %(sort_type)s=3 THEN product.id END) DESC
+        LIMIT %(limit)s;
+        """
+
+        try:
+            with connection.cursor(pymysql.cursors.DictCursor) as cursor:
+                cursor.execute(sql, data)
+                return cursor.fetchall()
+        except Exception:
+            raise DatabaseError('서버에 알 수 없는 에러가 발생했습니다.')
+
+    def get_search_index_rows_dao(self, connection, updated_since=None):
+        """ 검색 색인 대상 상품 (utils.search_index.ProductSearchIndex.sync)
+
+            Args:
+                connection    : 데이터베이스 연결 객체
+                updated_since : None 이면 전체 상품, 아니면 이 시각 이후 상품 혹은 셀러 정보가 변경된 상품
+
+            Returns:
+                (데이터베이스 현재 시각, {product_id, product_name, seller_name, is_deleted} row generator)
+                updated_since 가 있으면 삭제된 상품도 is_deleted=1 로 포함한다.
+
+            Raises:
+                500, {'message': 'database_error', 'error_message': '서버에 알 수 없는 에러가 발생했습니다.'} : 데이터베이스 에러
+        """
+
+        sql = """
+        SELECT
+            product.id AS product_id
+            , product.name AS product_name
+            , seller.name AS seller_name
+            , product.is_deleted
+        FROM
+            products AS product
+        INNER JOIN sellers AS seller
+            ON seller.account_id = product.seller_id
+        """
+
+        if updated_since is None:
+            sql += " WHERE product.is_deleted=0"
+        else:
+            sql += " WHERE (product.updated_at >= %(updated_since)s OR seller.updated_at >= %(updated_since)s)"
+
+        try:
+            # server-side cursor 를 열기 전에 동기화 기준 시각을 읽는다. (경계의 변경분은 다음 동기화에서 다시 읽는다.)
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT NOW()")
+                synced_at = cursor.fetchone()[0]
+        except Exception:
+            raise DatabaseError('서버에 알 수 없는 에러가 발생했습니다.')
+
+        return synced_at, _iter_rows(connection, sql, {'updated_since': updated_since})
+
+    def get_autocomplete_rows_dao(self, connection):
+        """ 자동완성 대상 상품명 / 셀러명과 판매량 (utils.autocomplete.build_index)
+
+            Args:
+                connection : 데이터베이스 연결 객체
+
+            Returns:
+                {'keyword': 이름, 'type': 'product' | 'seller', 'score': 판매량 합계} row generator
+
+            Raises:
+                500, {'message': 'database_error', 'error_message': '서버에 알 수 없는 에러가 발생했습니다.'} : 데이터베이스 에러
+        """
+
+        sql = """
+        SELECT
+            product.name AS keyword
+            , 'product' AS type
+            , SUM(product_sales_volume.sales_count) AS score
+        FROM
+            products AS product
+        INNER JOIN product_sales_volumes AS product_sales_volume
+            ON product_sales_volume.product_id = product.id
+        WHERE
+            product.is_deleted = 0
+            AND product.is_display = 1
+        GROUP BY
+            product.name
+        UNION ALL
+        SELECT
+            seller.name AS keyword
+            , 'seller' AS type
+            , SUM(product_sales_volume.sales_count) AS score
+        FROM
+            sellers AS seller
+        INNER JOIN products AS product
+            ON product.seller_id = seller.account_id
+            AND product.is_deleted = 0
+        INNER JOIN product_sales_volumes AS product_sales_volume
+            ON product_sales_volume.product_id = product.id
+        WHERE
+            seller.is_deleted = 0
+        GROUP BY
+            seller.account_id
+            , seller.name;
+        """
+
+        return _iter_rows(connection, sql)
+
     def get_product_list(self, connection, data):
 
         """ 상품 리스트 조회
@@ -97,6 +258,7 @@ class ProductListDao:
             Args:
                 connection : 데이터베이스 연결 객체
                 data   : 서비스에서 넘겨 받은 dict
+                         (event_id, limit: 없으면 전체, product_ids: 있으면 해당 상품만 조회)
 
             Author: 김민구
 
@@ -150,11 +312,24 @@ class ProductListDao:
                 event_id = %(event_id)s
                 AND product.is_deleted = 0
                 AND product.is_display = 1
+        """
+
+        # 홈 피드의 부분 갱신 (utils.home_feed)
+        if data.get('product_ids'):
+            sql += """
+                AND product.id IN %(product_ids)s
+            """
+
+        sql += """
             ORDER BY
                 product.id DESC
-            LIMIT %(limit)s
         """
 
+        if data.get('limit') is not None:
+            sql += """
+            LIMIT %(limit)s
+            """
+
         try:
             with connection.cursor(pymysql.cursors.DictCursor) as cursor:
                 cursor.execute(sql, data)
@@ -434,3 +609,273 @@ class ProductListDao:
         except Exception:
             raise DatabaseError('서버에 알 수 없는 에러가 발생했습니다.')
 
+    def get_product_detail_bundle_dao(self, connection, data):
+        """ 상품 상세정보, 이미지, 컬러, 사이즈를 한 번의 쿼리로 조회
+
+            get_product_detail_dao, get_product_image_dao, get_product_color_dao, get_product_size_dao 를
+            순서대로 실행하던 것을 JSON_ARRAYAGG 서브쿼리로 합쳐 데이터베이스 왕복을 한 번으로 줄인다. (MySQL 5.7.22 이상)
+
+            Args:
+                connection : 데이터베이스 연결 객체
+                data       : {'product_id': 상품 id, 'account_id': 로그인 유저 id (비회원이면 없음)}
+
+            Returns:
+                get_product_detail_dao 의 결과에 images, colors, sizes 리스트를 추가한 dict
+                (상품이 없으면 None)
+
+            Raises:
+                500, {'message': 'database_error', 'error_message': '서버에 알 수 없는 에러가 발생했습니다.'} : 데이터베이스 에러
+        """
+
+        sql = """
+            SELECT
+                product.id AS product_id
+                , product.name AS product_name
+                , product.detail_information
+                , product.seller_id AS seller_id
+                , seller.name AS seller_name
+                , product.origin_price
+                , product.discount_rate
+                , product.discounted_price
+                , product_sales_volume.sales_count
+                , bookmark.bookmark_count
+                , IF(
+                    %(account_id)s IS NULL,
+                    0,
+                    EXISTS(
+                        SELECT
+                            id
+                        FROM
+                            bookmarks
+                        WHERE
+                            account_id = %(account_id)s
+                            AND product_id = %(product_id)s
+                            AND is_deleted = 0
+                    )
+                ) AS is_bookmarked
+                , (
+                    SELECT
+                        JSON_ARRAYAGG(JSON_OBJECT('image_id', product_image.id, 'image_url', product_image.image_url))
+                    FROM
+                        product_images AS product_image
+                    WHERE
+                        product_image.product_id = %(product_id)s
+                ) AS images
+                , (
+                    SELECT
+                        JSON_ARRAYAGG(JSON_OBJECT('color_name', color.color_name, 'color_id', color.color_id))
+                    FROM (
+                        SELECT DISTINCT
+                            color.name AS color_name
+                            , color.id AS color_id
+                        FROM
+                            stocks
+                        INNER JOIN colors AS color
+                            ON stocks.color_id = color.id
+                        WHERE
+                            stocks.product_id = %(product_id)s
+                    ) AS color
+                ) AS colors
+                , (
+                    SELECT
+                        JSON_ARRAYAGG(JSON_OBJECT('size_id', size.size_id, 'size_name', size.size_name))
+                    FROM (
+                        SELECT DISTINCT
+                            size.id AS size_id
+                            , size.name AS size_name
+                        FROM
+                            stocks
+                        INNER JOIN sizes AS size
+                            ON stocks.size_id = size.id
+                        WHERE
+                            stocks.product_id = %(product_id)s
+                    ) AS size
+                ) AS sizes
+            FROM
+                products AS product
+            INNER JOIN sellers AS seller
+                ON product.seller_id = seller.account_id
+            INNER JOIN product_sales_volumes AS product_sales_volume
+                ON product_sales_volume.product_id = product.id
+            INNER JOIN bookmark_volumes AS bookmark
+                ON bookmark.product_id = product.id
+            WHERE
+                product.id = %(product_id)s
+                AND product.is_deleted = 0
+                AND EXISTS(SELECT id FROM stocks WHERE stocks.product_id = product.id)
+            ;
+        """
+
+        try:
+            with connection.cursor(pymysql.cursors.DictCursor) as cursor:
+                cursor.execute(sql, {'product_id': data['product_id'], 'account_id': data.get('account_id')})
+                result = cursor.fetchone()
+
+        except Exception:
+            raise DatabaseError('서버에 알 수 없는 에러가 발생했습니다.')
+
+        if result is None:
+            return None
+
+        # 옵션이 없으면 JSON_ARRAYAGG 결과는 NULL
+        for key in ('images', 'colors', 'sizes'):
+            result[key] = json.loads(result[key]) if result[key] else []
+
+        return result
+
+    def get_product_details_by_ids_dao(self, connection, data):
+        """ 여러 상품의 상세정보 조회
+
+            get_product_detail_bundle_dao 와 같은 컬럼을 IN 조건으로 조회한다. (이미지, 컬러, 사이즈, 북마크 여부 제외)
+
+            Args:
+                connection : 데이터베이스 연결 객체
+                data       : {'product_ids': 상품 id tuple}
+
+            Returns:
+                [{'product_id': 1, 'product_name': '성보의하루1', 'seller_id': 7, ...}] (순서 보장 없음)
+
+            Raises:
+                500, {'message': 'database_error', 'error_message': '서버에 알 수 없는 에러가 발생했습니다.'} : 데이터베이스 에러
+        """
+
+        sql = """
+            SELECT
+                product.id AS product_id
+                , product.name AS product_name
+                , product.detail_information
+                , product.seller_id AS seller_id
+                , seller.name AS seller_name
+                , product.origin_price
+                , product.discount_rate
+                , product.discounted_price
+                , product_sales_volume.sales_count
+                , bookmark.bookmark_count
+            FROM
+                products AS product
+            INNER JOIN sellers AS seller
+                ON product.seller_id = seller.account_id
+            INNER JOIN product_sales_volumes AS product_sales_volume
+                ON product_sales_volume.product_id = product.id
+            INNER JOIN bookmark_volumes AS bookmark
+                ON bookmark.product_id = product.id
+            WHERE
+                product.id IN %(product_ids)s
+                AND product.is_deleted = 0
+                AND EXISTS(SELECT id FROM stocks WHERE stocks.product_id = product.id)
+            ;
+        """
+
+        try:
+            with connection.cursor(pymysql.cursors.DictCursor) as cursor:
+                cursor.execute(sql, data)
+                return cursor.fetchall()
+
+        except Exception:
+            raise DatabaseError('서버에 알 수 없는 에러가 발생했습니다.')
+
+    def get_product_images_by_ids_dao(self, connection, data):
+        """ 여러 상품의 이미지 조회
+
+            Args:
+                connection : 데이터베이스 연결 객체
+                data       : {'product_ids': 상품 id tuple}
+
+            Returns:
+                [{'product_id': 1, 'image_id': 1, 'image_url': 'url'}]
+
+            Raises:
+                500, {'message': 'database_error', 'error_message': '서버에 알 수 없는 에러가 발생했습니다.'} : 데이터베이스 에러
+        """
+
+        sql = """
+            SELECT
+                product_image.product_id
+                , product_image.id AS image_id
+                , product_image.image_url AS image_url
+            FROM
+                product_images AS product_image
+            WHERE
+                product_image.product_id IN %(product_ids)s
+            ;
+        """
+
+        try:
+            with connection.cursor(pymysql.cursors.DictCursor) as cursor:
+                cursor.execute(sql, data)
+                return cursor.fetchall()
+
+        except Exception:
+            raise DatabaseError('서버에 알 수 없는 에러가 발생했습니다.')
+
+    def get_product_colors_by_ids_dao(self, connection, data):
+        """ 여러 상품의 컬러 조회
+
+            Args:
+                connection : 데이터베이스 연결 객체
+                data       : {'product_ids': 상품 id tuple}
+
+            Returns:
+                [{'product_id': 1, 'color_name': 'black', 'color_id': 1}]
+
+            Raises:
+                500, {'message': 'database_error', 'error_message': '서버에 알 수 없는 에러가 발생했습니다.'} : 데이터베이스 에러
+        """
+
+        sql = """
+            SELECT DISTINCT
+                stocks.product_id
+                , color.name AS color_name
+                , color.id AS color_id
+            FROM
+                stocks
+            INNER JOIN colors AS color
+                ON stocks.color_id = color.id
+            WHERE
+                stocks.product_id IN %(product_ids)s
+            ;
+        """
+
+        try:
+            with connection.cursor(pymysql.cursors.DictCursor) as cursor:
+                cursor.execute(sql, data)
+                return cursor.fetchall()
+
+        except Exception:
+            raise DatabaseError('서버에 알 수 없는 에러가 발생했습니다.')
+
+    def get_product_sizes_by_ids_dao(self, connection, data):
+        """ 여러 상품의 사이즈 조회
+
+            Args:
+                connection : 데이터베이스 연결 객체
+                data       : {'product_ids': 상품 id tuple}
+
+            Returns:
+                [{'product_id': 1, 'size_id': 1, 'size_name': 'Free'}]
+
+            Raises:
+                500, {'message': 'database_error', 'error_message': '서버에 알 수 없는 에러가 발생했습니다.'} : 데이터베이스 에러
+        """
+
+        sql = """
+            SELECT DISTINCT
+                stocks.product_id
+                , size.id AS size_id
+                , size.name AS size_name
+            FROM
+                stocks
+            INNER JOIN sizes AS size
+                ON stocks.size_id = size.id
+            WHERE
+                stocks.product_id IN %(product_ids)s
+            ;
+        """
+
+        try:
+            with connection.cursor(pymysql.cursors.DictCursor) as cursor:
+                cursor.execute(sql, data)
+                return cursor.fetchall()
+
+        except Exception:
+            raise DatabaseError('서버에 알 수 없는 에러가 발생했습니다.')
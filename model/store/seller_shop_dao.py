@@ -288,21 +288,49 @@ class SellerShopDao:
         WHERE pd.seller_id = %(seller_id)s
                 """
 
-            # 최신순 정렬일 경우
+            # 커서가 있으면 이전 페이지 마지막 상품 다음부터 조회한다. (utils.pagination)
+            # 최신순 정렬일 경우 커서는 [상품 id]
             if data['type'] == "latest":
                 sql += """
         AND pd.is_deleted = 0
+                """
+
+                if data.get('cursor'):
+                    data['cursor_id'] = data['cursor'][0]
+                    sql += """
+        AND pd.id < %(cursor_id)s
+                    """
+
+                sql += """
         ORDER BY pd.id DESC
-        LIMIT %(limit)s
-        OFFSET %(offset)s
-        ;
                 """
 
-            # 인기순 정렬일 경우
+            # 인기순 정렬일 경우 커서는 [판매량, 상품 id] (판매량이 같으면 최신순)
             else:
                 sql += """
         AND pd.is_deleted = 0
-        ORDER BY product_sales_count DESC
+                """
+
+                if data.get('cursor'):
+                    data['cursor_sales_count'], data['cursor_id'] = data['cursor']
+                    sql += """
+        AND (
+            COALESCE(psv.sales_count, 0) < %(cursor_sales_count)s
+            OR (COALESCE(psv.sales_count, 0) = %(cursor_sales_count)s AND pd.id < %(cursor_id)s)
+        )
+                    """
+
+                sql += """
+        ORDER BY COALESCE(psv.sales_count, 0) DESC, pd.id DESC
+                """
+
+            if data.get('cursor'):
+                sql += """
+        LIMIT %(limit)s
+        ;
+                """
+            else:
+                sql += """
         LIMIT %(limit)s
         OFFSET %(offset)s
         ;
@@ -0,0 +1,264 @@
+import traceback
+import pymysql
+
+from utils.custom_exceptions import (
+    NotEnoughProduct,
+    ServerError,
+    StockReservationDenied,
+)
+from utils.cache import PRODUCT_DETAIL_CACHE, invalidate_on_commit
+
+
+class StockReservationDao:
+    """ Persistence Layer
+
+        Attributes: None
+
+        Notes:
+            재고 예약 (migrations/002_stock_reservations.sql)
+            예약하는 순간 stocks.remain 을 조건부로 차감하므로(remain >= 수량) 동시에 같은 재고를 예약 / 주문해도
+            재고보다 많이 판매되지 않는다. 예약을 해제하면 차감한 수량을 되돌린다.
+            잠금 순서는 cart_items -> stock_reservations -> stocks 로 주문(StoreOrderDao)과 같다.
+    """
+
+    def get_reservation_cart_items_dao(self, connection, data):
+        """예약할 장바구니 상품과 기존 예약 조회
+
+        Args:
+            connection : 데이터베이스 연결 객체
+            data       : {'user_id': 유저 id, 'cart_ids': 장바구니 상품 id tuple (None 이면 전체)}
+
+        Returns:
+            [{'cart_id', 'product_id', 'stock_id', 'quantity', 'reserved_quantity': 예약한 수량 (없으면 None)}, ...]
+
+        Raises:
+            500, {'message: server_error',
+            'errorMessage': 'server_error'} :서버 에러 발생
+
+        Notes:
+            FOR UPDATE 로 장바구니 상품과 기존 예약 row 를 잠근다. (같은 장바구니 상품의 중복 예약 방지)
+        """
+        sql = """
+        SELECT
+        ct.id AS cart_id
+        , ct.product_id
+        , ct.stock_id
+        , ct.quantity
+        , sr.quantity AS reserved_quantity
+        FROM cart_items AS ct
+        LEFT JOIN stock_reservations AS sr ON sr.cart_id = ct.id
+        WHERE ct.user_id = %(user_id)s
+        AND ct.is_deleted = 0
+        """
+
+        if data['cart_ids'] is not None:
+            sql += """
+        AND ct.id IN %(cart_ids)s
+        """
+
+        sql += """
+        ORDER BY ct.id
+        FOR UPDATE
+        ;
+        """
+
+        try:
+            with connection.cursor(pymysql.cursors.DictCursor) as cursor:
+                cursor.execute(sql, data)
+                items = cursor.fetchall()
+                for item in items:
+                    item['quantity'] = int(item['quantity'])
+                return items
+
+        except Exception:
+            traceback.print_exc()
+            raise ServerError('server_error')
+
+    def get_reservations_dao(self, connection, data):
+        """예약 조회 (해제 대상)
+
+        Args:
+            connection : 데이터베이스 연결 객체
+            data       : {
+                            'user_id'        : 유저 id (None 이면 전체),
+                            'cart_ids'       : 장바구니 상품 id tuple (None 이면 전체),
+                            'expired_before' : 이 시각 이전에 만료된 예약만 (None 이면 만료 여부와 무관),
+                            'limit'          : 최대 개수
+                         }
+
+        Returns:
+            [{'id', 'stock_id', 'product_id', 'quantity'}, ...]
+
+        Raises:
+            500, {'message: server_error',
+            'errorMessage': 'server_error'} :서버 에러 발생
+
+        Notes:
+            FOR UPDATE 로 예약 row 를 잠그므로 같은 예약을 주문과 해제가 동시에 처리하지 않는다.
+        """
+        sql = """
+        SELECT
+        sr.id
+        , sr.stock_id
+        , st.product_id
+        , sr.quantity
+        FROM stock_reservations AS sr
+        INNER JOIN stocks AS st ON st.id = sr.stock_id
+        WHERE 1 = 1
+        """
+
+        if data['user_id'] is not None:
+            sql += """
+        AND sr.user_id = %(user_id)s
+        """
+
+        if data['cart_ids'] is not None:
+            sql += """
+        AND sr.cart_id IN %(cart_ids)s
+        """
+
+        if data['expired_before'] is not None:
+            sql += """
+        AND sr.expires_at <= %(expired_before)s
+        """
+
+        sql += """
+        ORDER BY sr.id
+        LIMIT %(limit)s
+        FOR UPDATE
+        ;
+        """
+
+        try:
+            with connection.cursor(pymysql.cursors.DictCursor) as cursor:
+                cursor.execute(sql, data)
+                return cursor.fetchall()
+
+        except Exception:
+            traceback.print_exc()
+            raise ServerError('server_error')
+
+    def patch_stock_remains_dao(self, connection, data):
+        """재고별 수량 차감 (여러 재고를 한 문장으로 처리)
+
+        Args:
+            connection : 데이터베이스 연결 객체
+            data       : {'quantities': {stock_id: 차감할 수량 (음수면 되돌린다.)}, 'product_ids': 상품 id set}
+
+        Returns: None
+
+        Raises:
+            400, {'message': 'Not Enough Product',
+            'errorMessage': 'Not as many in stock as quantity'} : 재고가 차감할 수량보다 적음
+            500, {'message: server_error',
+            'errorMessage': 'server_error'} :서버 에러 발생
+
+        Notes:
+            remain >= 수량 인 row 만 차감하고 차감한 row 수를 확인하므로, 조회와 차감 사이에 다른 요청이
+            재고를 가져가도 remain 이 음수가 되지 않는다. 일부만 차감된 경우 예외가 발생하고 트랜잭션이 rollback 된다.
+        """
+        quantities = data['quantities']
+
+        sql = """
+        UPDATE stocks AS st
+        INNER JOIN (
+            {}
+        ) AS qt ON qt.stock_id = st.id
+        SET st.remain = st.remain - qt.quantity
+        WHERE st.remain >= qt.quantity
+        ;
+        """.format('\n            UNION ALL '.join(['SELECT %s AS stock_id, %s AS quantity'] * len(quantities)))
+
+        params = [value for item in quantities.items() for value in item]
+
+        try:
+            with connection.cursor() as cursor:
+                affected_row = cursor.execute(sql, params)
+                if affected_row != len(quantities):
+                    raise NotEnoughProduct('Not as many in stock as quantity')
+
+            for product_id in data['product_ids']:
+                invalidate_on_commit(PRODUCT_DETAIL_CACHE, int(product_id))
+
+        except NotEnoughProduct as e:
+            traceback.print_exc()
+            raise e
+
+        except Exception:
+            traceback.print_exc()
+            raise ServerError('server_error')
+
+    def post_reservations_dao(self, connection, data):
+        """재고 예약 추가 (이미 예약한 장바구니 상품은 만료 시각만 연장)
+
+        Args:
+            connection : 데이터베이스 연결 객체
+            data       : {'reservations': [{'cart_id', 'stock_id', 'user_id', 'quantity', 'expires_at'}, ...]}
+
+        Returns: None
+
+        Raises:
+            500, {'message: server_error',
+            'errorMessage': 'server_error'} :서버 에러 발생
+        """
+        sql = """
+        INSERT INTO stock_reservations (
+            cart_id
+            , stock_id
+            , user_id
+            , quantity
+            , expires_at
+        ) VALUES (
+            %(cart_id)s
+            , %(stock_id)s
+            , %(user_id)s
+            , %(quantity)s
+            , %(expires_at)s
+        )
+        ON DUPLICATE KEY UPDATE
+        expires_at = VALUES(expires_at)
+        ;
+        """
+
+        try:
+            with connection.cursor() as cursor:
+                cursor.executemany(sql, data['reservations'])
+
+        except Exception:
+            traceback.print_exc()
+            raise ServerError('server_error')
+
+    def delete_reservations_dao(self, connection, data):
+        """재고 예약 삭제
+
+        Args:
+            connection : 데이터베이스 연결 객체
+            data       : {'reservation_ids': 예약 id tuple}
+
+        Returns: None
+
+        Raises:
+            400, {'message': 'stock reservation denied',
+            'errorMessage': 'unable_to_release'} : 예약 삭제 실패
+            500, {'message: server_error',
+            'errorMessage': 'server_error'} :서버 에러 발생
+        """
+        sql = """
+        DELETE FROM stock_reservations
+        WHERE id IN %(reservation_ids)s
+        ;
+        """
+
+        try:
+            with connection.cursor() as cursor:
+                affected_row = cursor.execute(sql, data)
+                if affected_row != len(data['reservation_ids']):
+                    raise StockReservationDenied('unable_to_release')
+
+        except StockReservationDenied as e:
+            traceback.print_exc()
+            raise e
+
+        except Exception:
+            traceback.print_exc()
+            raise ServerError('server_error')
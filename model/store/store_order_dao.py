@@ -4,7 +4,7 @@ import pymysql
 from utils.custom_exceptions import (
     OrderNotExist,
     OrderCreateDenied,
-    ProductNotExist,
+    CartItemNotExist,
     CheckoutDenied,
     NotEnoughProduct,
     DeleteDenied,
@@ -13,7 +13,9 @@ from utils.custom_exceptions import (
     ServerError,
     OrderHistoryCreateDenied,
     ProductRemainUpdateDenied,
+    StockReservationDenied,
 )
+from utils.cache import PRODUCT_DETAIL_CACHE, invalidate_on_commit
 
 
 class StoreOrderDao:
@@ -72,52 +74,94 @@ class StoreOrderDao:
             traceback.print_exc()
             raise ServerError('server_error')
 
-    def order_product_soldout_dao(self, connection, data):
-        """상품 결제 시점에 해당 상품이 품절되었는지 여부 체크
+    def get_order_cart_items_dao(self, connection, data):
+        """주문할 장바구니 상품 조회 및 재고 체크
 
         Args:
             connection  : 데이터베이스 연결 객체
-            data        : 서비스 레이어에서 넘겨 받아 조회할 data
-
-        Author: 고수희
+            data        : {'user_id': 유저 id, 'cart_ids': 주문할 장바구니 상품 id tuple (None 이면 전체)}
 
         Returns:
-            {'soldOut': true}: 상품이 품절됨
-            {'soldOut': false}: 상품이 품절되지 않음
+            [{'cart_id', 'product_id', 'stock_id', 'quantity', 'sale', 'original_price', 'discounted_price',
+              'reserved_quantity': 재고 예약으로 이미 차감한 수량 (예약이 없으면 0)}, ...]
 
         Raises:
-            400, {'message': 'product does not exist',
-            'errorMessage': 'product_does_not_exist'} : 상품을 조회할 수 없음
+            400, {'message': 'cart item does not exist',
+            'errorMessage': 'cart_item_does_not_exist'} : 주문할 장바구니 상품이 없음
+            400, {'message': 'Not Enough Product',
+            'errorMessage': 'Not as many in stock as quantity'} : 재고가 주문량보다 적음
+            400, {'message': 'checkout denied',
+            'errorMessage': 'unable_to_checkout'} : 상품이 품절됨
             500, {'message: server_error',
             'errorMessage': 'server_error'} :서버 에러 발생
 
-        History:
-            2020-12-30(고수희): 초기 생성
+        Notes:
+            FOR UPDATE 로 장바구니 상품, 재고(stocks), 재고 예약(stock_reservations) row 를 잠근다.
+            (MySQL 5.7 에서도 실행되도록 FOR UPDATE OF 는 사용하지 않는다. 재고 예약 조회와 같은 방식)
+            같은 재고(stock_id)를 여러 장바구니 상품으로 주문하면 예약하지 않은 주문량을 합산해 체크한다.
+            이 체크는 빠른 실패를 위한 것이고, 재고보다 많이 판매되지 않는 것은 patch_product_remains_dao 의
+            조건부 차감(remain >= 수량)이 보장한다.
         """
         sql = """
-        SELECT st.remain as remain
-        FROM products as pd
-        INNER JOIN stocks as st ON st.id = pd.id
-        WHERE pd.id = %s
+        SELECT
+        ct.id AS cart_id
+        , ct.product_id
+        , ct.stock_id
+        , ct.quantity
+        , ct.sale
+        , ct.original_price
+        , ct.discounted_price
+        , COALESCE(sr.quantity, 0) AS reserved_quantity
+        , st.remain
+        FROM cart_items AS ct
+        INNER JOIN stocks AS st ON st.id = ct.stock_id
+        LEFT JOIN stock_reservations AS sr ON sr.cart_id = ct.id
+        WHERE ct.user_id = %(user_id)s
+        AND ct.is_deleted = 0
+        """
+
+        if data['cart_ids'] is not None:
+            sql += """
+        AND ct.id IN %(cart_ids)s
+        """
+
+        sql += """
+        ORDER BY ct.id
+        FOR UPDATE
         ;
         """
 
         try:
             with connection.cursor(pymysql.cursors.DictCursor) as cursor:
-                cursor.execute(sql, data['product_id'])
-                result = cursor.fetchone()
-                if not result:
-                    raise ProductNotExist('product_does_not_exist')
+                cursor.execute(sql, data)
+                items = cursor.fetchall()
+                if not items or (data['cart_ids'] is not None and len(items) != len(data['cart_ids'])):
+                    raise CartItemNotExist('cart_item_does_not_exist')
+
+                quantities = {}
+                for item in items:
+                    item['quantity'] = int(item['quantity'])
+                    quantities[item['stock_id']] = (quantities.get(item['stock_id'], 0)
+                                                    + item['quantity'] - item['reserved_quantity'])
 
-                # 상품 재고가 주문량을 소화할 수 있는지 체크
-                if result['remain'] < data['quantity']:
-                    raise NotEnoughProduct('Not as many in stock as quantity')
+                for item in items:
+                    remain = item.pop('remain')
 
-                # 상품 재고가 0인지 확인하여, 상품이 품절되었는지 체크
-                if result['remain'] <= 0:
-                    raise CheckoutDenied('unable_to_checkout')
+                    # 예약한 수량만큼 이미 차감되어 있으므로 추가로 차감할 수량이 없으면 체크하지 않는다.
+                    if quantities[item['stock_id']] <= 0:
+                        continue
 
-        except ProductNotExist as e:
+                    # 상품 재고가 0인지 확인하여, 상품이 품절되었는지 체크
+                    if remain <= 0:
+                        raise CheckoutDenied('unable_to_checkout')
+
+                    # 상품 재고가 주문량을 소화할 수 있는지 체크
+                    if remain < quantities[item['stock_id']]:
+                        raise NotEnoughProduct('Not as many in stock as quantity')
+
+                return items
+
+        except CartItemNotExist as e:
             traceback.print_exc()
             raise e
 
@@ -181,33 +225,64 @@ class StoreOrderDao:
             traceback.print_exc()
             raise ServerError('server_error')
 
-    def get_today_order_number_dao(self, connection):
-        """주문번호 생성을 위한 당일 주문번호 채번
+    def reserve_sequence_block_dao(self, connection, data):
+        """주문번호 시퀀스 블록 예약 (데이터베이스 날짜 기준)
 
         Args:
-            connection: 데이터베이스 연결 객체
+            connection: 데이터베이스 연결 객체 (autocommit)
+            data      : {'name': 시퀀스 이름, 'size': 예약할 번호 개수}
 
-        Author: 고수희
+        Returns:
+            {
+                'day'        : 데이터베이스 기준 날짜 ('YYYYMMDD'),
+                'start'      : 예약한 블록의 첫 번호,
+                'expires_in' : 데이터베이스 기준 날짜가 바뀔 때까지 남은 시간 (초)
+            }
 
-        Returns: 당일 주문량 +1
+        Raises:
+            500, {'message: server_error',
+            'errorMessage': 'server_error'} :서버 에러 발생
 
-        History:
-            2020-12-30(고수희): 초기 생성
+        Notes:
+            날짜는 orders.created_at 과 같은 데이터베이스 시각(NOW())에서 가져온다. (앱 서버와 시간대 / 시계가 달라도 같은 날짜)
+            INSERT ... ON DUPLICATE KEY UPDATE 한 문장으로 '이름:날짜' row 의 next_value 를 size 만큼 증가시킨다.
+            기존 row 를 갱신한 경우 LAST_INSERT_ID(expr) 로 증가 전 값을 돌려받는다. (utils.sequence)
         """
 
-        # TODO 다른 주문이 같은 시점에 주문이 될 수 있음
-        today_sql = """
-        SELECT count(*)+1 as today 
-        FROM orders 
-        WHERE date(created_at) = date(now())
+        sql = """
+        INSERT INTO order_number_sequences (
+        name
+        , next_value
+        )
+        VALUES (
+        %(name)s
+        , %(size)s + 1
+        )
+        ON DUPLICATE KEY UPDATE
+        next_value = LAST_INSERT_ID(next_value) + %(size)s
         ;
         """
 
         try:
-            with connection.cursor(pymysql.cursors.DictCursor) as cursor:
-                cursor.execute(today_sql)
-                result = cursor.fetchone()
-                return result
+            with connection.cursor() as cursor:
+                cursor.execute("""
+                SELECT
+                DATE_FORMAT(NOW(), '%Y%m%d')
+                , TIMESTAMPDIFF(SECOND, NOW(), CURDATE() + INTERVAL 1 DAY)
+                ;
+                """)
+                day, expires_in = cursor.fetchone()
+
+                affected_row = cursor.execute(sql, {'name': '{}:{}'.format(data['name'], day), 'size': data['size']})
+
+                # 1: 새 row 생성 (1부터 시작), 2: 기존 row 갱신
+                if affected_row == 1:
+                    start = 1
+                else:
+                    cursor.execute("SELECT LAST_INSERT_ID();")
+                    start = cursor.fetchone()[0]
+
+                return {'day': day, 'start': start, 'expires_in': expires_in}
 
         except Exception:
             traceback.print_exc()
@@ -249,7 +324,7 @@ class StoreOrderDao:
         , total_price
         )
         VALUES (
-        CONCAT(DATE_FORMAT(now(), '%%Y%%m%%d'),(LPAD(%(today)s,6,0)),(LPAD(0,3,0)))
+        %(order_number)s
         , %(sender_name)s
         , %(sender_phone)s
         , %(sender_email)s
@@ -280,15 +355,14 @@ class StoreOrderDao:
             traceback.print_exc()
             raise ServerError('server_error')
 
-    def post_store_order_item_dao(self, connection, data):
-        """주문 상품 추가
+    def post_store_order_items_dao(self, connection, data):
+        """주문 상품 추가 (여러 상품을 한 문장으로 추가)
+
         Args:
             connection: 데이터베이스 연결 객체
-            data      : 서비스 레이어에서 넘겨 받아 추가할 data
-
-        Author: 고수희
+            data      : {'items': 주문 상품 dict 리스트}
 
-        Returns: 생성된 order_item의 id 반환
+        Returns: None
 
         Raises:
             400, {'message': 'order item create denied',
@@ -296,8 +370,8 @@ class StoreOrderDao:
             500, {'message: server_error',
             'errorMessage': 'server_error'} :서버 에러 발생
 
-        History:
-            2020-12-30(고수희): 초기 생성
+        Notes:
+            pymysql 의 executemany 는 INSERT ... VALUES 문을 multi-row INSERT 한 문장으로 묶어 전송한다.
         """
 
         sql = """
@@ -318,21 +392,19 @@ class StoreOrderDao:
               , %(quantity)s
               , %(order_id)s
               , %(cart_id)s
-              , CONCAT('B', DATE_FORMAT(now(), '%%Y%%m%%d'),(LPAD(%(today)s,6,0)),(LPAD(1,3,0)))
+              , %(order_detail_number)s
               , %(order_item_status_type_id)s
               , %(original_price)s
               , %(discounted_price)s
               , %(sale)s
           );
           """
-        # TODO insert로 꺼내서 넣기
+
         try:
             with connection.cursor() as cursor:
-                cursor.execute(sql, data)
-                result = cursor.lastrowid
-                if not result:
+                created_rows = cursor.executemany(sql, data['items'])
+                if created_rows != len(data['items']):
                     raise OrderItemCreateDenied('unable_to_create')
-                return result
 
         except OrderItemCreateDenied as e:
             traceback.print_exc()
@@ -342,14 +414,12 @@ class StoreOrderDao:
             traceback.print_exc()
             raise ServerError('server error')
 
-    def post_store_order_item_history_dao(self, connection, data):
-        """주문 상품 정보 이력 추가
+    def post_store_order_item_histories_dao(self, connection, data):
+        """주문 상품 정보 이력 추가 (주문의 모든 상품)
 
         Args:
             connection: 데이터베이스 연결 객체
-            data      : 서비스 레이어에서 넘겨 받아 추가할 data
-
-        Author: 고수희
+            data      : {'order_id', 'order_item_status_type_id', 'user_id', 'item_count': 주문 상품 수}
 
         Returns: None
 
@@ -359,8 +429,9 @@ class StoreOrderDao:
             500, {'message: server_error',
             'errorMessage': 'server_error'} :서버 에러 발생
 
-        History:
-            2020-12-30(고수희): 초기 생성
+        Notes:
+            multi-row INSERT 는 첫 번째 id 만 돌려주므로 order_item id 를 다시 조회하지 않고
+            INSERT ... SELECT 한 문장으로 주문의 order_items 에서 이력을 만든다.
         """
 
         sql = """
@@ -368,18 +439,20 @@ class StoreOrderDao:
             order_item_id
             , order_item_status_type_id
             , updater_id
-        ) VALUES (
-            %(order_item_id)s
+        )
+        SELECT
+            id
             , %(order_item_status_type_id)s
             , %(user_id)s
-        );
+        FROM order_items
+        WHERE order_id = %(order_id)s
+        ;
         """
 
         try:
             with connection.cursor() as cursor:
-                cursor.execute(sql, data)
-                result = cursor.lastrowid
-                if not result:
+                created_rows = cursor.execute(sql, data)
+                if created_rows != data['item_count']:
                     raise OrderHistoryCreateDenied('unable_to_create')
 
         except OrderHistoryCreateDenied as e:
@@ -390,14 +463,12 @@ class StoreOrderDao:
             traceback.print_exc()
             raise ServerError('server error')
 
-    def patch_product_remain_dao(self, connection, data):
-        """상품 재고 감소 처리
+    def patch_product_remains_dao(self, connection, data):
+        """주문 상품 재고 감소 처리 (주문의 모든 재고를 한 문장으로 처리)
 
         Args:
             connection: 데이터베이스 연결 객체
-            data      : 서비스 레이어에서 넘겨 받아 추가할 data
-
-        Author: 고수희
+            data      : {'order_id', 'stock_count': 추가로 차감할 재고(stock_id) 수, 'product_ids': 주문한 상품 id set}
 
         Returns: None
 
@@ -407,23 +478,36 @@ class StoreOrderDao:
             500, {'message: server_error',
             'errorMessage': 'server_error'} :서버 에러 발생
 
-        History:
-            2020-12-31(고수희): 초기 생성
+        Notes:
+            multi-table UPDATE 는 row 를 한 번만 갱신하므로 재고별 주문량을 합산한 뒤 join 한다.
+            재고 예약(stock_reservations)으로 이미 차감한 수량은 빼고, 남은 수량은 remain >= 수량 인 경우에만 차감한다.
+            (조회와 차감 사이에 다른 요청이 재고를 가져가면 차감한 row 수가 달라져 주문이 rollback 된다.)
         """
 
         sql = """
-        UPDATE stocks
-        SET  remain = remain - %(quantity)s
-        WHERE id = %(stock_id)s
+        UPDATE stocks AS st
+        INNER JOIN (
+            SELECT oi.stock_id, SUM(oi.quantity - COALESCE(sr.quantity, 0)) AS net_quantity
+            FROM order_items AS oi
+            LEFT JOIN stock_reservations AS sr ON sr.cart_id = oi.cart_id
+            WHERE oi.order_id = %(order_id)s
+            GROUP BY oi.stock_id
+            HAVING net_quantity <> 0
+        ) AS oi ON oi.stock_id = st.id
+        SET st.remain = st.remain - oi.net_quantity
+        WHERE st.remain >= oi.net_quantity
         ;
         """
 
         try:
             with connection.cursor() as cursor:
                 affected_row = cursor.execute(sql, data)
-                if affected_row == 0:
+                if affected_row != data['stock_count']:
                     raise ProductRemainUpdateDenied('unable_to_update')
 
+            for product_id in data['product_ids']:
+                invalidate_on_commit(PRODUCT_DETAIL_CACHE, int(product_id))
+
         except ProductRemainUpdateDenied as e:
             traceback.print_exc()
             raise e
@@ -432,14 +516,49 @@ class StoreOrderDao:
             traceback.print_exc()
             raise ServerError('server error')
 
-    def patch_is_delete_cart_item_dao(self, connection, data):
-        """장바구니 상품 논리 삭제 처리
+    def delete_order_reservations_dao(self, connection, data):
+        """주문한 장바구니 상품의 재고 예약 삭제 (예약으로 차감한 재고는 주문에 사용된다.)
 
         Args:
             connection: 데이터베이스 연결 객체
-            data      : 서비스 레이어에서 넘겨 받아 추가할 data
+            data      : {'order_id', 'reserved_count': 예약이 있는 주문 상품 수}
 
-        Author: 고수희
+        Returns: None
+
+        Raises:
+            400, {'message': 'stock reservation denied',
+            'errorMessage': 'unable_to_release'} : 예약 삭제 실패
+            500, {'message: server_error',
+            'errorMessage': 'server_error'} :서버 에러 발생
+        """
+        sql = """
+        DELETE sr
+        FROM stock_reservations AS sr
+        INNER JOIN order_items AS oi ON oi.cart_id = sr.cart_id
+        WHERE oi.order_id = %(order_id)s
+        ;
+        """
+
+        try:
+            with connection.cursor() as cursor:
+                affected_row = cursor.execute(sql, data)
+                if affected_row != data['reserved_count']:
+                    raise StockReservationDenied('unable_to_release')
+
+        except StockReservationDenied as e:
+            traceback.print_exc()
+            raise e
+
+        except Exception:
+            traceback.print_exc()
+            raise ServerError('server_error')
+
+    def patch_is_delete_cart_items_dao(self, connection, data):
+        """주문한 장바구니 상품 논리 삭제 처리
+
+        Args:
+            connection: 데이터베이스 연결 객체
+            data      : {'order_id', 'item_count': 주문 상품 수}
 
         Returns: None
 
@@ -448,21 +567,19 @@ class StoreOrderDao:
             'errorMessage': 'unable_to_delete'} : 논리삭제 실패
             500, {'message: server_error',
             'errorMessage': 'server_error'} :서버 에러 발생
-
-        History:
-            2020-12-31(고수희): 초기 생성
         """
-        # TODO 주문이 복수 아이템일 경우 Update join을 사용해서 삭제 처리
         sql = """
-        UPDATE cart_items
-        SET is_deleted = 1
-        WHERE id = %(cart_id)s;
+        UPDATE cart_items AS ct
+        INNER JOIN order_items AS oi ON oi.cart_id = ct.id
+        SET ct.is_deleted = 1
+        WHERE oi.order_id = %(order_id)s
+        ;
         """
 
         try:
             with connection.cursor() as cursor:
                 affected_row = cursor.execute(sql, data)
-                if affected_row == 0:
+                if affected_row != data['item_count']:
                     raise DeleteDenied('unable_to_delete')
 
         except DeleteDenied as e:
@@ -520,3 +637,143 @@ class StoreOrderDao:
         except Exception:
             traceback.print_exc()
             raise ServerError('server error')
+
+    def post_idempotency_key_dao(self, connection, data):
+        """Idempotency-Key 선점
+
+        Args:
+            connection: 데이터베이스 연결 객체
+            data      : {'user_id', 'idempotency_key', 'request_hash'}
+
+        Returns:
+            True : 새 키 (주문을 처리한다.)
+            False: 이미 처리한 키
+
+        Raises:
+            500, {'message: server_error',
+            'errorMessage': 'server_error'} :서버 에러 발생
+
+        Notes:
+            같은 키로 처리 중인 요청이 있으면 그 트랜잭션이 끝날 때까지 기다린다. (PK 잠금)
+            주문이 실패해 rollback 되면 키도 함께 삭제되므로 다시 요청할 수 있다.
+        """
+        sql = """
+        INSERT INTO idempotency_keys (
+        user_id
+        , idempotency_key
+        , request_hash
+        )
+        VALUES (
+        %(user_id)s
+        , %(idempotency_key)s
+        , %(request_hash)s
+        )
+        ON DUPLICATE KEY UPDATE
+        user_id = user_id
+        ;
+        """
+
+        try:
+            with connection.cursor() as cursor:
+                # 1: 새 row 생성, 0: 이미 있는 키 (변경 없음)
+                return cursor.execute(sql, data) == 1
+
+        except Exception:
+            traceback.print_exc()
+            raise ServerError('server_error')
+
+    def get_idempotency_key_dao(self, connection, data):
+        """처리한 Idempotency-Key 의 저장된 응답 조회
+
+        Args:
+            connection: 데이터베이스 연결 객체
+            data      : {'user_id', 'idempotency_key'}
+
+        Returns:
+            {'request_hash', 'order_id', 'status_code', 'response'}
+
+        Raises:
+            500, {'message: server_error',
+            'errorMessage': 'server_error'} :서버 에러 발생
+        """
+        sql = """
+        SELECT
+        request_hash
+        , order_id
+        , status_code
+        , response
+        FROM idempotency_keys
+        WHERE user_id = %(user_id)s
+        AND idempotency_key = %(idempotency_key)s
+        LOCK IN SHARE MODE
+        ;
+        """
+
+        try:
+            with connection.cursor(pymysql.cursors.DictCursor) as cursor:
+                cursor.execute(sql, data)
+                return cursor.fetchone()
+
+        except Exception:
+            traceback.print_exc()
+            raise ServerError('server_error')
+
+    def patch_idempotency_key_dao(self, connection, data):
+        """Idempotency-Key 에 처리 결과 저장
+
+        Args:
+            connection: 데이터베이스 연결 객체
+            data      : {'user_id', 'idempotency_key', 'order_id', 'status_code', 'response': 응답 result (JSON 문자열)}
+
+        Returns: None
+
+        Raises:
+            500, {'message: server_error',
+            'errorMessage': 'server_error'} :서버 에러 발생
+        """
+        sql = """
+        UPDATE idempotency_keys
+        SET order_id = %(order_id)s
+        , status_code = %(status_code)s
+        , response = %(response)s
+        WHERE user_id = %(user_id)s
+        AND idempotency_key = %(idempotency_key)s
+        ;
+        """
+
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute(sql, data)
+
+        except Exception:
+            traceback.print_exc()
+            raise ServerError('server_error')
+
+    def delete_expired_idempotency_keys_dao(self, connection, data):
+        """보관 기간이 지난 Idempotency-Key 삭제
+
+        Args:
+            connection: 데이터베이스 연결 객체
+            data      : {'ttl': 보관 기간 (초), 'limit': 최대 삭제 수}
+
+        Returns: 삭제한 키 수
+
+        Raises:
+            500, {'message: server_error',
+            'errorMessage': 'server_error'} :서버 에러 발생
+        """
+        sql = """
+        DELETE FROM idempotency_keys
+        WHERE created_at < NOW() - INTERVAL %(ttl)s SECOND
+        ORDER BY created_at
+        LIMIT %(limit)s
+        ;
+        """
+
+        try:
+            with connection.cursor() as cursor:
+                return cursor.execute(sql, data)
+
+        except Exception:
+            traceback.print_exc()
+            raise ServerError('server_error')
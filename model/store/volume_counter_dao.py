@@ -0,0 +1,209 @@
+import traceback
+import pymysql
+
+from utils.custom_exceptions import ServerError
+from utils.volume_counter import VOLUME_TARGETS
+
+
+class VolumeCounterDao:
+    """ Persistence Layer
+
+        Attributes: None
+
+        Notes:
+            판매량 / 북마크 수 증감 슬롯 (utils.volume_counter, migrations/004_volume_counter_shards.sql)
+            쓰기 요청은 슬롯에 증감만 누적하고, 집계 컬럼은 fold 할 때만 갱신한다.
+            잠금 순서는 volume_counter_shards -> bookmark_volumes / product_sales_volumes 이다.
+    """
+
+    def add_volume_deltas_dao(self, connection, data):
+        """슬롯에 증감 누적 (여러 슬롯을 한 문장으로 처리)
+
+        Args:
+            connection : 데이터베이스 연결 객체
+            data       : {'deltas': [{'name', 'product_id', 'slot', 'delta'}, ...] (utils.volume_counter.volume_deltas)}
+
+        Returns: None
+
+        Raises:
+            500, {'message: server_error',
+            'errorMessage': 'server_error'} :서버 에러 발생
+
+        Notes:
+            delta 는 signed 이므로 북마크 삭제(-1)가 먼저 기록되어도 unsigned 범위 오류(1690)가 발생하지 않는다.
+        """
+        if not data['deltas']:
+            return
+
+        sql = """
+        INSERT INTO volume_counter_shards (
+            name
+            , product_id
+            , slot
+            , delta
+        ) VALUES (
+            %(name)s
+            , %(product_id)s
+            , %(slot)s
+            , %(delta)s
+        )
+        ON DUPLICATE KEY UPDATE
+        delta = delta + VALUES(delta)
+        ;
+        """
+
+        try:
+            with connection.cursor() as cursor:
+                cursor.executemany(sql, data['deltas'])
+
+        except Exception:
+            traceback.print_exc()
+            raise ServerError('server_error')
+
+    def get_volume_products_dao(self, connection, data):
+        """반영할 상품 조회
+
+        Args:
+            connection : 데이터베이스 연결 객체
+            data       : {'limit': 최대 상품 수}
+
+        Returns:
+            [(name, product_id), ...]
+
+        Raises:
+            500, {'message: server_error',
+            'errorMessage': 'server_error'} :서버 에러 발생
+
+        Notes:
+            슬롯이 아니라 (카운터, 상품) 단위로 나누므로 한 상품의 슬롯이 여러 번에 나누어 반영되지 않는다.
+        """
+        sql = """
+        SELECT DISTINCT
+        name
+        , product_id
+        FROM volume_counter_shards
+        ORDER BY name, product_id
+        LIMIT %(limit)s
+        ;
+        """
+
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute(sql, data)
+                return [(name, product_id) for name, product_id in cursor.fetchall()]
+
+        except Exception:
+            traceback.print_exc()
+            raise ServerError('server_error')
+
+    def get_volume_shards_dao(self, connection, data):
+        """반영할 상품의 모든 슬롯 조회
+
+        Args:
+            connection : 데이터베이스 연결 객체
+            data       : {'products': ((name, product_id), ...)}
+
+        Returns:
+            [{'name', 'product_id', 'slot', 'delta'}, ...]
+
+        Raises:
+            500, {'message: server_error',
+            'errorMessage': 'server_error'} :서버 에러 발생
+
+        Notes:
+            FOR UPDATE 로 상품의 슬롯 범위를 잠그므로 조회한 delta 는 삭제할 때까지 바뀌지 않고,
+            같은 상품에 슬롯을 새로 추가하려는 요청도 fold 트랜잭션이 끝날 때까지 기다린다.
+            (북마크 삭제(-1)는 추가(+1)가 커밋된 뒤에만 기록되므로 상품별 합계는 0 미만이 되지 않는다.)
+        """
+        sql = """
+        SELECT
+        name
+        , product_id
+        , slot
+        , delta
+        FROM volume_counter_shards
+        WHERE (name, product_id) IN %(products)s
+        ORDER BY name, product_id, slot
+        FOR UPDATE
+        ;
+        """
+
+        try:
+            with connection.cursor(pymysql.cursors.DictCursor) as cursor:
+                cursor.execute(sql, data)
+                return cursor.fetchall()
+
+        except Exception:
+            traceback.print_exc()
+            raise ServerError('server_error')
+
+    def patch_volumes_dao(self, connection, data):
+        """집계 컬럼에 증감 반영 (여러 상품을 한 문장으로 처리)
+
+        Args:
+            connection : 데이터베이스 연결 객체
+            data       : {'name': 카운터 이름, 'deltas': {product_id: 증감}}
+
+        Returns: None
+
+        Raises:
+            500, {'message: server_error',
+            'errorMessage': 'server_error'} :서버 에러 발생
+
+        Notes:
+            상품의 슬롯을 모두 합산해 반영하므로 결과는 0 미만이 되지 않는다.
+            (GREATEST 는 집계 컬럼이 이미 어긋나 있는 경우 unsigned 범위 오류를 막기 위한 것이다.)
+            집계 row 가 없는 상품(삭제된 상품 등)의 증감은 반영하지 않는다.
+        """
+        table, column = VOLUME_TARGETS[data['name']]
+        deltas = data['deltas']
+
+        sql = """
+        UPDATE {table} AS vl
+        INNER JOIN (
+            {deltas}
+        ) AS dt ON dt.product_id = vl.product_id
+        SET vl.{column} = GREATEST(CAST(vl.{column} AS SIGNED) + dt.delta, 0)
+        ;
+        """.format(
+            table=table,
+            column=column,
+            deltas='\n            UNION ALL '.join(['SELECT %s AS product_id, %s AS delta'] * len(deltas))
+        )
+
+        params = [value for item in deltas.items() for value in item]
+
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute(sql, params)
+
+        except Exception:
+            traceback.print_exc()
+            raise ServerError('server_error')
+
+    def delete_volume_shards_dao(self, connection, data):
+        """반영한 슬롯 삭제
+
+        Args:
+            connection : 데이터베이스 연결 객체
+            data       : {'shards': ((name, product_id, slot), ...)}
+
+        Returns: None
+
+        Raises:
+            500, {'message: server_error',
+            'errorMessage': 'server_error'} :서버 에러 발생
+        """
+        sql = """
+        DELETE FROM volume_counter_shards
+        WHERE (name, product_id, slot) IN %(shards)s
+        ;
+        """
+
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute(sql, data)
+
+        except Exception:
+            traceback.print_exc()
+            raise ServerError('server_error')
@@ -17,6 +17,7 @@ from .store.destination_service import DestinationService
 from .store.cart_item_service import CartItemService
 from .store.sender_service import SenderService
 from .store.store_order_service import StoreOrderService
+from .store.volume_counter_service import VolumeCounterService
 from .store.bookmark_service import BookmarkService
 from .store.event_list_service import EventListService
 from .store.seller_shop_service import SellerShopService
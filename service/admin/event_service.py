@@ -3,6 +3,8 @@ import datetime
 from werkzeug.utils import secure_filename
 from utils.custom_exceptions import ButtonProductDoesNotMatch, EventDoesNotExist
 from utils.amazon_s3 import S3FileManager, GenerateFilePath
+from utils.cache import EVENT_CACHE, clear_on_commit
+from utils.home_feed import invalidate_home_feed_on_commit
 
 from config import S3_BUCKET_URL
 
@@ -438,6 +440,8 @@ class EventService:
             data['end_datetime'] += ':00'
 
             data['event_id'] = self.event_dao.create_event(connection, data)
+            clear_on_commit(EVENT_CACHE)
+            invalidate_home_feed_on_commit()
 
             if buttons:
                 button_product_matched = False
@@ -493,6 +497,8 @@ class EventService:
 
             self.event_dao.delete_event_products_by_event(connection, data)
             self.event_dao.delete_event(connection, data)
+            clear_on_commit(EVENT_CACHE)
+            invalidate_home_feed_on_commit()
 
         except Exception as e:
             raise e
@@ -575,6 +581,8 @@ class EventService:
             data['end_datetime'] += ':00'
 
             self.event_dao.update_event_detail(connection, data)
+            clear_on_commit(EVENT_CACHE)
+            invalidate_home_feed_on_commit()
 
             # 버튼형이면 버튼 데이터 업데이트
             if data['event_kind_id'] == 2:
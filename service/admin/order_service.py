@@ -23,7 +23,15 @@ class OrderService:
     def __init__(self, admin_order_dao):
         self.admin_order_dao = admin_order_dao
 
-    def get_orders_service(self, connection, data):
+    def get_orders_service(self, connection, data, stream=False):
+        """ 주문 리스트 조회
+
+            Args:
+                connection : 데이터베이스 연결 객체
+                data       : 뷰에서 넘겨 받은 dict
+                stream     : True 이면 order_lists 를 server-side cursor generator 로 반환 (utils.streaming)
+        """
+
         try:
             # 권한 체크 (마스터 혹은 셀러가 아닌 경우)
             if not (data['permission'] == 1 or data['permission'] == 2):
@@ -55,6 +63,9 @@ class OrderService:
             if data['product_name']:
                 data['product_name'] = '%' + data['product_name'] + '%'
 
+            if stream:
+                return self.admin_order_dao.stream_order_list_dao(connection, data)
+
             return self.admin_order_dao.get_order_list_dao(connection, data)
 
         except KeyError:
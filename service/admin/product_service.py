@@ -7,6 +7,9 @@ from utils.const             import ACCOUNT_ADMIN, ACCOUNT_SELLER
 from config                  import S3_BUCKET_URL
 from utils.amazon_s3         import S3FileManager, GenerateFilePath
 from model                   import ProductManageDao, SellerDao
+from utils.cache             import PRODUCT_DETAIL_CACHE, invalidate_on_commit
+from utils.home_feed         import mark_home_feed_products_on_commit
+from utils.search_index      import index_product_on_commit
 from utils.custom_exceptions import (
     RequiredFieldException,
     NotValidFileException,
@@ -454,7 +457,11 @@ class ProductManageService:
         
             print(type(data['detail_information']), data['detail_information'])
         
-            return self.product_manage_dao.insert_product(connection, data)
+            product_id = self.product_manage_dao.insert_product(connection, data)
+            invalidate_on_commit(PRODUCT_DETAIL_CACHE, product_id)
+            index_product_on_commit(product_id, data['product_name'])
+
+            return product_id
     
         except KeyError as e:
             raise e
@@ -493,6 +500,7 @@ class ProductManageService:
             }
         
             self.product_manage_dao.update_product_code(connection, data)
+            invalidate_on_commit(PRODUCT_DETAIL_CACHE, product_id)
         
             return data['product_code']
     
@@ -595,6 +603,9 @@ class ProductManageService:
                 }
             
                 self.product_manage_dao.insert_product_image(connection, data)
+
+            invalidate_on_commit(PRODUCT_DETAIL_CACHE, product_id)
+            mark_home_feed_products_on_commit([product_id])
     
         except Exception as e:
             raise e
@@ -649,6 +660,8 @@ class ProductManageService:
                     data['remain'] = 0
             
                 self.product_manage_dao.insert_stock(connection, data)
+
+            invalidate_on_commit(PRODUCT_DETAIL_CACHE, product_id)
     
         except KeyError as e:
             raise e
@@ -758,12 +771,13 @@ class ProductManageService:
         except Exception as e:
             raise e
     
-    def search_product_service(self, connection, data):
+    def search_product_service(self, connection, data, stream=False):
         """ 특정 조건에 따른 product 검색
         
             Parameters:
                 connection : 데이터베이스 연결 객체
                 data       : View 에서 넘겨받은 딕셔너리 객체
+                stream     : True 이면 product_list 를 generator 로 반환 (utils.streaming)
             
             Author: 심원두
 
@@ -831,27 +845,30 @@ class ProductManageService:
             
             product_list = self.product_manage_dao.search_products(
                                 connection,
-                                data
+                                data,
+                                stream
                             )
             
+            products = (
+                {
+                    'updated_at'            : product['updated_at'],
+                    'product_image_url'     : S3_BUCKET_URL + product['product_image_url'],
+                    'product_name'          : product['product_name'],
+                    'product_code'          : product['product_code'],
+                    'product_id'            : product['product_id'],
+                    'seller_attribute_type' : product['seller_attribute_type'],
+                    'seller_name'           : product['seller_name'],
+                    'origin_price'          : '{:,}'.format(int(product['origin_price'])),
+                    'discounted_price'      : '{:,}'.format(int(product['discounted_price'])),
+                    'discount_rate'         : int(product['discount_rate']),
+                    'is_sale'               : product['is_sale'],
+                    'is_display'            : product['is_display'],
+                } for product in product_list
+            )
+            
             result = {
                 'total_count'  : total_count,
-                'product_list' : [
-                    {
-                        'updated_at'            : product['updated_at'],
-                        'product_image_url'     : S3_BUCKET_URL + product['product_image_url'],
-                        'product_name'          : product['product_name'],
-                        'product_code'          : product['product_code'],
-                        'product_id'            : product['product_id'],
-                        'seller_attribute_type' : product['seller_attribute_type'],
-                        'seller_name'           : product['seller_name'],
-                        'origin_price'          : '{:,}'.format(int(product['origin_price'])),
-                        'discounted_price'      : '{:,}'.format(int(product['discounted_price'])),
-                        'discount_rate'         : int(product['discount_rate']),
-                        'is_sale'               : product['is_sale'],
-                        'is_display'            : product['is_display'],
-                    } for product in product_list
-                ]
+                'product_list' : products if stream else list(products)
             }
             
             return result
@@ -84,7 +84,11 @@ class SellerService:
         return seller_info
 
 
-    def seller_list_service(self, connection, offset):
+    def seller_list_service(self, connection, offset, stream=False):
+        if stream:
+            # {'total_count': ..., 'seller_list': server-side cursor generator} (utils.streaming)
+            return self.seller_dao.stream_seller_list(connection, offset)
+
         seller_list = self.seller_dao.get_seller_list(connection, offset)
         if not seller_list:
             return []
@@ -1,12 +1,14 @@
-from model import BookmarkDao
+from model import BookmarkDao, VolumeCounterDao
 from utils.custom_exceptions import AlreadyExistBookmark, NotExistBookmark, ProductNotExist
+from utils.volume_counter import BOOKMARK_VOLUME, volume_deltas
 
 
 class BookmarkService:
     """ Business Layer
 
         Attributes:
-            bookmark_dao : BookmarkDao 클래스
+            bookmark_dao       : BookmarkDao 클래스
+            volume_counter_dao : VolumeCounterDao 클래스
 
         Author: 김민구
 
@@ -17,6 +19,7 @@ class BookmarkService:
 
     def __init__(self):
         self.bookmark_dao = BookmarkDao()
+        self.volume_counter_dao = VolumeCounterDao()
 
     def post_bookmark_logic(self, connection, data):
         """ 상품 북마크 추가
@@ -46,8 +49,10 @@ class BookmarkService:
 
         self.bookmark_dao.create_bookmark(connection, data)
 
-        data['count'] = 1
-        self.bookmark_dao.update_bookmark_volume_count(connection, data)
+        # 북마크 수는 슬롯에 누적하고 flask fold-volume-counters 에서 bookmark_volumes 에 반영한다.
+        self.volume_counter_dao.add_volume_deltas_dao(connection, {
+            'deltas': volume_deltas(BOOKMARK_VOLUME, {data['product_id']: 1})
+        })
 
     def delete_bookmark_logic(self, connection, data):
         """ 상품 북마크 삭제
@@ -78,5 +83,7 @@ class BookmarkService:
 
         self.bookmark_dao.delete_bookmark(connection, data)
 
-        data['count'] = -1
-        self.bookmark_dao.update_bookmark_volume_count(connection, data)
+        # 북마크 수 감소 (슬롯에 누적)
+        self.volume_counter_dao.add_volume_deltas_dao(connection, {
+            'deltas': volume_deltas(BOOKMARK_VOLUME, {data['product_id']: -1})
+        })
@@ -1,4 +1,8 @@
+from flask import current_app, jsonify
+
 from model import CategoryListDao
+from utils.cache import CATEGORY_TREE_SNAPSHOT, get_snapshot
+from utils.connection import unit_of_work
 
 
 class CategoryListService:
@@ -57,24 +61,56 @@ class CategoryListService:
         first_category_list = self.category_list_dao.get_first_category_list(connection)
         second_category_list = self.category_list_dao.get_second_category_list(connection)
         third_category_list = self.category_list_dao.get_third_category_list(connection)
+
+        # 상위 카테고리 id 별로 한 번씩만 묶는다. (O(n + m + k))
+        sub_categories = dict()
+        for third in third_category_list:
+            sub_categories.setdefault(third['main_category_id'], []).append({
+                'id': third['id'],
+                'name': third['name'],
+                'main_category_id': third['main_category_id']
+            })
+
+        main_categories = dict()
+        for second in second_category_list:
+            main_categories.setdefault(second['menu_id'], []).append({
+                'id': second['id'],
+                'name': second['name'],
+                'menu_id': second['menu_id'],
+                'sub_categories': sub_categories.get(second['id'], [])
+            })
+
         result = [
             {
                 'id': first['id'],
                 'name': first['name'],
-                'main_categories': [
-                    {
-                        'id': second['id'],
-                        'name': second['name'],
-                        'menu_id': second['menu_id'],
-                        'sub_categories': [
-                            {
-                                'id': third['id'],
-                                'name': third['name'],
-                                'main_category_id': third['main_category_id']
-                            } for third in third_category_list if third['main_category_id'] == second['id']
-                        ]
-                    } for second in second_category_list if second['menu_id'] == first['id']
-                ]
+                'main_categories': main_categories.get(first['id'], [])
             } for first in first_category_list]
 
         return result
+
+    def category_tree_service(self, database):
+        """ 직렬화한 카테고리 트리 응답 (데이터베이스에 접근하지 않는다.)
+
+            Args:
+                database : app.config['DB'] (트리 생성에 사용)
+
+            Returns:
+                {'message': 'success', 'result': category_list_logic 결과} 를 JSON 으로 직렬화한 bytes
+
+            Notes:
+                워커마다 처음 한 번만 요청 안에서 조회하고, 이후에는 CATEGORY_TREE_SNAPSHOT_TTL 마다 백그라운드에서 다시 만든다.
+                (카테고리는 앱에서 변경하지 않으므로 별도의 무효화는 없다.)
+                jsonify 로 직렬화하므로 응답 본문과 ETag 는 jsonify 를 직접 호출할 때와 같다.
+        """
+
+        app = current_app._get_current_object()
+
+        def build():
+            with app.app_context():
+                with unit_of_work(database, read_only=True, replica=True) as connection:
+                    result = self.category_list_logic(connection)
+
+                return jsonify({'message': 'success', 'result': result}).get_data()
+
+        return get_snapshot(CATEGORY_TREE_SNAPSHOT).get(build)
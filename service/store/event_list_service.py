@@ -1,4 +1,5 @@
 from model import EventListDao
+from utils.cache import EVENT_CACHE, get_cache
 
 
 class EventListService:
@@ -40,9 +41,28 @@ class EventListService:
 
             History:
                 2021-01-01(김민구): 초기 생성
+
+            Notes:
+                페이지(is_proceeding, offset, limit, cursor) 별로 EVENT_CACHE 에 보관한다.
+                진행 중인 기획전이 종료되면 진행 중 / 종료 목록이 모두 바뀌므로
+                가장 먼저 종료되는 기획전의 종료 시각에 만료시킨다.
         """
 
-        event_list = self.event_list_dao.get_event_banner_list(connection, data)
+        key = (
+            'banners',
+            int(data['is_proceeding']),
+            data['offset'],
+            data['limit'],
+            tuple(data['cursor']) if data.get('cursor') else None
+        )
+
+        def load():
+            return (
+                self.event_list_dao.get_event_banner_list(connection, data),
+                self.event_list_dao.get_next_event_end_seconds(connection)
+            )
+
+        event_list, _ = get_cache(EVENT_CACHE).get(key, load, expires_in=lambda value: value[1])
         return event_list
 
     def event_detail_information_logic(self, connection, event_id):
@@ -74,9 +94,13 @@ class EventListService:
             Notes:
                 해당 기획전의 정보를 반환
                 is_button으로 버튼 유무를 판별
+                EVENT_CACHE 에 보관하며 관리자 기획전 등록 / 수정 / 삭제 시 무효화된다.
         """
 
-        event_info = self.event_list_dao.get_event_information(connection, event_id)
+        event_info = get_cache(EVENT_CACHE).get(
+            ('information', event_id),
+            lambda: self.event_list_dao.get_event_information(connection, event_id)
+        )
         return event_info
 
     def event_detail_button_list_logic(self, connection, event_id):
@@ -106,9 +130,13 @@ class EventListService:
 
             Notes:
                 해당 기획전의 버튼 리스트를 반환
+                EVENT_CACHE 에 보관하며 관리자 기획전 등록 / 수정 / 삭제 시 무효화된다.
         """
 
-        event_button_list = self.event_list_dao.get_event_button(connection, event_id)
+        event_button_list = get_cache(EVENT_CACHE).get(
+            ('buttons', event_id),
+            lambda: self.event_list_dao.get_event_button(connection, event_id)
+        )
         return event_button_list
 
     def event_detail_list_logic(self, connection, data):
@@ -140,12 +168,15 @@ class EventListService:
                 2021-01-01(김민구): 초기 생성
 
             Notes:
-                먼저 해당 기획전에 버튼이 있는지 조회
+                먼저 해당 기획전에 버튼이 있는지 조회 (EVENT_CACHE)
                 해당 기획전에 버튼이 존재한다면 button_id 컬럼이 포함된 기획전 리스트
                 아니라면 button_id 컬럼이 없는 기획전 리스트
         """
 
-        is_button = self.event_list_dao.is_event_has_button(connection, data['event_id'])
+        is_button = get_cache(EVENT_CACHE).get(
+            ('is_button', data['event_id']),
+            lambda: self.event_list_dao.is_event_has_button(connection, data['event_id'])
+        )
 
         if is_button:
             event_button_products = self.event_list_dao.get_event_button_product_list(connection, data)
@@ -1,11 +1,19 @@
-from model import ProductListDao
+from model import ProductListDao, BookmarkDao, EventListDao
+from utils.autocomplete import suggest
+from utils.cache import EVENT_CACHE, PRODUCT_DETAIL_CACHE, get_cache
+from utils.const import PRODUCT_BATCH_MAX_SIZE
+from utils.custom_exceptions import ProductNotExist, TooManyProducts
+from utils.home_feed import get_home_feed
+from utils.search_index import search_product_ids
 
 
 class ProductListService:
     """ Business Layer
 
         Attributes:
-            product_dao : ProductListDao 클래스
+            product_dao  : ProductListDao 클래스
+            bookmark_dao : BookmarkDao 클래스
+            event_dao    : EventListDao 클래스
 
         Author: 김민구
 
@@ -16,6 +24,8 @@ class ProductListService:
 
     def __init__(self):
         self.product_dao = ProductListDao()
+        self.bookmark_dao = BookmarkDao()
+        self.event_dao = EventListDao()
 
     def product_list_logic(self, connection, data):
         """ 상품 리스트와 이벤트 배너 조회
@@ -52,15 +62,32 @@ class ProductListService:
             History:
                 2020-12-30(김민구): 초기 생성
                 2020-12-31(김민구): 에러 문구 변경 / 이벤트에 해당하는 상품리스트를 반환하는 작업으로 수정
+
+            Notes:
+                offset 번째 기획전은 EVENT_CACHE 에 보관하고 가장 먼저 종료되는 기획전의 종료 시각에 만료시킨다.
+                상품 리스트는 기획전별로 메모리에 만들어 둔 홈 피드에서 잘라 반환한다. (utils.home_feed)
         """
 
-        event = self.product_dao.get_event(connection, data)
+        def load_event():
+            return (
+                self.product_dao.get_event(connection, data),
+                self.event_dao.get_next_event_end_seconds(connection)
+            )
+
+        event, _ = get_cache(EVENT_CACHE).get(('home_event', data['offset']), load_event, expires_in=lambda value: value[1])
 
         if not event:
             return []
 
-        data['event_id'] = event['event_id']
-        product_list = self.product_dao.get_product_list(connection, data)
+        event_id = event['event_id']
+        product_list = get_home_feed().get(
+            event_id,
+            data['limit'],
+            lambda: self.product_dao.get_product_list(connection, {'event_id': event_id}),
+            lambda product_ids: self.product_dao.get_product_list(
+                connection, {'event_id': event_id, 'product_ids': product_ids}
+            )
+        )
         return {'event': event, 'product_list': product_list}
     
     def product_search_service(self, connection, data):
@@ -88,9 +115,40 @@ class ProductListService:
             History:
                 2020-12-31(김기용): 초기 생성
 
+            Notes:
+                상품명 / 셀러명 검색 색인(utils.search_index)으로 상품 id 를 먼저 찾고 해당 상품만 조회해 정렬한다.
+                색인을 사용할 수 없으면(한 글자 검색어, 너무 많은 후보, 색인 생성 중) 같은 조건(상품명 혹은 셀러명)의
+                LIKE 검색을 사용한다.
         """
-        return self.product_dao.get_search_products_dao(connection, data)
+        product_ids = search_product_ids(data['search'], self.product_dao.get_search_index_rows_dao)
+
+        if product_ids is None:
+            return self.product_dao.get_search_products_dao(connection, data)
+
+        if not product_ids:
+            return []
+
+        return self.product_dao.get_search_products_by_ids_dao(connection, {
+            'product_ids': tuple(product_ids),
+            'sort_type'  : data['sort_type'],
+            'limit'      : data['limit']
+        })
     
+    def product_autocomplete_service(self, database, data):
+        """ 검색어 자동완성 서비스
+
+            Args:
+                database : app.config['DB'] (자동완성 색인 생성에 사용)
+                data     : {'q': 입력한 접두어, 'limit': 최대 개수}
+
+            Returns:
+                [{'keyword': '데일리 니트', 'type': 'product'}, {'keyword': '니트하우스', 'type': 'seller'}]
+
+            Notes:
+                메모리의 자동완성 색인(utils.autocomplete)만 조회한다.
+        """
+        return suggest(database, data['q'], data['limit'], self.product_dao.get_autocomplete_rows_dao)
+
     def product_detail_service(self, connection, data):
         """ 상품상세정보 조회 서비스
 
@@ -106,18 +164,95 @@ class ProductListService:
             History:
                 2020-12-31(김기용): 초기 생성
                 2020-01-05(김기용): 누락된여러개의 size 와 color 값을 추가
+
+            Notes:
+                상세정보, 이미지, 컬러, 사이즈를 get_product_detail_bundle_dao 한 번의 쿼리로 조회한다.
+                유저별 값인 is_bookmarked 를 뺀 결과를 PRODUCT_DETAIL_CACHE 에 보관하고,
+                캐시된 상품은 로그인 유저의 북마크 여부만 조회해 합친다. (utils.cache)
         """
-        
-        try:
-
-            images = self.product_dao.get_product_image_dao(connection, data)
-            sizes = self.product_dao.get_product_size_dao(connection, data)
-            colors = self.product_dao.get_product_color_dao(connection, data)
-            product = self.product_dao.get_product_detail_dao(connection, data)
-            product['colors'] = colors
-            product['sizes'] = sizes
-            product['images'] = images
+
+        product_id = str(data['product_id'])
+        bookmark = dict()
+
+        def load():
+            product = self.product_dao.get_product_detail_bundle_dao(connection, data)
+
+            if product is None:
+                raise ProductNotExist('해당 상품이 존재하지 않습니다.')
+
+            bookmark['is_bookmarked'] = product.pop('is_bookmarked')
             return product
-        except KeyError('키 값이 일치하지 않습니다.'):
-            raise
-        return self.product_dao.get_product_detail_dao(connection, data)
+
+        # '01' 과 같은 형식은 무효화 key 와 맞지 않으므로 캐시하지 않는다.
+        if product_id.isdigit() and product_id == str(int(product_id)):
+            product = get_cache(PRODUCT_DETAIL_CACHE).get(int(product_id), load)
+        else:
+            product = load()
+
+        if 'is_bookmarked' not in bookmark:
+            bookmark['is_bookmarked'] = (
+                self.bookmark_dao.get_bookmark_exist(connection, data) if data.get('account_id') else 0
+            )
+
+        return dict(product, **bookmark)
+
+    def product_batch_detail_service(self, connection, data):
+        """ 여러 상품의 상세정보 조회 서비스
+
+            Args:
+                connection : 데이터베이스 연결 객체
+                data       : {'product_ids': 상품 id 리스트, 'account_id': 로그인 유저 id (비회원이면 없음)}
+
+            Returns:
+                product_detail_service 와 같은 형태의 리스트 (요청한 순서, 없는 상품은 제외)
+
+            Raises:
+                400, {'message': 'too_many_products', 'error_message': ...} : PRODUCT_BATCH_MAX_SIZE 초과
+
+            Notes:
+                PRODUCT_DETAIL_CACHE 에 없는 상품만 상세정보, 이미지, 컬러, 사이즈를 각각 IN 조건 쿼리 한 번으로 조회하고
+                product_id 기준 dict 로 합친다. 로그인 유저는 북마크 여부를 한 번 더 조회한다.
+        """
+
+        product_ids = list(dict.fromkeys(data['product_ids']))
+
+        if len(product_ids) > PRODUCT_BATCH_MAX_SIZE:
+            raise TooManyProducts('한 번에 {}개까지 조회할 수 있습니다.'.format(PRODUCT_BATCH_MAX_SIZE))
+
+        if not product_ids:
+            return []
+
+        def load_many(missing_ids):
+            params = {'product_ids': tuple(missing_ids)}
+            products = {
+                product['product_id']: dict(product, images=[], colors=[], sizes=[])
+                for product in self.product_dao.get_product_details_by_ids_dao(connection, params)
+            }
+
+            if not products:
+                return products
+
+            params = {'product_ids': tuple(products)}
+            for key, rows in (
+                ('images', self.product_dao.get_product_images_by_ids_dao(connection, params)),
+                ('colors', self.product_dao.get_product_colors_by_ids_dao(connection, params)),
+                ('sizes', self.product_dao.get_product_sizes_by_ids_dao(connection, params))
+            ):
+                for row in rows:
+                    products[row.pop('product_id')][key].append(row)
+
+            return products
+
+        products = get_cache(PRODUCT_DETAIL_CACHE).get_many(product_ids, load_many)
+
+        bookmarked = set()
+        if data.get('account_id') and products:
+            bookmarked = self.bookmark_dao.get_bookmarked_product_ids(
+                connection,
+                {'account_id': data['account_id'], 'product_ids': tuple(products)}
+            )
+
+        return [
+            dict(products[product_id], is_bookmarked=int(product_id in bookmarked))
+            for product_id in product_ids if product_id in products
+        ]
@@ -1,12 +1,23 @@
+import datetime
+import json
 import traceback
-from utils.custom_exceptions import CustomerPermissionDenied, CheckoutDenied
+
+from flask import current_app
+
+from model import StockReservationDao, VolumeCounterDao
+from utils.const import STOCK_RESERVATION_TTL, STOCK_RESERVATION_RELEASE_BATCH_SIZE, IDEMPOTENCY_KEY_TTL
+from utils.custom_exceptions import CustomerPermissionDenied, CartItemNotExist, IdempotencyKeyMismatch
+from utils.sequence import ORDER_NUMBER_SEQUENCE, next_daily_value
+from utils.volume_counter import SALES_VOLUME, volume_deltas
 
 
 class StoreOrderService:
     """ Business Layer
 
         Attributes:
-            store_order_dao: StoreOrderDao 클래스
+            store_order_dao      : StoreOrderDao 클래스
+            stock_reservation_dao: StockReservationDao 클래스
+            volume_counter_dao   : VolumeCounterDao 클래스
 
         Author: 고수희
 
@@ -16,6 +27,8 @@ class StoreOrderService:
 
     def __init__(self, store_order_dao):
         self.store_order_dao = store_order_dao
+        self.stock_reservation_dao = StockReservationDao()
+        self.volume_counter_dao = VolumeCounterDao()
 
     def get_store_order_service(self, connection, data):
         """ GET 메소드: 결제 정보 조회
@@ -71,8 +84,12 @@ class StoreOrderService:
         Raises:
             400, {'message': 'key error',
             'errorMessage': 'key_error'} : 잘못 입력된 키값
-            400, {'message': 'product does not exist',
-            'errorMessage': 'product_does_not_exist'} : 상품을 조회할 수 없음
+            400, {'message': 'cart item does not exist',
+            'errorMessage': 'cart_item_does_not_exist'} : 주문할 장바구니 상품이 없음
+            400, {'message': 'Not Enough Product',
+            'errorMessage': 'Not as many in stock as quantity'} : 재고가 주문량보다 적음
+            400, {'message': 'checkout denied',
+            'errorMessage': 'unable_to_checkout'} : 상품이 품절됨
             400, {'message': 'delivery memo create denied',
             'errorMessage': 'unable_to_create'} : 배송 정보 추가 실패
             400, {'message': 'order create denied',
@@ -92,6 +109,10 @@ class StoreOrderService:
 
         History:
             2020-12-30(고수희): 초기 생성
+
+        Notes:
+            장바구니 상품 수와 관계없이 같은 수의 쿼리로 처리한다.
+            (주문 상품 / 판매량은 multi-row INSERT, 이력 / 재고 / 장바구니는 order_id 기준 한 문장씩)
         """
 
         try:
@@ -99,39 +120,65 @@ class StoreOrderService:
             if data['user_permission'] != 3:
                 raise CustomerPermissionDenied('customer_permission_denied')
 
-            # 상품 구매 가능 여부 체크
-            if data['sold_out'] is True:
-                raise CheckoutDenied('unable_to_checkout')
-
-            # 상품 품절 여부 체크
-            self.store_order_dao.order_product_soldout_dao(connection, data)
+            # 주문할 장바구니 상품 조회 및 품절 여부 체크 (cart_ids 가 None 이면 장바구니 전체)
+            items = self.store_order_dao.get_order_cart_items_dao(connection, data)
 
             # 배송 정보 추가 (배송 메모가 직접 입력일 경우)
             if data['delivery_memo_type_id'] == 5:
                 custom_memo = self.store_order_dao.post_delivery_type_dao(connection, data)
                 data['delivery_memo_type_id'] = custom_memo
 
-            # 주문번호 채번을 위한 당일 주문량 파악
-            today = self.store_order_dao.get_today_order_number_dao(connection)
-            data.update(today)
+            # 주문번호 채번 (날짜 + 당일 순번 6자리 + 주문 상품 순번 3자리, utils.sequence)
+            day, sequence = next_daily_value(ORDER_NUMBER_SEQUENCE, self.store_order_dao.reserve_sequence_block_dao)
+            data['order_number'] = '{}{:06d}{:03d}'.format(day, sequence, 0)
+
+            # 총 결제 금액, 할인가가 있으면 할인가로 계산 (CartItemDao.get_cart_item_dao 와 동일)
+            data['total_price'] = sum(
+                item['discounted_price'] if item['discounted_price'] > 0 else item['original_price']
+                for item in items
+            )
 
             # 주문 정보 추가 (주문자 정보, 배송지 정보, 기타 배송 정보)
             order = self.store_order_dao.post_store_order_dao(connection, data)
             data['order_id'] = order
             data['order_item_status_type_id'] = 1
+            data['item_count'] = len(items)
+
+            for index, item in enumerate(items, 1):
+                item['order_id'] = order
+                item['order_detail_number'] = 'B{}{:06d}{:03d}'.format(day, sequence, index)
+                item['order_item_status_type_id'] = data['order_item_status_type_id']
 
             # 주문 상품 추가 (주문 상품에 대한 정보)
-            order_item = self.store_order_dao.post_store_order_item_dao(connection, data)
-            data['order_item_id'] = order_item
+            self.store_order_dao.post_store_order_items_dao(connection, {'items': items})
 
             # 주문 상품 정보 이력 추가
-            self.store_order_dao.post_store_order_item_history_dao(connection, data)
+            self.store_order_dao.post_store_order_item_histories_dao(connection, data)
+
+            # 주문한 상품 수량 만큼 재고 감소 처리 (재고 예약으로 이미 차감한 수량 제외)
+            quantities = {}
+            for item in items:
+                quantities[item['stock_id']] = (quantities.get(item['stock_id'], 0)
+                                                + item['quantity'] - item['reserved_quantity'])
 
-            # 주문한 상품 수량 만큼 재고 감소 처리
-            self.store_order_dao.patch_product_remain_dao(connection, data)
+            data['stock_count'] = len([quantity for quantity in quantities.values() if quantity != 0])
+            data['product_ids'] = {item['product_id'] for item in items}
+            self.store_order_dao.patch_product_remains_dao(connection, data)
+
+            # 상품별 판매량 증가 (슬롯에 누적, flask fold-volume-counters 에서 product_sales_volumes 에 반영)
+            sales = {}
+            for item in items:
+                sales[item['product_id']] = sales.get(item['product_id'], 0) + item['quantity']
+
+            self.volume_counter_dao.add_volume_deltas_dao(connection, {'deltas': volume_deltas(SALES_VOLUME, sales)})
+
+            # 주문에 사용한 재고 예약 삭제
+            data['reserved_count'] = len([item for item in items if item['reserved_quantity']])
+            if data['reserved_count']:
+                self.store_order_dao.delete_order_reservations_dao(connection, data)
 
             # 장바구니 상품 논리 삭제 처리
-            self.store_order_dao.patch_is_delete_cart_item_dao(connection, data)
+            self.store_order_dao.patch_is_delete_cart_items_dao(connection, data)
 
             # 주문자 정보가 없으면 주문자 정보 추가, 있으면 수정
             self.store_order_dao.patch_customer_information_dao(connection, data)
@@ -145,3 +192,215 @@ class StoreOrderService:
         except KeyError:
             traceback.print_exc()
             raise KeyError('key_error')
+
+    def post_idempotent_order_service(self, connection, data):
+        """ POST 메소드: Idempotency-Key 를 사용한 결제 추가
+
+        Args:
+            connection: 데이터베이스 연결 객체
+            data      : post_order_service 의 data 와 {'idempotency_key': 키 (None 이면 사용하지 않음),
+                        'request_hash': 요청 body 의 sha256}
+
+        Returns:
+            {'status_code': 응답 status code, 'result': 응답 result, 'replayed': 저장된 응답이면 True}
+
+        Raises:
+            422, {'message': 'idempotency_key_reused',
+            'errorMessage': 'idempotency_key_reused'} : 같은 키로 다른 요청을 보냄
+            post_order_service 의 예외
+
+        Notes:
+            키 선점, 주문, 응답 저장이 하나의 트랜잭션이므로 주문이 실패하면 키도 남지 않는다.
+            이미 처리한 키는 post_order_service 를 실행하지 않고 저장된 응답을 반환한다. (쿼리 2번)
+        """
+
+        if data['idempotency_key'] is None:
+            order_id = self.post_order_service(connection, data)
+            return {'status_code': 201, 'result': {'order_id': order_id}, 'replayed': False}
+
+        if not self.store_order_dao.post_idempotency_key_dao(connection, data):
+            stored = self.store_order_dao.get_idempotency_key_dao(connection, data)
+
+            if stored['request_hash'] != data['request_hash']:
+                raise IdempotencyKeyMismatch('idempotency_key_reused')
+
+            return {'status_code': stored['status_code'], 'result': json.loads(stored['response']), 'replayed': True}
+
+        result = {'order_id': self.post_order_service(connection, data)}
+
+        self.store_order_dao.patch_idempotency_key_dao(connection, {
+            'user_id': data['user_id'],
+            'idempotency_key': data['idempotency_key'],
+            'order_id': result['order_id'],
+            'status_code': 201,
+            'response': json.dumps(result, separators=(',', ':'))
+        })
+
+        return {'status_code': 201, 'result': result, 'replayed': False}
+
+    def purge_expired_idempotency_keys_service(self, connection, data):
+        """ 보관 기간(IDEMPOTENCY_KEY_TTL)이 지난 Idempotency-Key 삭제 (flask purge-idempotency-keys)
+
+        Args:
+            connection: 데이터베이스 연결 객체
+            data      : {'limit': 한 번에 삭제할 최대 키 수}
+
+        Returns:
+            삭제한 키 수 (limit 과 같으면 남은 키가 있을 수 있다.)
+        """
+
+        return self.store_order_dao.delete_expired_idempotency_keys_dao(connection, {
+            'ttl': current_app.config.get('IDEMPOTENCY_KEY_TTL', IDEMPOTENCY_KEY_TTL),
+            'limit': data['limit']
+        })
+
+    def post_stock_reservation_service(self, connection, data):
+        """ POST 메소드: 결제 진행 중인 장바구니 상품의 재고 예약
+
+        Args:
+            connection: 데이터베이스 연결 객체
+            data      : {'user_id', 'user_permission', 'cart_ids': 장바구니 상품 id tuple (None 이면 전체)}
+
+        Returns:
+            {'cart_ids': 예약한 장바구니 상품 id 리스트, 'expires_at': 예약 만료 시각}
+
+        Raises:
+            400, {'message': 'cart item does not exist',
+            'errorMessage': 'cart_item_does_not_exist'} : 예약할 장바구니 상품이 없음
+            400, {'message': 'Not Enough Product',
+            'errorMessage': 'Not as many in stock as quantity'} : 재고가 예약할 수량보다 적음
+            403, {'message': 'customer permissions denied',
+            'errorMessage': 'customer_permission_denied'} : 사용자 권한이 없음
+            500, {'message: server_error',
+            'errorMessage': 'server_error'} :서버 에러 발생
+
+        Notes:
+            예약하지 않은 장바구니 상품만 재고를 차감하고, 이미 예약한 상품은 만료 시각만 연장한다.
+            예약한 재고는 주문(post_order_service)에 사용되거나, 해제하거나, 만료되면 되돌려진다.
+        """
+
+        try:
+            # 사용자 권한 체크
+            if data['user_permission'] != 3:
+                raise CustomerPermissionDenied('customer_permission_denied')
+
+            items = self.stock_reservation_dao.get_reservation_cart_items_dao(connection, data)
+            if not items or (data['cart_ids'] is not None and len(items) != len(data['cart_ids'])):
+                raise CartItemNotExist('cart_item_does_not_exist')
+
+            # 새로 예약하는 상품의 재고 차감 (재고별 수량 합산, 한 문장으로 처리)
+            quantities = {}
+            product_ids = set()
+            for item in items:
+                if item['reserved_quantity'] is None:
+                    quantities[item['stock_id']] = quantities.get(item['stock_id'], 0) + item['quantity']
+                    product_ids.add(item['product_id'])
+
+            if quantities:
+                self.stock_reservation_dao.patch_stock_remains_dao(
+                    connection,
+                    {'quantities': quantities, 'product_ids': product_ids}
+                )
+
+            ttl = current_app.config.get('STOCK_RESERVATION_TTL', STOCK_RESERVATION_TTL)
+            expires_at = datetime.datetime.now().replace(microsecond=0) + datetime.timedelta(seconds=ttl)
+
+            reservations = [{
+                'cart_id': item['cart_id'],
+                'stock_id': item['stock_id'],
+                'user_id': data['user_id'],
+                'quantity': item['quantity'] if item['reserved_quantity'] is None else item['reserved_quantity'],
+                'expires_at': expires_at
+            } for item in items]
+
+            self.stock_reservation_dao.post_reservations_dao(connection, {'reservations': reservations})
+
+            return {'cart_ids': [item['cart_id'] for item in items], 'expires_at': expires_at}
+
+        except CustomerPermissionDenied as e:
+            traceback.print_exc()
+            raise e
+
+        except KeyError:
+            traceback.print_exc()
+            raise KeyError('key_error')
+
+    def delete_stock_reservation_service(self, connection, data):
+        """ DELETE 메소드: 재고 예약 해제 (결제 취소)
+
+        Args:
+            connection: 데이터베이스 연결 객체
+            data      : {'user_id', 'user_permission', 'cart_ids': 장바구니 상품 id tuple (None 이면 전체)}
+
+        Returns:
+            해제한 예약 수
+
+        Raises:
+            403, {'message': 'customer permissions denied',
+            'errorMessage': 'customer_permission_denied'} : 사용자 권한이 없음
+            500, {'message: server_error',
+            'errorMessage': 'server_error'} :서버 에러 발생
+        """
+
+        try:
+            # 사용자 권한 체크
+            if data['user_permission'] != 3:
+                raise CustomerPermissionDenied('customer_permission_denied')
+
+            reservations = self.stock_reservation_dao.get_reservations_dao(connection, {
+                'user_id': data['user_id'],
+                'cart_ids': data['cart_ids'],
+                'expired_before': None,
+                'limit': STOCK_RESERVATION_RELEASE_BATCH_SIZE
+            })
+
+            return self._release_stock_reservations(connection, reservations)
+
+        except CustomerPermissionDenied as e:
+            traceback.print_exc()
+            raise e
+
+        except KeyError:
+            traceback.print_exc()
+            raise KeyError('key_error')
+
+    def release_expired_stock_reservations_service(self, connection, data):
+        """ 만료된 재고 예약 일괄 해제 (flask release-stock-reservations)
+
+        Args:
+            connection: 데이터베이스 연결 객체
+            data      : {'now': 기준 시각, 'limit': 한 번에 해제할 최대 예약 수}
+
+        Returns:
+            해제한 예약 수 (limit 과 같으면 남은 예약이 있을 수 있다.)
+        """
+
+        reservations = self.stock_reservation_dao.get_reservations_dao(connection, {
+            'user_id': None,
+            'cart_ids': None,
+            'expired_before': data['now'],
+            'limit': data['limit']
+        })
+
+        return self._release_stock_reservations(connection, reservations)
+
+    def _release_stock_reservations(self, connection, reservations):
+        """ 예약한 수량을 재고에 되돌리고 예약 삭제 (재고 / 예약 모두 한 문장씩 처리) """
+
+        if not reservations:
+            return 0
+
+        quantities = {}
+        for reservation in reservations:
+            quantities[reservation['stock_id']] = quantities.get(reservation['stock_id'], 0) - reservation['quantity']
+
+        self.stock_reservation_dao.patch_stock_remains_dao(connection, {
+            'quantities': quantities,
+            'product_ids': {reservation['product_id'] for reservation in reservations}
+        })
+
+        self.stock_reservation_dao.delete_reservations_dao(connection, {
+            'reservation_ids': tuple(reservation['id'] for reservation in reservations)
+        })
+
+        return len(reservations)
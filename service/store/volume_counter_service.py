@@ -0,0 +1,52 @@
+from model import VolumeCounterDao
+
+
+class VolumeCounterService:
+    """ Business Layer
+
+        Attributes:
+            volume_counter_dao : VolumeCounterDao 클래스
+    """
+
+    def __init__(self):
+        self.volume_counter_dao = VolumeCounterDao()
+
+    def fold_volume_counters_service(self, connection, data):
+        """ 슬롯에 누적된 판매량 / 북마크 수를 집계 컬럼에 반영 (flask fold-volume-counters)
+
+        Args:
+            connection: 데이터베이스 연결 객체
+            data      : {'limit': 한 번에 반영할 최대 상품 수}
+
+        Returns:
+            반영한 상품 수 (limit 과 같으면 남은 슬롯이 있을 수 있다.)
+
+        Notes:
+            상품을 먼저 고른 뒤 그 상품의 슬롯을 모두 잠그고 합산하므로, 한 상품의 증감이 여러 번에 나누어 반영되지 않는다.
+            (나누어 반영하면 -1 이 먼저 반영될 때 0 으로 맞춰져 이후 +1 만큼 어긋난다.)
+            워커의 상품 상세 캐시 / 홈 피드는 보관 시간(PRODUCT_DETAIL_CACHE_TTL, HOME_FEED_TTL)이 지나면 반영된다.
+        """
+
+        products = self.volume_counter_dao.get_volume_products_dao(connection, data)
+
+        if not products:
+            return 0
+
+        shards = self.volume_counter_dao.get_volume_shards_dao(connection, {'products': tuple(products)})
+
+        deltas = {}
+        for shard in shards:
+            counts = deltas.setdefault(shard['name'], {})
+            counts[shard['product_id']] = counts.get(shard['product_id'], 0) + shard['delta']
+
+        for name, counts in deltas.items():
+            counts = {product_id: delta for product_id, delta in counts.items() if delta}
+            if counts:
+                self.volume_counter_dao.patch_volumes_dao(connection, {'name': name, 'deltas': counts})
+
+        if shards:
+            self.volume_counter_dao.delete_volume_shards_dao(connection, {
+                'shards': tuple((shard['name'], shard['product_id'], shard['slot']) for shard in shards)
+            })
+
+        return len(products)
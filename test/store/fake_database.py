@@ -0,0 +1,95 @@
+""" 데이터베이스 없이 앱을 생성하기 위한 테스트 도구
+
+커넥션 풀이 FakeConnection 을 만들도록 utils.connection._connect 를 바꾸고,
+다른 테스트의 커넥션 풀과 섞이지 않도록 utils.connection._pools 를 비운 상태에서 앱을 생성한다.
+
+기본적인 사용 예시:
+    def setUp(self):
+        self.events = []
+        self.app = create_test_app(self, lambda database: FakeConnection(self.events))
+"""
+from unittest import mock
+
+import jwt
+
+import config
+from app import create_app
+
+
+class FakeConnection:
+    """ commit / rollback 호출만 기록하는 pymysql connection
+
+        Args:
+            events      : cursor / commit / rollback 호출을 기록할 list (None 이면 기록하지 않음)
+            transaction : commit() / rollback() 을 전달받을 객체 (메모리 저장소의 트랜잭션 흉내)
+
+        Notes:
+            커넥션 풀은 반납할 때 커밋되지 않은 트랜잭션을 한 번 더 rollback 한다.
+    """
+
+    def __init__(self, events=None, transaction=None):
+        self.events = events
+        self.transaction = transaction
+        self.open = True
+        self.autocommit_mode = False
+
+    def _record(self, event):
+        if self.events is not None:
+            self.events.append(event)
+
+    def ping(self, reconnect=False):
+        pass
+
+    def get_autocommit(self):
+        return self.autocommit_mode
+
+    def autocommit(self, value):
+        self.autocommit_mode = value
+
+    def cursor(self, *args, **kwargs):
+        self._record('cursor')
+        return mock.MagicMock()
+
+    def commit(self):
+        self._record('commit')
+        if self.transaction is not None:
+            self.transaction.commit()
+
+    def rollback(self):
+        self._record('rollback')
+        if self.transaction is not None:
+            self.transaction.rollback()
+
+    def close(self):
+        self.open = False
+
+
+def create_test_app(test_case, connect=None):
+    """ 실제 데이터베이스에 연결하지 않는 앱 생성
+
+        Args:
+            test_case : TestCase (테스트가 끝나면 patch 를 되돌린다.)
+            connect   : connect(database) -> 커넥션 풀이 사용할 connection (기본 FakeConnection())
+
+        Returns:
+            create_app(config.test_config) 로 생성한 앱
+    """
+
+    patchers = [
+        mock.patch.dict('utils.connection._pools', clear=True),
+        mock.patch('utils.connection._connect', side_effect=connect or (lambda database: FakeConnection())),
+    ]
+    for patcher in patchers:
+        patcher.start()
+        test_case.addCleanup(patcher.stop)
+
+    return create_app(config.test_config)
+
+
+def customer_token(app, account_id=7):
+    """ 일반 사용자(permission_type_id=3) access token """
+
+    token = jwt.encode({'username': 'customer', 'account_id': account_id, 'permission_type_id': 3},
+                       app.config['JWT_SECRET_KEY'], app.config['JWT_ALGORITHM'])
+
+    return token.decode() if isinstance(token, bytes) else token
@@ -0,0 +1,142 @@
+from unittest import mock, TestCase
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+
+from fake_database import FakeConnection, create_test_app, customer_token
+from model import StoreOrderDao
+from service import StoreOrderService
+from utils.custom_exceptions import NotEnoughProduct
+
+
+class MemoryIdempotencyKeys:
+    """ idempotency_keys 테이블을 메모리로 흉내 낸 저장소
+
+        Attributes:
+            committed : 커밋된 키 {(user_id, idempotency_key): 행}
+            pending   : 아직 커밋되지 않은 키 (rollback 하면 사라진다)
+    """
+
+    def __init__(self):
+        self.committed = {}
+        self.pending = {}
+
+    def rows(self):
+        return {**self.committed, **self.pending}
+
+    def commit(self):
+        self.committed.update(self.pending)
+        self.pending.clear()
+
+    def rollback(self):
+        self.pending.clear()
+
+    def post_idempotency_key_dao(self, connection, data):
+        connection.cursor()
+        key = (data['user_id'], data['idempotency_key'])
+        if key in self.rows():
+            return False
+
+        self.pending[key] = {'request_hash': data['request_hash'], 'order_id': None,
+                             'status_code': None, 'response': None}
+        return True
+
+    def get_idempotency_key_dao(self, connection, data):
+        connection.cursor()
+        return dict(self.rows()[(data['user_id'], data['idempotency_key'])])
+
+    def patch_idempotency_key_dao(self, connection, data):
+        connection.cursor()
+        key = (data['user_id'], data['idempotency_key'])
+        self.pending[key] = {**self.rows()[key], 'order_id': data['order_id'],
+                             'status_code': data['status_code'], 'response': data['response']}
+
+
+class TestIdempotencyKey(TestCase):
+    """ Test
+
+        Target: POST /checkout (Idempotency-Key)
+
+        Notes:
+            StoreOrderDao 의 Idempotency-Key 메소드를 MemoryIdempotencyKeys 로, 주문 처리(post_order_service)를 mock 으로 바꾼다.
+            FakeConnection 의 commit / rollback 이 MemoryIdempotencyKeys 에 전달된다.
+            키 선점과 주문이 같은 트랜잭션이므로 주문이 실패하면 pending 상태의 키도 rollback 된다.
+    """
+
+    body = {
+        'cartIds': [1],
+        'senderName': '보내는사람',
+        'senderPhone': '01012345678',
+        'senderEmail': 'sender@brandi.com',
+        'recipientName': '받는사람',
+        'recipientPhone': '01012345678',
+        'address1': '서울시',
+        'address2': '강남구',
+        'postNumber': '12345678',
+        'deliveryId': 1,
+    }
+
+    def setUp(self):
+        self.keys = MemoryIdempotencyKeys()
+        self.post_order = mock.MagicMock(return_value=11)
+
+        patchers = [mock.patch.object(StoreOrderService, 'post_order_service', self.post_order)]
+        for name in ('post_idempotency_key_dao', 'get_idempotency_key_dao', 'patch_idempotency_key_dao'):
+            patchers.append(mock.patch.object(StoreOrderDao, name, side_effect=getattr(self.keys, name)))
+
+        for patcher in patchers:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+        self.app = create_test_app(self, lambda database: FakeConnection(transaction=self.keys))
+        self.client = self.app.test_client()
+
+        self.headers = {'Authorization': customer_token(self.app), 'Idempotency-Key': 'order-7-abc'}
+
+    def test_replay_returns_stored_response(self):
+        """ 같은 키로 같은 요청을 다시 보내면 주문하지 않고 저장된 응답을 Idempotent-Replayed 헤더와 함께 반환한다. """
+
+        first = self.client.post('/checkout', json=self.body, headers=self.headers)
+
+        self.assertEqual(first.status_code, 201)
+        self.assertIsNone(first.headers.get('Idempotent-Replayed'))
+        self.assertEqual(first.get_json()['result'], {'order_id': 11})
+        self.assertEqual(self.keys.committed[(7, 'order-7-abc')]['order_id'], 11)
+
+        # key 순서가 달라도 같은 요청이다.
+        replay = self.client.post('/checkout', json=dict(reversed(list(self.body.items()))), headers=self.headers)
+
+        self.assertEqual(replay.status_code, 201)
+        self.assertEqual(replay.headers.get('Idempotent-Replayed'), 'true')
+        self.assertEqual(replay.get_json()['result'], {'order_id': 11})
+        self.assertEqual(self.post_order.call_count, 1)
+
+    def test_different_body_returns_422(self):
+        """ 같은 키로 다른 요청을 보내면 422 를 반환하고 주문하지 않는다. """
+
+        self.client.post('/checkout', json=self.body, headers=self.headers)
+
+        response = self.client.post('/checkout', json={**self.body, 'cartIds': [2]}, headers=self.headers)
+
+        self.assertEqual(response.status_code, 422)
+        self.assertEqual(response.get_json()['message'], 'idempotency_key_reused')
+        self.assertEqual(self.post_order.call_count, 1)
+
+    def test_rolled_back_order_leaves_no_key(self):
+        """ 주문이 실패해 rollback 되면 키가 남지 않으므로 같은 키로 다시 주문할 수 있다. """
+
+        self.post_order.side_effect = NotEnoughProduct('not_enough_product')
+
+        failed = self.client.post('/checkout', json=self.body, headers=self.headers)
+
+        self.assertEqual(failed.status_code, 400)
+        self.assertEqual(self.keys.rows(), {})
+
+        self.post_order.side_effect = None
+        retry = self.client.post('/checkout', json=self.body, headers=self.headers)
+
+        self.assertEqual(retry.status_code, 201)
+        self.assertIsNone(retry.headers.get('Idempotent-Replayed'))
+        self.assertEqual(self.post_order.call_count, 2)
+        self.assertIn((7, 'order-7-abc'), self.keys.committed)
@@ -0,0 +1,190 @@
+import datetime
+from unittest import mock, TestCase
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+
+from fake_database import create_test_app
+from model import StoreOrderDao
+from service import StoreOrderService
+from utils.custom_exceptions import ProductRemainUpdateDenied
+
+
+class MemoryStockReservationDao:
+    """ stocks / cart_items / stock_reservations 테이블을 메모리로 흉내 낸 StockReservationDao
+
+        Attributes:
+            remains      : {stock_id: 재고}
+            cart_items   : {cart_id: {'cart_id', 'user_id', 'product_id', 'stock_id', 'quantity'}}
+            reservations : {cart_id: {'id', 'cart_id', 'user_id', 'stock_id', 'quantity', 'expires_at'}}
+    """
+
+    def __init__(self, remains, cart_items):
+        self.remains = dict(remains)
+        self.cart_items = {item['cart_id']: item for item in cart_items}
+        self.reservations = {}
+        self.next_id = 1
+
+    def get_reservation_cart_items_dao(self, connection, data):
+        return [
+            {**item, 'reserved_quantity': self.reservations[cart_id]['quantity'] if cart_id in self.reservations else None}
+            for cart_id, item in sorted(self.cart_items.items())
+            if item['user_id'] == data['user_id'] and (data['cart_ids'] is None or cart_id in data['cart_ids'])
+        ]
+
+    def patch_stock_remains_dao(self, connection, data):
+        for stock_id, quantity in data['quantities'].items():
+            self.remains[stock_id] -= quantity
+
+    def post_reservations_dao(self, connection, data):
+        for reservation in data['reservations']:
+            stored = self.reservations.get(reservation['cart_id'])
+            if stored is None:
+                stored = self.reservations[reservation['cart_id']] = {'id': self.next_id}
+                self.next_id += 1
+            stored.update(reservation)
+
+    def get_reservations_dao(self, connection, data):
+        return [
+            {'id': reservation['id'], 'stock_id': reservation['stock_id'], 'quantity': reservation['quantity'],
+             'product_id': self.cart_items[cart_id]['product_id']}
+            for cart_id, reservation in sorted(self.reservations.items())
+            if (data['user_id'] is None or reservation['user_id'] == data['user_id'])
+            and (data['cart_ids'] is None or cart_id in data['cart_ids'])
+            and (data['expired_before'] is None or reservation['expires_at'] <= data['expired_before'])
+        ][:data['limit']]
+
+    def delete_reservations_dao(self, connection, data):
+        self.reservations = {
+            cart_id: reservation for cart_id, reservation in self.reservations.items()
+            if reservation['id'] not in data['reservation_ids']
+        }
+
+
+class TestStockReservation(TestCase):
+    """ Test
+
+        Target: store/store_order_service (재고 예약), StoreOrderDao.patch_product_remains_dao
+
+        Notes:
+            StockReservationDao 는 MemoryStockReservationDao 로, StoreOrderDao 는 MagicMock 으로 바꾼다.
+    """
+
+    def setUp(self):
+        patcher = mock.patch('service.store.store_order_service.next_daily_value', return_value=('20210105', 7))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.app = create_test_app(self)
+
+        self.dao = MemoryStockReservationDao(
+            remains={100: 5, 110: 5},
+            cart_items=[
+                {'cart_id': 1, 'user_id': 7, 'product_id': 10, 'stock_id': 100, 'quantity': 2},
+                {'cart_id': 2, 'user_id': 7, 'product_id': 11, 'stock_id': 110, 'quantity': 1},
+                {'cart_id': 3, 'user_id': 8, 'product_id': 11, 'stock_id': 110, 'quantity': 3},
+            ]
+        )
+        self.store_order_dao = mock.MagicMock()
+        self.service = StoreOrderService(self.store_order_dao)
+        self.service.stock_reservation_dao = self.dao
+        self.service.volume_counter_dao = mock.MagicMock()
+
+    def reserve(self, user_id, cart_ids=None):
+        with self.app.app_context():
+            return self.service.post_stock_reservation_service(
+                None, {'user_id': user_id, 'user_permission': 3, 'cart_ids': cart_ids}
+            )
+
+    def test_reserve_twice_extends_expiry(self):
+        """ 이미 예약한 상품을 다시 예약하면 재고는 차감하지 않고 만료 시각만 연장한다. """
+
+        with mock.patch('service.store.store_order_service.datetime') as clock:
+            clock.timedelta = datetime.timedelta
+            clock.datetime.now.return_value = datetime.datetime(2021, 1, 5, 12, 0, 0)
+            first = self.reserve(7)
+
+            clock.datetime.now.return_value = datetime.datetime(2021, 1, 5, 12, 5, 0)
+            second = self.reserve(7)
+
+        self.assertEqual(first['cart_ids'], [1, 2])
+        self.assertGreater(second['expires_at'], first['expires_at'])
+        self.assertEqual(self.dao.remains, {100: 3, 110: 4})
+        self.assertEqual({cart_id: reservation['quantity'] for cart_id, reservation in self.dao.reservations.items()},
+                         {1: 2, 2: 1})
+        self.assertTrue(all(reservation['expires_at'] == second['expires_at']
+                            for reservation in self.dao.reservations.values()))
+
+    def test_release_restores_remain(self):
+        """ 예약을 해제하면 예약한 수량이 재고에 되돌려지고 예약이 삭제된다. """
+
+        self.reserve(7)
+        self.reserve(8)
+
+        with self.app.app_context():
+            released = self.service.delete_stock_reservation_service(
+                None, {'user_id': 7, 'user_permission': 3, 'cart_ids': None}
+            )
+
+        self.assertEqual(released, 2)
+        self.assertEqual(self.dao.remains, {100: 5, 110: 2})
+        self.assertEqual(list(self.dao.reservations), [3])
+
+    def test_release_expired(self):
+        """ 만료 시각이 지난 예약만 해제된다. """
+
+        with mock.patch('service.store.store_order_service.datetime') as clock:
+            clock.timedelta = datetime.timedelta
+            clock.datetime.now.return_value = datetime.datetime(2021, 1, 5, 12, 0, 0)
+            expired = self.reserve(7)
+
+            clock.datetime.now.return_value = datetime.datetime(2021, 1, 5, 13, 0, 0)
+            self.reserve(8)
+
+        with self.app.app_context():
+            released = self.service.release_expired_stock_reservations_service(
+                None, {'now': expired['expires_at'], 'limit': 100}
+            )
+
+        self.assertEqual(released, 2)
+        self.assertEqual(self.dao.remains, {100: 5, 110: 2})
+        self.assertEqual(list(self.dao.reservations), [3])
+
+    def test_checkout_nets_out_reserved_quantity(self):
+        """ 결제 시 예약으로 이미 차감한 수량은 다시 차감하지 않고, 주문에 사용한 예약을 삭제한다. """
+
+        self.store_order_dao.post_store_order_dao.return_value = 30
+        self.store_order_dao.get_order_cart_items_dao.return_value = [
+            {'cart_id': 1, 'product_id': 10, 'stock_id': 100, 'quantity': 2, 'sale': 0,
+             'original_price': 10000, 'discounted_price': 0, 'reserved_quantity': 2},
+            {'cart_id': 2, 'product_id': 11, 'stock_id': 110, 'quantity': 3, 'sale': 0,
+             'original_price': 5000, 'discounted_price': 0, 'reserved_quantity': 1},
+        ]
+        data = {'user_id': 7, 'user_permission': 3, 'cart_ids': (1, 2), 'delivery_memo_type_id': 1}
+
+        with self.app.app_context():
+            self.service.post_order_service(None, data)
+
+        # 재고 100 은 모두 예약으로 차감되었으므로 재고 110 만 추가로 차감한다.
+        self.assertEqual(data['stock_count'], 1)
+        self.assertEqual(data['reserved_count'], 2)
+        self.store_order_dao.delete_order_reservations_dao.assert_called_once()
+
+    def test_remains_update_checks_net_stock_count(self):
+        """ patch_product_remains_dao 는 예약 수량을 뺀 재고 수만큼 차감되어야 성공한다. """
+
+        dao = StoreOrderDao()
+        connection = mock.MagicMock()
+        cursor = connection.cursor.return_value.__enter__.return_value
+
+        cursor.execute.return_value = 0
+        dao.patch_product_remains_dao(connection, {'order_id': 30, 'stock_count': 0, 'product_ids': set()})
+
+        sql = ' '.join(cursor.execute.call_args[0][0].split())
+        self.assertIn('SUM(oi.quantity - COALESCE(sr.quantity, 0)) AS net_quantity', sql)
+        self.assertIn('WHERE st.remain >= oi.net_quantity', sql)
+
+        # 다른 요청이 재고를 가져가 차감한 row 수가 다르면 실패한다.
+        with self.assertRaises(ProductRemainUpdateDenied):
+            dao.patch_product_remains_dao(connection, {'order_id': 30, 'stock_count': 1, 'product_ids': set()})
@@ -0,0 +1,157 @@
+from unittest import mock, TestCase
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+
+from fake_database import create_test_app, customer_token
+from model import StoreOrderDao
+from service import StoreOrderService
+from utils.custom_exceptions import NotEnoughProduct
+
+
+def cart_item(cart_id, product_id, stock_id, quantity, original_price, discounted_price=0, reserved_quantity=0):
+    return {
+        'cart_id': cart_id,
+        'product_id': product_id,
+        'stock_id': stock_id,
+        'quantity': quantity,
+        'sale': 0,
+        'original_price': original_price,
+        'discounted_price': discounted_price,
+        'reserved_quantity': reserved_quantity,
+    }
+
+
+class TestStoreOrder(TestCase):
+    """ Test
+
+        Target: POST /checkout, store/store_order_service.post_order_service, StoreOrderDao.get_order_cart_items_dao
+
+        Notes:
+            DAO 는 MagicMock 으로 바꾸고, 주문번호 채번(next_daily_value)은 고정 값을 반환하도록 바꾼다.
+    """
+
+    def setUp(self):
+        patcher = mock.patch('service.store.store_order_service.next_daily_value', return_value=('20210105', 7))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.app = create_test_app(self)
+
+        self.dao = mock.MagicMock()
+        self.dao.post_store_order_dao.return_value = 30
+        self.service = StoreOrderService(self.dao)
+        self.service.volume_counter_dao = mock.MagicMock()
+
+        self.data = {
+            'user_id': 7,
+            'user_permission': 3,
+            'cart_ids': None,
+            'delivery_memo_type_id': 1,
+        }
+
+    def post_order(self, items):
+        self.dao.get_order_cart_items_dao.return_value = items
+
+        with self.app.app_context():
+            return self.service.post_order_service(None, self.data)
+
+    def test_checkout_several_items(self):
+        """ 여러 상품을 한 번에 주문하면 주문 상품은 한 번의 INSERT 로 추가되고 상품 순번대로 주문 상세 번호를 받는다. """
+
+        items = [
+            cart_item(1, 10, 100, 1, 10000),
+            cart_item(2, 11, 110, 2, 20000, discounted_price=18000),
+            cart_item(3, 10, 101, 3, 5000),
+        ]
+
+        self.assertEqual(self.post_order(items), 30)
+
+        self.assertEqual(self.data['order_number'], '20210105000007000')
+        self.assertEqual(self.data['total_price'], 10000 + 18000 + 5000)
+        self.assertEqual(self.data['item_count'], 3)
+        self.assertEqual(self.data['stock_count'], 3)
+        self.assertEqual(self.data['product_ids'], {10, 11})
+
+        self.dao.post_store_order_items_dao.assert_called_once()
+        inserted = self.dao.post_store_order_items_dao.call_args[0][1]['items']
+        self.assertEqual([item['order_detail_number'] for item in inserted],
+                         ['B20210105000007001', 'B20210105000007002', 'B20210105000007003'])
+        self.assertTrue(all(item['order_id'] == 30 for item in inserted))
+
+        self.service.volume_counter_dao.add_volume_deltas_dao.assert_called_once()
+        deltas = self.service.volume_counter_dao.add_volume_deltas_dao.call_args[0][1]['deltas']
+        self.assertEqual({delta['product_id']: delta['delta'] for delta in deltas}, {10: 4, 11: 2})
+
+        self.dao.patch_product_remains_dao.assert_called_once()
+        self.dao.delete_order_reservations_dao.assert_not_called()
+
+    def test_checkout_shared_stock(self):
+        """ 두 장바구니 상품이 같은 재고를 주문하면 재고 차감은 한 재고로 합산된다. """
+
+        items = [
+            cart_item(1, 10, 100, 2, 10000),
+            cart_item(2, 10, 100, 1, 5000),
+        ]
+
+        self.post_order(items)
+
+        self.assertEqual(self.data['item_count'], 2)
+        self.assertEqual(self.data['stock_count'], 1)
+
+    def test_shared_stock_checks_total_quantity(self):
+        """ 같은 재고를 주문하는 장바구니 상품은 주문량을 합산해 재고를 체크한다. """
+
+        dao = StoreOrderDao()
+        connection = mock.MagicMock()
+        cursor = connection.cursor.return_value.__enter__.return_value
+
+        def rows(remain):
+            return [
+                {**cart_item(1, 10, 100, 2, 10000), 'remain': remain},
+                {**cart_item(2, 10, 100, 2, 10000), 'remain': remain},
+            ]
+
+        # 각각은 재고(3)보다 적지만 합계(4)는 재고보다 많다.
+        cursor.fetchall.return_value = rows(3)
+        with self.assertRaises(NotEnoughProduct):
+            dao.get_order_cart_items_dao(connection, {'user_id': 7, 'cart_ids': (1, 2)})
+
+        cursor.fetchall.return_value = rows(4)
+        items = dao.get_order_cart_items_dao(connection, {'user_id': 7, 'cart_ids': (1, 2)})
+        self.assertEqual([item['cart_id'] for item in items], [1, 2])
+        self.assertTrue(all('remain' not in item for item in items))
+
+    def test_legacy_cart_id_body(self):
+        """ cartId 만 보내는 이전 요청 형식도 해당 장바구니 상품을 주문한다. """
+
+        body = {
+            'cartId': 5,
+            'productId': 10,
+            'stockId': 100,
+            'quantity': 1,
+            'originalPrice': 10000,
+            'sale': '0.00',
+            'discountedPrice': 0,
+            'totalPrice': 10000,
+            'soldOut': False,
+            'senderName': '보내는사람',
+            'senderPhone': '01012345678',
+            'senderEmail': 'sender@brandi.com',
+            'recipientName': '받는사람',
+            'recipientPhone': '01012345678',
+            'address1': '서울시',
+            'address2': '강남구',
+            'postNumber': '12345678',
+            'deliveryId': 1,
+        }
+
+        with mock.patch.object(StoreOrderService, 'post_idempotent_order_service',
+                               return_value={'status_code': 201, 'result': {'order_id': 30}, 'replayed': False}) as post:
+            response = self.app.test_client().post('/checkout', json=body,
+                                                   headers={'Authorization': customer_token(self.app)})
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.get_json()['result'], {'order_id': 30})
+        self.assertEqual(post.call_args[0][1]['cart_ids'], (5,))
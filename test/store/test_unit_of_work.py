@@ -0,0 +1,83 @@
+from unittest import TestCase
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+
+from fake_database import FakeConnection, create_test_app
+from utils.connection import get_pool, on_commit, unit_of_work
+
+
+class TestUnitOfWork(TestCase):
+    """ Test
+
+        Target: utils/connection.unit_of_work
+
+        Notes:
+            커넥션 풀이 만드는 FakeConnection 이 cursor / commit / rollback 호출을 events 에 기록한다.
+    """
+
+    def setUp(self):
+        self.events = []
+
+        self.app = create_test_app(self, lambda database: FakeConnection(self.events))
+        self.database = self.app.config['DB']
+        self.pool = get_pool(self.database)
+        self.events.clear()
+
+    def test_commit_runs_callbacks_after_commit(self):
+        """ 예외 없이 끝나면 commit 후 on_commit 함수를 실행하고 커넥션을 반납한다. """
+
+        seen = []
+
+        with self.app.test_request_context('/', method='POST'):
+            with unit_of_work(self.database) as connection:
+                connection.cursor()
+                on_commit(lambda: seen.append(list(self.events)))
+
+                self.assertEqual(seen, [])
+                self.assertEqual(self.pool.in_use, 1)
+
+            self.assertEqual(len(seen), 1)
+            self.assertEqual(seen[0][:2], ['cursor', 'commit'])
+            self.assertEqual(self.pool.in_use, 0)
+
+    def test_exception_rolls_back(self):
+        """ 블록 안에서 예외가 발생하면 rollback 후 반납하고, on_commit 함수는 실행하지 않는다. """
+
+        seen = []
+
+        with self.app.test_request_context('/', method='POST'):
+            with self.assertRaises(ValueError):
+                with unit_of_work(self.database) as connection:
+                    connection.cursor()
+                    on_commit(lambda: seen.append('called'))
+                    raise ValueError('rollback')
+
+            self.assertEqual(self.pool.in_use, 0)
+
+        self.assertEqual(seen, [])
+        self.assertIn('rollback', self.events)
+        self.assertNotIn('commit', self.events)
+
+    def test_teardown_releases_unfinished_unit(self):
+        """ 끝나지 않은 UnitOfWork 는 app context 종료 시점에 rollback 후 반납된다. """
+
+        with self.app.test_request_context('/', method='POST'):
+            connection = unit_of_work(self.database).__enter__()
+            connection.cursor()
+
+            self.assertEqual(self.pool.in_use, 1)
+
+        self.assertEqual(self.pool.in_use, 0)
+        self.assertEqual(self.events[:2], ['cursor', 'rollback'])
+        self.assertNotIn('commit', self.events)
+
+    def test_unused_unit_does_not_acquire(self):
+        """ DAO 를 호출하지 않은 요청은 커넥션을 대여하지 않는다. """
+
+        with self.app.test_request_context('/', method='POST'):
+            with unit_of_work(self.database):
+                pass
+
+        self.assertEqual(self.events, [])
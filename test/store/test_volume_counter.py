@@ -0,0 +1,94 @@
+from unittest import TestCase
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+
+from service.store.volume_counter_service import VolumeCounterService
+
+
+class MemoryVolumeCounterDao:
+    """ volume_counter_shards / 집계 테이블을 메모리로 흉내 낸 VolumeCounterDao
+
+        Attributes:
+            shards  : {(name, product_id, slot): delta}
+            volumes : {(name, product_id): 집계 값}
+    """
+
+    def __init__(self, shards, volumes):
+        self.shards = dict(shards)
+        self.volumes = dict(volumes)
+
+    def get_volume_products_dao(self, connection, data):
+        return sorted({(name, product_id) for name, product_id, slot in self.shards})[:data['limit']]
+
+    def get_volume_shards_dao(self, connection, data):
+        return [
+            {'name': name, 'product_id': product_id, 'slot': slot, 'delta': delta}
+            for (name, product_id, slot), delta in sorted(self.shards.items())
+            if (name, product_id) in data['products']
+        ]
+
+    def patch_volumes_dao(self, connection, data):
+        for product_id, delta in data['deltas'].items():
+            key = (data['name'], product_id)
+            self.volumes[key] = max(self.volumes[key] + delta, 0)
+
+    def delete_volume_shards_dao(self, connection, data):
+        for shard in data['shards']:
+            del self.shards[shard]
+
+
+class TestVolumeCounter(TestCase):
+    """ Test
+
+        Target: store/volume_counter_service
+    """
+
+    def setUp(self):
+        self.service = VolumeCounterService()
+
+    def fold_all(self, dao, limit):
+        self.service.volume_counter_dao = dao
+        while self.service.fold_volume_counters_service(None, {'limit': limit}) == limit:
+            pass
+
+    def test_fold_split_batch(self):
+        """ 한 번에 반영하는 상품 수보다 슬롯이 많아도 상품의 슬롯은 함께 반영된다.
+
+            Notes:
+                상품 10 의 슬롯 3(-1), 7(+1) 이 다른 배치로 나뉘면 -1 이 0 으로 맞춰져 최종 값이 1 이 된다.
+        """
+
+        dao = MemoryVolumeCounterDao(
+            shards={
+                ('bookmark', 9, 0): 2,
+                ('bookmark', 10, 3): -1,
+                ('bookmark', 10, 7): 1,
+                ('sales', 10, 1): 4,
+            },
+            volumes={('bookmark', 9): 0, ('bookmark', 10): 0, ('sales', 10): 3}
+        )
+
+        self.fold_all(dao, limit=1)
+
+        self.assertEqual(dao.shards, {})
+        self.assertEqual(dao.volumes, {('bookmark', 9): 2, ('bookmark', 10): 0, ('sales', 10): 7})
+
+    def test_fold_batch_size(self):
+        """ 반환 값은 반영한 상품 수이고, 남은 상품은 다음 배치에서 반영된다. """
+
+        dao = MemoryVolumeCounterDao(
+            shards={('bookmark', product_id, slot): 1 for product_id in range(5) for slot in range(3)},
+            volumes={('bookmark', product_id): 0 for product_id in range(5)}
+        )
+        self.service.volume_counter_dao = dao
+
+        self.assertEqual(self.service.fold_volume_counters_service(None, {'limit': 2}), 2)
+        self.assertEqual(dao.volumes, {('bookmark', 0): 3, ('bookmark', 1): 3, ('bookmark', 2): 0,
+                                       ('bookmark', 3): 0, ('bookmark', 4): 0})
+
+        self.fold_all(dao, limit=2)
+
+        self.assertEqual(dao.volumes, {('bookmark', product_id): 3 for product_id in range(5)})
+        self.assertEqual(self.service.fold_volume_counters_service(None, {'limit': 2}), 0)
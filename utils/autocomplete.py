@@ -0,0 +1,202 @@
+""" 검색어 자동완성 (프로세스 내 prefix 색인)
+
+상품명과 셀러명을 정렬된 배열로 만들어 두고 입력한 접두어로 시작하는 이름을 판매량 순으로 반환한다.
+조회는 메모리만 사용하며 데이터베이스에 접근하지 않는다.
+
+    - 이름의 각 단어 시작 위치를 색인하므로 '니트' 로 '데일리 니트' 도 찾는다. (NFKC 정규화, 대소문자 구분 없음)
+    - 후보는 판매량 순위(rank)로 저장하고, 짧은 접두어(PREFIX_CACHE_LENGTH 이하)는 상위 결과를 미리 계산해 둔다.
+      긴 접두어는 bisect 로 찾은 구간에서 상위 순위만 고른다.
+    - 색인은 워커마다 백그라운드 스레드가 AUTOCOMPLETE_REFRESH_INTERVAL 마다 새로 만들어 통째로 교체한다.
+      (읽는 쪽은 잠금 없이 교체 전 / 후 색인 중 하나를 사용한다.) 첫 색인이 만들어지기 전에는 빈 결과를 반환한다.
+
+AUTOCOMPLETE_REFRESH_INTERVAL (app.config) : 색인 재생성 주기 (초, 기본 300)
+
+기본적인 사용 예시:
+    suggestions = suggest(database, '니트', 10, ProductListDao().get_autocomplete_rows_dao)
+"""
+import bisect
+import heapq
+import logging
+import os
+import threading
+import time
+
+from flask import current_app
+
+from utils.connection   import unit_of_work
+from utils.http_cache   import clear_cache_policy
+from utils.search_index import normalize
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_REFRESH_INTERVAL = 300
+MAX_LIMIT                = 20
+PREFIX_CACHE_LENGTH      = 2
+
+# 접두어 구간의 끝 (모든 문자보다 큰 값)
+_PREFIX_END = '\U0010ffff'
+
+
+class PrefixIndex:
+    """ 정렬된 배열 기반 접두어 색인 (생성 후 변경하지 않는다.)
+
+        Attributes:
+            suggestions : 판매량 내림차순 [{'keyword': 이름, 'type': 'product' | 'seller'}]
+            terms       : 정규화한 이름의 단어 시작 위치부터의 문자열 (정렬)
+            ranks       : terms 와 같은 위치의 suggestions 인덱스
+            top         : {짧은 접두어: 상위 suggestions 인덱스 리스트}
+    """
+
+    def __init__(self, rows, top_k=MAX_LIMIT, cache_length=PREFIX_CACHE_LENGTH):
+        """
+            Args:
+                rows         : {'keyword', 'type', 'score'} row iterable (같은 이름은 score 를 합산한다.)
+                top_k        : 짧은 접두어마다 미리 계산하는 결과 수
+                cache_length : 결과를 미리 계산하는 접두어 최대 길이
+        """
+
+        scores = {}
+        for row in rows:
+            if not row['keyword']:
+                continue
+            key = (row['type'], row['keyword'])
+            scores[key] = scores.get(key, 0) + int(row['score'] or 0)
+
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0][1]))
+
+        self.suggestions = [{'keyword': keyword, 'type': kind} for (kind, keyword), _ in ranked]
+        self.cache_length = cache_length
+        self.top = {}
+
+        entries = []
+        for rank, ((_, keyword), _) in enumerate(ranked):
+            prefixes = set()
+            for term in _word_suffixes(normalize(keyword)):
+                entries.append((term, rank))
+                prefixes.update(term[:length] for length in range(1, cache_length + 1))
+
+            # rank 오름차순으로 추가하므로 앞에서부터 top_k 개가 상위 결과다.
+            for prefix in prefixes:
+                top = self.top.setdefault(prefix, [])
+                if len(top) < top_k:
+                    top.append(rank)
+
+        entries.sort()
+        self.terms = [term for term, _ in entries]
+        self.ranks = [rank for _, rank in entries]
+
+    def __len__(self):
+        return len(self.suggestions)
+
+    def complete(self, query, limit):
+        """ 접두어로 시작하는 이름 (판매량 순)
+
+            Args:
+                query : 입력한 접두어
+                limit : 최대 개수
+
+            Returns:
+                [{'keyword': 이름, 'type': 'product' | 'seller'}]
+        """
+
+        prefix = normalize(query).lstrip()
+
+        if not prefix:
+            return []
+
+        if len(prefix) <= self.cache_length:
+            ranks = self.top.get(prefix, [])[:limit]
+        else:
+            start = bisect.bisect_left(self.terms, prefix)
+            end = bisect.bisect_left(self.terms, prefix + _PREFIX_END, start)
+            ranks = heapq.nsmallest(limit, set(self.ranks[start:end]))
+
+        return [self.suggestions[rank] for rank in ranks]
+
+
+def _word_suffixes(text):
+    """ 단어 시작 위치부터의 문자열 ('데일리 니트' -> '데일리 니트', '니트') """
+
+    return [text[index:] for index, char in enumerate(text)
+            if not char.isspace() and (index == 0 or text[index - 1].isspace())]
+
+
+class _Refresher:
+    """ 워커(프로세스)별 색인 재생성 스레드 """
+
+    def __init__(self):
+        self.index = None
+        self.pid = None
+        self.lock = threading.Lock()
+
+    def ensure_started(self, app, database, load):
+        if self.pid == os.getpid():
+            return
+
+        with self.lock:
+            if self.pid == os.getpid():
+                return
+
+            # fork 이전 프로세스의 색인은 버리지 않는다. (새 색인을 만들 때까지 사용)
+            self.pid = os.getpid()
+            thread = threading.Thread(
+                target=self._run, args=(app, database, load), name='autocomplete-refresher', daemon=True
+            )
+            thread.start()
+
+    def _run(self, app, database, load):
+        while True:
+            try:
+                self.index = build_index(app, database, load)
+            except Exception:
+                logger.exception('autocomplete index build failed')
+
+            time.sleep(app.config.get('AUTOCOMPLETE_REFRESH_INTERVAL', DEFAULT_REFRESH_INTERVAL))
+
+
+_refresher = _Refresher()
+
+
+def build_index(app, database, load):
+    """ 데이터베이스에서 자동완성 대상을 읽어 PrefixIndex 생성
+
+        Args:
+            app      : Flask 앱
+            database : app.config['DB']
+            load     : load(connection) -> {'keyword', 'type', 'score'} row iterable
+
+        Returns:
+            PrefixIndex
+    """
+
+    start = time.perf_counter()
+
+    with app.app_context():
+        with unit_of_work(database, read_only=True, replica=True) as connection:
+            index = PrefixIndex(load(connection))
+
+    logger.info('autocomplete index built: %s keywords, %.1fms', len(index), (time.perf_counter() - start) * 1000)
+    return index
+
+
+def suggest(database, query, limit, load):
+    """ 자동완성 검색어 (데이터베이스에 접근하지 않는다.)
+
+        Args:
+            database : app.config['DB']
+            query    : 입력한 접두어
+            limit    : 최대 개수 (MAX_LIMIT 이하)
+            load     : 색인 생성에 사용할 조회 함수 (build_index)
+
+        Returns:
+            [{'keyword': 이름, 'type': 'product' | 'seller'}], 색인 생성 전이면 빈 리스트
+    """
+
+    _refresher.ensure_started(current_app._get_current_object(), database, load)
+
+    index = _refresher.index
+    if index is None:
+        clear_cache_policy()
+        return []
+
+    return index.complete(query, min(limit, MAX_LIMIT))
@@ -0,0 +1,289 @@
+""" 프로세스 내 read-through 캐시
+
+자주 읽고 드물게 바뀌는 조회 결과(상품 상세 등)를 워커 메모리에 보관한다.
+cachetools.TTLCache 를 사용하므로 크기를 넘으면 가장 오래 사용하지 않은 항목부터, 보관 시간이 지나면 만료된다.
+
+    - key 마다 버전을 두고 invalidate 할 때 버전을 올린다. 조회를 시작한 뒤에 invalidate 된 경우에는
+      조회 결과를 저장하지 않으므로 변경 전 데이터가 다시 캐시되지 않는다.
+    - 쓰기 요청에서는 invalidate_on_commit 으로 트랜잭션이 커밋된 뒤에 무효화한다.
+      (커밋 전에 무효화하면 그 사이의 조회가 변경 전 데이터를 다시 캐시할 수 있다.)
+    - 워커(프로세스)마다 캐시를 가지므로 다른 워커의 캐시는 보관 시간이 지나야 갱신된다.
+    - get 의 expires_in 으로 항목별 만료 시점을 보관 시간보다 앞당길 수 있다. (기획전 종료 시각 등)
+
+<NAME>_CACHE_SIZE (app.config) : 최대 항목 수 (0 이면 캐시하지 않는다.)
+<NAME>_CACHE_TTL (app.config)  : 보관 시간 (초, 0 이면 캐시하지 않는다.)
+
+카테고리 트리처럼 전체를 한 번에 만들고 앱에서 변경하지 않는 값은 Snapshot 으로 보관한다.
+보관 시간이 지나면 백그라운드 스레드가 새로 만들고, 그동안에는 이전 값을 반환한다.
+
+<NAME>_SNAPSHOT_TTL (app.config) : 재생성 주기 (초)
+
+기본적인 사용 예시:
+    cache = get_cache(PRODUCT_DETAIL_CACHE)
+    product = cache.get(product_id, lambda: dao.get_product_detail_bundle_dao(connection, data))
+
+    invalidate_on_commit(PRODUCT_DETAIL_CACHE, product_id)
+
+    body = get_snapshot(CATEGORY_TREE_SNAPSHOT).get(build)
+"""
+import logging
+import threading
+import time
+
+from cachetools import TTLCache
+from flask import current_app
+
+from utils.connection import on_commit
+
+logger = logging.getLogger(__name__)
+
+PRODUCT_DETAIL_CACHE   = 'product_detail'
+EVENT_CACHE            = 'event'
+CATEGORY_TREE_SNAPSHOT = 'category_tree'
+
+# {캐시 이름: (기본 최대 항목 수, 기본 보관 시간)}
+CACHE_DEFAULTS = {
+    PRODUCT_DETAIL_CACHE: (4096, 60),
+    EVENT_CACHE: (1024, 300),
+}
+
+# {스냅샷 이름: 기본 재생성 주기}
+SNAPSHOT_DEFAULTS = {
+    CATEGORY_TREE_SNAPSHOT: 600,
+}
+
+SNAPSHOT_RETRY_INTERVAL = 30
+
+_MISSING = object()
+
+_caches = {}
+_caches_lock = threading.Lock()
+_snapshots = {}
+
+
+class VersionedCache:
+    """ key 별 버전을 가진 TTL / LRU 캐시
+
+        Attributes:
+            entries  : cachetools.TTLCache {key: (값, 만료 시각 혹은 None)} (maxsize 가 0 이면 None)
+            versions : {key: 버전} invalidate 된 key 만 기록한다.
+            clears   : clear 횟수 (clear 전에 시작한 조회 결과를 저장하지 않는다.)
+    """
+
+    def __init__(self, maxsize, ttl):
+        self.entries = TTLCache(maxsize=maxsize, ttl=ttl) if maxsize and ttl else None
+        self.versions = {}
+        self.clears = 0
+        self.lock = threading.Lock()
+
+    def _version(self, key):
+        return self.clears, self.versions.get(key, 0)
+
+    def _lookup(self, key):
+        entry = self.entries.get(key)
+
+        if entry is None:
+            return _MISSING
+
+        value, expires_at = entry
+        if expires_at is not None and expires_at <= time.monotonic():
+            del self.entries[key]
+            return _MISSING
+
+        return value
+
+    def get(self, key, load, expires_in=None):
+        """ 캐시된 값, 없으면 load() 결과를 저장 후 반환
+
+            Args:
+                key        : 캐시 key
+                load       : 캐시에 없을 때 호출할 함수 (예외가 발생하면 저장하지 않는다.)
+                expires_in : expires_in(값) -> 만료까지 남은 시간 (초, None 이면 보관 시간만 적용)
+        """
+
+        if self.entries is None:
+            return load()
+
+        with self.lock:
+            version = self._version(key)
+            value = self._lookup(key)
+
+        if value is not _MISSING:
+            return value
+
+        value = load()
+        seconds = expires_in(value) if expires_in else None
+
+        with self.lock:
+            if self._version(key) == version and (seconds is None or seconds > 0):
+                self.entries[key] = (value, None if seconds is None else time.monotonic() + seconds)
+
+        return value
+
+    def get_many(self, keys, load_many):
+        """ 여러 key 를 한 번에 조회, 캐시에 없는 key 만 load_many 로 조회 후 저장
+
+            Args:
+                keys      : 캐시 key 리스트
+                load_many : load_many(캐시에 없는 key 리스트) -> {key: 값} (조회되지 않은 key 는 빠진다.)
+
+            Returns:
+                {key: 값} (캐시와 load_many 결과 모두에 없는 key 는 빠진다.)
+        """
+
+        if self.entries is None:
+            return load_many(list(keys)) if keys else {}
+
+        found = {}
+        versions = {}
+
+        with self.lock:
+            for key in keys:
+                value = self._lookup(key)
+                if value is _MISSING:
+                    versions[key] = self._version(key)
+                else:
+                    found[key] = value
+
+        if not versions:
+            return found
+
+        loaded = load_many(list(versions))
+
+        with self.lock:
+            for key, value in loaded.items():
+                if self._version(key) == versions.get(key):
+                    self.entries[key] = (value, None)
+
+        found.update(loaded)
+        return found
+
+    def invalidate(self, key):
+        with self.lock:
+            self.versions[key] = self.versions.get(key, 0) + 1
+            if self.entries is not None:
+                self.entries.pop(key, None)
+
+    def clear(self):
+        with self.lock:
+            self.clears += 1
+            self.versions.clear()
+            if self.entries is not None:
+                self.entries.clear()
+
+
+def get_cache(name):
+    """ 이름별 캐시 (워커마다 하나, 처음 사용할 때 app.config 로 생성)
+
+        Args:
+            name : CACHE_DEFAULTS 에 등록된 캐시 이름
+
+        Returns:
+            VersionedCache
+    """
+
+    cache = _caches.get(name)
+
+    if cache is None:
+        with _caches_lock:
+            cache = _caches.get(name)
+            if cache is None:
+                default_size, default_ttl = CACHE_DEFAULTS[name]
+                cache = _caches[name] = VersionedCache(
+                    maxsize=current_app.config.get('{}_CACHE_SIZE'.format(name.upper()), default_size),
+                    ttl=current_app.config.get('{}_CACHE_TTL'.format(name.upper()), default_ttl)
+                )
+
+    return cache
+
+
+def invalidate_on_commit(name, key):
+    """ 현재 요청의 트랜잭션이 커밋된 뒤 key 무효화 (트랜잭션 밖이면 바로 무효화) """
+
+    on_commit(lambda: get_cache(name).invalidate(key))
+
+
+def clear_on_commit(name):
+    """ 현재 요청의 트랜잭션이 커밋된 뒤 캐시 전체 무효화 (트랜잭션 밖이면 바로 무효화) """
+
+    on_commit(lambda: get_cache(name).clear())
+
+
+class Snapshot:
+    """ 통째로 만들고 교체하는 단일 값 캐시 (직렬화한 응답 등)
+
+        Attributes:
+            ttl      : 재생성 주기 (초)
+            current  : (값, 만든 시각) 만들기 전이면 None
+            retry_at : 재생성에 실패한 뒤 다시 시도할 시각 (실패가 반복되어도 요청마다 재시도하지 않는다.)
+    """
+
+    def __init__(self, ttl):
+        self.ttl = ttl
+        self.current = None
+        self.retry_at = 0
+        self.lock = threading.Lock()
+
+    def is_stale(self, current):
+        now = time.monotonic()
+        return now >= self.retry_at and now - current[1] >= self.ttl
+
+    def get(self, build):
+        """ 보관한 값 (없으면 build() 결과를 만들어 보관 후 반환)
+
+            Args:
+                build : 인자 없이 값을 만드는 함수. 재생성은 요청 밖 스레드에서 실행되므로
+                        app context 와 커넥션을 직접 준비해야 한다.
+
+            Notes:
+                처음 한 번만 요청 안에서 만들고, 이후 재생성은 백그라운드에서 진행하며 이전 값을 반환한다.
+        """
+
+        current = self.current
+
+        if current is None:
+            with self.lock:
+                if self.current is None:
+                    self._build(build)
+                return self.current[0]
+
+        if self.is_stale(current) and self.lock.acquire(blocking=False):
+            threading.Thread(target=self._refresh, args=(build,), name='snapshot-refresher', daemon=True).start()
+
+        return current[0]
+
+    def _build(self, build):
+        self.current = (build(), time.monotonic())
+
+    def _refresh(self, build):
+        try:
+            self._build(build)
+        except Exception:
+            self.retry_at = time.monotonic() + min(self.ttl, SNAPSHOT_RETRY_INTERVAL)
+            logger.exception('snapshot refresh failed')
+        finally:
+            self.lock.release()
+
+
+def get_snapshot(name):
+    """ 이름별 스냅샷 (워커마다 하나, 처음 사용할 때 app.config 로 생성)
+
+        Args:
+            name : SNAPSHOT_DEFAULTS 에 등록된 스냅샷 이름
+
+        Returns:
+            Snapshot
+    """
+
+    snapshot = _snapshots.get(name)
+
+    if snapshot is None:
+        with _caches_lock:
+            snapshot = _snapshots.get(name)
+            if snapshot is None:
+                snapshot = _snapshots[name] = Snapshot(
+                    ttl=current_app.config.get('{}_SNAPSHOT_TTL'.format(name.upper()), SNAPSHOT_DEFAULTS[name])
+                )
+
+    return snapshot
+
@@ -9,4 +9,18 @@
 # 계정 권한 정의
 ACCOUNT_ADMIN  = 1
 ACCOUNT_SELLER = 2
-ACCOUNT_USER   = 3
\ No newline at end of file
+ACCOUNT_USER   = 3
+# 상품 일괄 조회(/products/batch) 최대 상품 수
+PRODUCT_BATCH_MAX_SIZE = 50
+# 재고 예약 기본 유지 시간 (초, app.config['STOCK_RESERVATION_TTL'] 로 변경)
+STOCK_RESERVATION_TTL = 600
+# 재고 예약 해제 시 한 트랜잭션에서 처리하는 최대 예약 수
+STOCK_RESERVATION_RELEASE_BATCH_SIZE = 500
+# Idempotency-Key 헤더 형식 (영문, 숫자, -_.: 로 이루어진 1~64자, 예: UUID, re.fullmatch 로 전체를 비교)
+IDEMPOTENCY_KEY_PATTERN = '[A-Za-z0-9_.:-]{1,64}'
+# Idempotency-Key 보관 기간 (초, app.config['IDEMPOTENCY_KEY_TTL'] 로 변경)
+IDEMPOTENCY_KEY_TTL = 86400
+# 만료된 Idempotency-Key 삭제 시 한 트랜잭션에서 처리하는 최대 키 수
+IDEMPOTENCY_KEY_PURGE_BATCH_SIZE = 1000
+# 판매량 / 북마크 수 슬롯 반영 시 한 트랜잭션에서 처리하는 최대 상품 수 (상품의 슬롯은 모두 함께 처리)
+VOLUME_COUNTER_FOLD_BATCH_SIZE = 1000
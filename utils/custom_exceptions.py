@@ -1261,3 +1261,91 @@ class AnswerCreateFail(CustomUserError):
         message = 'answer create'
         error_message = error_message
         super().__init__(status_code, message, error_message)
+
+
+class ConnectionPoolTimeout(CustomUserError):
+    """ 커넥션 풀 대여 대기 시간 초과
+    """
+
+    def __init__(self, error_message):
+        status_code = 503
+        message = 'database_connection_timeout'
+        error_message = error_message
+        super().__init__(status_code, message, error_message)
+
+
+class QueryBudgetExceeded(CustomUserError):
+    """ 요청 단위 쿼리 수 초과 (QUERY_BUDGET_MODE = raise)
+    """
+
+    def __init__(self, error_message):
+        status_code = 500
+        message = 'query_budget_exceeded'
+        error_message = error_message
+        super().__init__(status_code, message, error_message)
+
+
+class InvalidCursor(CustomUserError):
+    """ 페이지네이션 커서 해석 실패
+    """
+
+    def __init__(self, error_message):
+        status_code = 400
+        message = 'invalid_cursor'
+        error_message = error_message
+        super().__init__(status_code, message, error_message)
+
+
+class InvalidCountStrategy(CustomUserError):
+    """ 알 수 없는 전체 개수 조회 전략 (utils.row_count)
+    """
+
+    def __init__(self, error_message):
+        status_code = 400
+        message = 'invalid_count_strategy'
+        error_message = error_message
+        super().__init__(status_code, message, error_message)
+
+
+class TooManyProducts(CustomUserError):
+    """ 한 번에 조회할 수 있는 상품 수 초과
+    """
+
+    def __init__(self, error_message):
+        status_code = 400
+        message = 'too_many_products'
+        error_message = error_message
+        super().__init__(status_code, message, error_message)
+
+
+class StockReservationDenied(CustomUserError):
+    """ 재고 예약 처리 실패 (model.store.stock_reservation_dao)
+    """
+
+    def __init__(self, error_message):
+        status_code = 400
+        message = 'stock reservation denied'
+        error_message = error_message
+        super().__init__(status_code, message, error_message)
+
+
+class IdempotencyKeyMismatch(CustomUserError):
+    """ 같은 Idempotency-Key 로 다른 요청을 보냄
+    """
+
+    def __init__(self, error_message):
+        status_code = 422
+        message = 'idempotency_key_reused'
+        error_message = error_message
+        super().__init__(status_code, message, error_message)
+
+
+class InvalidIdempotencyKey(CustomUserError):
+    """ Idempotency-Key 헤더 형식 오류 (영문, 숫자, -_.: 로 이루어진 1~64자)
+    """
+
+    def __init__(self, error_message):
+        status_code = 400
+        message = 'invalid_idempotency_key'
+        error_message = error_message
+        super().__init__(status_code, message, error_message)
@@ -5,6 +5,8 @@ from flask import request, g, current_app
 import jwt
 
 from utils.custom_exceptions import UnauthorizedUser, InvalidToken
+from utils.http_cache        import set_cache_policy
+from utils.query_budget      import check_query_budget
 
 
 def signin_decorator(required=True):
@@ -61,3 +63,54 @@ def signin_decorator(required=True):
             return func(*args, **kwargs)
         return wrapper
     return real_decorator
+
+
+def query_budget(max_queries=None, max_repeats=None):
+    """ 엔드포인트별 쿼리 수 예산 데코레이터
+
+        Args:
+            max_queries : 요청 한 번에 허용하는 최대 쿼리 수
+            max_repeats : 같은 형태의 쿼리를 허용하는 최대 횟수 (기본 app.config['QUERY_REPEAT_LIMIT'])
+
+        Returns:
+            func(*args, **kwargs) : 타겟 함수 실행 후 실행된 쿼리 수를 검사
+
+        Raises:
+            500, {'message': 'query_budget_exceeded', 'error_message': ...} : QUERY_BUDGET_MODE 가 raise 일 때 예산 초과
+
+        Notes:
+            QUERY_BUDGET_MODE 가 warn 이면 경고 로그만 남기고, off 이면 검사하지 않는다. (utils.query_budget)
+    """
+
+    def real_decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            result = func(*args, **kwargs)
+            check_query_budget(max_queries, max_repeats)
+            return result
+        return wrapper
+    return real_decorator
+
+
+def http_cache(max_age, shared_max_age=None, vary_by_user=False):
+    """ 엔드포인트별 Cache-Control / ETag 데코레이터
+
+        Args:
+            max_age        : 브라우저 캐시 시간 (초)
+            shared_max_age : CDN 등 공유 캐시 시간 (초, s-maxage)
+            vary_by_user   : 로그인 여부에 따라 응답이 달라지는 엔드포인트 (로그인 사용자 응답은 private)
+
+        Returns:
+            func(*args, **kwargs) : 200 응답에 Cache-Control 과 ETag 를 추가하고, If-None-Match 가 일치하면 304
+
+        Notes:
+            ETag 는 응답 본문의 해시이므로 뷰는 그대로 실행된다. (DB 조회는 줄지 않고 전송량만 줄어든다.)
+    """
+
+    def real_decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            set_cache_policy(max_age, shared_max_age, vary_by_user)
+            return func(*args, **kwargs)
+        return wrapper
+    return real_decorator
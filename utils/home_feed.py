@@ -0,0 +1,163 @@
+""" 홈 화면 상품 피드 (프로세스 내 materialized 목록)
+
+/products 는 노출 중인 기획전의 상품을 events_products, products, product_images, sellers, product_sales_volumes
+5개 테이블 join 으로 조회한다. 기획전별 전체 상품 목록을 product.id 내림차순으로 한 번 만들어 두고,
+요청에서는 메모리의 목록을 잘라서 반환한다.
+
+    - 기획전 상품 구성이 바뀌면(관리자 기획전 등록 / 수정 / 삭제) 피드 전체를 버린다.
+    - 상품 정보(노출 여부, 대표 이미지, 판매량 등)가 바뀌면 해당 상품만 표시해 두고,
+      다음 조회에서 표시된 상품의 row 만 다시 조회해 목록에 반영한다.
+    - 변경 알림은 트랜잭션이 커밋된 뒤에 반영한다. (utils.connection.on_commit)
+    - 워커(프로세스)마다 피드를 가지므로 다른 워커는 HOME_FEED_TTL 이 지나 전체를 다시 만들 때 반영된다.
+
+HOME_FEED_TTL (app.config) : 기획전별 피드 전체를 다시 만드는 주기 (초, 기본 300)
+
+기본적인 사용 예시:
+    product_list = get_home_feed().get(event_id, limit, load_all, load_products)
+
+    mark_home_feed_products_on_commit([product_id])
+"""
+import threading
+import time
+
+from flask import current_app
+
+from utils.connection import on_commit
+
+DEFAULT_TTL = 300
+
+
+def _sort_key(row):
+    return -row['product_id']
+
+
+class _EventFeed:
+    """ 기획전 하나의 피드
+
+        Attributes:
+            rows     : product_id 내림차순 상품 row 리스트 (교체만 하고 수정하지 않는다.)
+            built_at : 전체를 조회한 시각
+            pending  : 다시 조회해야 하는 product_id set
+    """
+
+    def __init__(self, rows):
+        self.rows = sorted(rows, key=_sort_key)
+        self.built_at = time.monotonic()
+        self.pending = set()
+
+    def patch(self, product_ids, rows):
+        """ product_ids 의 row 를 빼고 다시 조회한 rows 를 넣은 새 목록으로 교체 """
+
+        kept = [row for row in self.rows if row['product_id'] not in product_ids]
+        self.rows = sorted(kept + list(rows), key=_sort_key)
+
+
+class HomeFeed:
+    """ 기획전별 홈 피드
+
+        Attributes:
+            ttl        : 피드 전체를 다시 만드는 주기 (초)
+            feeds      : {event_id: _EventFeed}
+            generation : invalidate 횟수 (invalidate 전에 시작한 조회 결과를 저장하지 않는다.)
+    """
+
+    def __init__(self, ttl):
+        self.ttl = ttl
+        self.feeds = {}
+        self.generation = 0
+        self.lock = threading.Lock()
+
+    def get(self, event_id, limit, load_all, load_products):
+        """ 기획전 상품 목록 앞에서부터 limit 개
+
+            Args:
+                event_id      : 기획전 id
+                limit         : 개수
+                load_all      : load_all() -> 기획전의 전체 상품 row 리스트
+                load_products : load_products(product_id tuple) -> 해당 상품 중 피드에 포함될 row 리스트
+
+            Returns:
+                product_id 내림차순 상품 row 리스트
+        """
+
+        pending = None
+
+        with self.lock:
+            generation = self.generation
+            feed = self.feeds.get(event_id)
+
+            if feed is not None and time.monotonic() - feed.built_at >= self.ttl:
+                feed = None
+
+            if feed is not None and feed.pending:
+                pending, feed.pending = feed.pending, set()
+
+        if feed is None:
+            feed = _EventFeed(load_all())
+
+            with self.lock:
+                if self.generation == generation:
+                    self.feeds[event_id] = feed
+
+            return feed.rows[:limit]
+
+        if pending:
+            try:
+                rows = load_products(tuple(pending))
+            except Exception:
+                with self.lock:
+                    feed.pending.update(pending)
+                raise
+
+            with self.lock:
+                feed.patch(pending, rows)
+
+        return feed.rows[:limit]
+
+    def mark_products(self, product_ids):
+        """ 상품 정보가 바뀐 상품 표시 (다음 조회에서 해당 상품만 다시 조회한다.) """
+
+        with self.lock:
+            for feed in self.feeds.values():
+                feed.pending.update(product_ids)
+
+    def invalidate(self):
+        """ 모든 기획전 피드 삭제 (다음 조회에서 전체를 다시 만든다.) """
+
+        with self.lock:
+            self.generation += 1
+            self.feeds.clear()
+
+
+_home_feed = None
+_home_feed_lock = threading.Lock()
+
+
+def get_home_feed():
+    """ 워커(프로세스)별 HomeFeed (처음 사용할 때 app.config 로 생성) """
+
+    global _home_feed
+
+    if _home_feed is None:
+        with _home_feed_lock:
+            if _home_feed is None:
+                _home_feed = HomeFeed(current_app.config.get('HOME_FEED_TTL', DEFAULT_TTL))
+
+    return _home_feed
+
+
+def mark_home_feed_products_on_commit(product_ids):
+    """ 현재 요청의 트랜잭션이 커밋된 뒤 상품 변경 반영 예약
+
+        Args:
+            product_ids : 노출 여부, 대표 이미지, 가격, 판매량 등이 바뀐 상품 id iterable
+    """
+
+    product_ids = {int(product_id) for product_id in product_ids}
+    on_commit(lambda: get_home_feed().mark_products(product_ids))
+
+
+def invalidate_home_feed_on_commit():
+    """ 현재 요청의 트랜잭션이 커밋된 뒤 피드 전체 삭제 (기획전 상품 구성 변경) """
+
+    on_commit(lambda: get_home_feed().invalidate())
@@ -0,0 +1,149 @@
+""" 응답 압축 및 조건부 GET (ETag / 304)
+
+    - utils.decorator.http_cache 를 선언한 GET 엔드포인트는 응답 본문의 해시로 strong ETag 를 만들고,
+      If-None-Match 가 일치하면 본문 없이 304 를 반환한다. Cache-Control 은 엔드포인트별로 지정한다.
+    - 압축 가능한 응답(JSON, text)은 COMPRESS_MIN_SIZE 이상이면 Accept-Encoding 에 따라 brotli 혹은 gzip 으로 압축한다.
+      brotli 는 패키지가 설치되어 있을 때만 사용한다.
+
+압축한 응답의 ETag 에는 '-gzip', '-br' 을 붙여 표현(representation)마다 다른 ETag 를 갖도록 하고,
+If-None-Match 비교 시에는 어느 표현의 ETag 든 같은 본문으로 인정한다.
+
+COMPRESS_MIN_SIZE (app.config)      : 압축을 시작하는 본문 크기 (기본 1024 bytes, None 이면 압축하지 않는다.)
+COMPRESS_LEVEL (app.config)         : gzip 압축 레벨 (기본 6)
+COMPRESS_BROTLI_QUALITY (app.config): brotli 압축 품질 (기본 4)
+
+기본적인 사용 예시:
+    @http_cache(max_age=300)
+    def get(self):
+        ...
+"""
+import gzip
+
+from flask import g, request
+from werkzeug.http import generate_etag
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+DEFAULT_COMPRESS_MIN_SIZE       = 1024
+DEFAULT_COMPRESS_LEVEL          = 6
+DEFAULT_COMPRESS_BROTLI_QUALITY = 4
+
+COMPRESSIBLE_MIMETYPES = ('application/json', 'text/plain', 'text/html', 'text/css', 'application/javascript')
+
+ENCODING_SUFFIXES = ('', '-gzip', '-br')
+
+
+def set_cache_policy(max_age, shared_max_age=None, vary_by_user=False):
+    """ 현재 요청의 캐시 정책 (utils.decorator.http_cache)
+
+        Args:
+            max_age        : 브라우저 캐시 시간 (초)
+            shared_max_age : CDN 등 공유 캐시 시간 (초, s-maxage)
+            vary_by_user   : True 이면 로그인 사용자의 응답은 private 으로 표시하고 Vary: Authorization 을 추가한다.
+    """
+
+    g.http_cache = {'max_age': max_age, 'shared_max_age': shared_max_age, 'vary_by_user': vary_by_user}
+
+
+def clear_cache_policy():
+    """ 현재 요청의 응답을 캐시하지 않는다. (준비되지 않은 임시 결과 등) """
+
+    g.pop('http_cache', None)
+
+
+def _apply_cache_policy(response):
+    policy = g.http_cache
+
+    if policy['vary_by_user']:
+        response.vary.add('Authorization')
+
+    if policy['vary_by_user'] and request.headers.get('Authorization'):
+        response.cache_control.private = True
+    else:
+        response.cache_control.public = True
+        if policy['shared_max_age'] is not None:
+            response.cache_control.s_maxage = policy['shared_max_age']
+
+    response.cache_control.max_age = policy['max_age']
+
+    etag = generate_etag(response.get_data())
+    response.set_etag(etag)
+
+    if_none_match = request.if_none_match
+    matched = next((etag + suffix for suffix in ENCODING_SUFFIXES if if_none_match.contains_weak(etag + suffix)), None)
+
+    if matched or if_none_match.star_tag:
+        # 본문 / Content-Type / Content-Length 는 werkzeug 가 304 응답에서 제거한다.
+        response.set_etag(matched or etag)
+        response.status_code = 304
+        response.set_data(b'')
+
+    return response
+
+
+def _choose_encoding():
+    accept = request.accept_encodings
+
+    if brotli is not None and accept['br']:
+        return 'br'
+
+    if accept['gzip']:
+        return 'gzip'
+
+    return None
+
+
+def _compress(response, config):
+    min_size = config.get('COMPRESS_MIN_SIZE', DEFAULT_COMPRESS_MIN_SIZE)
+
+    if (
+        min_size is None
+        or response.direct_passthrough
+        or response.is_streamed
+        or response.status_code < 200
+        or response.status_code in (204, 304)
+        or 'Content-Encoding' in response.headers
+        or response.mimetype not in COMPRESSIBLE_MIMETYPES
+    ):
+        return response
+
+    response.vary.add('Accept-Encoding')
+
+    encoding = _choose_encoding()
+    data = response.get_data()
+
+    if encoding is None or len(data) < min_size:
+        return response
+
+    if encoding == 'br':
+        data = brotli.compress(data, quality=config.get('COMPRESS_BROTLI_QUALITY', DEFAULT_COMPRESS_BROTLI_QUALITY))
+    else:
+        data = gzip.compress(data, compresslevel=config.get('COMPRESS_LEVEL', DEFAULT_COMPRESS_LEVEL), mtime=0)
+
+    response.set_data(data)
+    response.headers['Content-Encoding'] = encoding
+
+    etag, weak = response.get_etag()
+    if etag and not weak:
+        response.set_etag(etag + '-' + encoding)
+
+    return response
+
+
+def init_http_cache(app):
+    """ create_app 시점에 ETag / Cache-Control / 압축 처리 등록
+
+        Args:
+            app : Flask 앱
+    """
+
+    def finish_response(response):
+        if 'http_cache' in g and request.method in ('GET', 'HEAD') and response.status_code == 200:
+            response = _apply_cache_policy(response)
+
+        return _compress(response, app.config)
+
+    app.after_request(finish_response)
@@ -0,0 +1,401 @@
+""" 요청 단위 지표 수집
+
+엔드포인트별 요청 수, 상태 코드, 응답 시간(전체 / DB / JSON 직렬화) 히스토그램과
+커넥션 풀, 처리 중인 요청 수를 수집해 /metrics 에서 Prometheus text 형식으로 내보낸다.
+
+gunicorn 처럼 여러 worker 프로세스로 실행되는 경우를 위해, METRICS_DIR (혹은 PROMETHEUS_MULTIPROC_DIR
+환경 변수) 을 설정하면 각 프로세스는 자신의 지표를 프로세스별 파일(metrics_<pid>_<token>.json)에 기록하고,
+/metrics 는 모든 파일을 합산한다. 파일은 METRICS_FLUSH_INTERVAL (기본 1초) 간격으로 갱신하고, 프로세스가
+종료될 때 한 번 더 기록한다. 디렉토리를 설정하지 않으면 파일을 사용하지 않고 현재 프로세스의 지표만 내보낸다.
+
+    - counter, histogram : 종료된 worker 의 값까지 합산한다. (pid 가 재사용되어도 token 이 달라 덮어쓰지 않는다.)
+    - gauge              : 살아 있고 최근에 기록한 worker 의 값만 합산한다.
+    배포 시 METRICS_DIR 을 비우고 시작해야 이전 배포의 counter 가 합산되지 않는다.
+
+기본적인 사용 예시:
+    init_metrics(app)
+    app.add_url_rule('/metrics', view_func=MetricsView.as_view('metrics_view'))
+"""
+import atexit
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+import uuid
+
+from flask import g, has_app_context, request
+
+from utils.connection  import iter_pools
+from utils.query_stats import LATENCY_BUCKETS, add_query_listener, get_query_stats
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_FLUSH_INTERVAL = 1
+
+# 이 횟수만큼 flush 간격이 지나도록 갱신되지 않은 파일의 gauge 는 종료된 worker 로 보고 합산하지 않는다.
+STALE_FLUSH_COUNT = 5
+
+METRIC_HELP = {
+    'http_requests_total'                   : ('counter', '엔드포인트별 요청 수'),
+    'http_request_duration_seconds'         : ('histogram', '엔드포인트별 전체 응답 시간'),
+    'http_request_db_seconds'               : ('histogram', '엔드포인트별 요청당 쿼리 실행 시간 합계'),
+    'http_request_serialization_seconds'    : ('histogram', '엔드포인트별 JSON 직렬화 시간'),
+    'http_requests_in_flight'               : ('gauge', '처리 중인 요청 수'),
+    'db_pool_connections'                   : ('gauge', '커넥션 풀 커넥션 수'),
+    'db_query_duration_seconds'             : ('histogram', 'DAO 메소드별 쿼리 실행 시간'),
+}
+
+
+class _Store:
+    """ 프로세스 내부 지표 저장소
+
+        Notes:
+            key 는 (metric 이름, ((label, value), ...)) 형식이다.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.counters = dict()
+        self.histograms = dict()
+        self.in_flight = 0
+        self.last_flush = 0.0
+
+    def inc(self, name, labels, value=1):
+        key = (name, tuple(sorted(labels.items())))
+        with self.lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def observe(self, name, labels, value):
+        key = (name, tuple(sorted(labels.items())))
+        with self.lock:
+            histogram = self.histograms.get(key)
+
+            if histogram is None:
+                histogram = self.histograms[key] = {'buckets': [0] * len(LATENCY_BUCKETS), 'sum': 0.0, 'count': 0}
+
+            histogram['sum'] += value
+            histogram['count'] += 1
+
+            for index, bound in enumerate(LATENCY_BUCKETS):
+                if value <= bound:
+                    histogram['buckets'][index] += 1
+                    break
+
+
+class _Flusher:
+    """ 워커(프로세스)별 지표 파일 기록 스레드
+
+        Notes:
+            요청이 없는 worker 도 METRICS_FLUSH_INTERVAL 간격으로 파일을 갱신해 gauge 가 최신 상태로 유지된다.
+            파일 이름의 token 은 프로세스마다 새로 만든다. (fork 이후 부모 프로세스의 파일을 덮어쓰지 않는다.)
+    """
+
+    def __init__(self):
+        self.pid = None
+        self.path = None
+        self.lock = threading.Lock()
+
+    def ensure_started(self):
+        if self.pid == os.getpid():
+            return
+
+        with self.lock:
+            if self.pid == os.getpid():
+                return
+
+            self.pid = os.getpid()
+            self.path = os.path.join(_directory, 'metrics_{}_{}.json'.format(self.pid, uuid.uuid4().hex[:12]))
+            thread = threading.Thread(target=self._run, name='metrics-flusher', daemon=True)
+            thread.start()
+
+    def _run(self):
+        while True:
+            time.sleep(_flush_interval)
+            flush(force=True)
+
+
+_store = _Store()
+_flusher = _Flusher()
+_directory = None
+_flush_interval = DEFAULT_FLUSH_INTERVAL
+
+
+def _labels_key(labels):
+    return json.dumps(labels, sort_keys=True, ensure_ascii=False)
+
+
+def _snapshot():
+    """ 현재 프로세스의 지표를 파일로 기록할 수 있는 형태로 변환 """
+
+    with _store.lock:
+        counters = [[name, dict(labels), value] for (name, labels), value in _store.counters.items()]
+        histograms = [
+            [name, dict(labels), dict(histogram, buckets=list(histogram['buckets']))]
+            for (name, labels), histogram in _store.histograms.items()
+        ]
+        in_flight = _store.in_flight
+
+    for method, stats in get_query_stats().items():
+        histograms.append([
+            'db_query_duration_seconds',
+            {'method': method},
+            {'buckets': stats['buckets'], 'sum': stats['sum'], 'count': stats['count']}
+        ])
+
+    gauges = [['http_requests_in_flight', {}, in_flight]]
+
+    for name, pool in iter_pools():
+        gauges.append(['db_pool_connections', {'pool': name, 'state': 'idle'}, pool.idle])
+        gauges.append(['db_pool_connections', {'pool': name, 'state': 'in_use'}, pool.in_use])
+
+    return {'pid': os.getpid(), 'counters': counters, 'histograms': histograms, 'gauges': gauges}
+
+
+def flush(force=False):
+    """ 현재 프로세스의 지표를 프로세스별 파일에 기록 (임시 파일 작성 후 rename)
+
+        Args:
+            force : True 이면 METRICS_FLUSH_INTERVAL 과 무관하게 기록한다.
+    """
+
+    if _directory is None:
+        return
+
+    now = time.monotonic()
+
+    if not force and now - _store.last_flush < _flush_interval:
+        return
+
+    _store.last_flush = now
+    _flusher.ensure_started()
+
+    try:
+        fd, temp_path = tempfile.mkstemp(dir=_directory, prefix='.metrics_')
+        with os.fdopen(fd, 'w') as f:
+            json.dump(_snapshot(), f)
+        os.replace(temp_path, _flusher.path)
+    except OSError:
+        logger.warning('metrics flush failed', exc_info=True)
+
+
+def _is_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _flush_at_exit():
+    """ 종료되는 프로세스의 마지막 METRICS_FLUSH_INTERVAL 동안의 지표 기록 """
+
+    if _flusher.pid == os.getpid():
+        flush(force=True)
+
+
+def _read_all():
+    """ 모든 프로세스의 지표와 기록 시각 (time.time 기준) """
+
+    if _directory is None:
+        yield _snapshot(), time.time()
+        return
+
+    flush(force=True)
+
+    for filename in sorted(os.listdir(_directory)):
+        if not (filename.startswith('metrics_') and filename.endswith('.json')):
+            continue
+
+        try:
+            with open(os.path.join(_directory, filename)) as f:
+                yield json.load(f), os.fstat(f.fileno()).st_mtime
+        except (OSError, ValueError):
+            continue
+
+
+def _collect():
+    """ 모든 worker 의 지표 합산 """
+
+    counters = dict()
+    histograms = dict()
+    gauges = dict()
+    stale_before = time.time() - max(_flush_interval, 1) * STALE_FLUSH_COUNT
+
+    for data, flushed_at in _read_all():
+        for name, labels, value in data['counters']:
+            key = (name, _labels_key(labels))
+            counters[key] = counters.get(key, 0) + value
+
+        for name, labels, value in data['histograms']:
+            key = (name, _labels_key(labels))
+            merged = histograms.setdefault(key, {'buckets': [0] * len(LATENCY_BUCKETS), 'sum': 0.0, 'count': 0})
+            merged['buckets'] = [a + b for a, b in zip(merged['buckets'], value['buckets'])]
+            merged['sum'] += value['sum']
+            merged['count'] += value['count']
+
+        if flushed_at >= stale_before and _is_alive(data['pid']):
+            for name, labels, value in data['gauges']:
+                key = (name, _labels_key(labels))
+                gauges[key] = gauges.get(key, 0) + value
+
+    return counters, histograms, gauges
+
+
+def _format_labels(labels, extra=None):
+    items = list(labels.items()) + list((extra or {}).items())
+
+    if not items:
+        return ''
+
+    return '{' + ','.join(
+        '{}="{}"'.format(key, str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n'))
+        for key, value in items
+    ) + '}'
+
+
+def _format_bound(bound):
+    return '+Inf' if bound == float('inf') else repr(bound)
+
+
+def render():
+    """ Prometheus text exposition 형식의 지표 문자열
+
+        Returns:
+            /metrics 응답 본문
+    """
+
+    counters, histograms, gauges = _collect()
+    series = dict()
+
+    for (name, labels), value in counters.items():
+        series.setdefault(name, []).append((json.loads(labels), value))
+
+    for (name, labels), value in histograms.items():
+        series.setdefault(name, []).append((json.loads(labels), value))
+
+    for (name, labels), value in gauges.items():
+        series.setdefault(name, []).append((json.loads(labels), value))
+
+    lines = []
+
+    for name in sorted(series):
+        metric_type, description = METRIC_HELP.get(name, ('untyped', name))
+        lines.append('# HELP {} {}'.format(name, description))
+        lines.append('# TYPE {} {}'.format(name, metric_type))
+
+        for labels, value in series[name]:
+            if metric_type != 'histogram':
+                lines.append('{}{} {}'.format(name, _format_labels(labels), value))
+                continue
+
+            cumulative = 0
+            for bound, count in zip(LATENCY_BUCKETS, value['buckets']):
+                cumulative += count
+                lines.append('{}_bucket{} {}'.format(name, _format_labels(labels, {'le': _format_bound(bound)}), cumulative))
+
+            lines.append('{}_sum{} {}'.format(name, _format_labels(labels), value['sum']))
+            lines.append('{}_count{} {}'.format(name, _format_labels(labels), value['count']))
+
+    return '\n'.join(lines) + '\n'
+
+
+def _record_query_time(event):
+    if has_app_context() and 'metrics_start' in g:
+        g.metrics_db_time += event.elapsed
+
+
+def timed_encoder(encoder):
+    """ encode() 실행 시간을 요청의 직렬화 시간으로 기록하는 JSONEncoder 하위 클래스
+
+        Args:
+            encoder : app.json_encoder
+
+        Returns:
+            encoder 를 상속한 JSONEncoder 클래스
+    """
+
+    class TimedJSONEncoder(encoder):
+        def encode(self, obj):
+            start = time.perf_counter()
+
+            try:
+                return super().encode(obj)
+            finally:
+                if has_app_context() and 'metrics_start' in g:
+                    g.metrics_serialization_time += time.perf_counter() - start
+
+    TimedJSONEncoder.__name__ = encoder.__name__
+    return TimedJSONEncoder
+
+
+def _before_request():
+    g.metrics_start = time.perf_counter()
+    g.metrics_db_time = 0.0
+    g.metrics_serialization_time = 0.0
+
+    with _store.lock:
+        _store.in_flight += 1
+
+
+def _after_request(response):
+    if 'metrics_start' not in g:
+        return response
+
+    endpoint = request.url_rule.rule if request.url_rule else 'unmatched'
+
+    _store.inc('http_requests_total', {
+        'endpoint': endpoint,
+        'method'  : request.method,
+        'status'  : response.status_code
+    })
+    _store.observe('http_request_duration_seconds', {'endpoint': endpoint, 'method': request.method},
+                   time.perf_counter() - g.metrics_start)
+    _store.observe('http_request_db_seconds', {'endpoint': endpoint, 'method': request.method},
+                   g.metrics_db_time)
+    _store.observe('http_request_serialization_seconds', {'endpoint': endpoint, 'method': request.method},
+                   g.metrics_serialization_time)
+
+    return response
+
+
+def _teardown_request(exception=None):
+    if 'metrics_start' not in g:
+        return
+
+    with _store.lock:
+        _store.in_flight -= 1
+
+    flush()
+
+
+def init_metrics(app):
+    """ create_app 시점에 지표 수집 시작
+
+        Args:
+            app : Flask 앱
+
+        Notes:
+            app.json_encoder 를 설정한 뒤에 호출해야 직렬화 시간이 측정된다.
+    """
+
+    global _directory, _flush_interval
+
+    _directory = app.config.get('METRICS_DIR') or os.environ.get('PROMETHEUS_MULTIPROC_DIR')
+    _flush_interval = app.config.get('METRICS_FLUSH_INTERVAL', DEFAULT_FLUSH_INTERVAL)
+
+    if _directory is not None:
+        os.makedirs(_directory, exist_ok=True)
+
+        # fork 된 worker 에도 등록이 상속되고, 각 worker 는 자신의 파일에 기록한다.
+        atexit.unregister(_flush_at_exit)
+        atexit.register(_flush_at_exit)
+
+    app.json_encoder = timed_encoder(app.json_encoder)
+    app.before_request(_before_request)
+    app.after_request(_after_request)
+    app.teardown_request(_teardown_request)
+    add_query_listener(_record_query_time)
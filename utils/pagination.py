@@ -0,0 +1,78 @@
+""" 커서(keyset) 기반 페이지네이션
+
+LIMIT offset, limit 은 앞 페이지의 row 를 모두 읽고 버리므로 페이지가 깊어질수록 느려진다.
+마지막 row 의 정렬 키 값을 커서로 돌려주고, 다음 요청에서는 WHERE 절로 그 뒤의 row 부터 읽는다.
+
+    - 커서는 정렬 키 값(정수 / 문자열) 리스트를 JSON 으로 만든 뒤 URL-safe base64 로 인코딩한 문자열이다.
+      클라이언트는 내용을 해석하지 않고 next_cursor 를 그대로 cursor 파라미터로 보낸다.
+    - 마지막 페이지(요청한 개수보다 적게 조회)이면 next_cursor 는 null 이다.
+    - cursor 가 없으면 기존처럼 offset 을 사용한다.
+
+기본적인 사용 예시:
+    data['cursor'] = decode_cursor(args[3], 1)
+    result = dao.get_event_product_list(connection, data)
+    return jsonify({'message': 'success', 'result': result,
+                    'next_cursor': next_cursor(result, data['limit'], lambda row: [row['product_id']])})
+"""
+import base64
+import binascii
+import json
+
+from utils.custom_exceptions import InvalidCursor
+
+
+def encode_cursor(values):
+    """ 정렬 키 값 리스트를 커서 문자열로 변환 """
+
+    text = json.dumps(values, separators=(',', ':'))
+    return base64.urlsafe_b64encode(text.encode()).rstrip(b'=').decode()
+
+
+def decode_cursor(cursor, size):
+    """ 커서 문자열을 정렬 키 값 리스트로 변환
+
+        Args:
+            cursor : 클라이언트가 보낸 커서 (None 이면 None)
+            size   : 정렬 키 개수
+
+        Returns:
+            정렬 키 값 리스트 (정수 / 문자열), cursor 가 None 이면 None
+
+        Raises:
+            400, {'message': 'invalid_cursor', 'error_message': '커서가 유효하지 않습니다.'} : 잘못된 커서
+    """
+
+    if cursor is None:
+        return None
+
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)))
+    except (binascii.Error, ValueError):
+        raise InvalidCursor('커서가 유효하지 않습니다.')
+
+    if (
+        not isinstance(values, list)
+        or len(values) != size
+        or not all(type(value) in (int, str) for value in values)
+    ):
+        raise InvalidCursor('커서가 유효하지 않습니다.')
+
+    return values
+
+
+def next_cursor(rows, limit, key):
+    """ 다음 페이지 커서
+
+        Args:
+            rows  : 조회 결과
+            limit : 요청한 개수
+            key   : key(row) -> 정렬 키 값 리스트 (ORDER BY 순서)
+
+        Returns:
+            커서 문자열, 마지막 페이지이거나 rows 가 목록이 아니면(결과 없음 메시지 등) None
+    """
+
+    if not isinstance(rows, (list, tuple)) or not rows or len(rows) < limit:
+        return None
+
+    return encode_cursor(key(rows[-1]))
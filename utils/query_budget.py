@@ -0,0 +1,147 @@
+""" 요청 단위 쿼리 수 검사 (개발 / 테스트 환경)
+
+요청마다 실행된 쿼리 수와 같은 형태의 쿼리가 반복된 횟수를 센다.
+
+    - utils.decorator.query_budget 으로 엔드포인트별 최대 쿼리 수를 선언한다.
+    - 선언하지 않은 엔드포인트도 같은 형태의 쿼리가 QUERY_REPEAT_LIMIT 를 넘으면 경고 로그를 남긴다. (N+1 쿼리)
+
+QUERY_BUDGET_MODE (app.config):
+    raise : 예산을 넘은 요청은 500, query_budget_exceeded 로 실패 (app.testing 기본값)
+    warn  : 경고 로그만 남긴다. (app.debug 기본값)
+    off   : 검사하지 않는다. (운영 기본값)
+
+기본적인 사용 예시:
+    @query_budget(max_queries=4)
+    def get(self, product_id):
+        ...
+"""
+import logging
+import re
+
+from collections import Counter
+
+from flask import current_app, g, has_app_context, request
+
+from utils.custom_exceptions import QueryBudgetExceeded
+from utils.query_stats       import add_query_listener
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_REPEAT_LIMIT = 3
+
+MODE_RAISE = 'raise'
+MODE_WARN  = 'warn'
+MODE_OFF   = 'off'
+
+_literals = re.compile(r"'(?:[^'\\]|\\.)*'|\"(?:[^\"\\]|\\.)*\"|\b\d+(?:\.\d+)?\b|%\([a-z_0-9]+\)s|%s")
+_in_lists = re.compile(r'\(\s*\?(?:\s*,\s*\?)*\s*\)')
+
+
+def statement_shape(statement):
+    """ 리터럴과 파라미터를 ? 로 치환한 쿼리 형태
+
+        Args:
+            statement : 공백이 정리된 쿼리 문자열 (utils.query_stats.normalize_statement)
+
+        Returns:
+            같은 쿼리를 다른 값으로 실행한 경우 같은 문자열
+    """
+
+    return _in_lists.sub('(?)', _literals.sub('?', statement))
+
+
+def get_mode(app=None):
+    app = app or current_app
+    mode = app.config.get('QUERY_BUDGET_MODE')
+
+    if mode:
+        return mode
+
+    if app.testing:
+        return MODE_RAISE
+
+    if app.debug:
+        return MODE_WARN
+
+    return MODE_OFF
+
+
+def _start_request():
+    g.query_budget = {'count': 0, 'shapes': Counter(), 'checked': False}
+
+
+def _record_query(event):
+    if has_app_context() and 'query_budget' in g:
+        g.query_budget['count'] += 1
+        g.query_budget['shapes'][statement_shape(event.statement)] += 1
+
+
+def _repeated_shapes(max_repeats):
+    return [
+        (shape, count) for shape, count in g.query_budget['shapes'].most_common()
+        if count > max_repeats
+    ]
+
+
+def check_query_budget(max_queries=None, max_repeats=None):
+    """ 현재 요청의 쿼리 수 검사
+
+        Args:
+            max_queries : 허용하는 최대 쿼리 수 (None 이면 검사하지 않는다.)
+            max_repeats : 같은 형태의 쿼리를 허용하는 최대 횟수 (기본 QUERY_REPEAT_LIMIT)
+
+        Raises:
+            500, {'message': 'query_budget_exceeded', 'error_message': ...} : QUERY_BUDGET_MODE 가 raise 일 때 예산 초과
+    """
+
+    if 'query_budget' not in g:
+        return
+
+    budget = g.query_budget
+    budget['checked'] = True
+
+    if max_repeats is None:
+        max_repeats = current_app.config.get('QUERY_REPEAT_LIMIT', DEFAULT_REPEAT_LIMIT)
+
+    problems = []
+
+    if max_queries is not None and budget['count'] > max_queries:
+        problems.append('{} queries (budget {})'.format(budget['count'], max_queries))
+
+    for shape, count in _repeated_shapes(max_repeats):
+        problems.append('statement repeated {} times: {}'.format(count, shape))
+
+    if not problems:
+        return
+
+    message = '{} {}: {}'.format(request.method, request.path, '; '.join(problems))
+
+    if get_mode() == MODE_RAISE:
+        raise QueryBudgetExceeded(message)
+
+    logger.warning('query budget exceeded %s', message)
+
+
+def _finish_request(response):
+    if 'query_budget' in g and not g.query_budget['checked']:
+        max_repeats = current_app.config.get('QUERY_REPEAT_LIMIT', DEFAULT_REPEAT_LIMIT)
+
+        for shape, count in _repeated_shapes(max_repeats):
+            logger.warning('query repeated %s times in %s %s: %s', count, request.method, request.path, shape)
+
+    return response
+
+
+def init_query_budget(app):
+    """ create_app 시점에 쿼리 수 검사 시작 (QUERY_BUDGET_MODE 가 off 이면 아무것도 하지 않는다.)
+
+        Args:
+            app : Flask 앱
+    """
+
+    if get_mode(app) == MODE_OFF:
+        return
+
+    app.before_request(_start_request)
+    app.after_request(_finish_request)
+    add_query_listener(_record_query)
@@ -0,0 +1,230 @@
+""" DAO 쿼리 실행 시간 측정
+
+커넥션 풀에서 대여한 connection 의 cursor() 는 InstrumentedCursor 를 반환한다.
+execute/executemany 마다 실행 시간, row 수, 호출한 DAO 메소드 이름을 기록한다.
+
+    - 메소드별 실행 시간 히스토그램은 get_query_stats() 로 조회한다.
+    - DB['slow_query_ms'] (기본 500) 를 넘는 쿼리는 파라미터 값을 가린 채 경고 로그로 남긴다.
+    - add_query_listener 로 등록한 함수는 쿼리마다 QueryEvent 를 전달받는다.
+
+기본적인 사용 예시:
+    for method, stats in get_query_stats().items():
+        print(method, stats['count'], stats['sum'], stats['buckets'])
+"""
+import logging
+import re
+import sys
+import threading
+import time
+
+from collections import namedtuple
+from functools   import lru_cache
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SLOW_QUERY_MS = 500
+
+# 히스토그램 구간 상한 (초)
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, float('inf'))
+
+QueryEvent = namedtuple('QueryEvent', ['method', 'statement', 'elapsed', 'rowcount', 'error'])
+
+_stats = dict()
+_stats_lock = threading.Lock()
+_listeners = []
+
+_whitespace = re.compile(r'\s+')
+
+
+@lru_cache(maxsize=1024)
+def normalize_statement(statement):
+    """ 공백과 줄바꿈을 정리한 쿼리 문자열 (파라미터 값은 포함하지 않는다.) """
+
+    return _whitespace.sub(' ', statement).strip()
+
+
+def redact_params(args):
+    """ 로그용 파라미터 (값 대신 타입 이름만 남긴다.)
+
+        Args:
+            args : execute 에 전달된 파라미터 (dict, tuple, list, 단일 값 혹은 None)
+
+        Returns:
+            값이 '<타입 이름>' 으로 치환된 파라미터
+    """
+
+    if args is None:
+        return None
+
+    if isinstance(args, dict):
+        return {key: '<{}>'.format(type(value).__name__) for key, value in args.items()}
+
+    if isinstance(args, (list, tuple)):
+        return ['<{}>'.format(type(value).__name__) for value in args]
+
+    return '<{}>'.format(type(args).__name__)
+
+
+def caller_name():
+    """ 쿼리를 실행한 DAO 메소드 이름
+
+        Returns:
+            'OrderDao.get_order_list_dao' 형식의 문자열, DAO 밖에서 실행한 경우 '모듈:함수'
+    """
+
+    frame = sys._getframe(2)
+    fallback = None
+
+    while frame is not None:
+        instance = frame.f_locals.get('self')
+
+        if instance is not None and type(instance).__name__.endswith('Dao'):
+            return '{}.{}'.format(type(instance).__name__, frame.f_code.co_name)
+
+        if fallback is None and frame.f_globals.get('__name__') != __name__:
+            fallback = '{}:{}'.format(frame.f_globals.get('__name__'), frame.f_code.co_name)
+
+        frame = frame.f_back
+
+    return fallback or 'unknown'
+
+
+def add_query_listener(listener):
+    """ 쿼리 실행마다 호출할 함수 등록
+
+        Args:
+            listener : QueryEvent 를 인자로 받는 함수
+    """
+
+    if listener not in _listeners:
+        _listeners.append(listener)
+
+
+def remove_query_listener(listener):
+    if listener in _listeners:
+        _listeners.remove(listener)
+
+
+def record_query(method, statement, elapsed, rowcount, error=None):
+    """ 메소드별 쿼리 실행 시간 집계 후 listener 호출 """
+
+    with _stats_lock:
+        stats = _stats.get(method)
+
+        if stats is None:
+            stats = _stats[method] = {
+                'count'  : 0,
+                'errors' : 0,
+                'sum'    : 0.0,
+                'max'    : 0.0,
+                'rows'   : 0,
+                'buckets': [0] * len(LATENCY_BUCKETS),
+            }
+
+        stats['count'] += 1
+        stats['sum'] += elapsed
+        stats['max'] = max(stats['max'], elapsed)
+        stats['rows'] += max(rowcount or 0, 0)
+
+        if error is not None:
+            stats['errors'] += 1
+
+        for index, bound in enumerate(LATENCY_BUCKETS):
+            if elapsed <= bound:
+                stats['buckets'][index] += 1
+                break
+
+    if _listeners:
+        event = QueryEvent(method, statement, elapsed, rowcount, error)
+        for listener in list(_listeners):
+            try:
+                listener(event)
+            except Exception:
+                logger.warning('query listener failed', exc_info=True)
+
+
+def get_query_stats():
+    """ 메소드별 쿼리 실행 시간 집계 조회
+
+        Returns:
+            {
+                'OrderDao.get_order_list_dao': {
+                    'count'  : 실행 횟수,
+                    'errors' : 예외 발생 횟수,
+                    'sum'    : 누적 실행 시간(초),
+                    'max'    : 최대 실행 시간(초),
+                    'rows'   : 누적 row 수,
+                    'buckets': LATENCY_BUCKETS 구간별 실행 횟수 (누적 아님)
+                }
+            }
+    """
+
+    with _stats_lock:
+        return {
+            method: dict(stats, buckets=list(stats['buckets']))
+            for method, stats in _stats.items()
+        }
+
+
+def reset_query_stats():
+    with _stats_lock:
+        _stats.clear()
+
+
+class InstrumentedCursor:
+    """ 실행 시간을 기록하는 cursor
+
+        pymysql cursor 의 모든 속성을 그대로 위임하고, execute/executemany 만 측정한다.
+
+        Attributes:
+            cursor        : 실제 pymysql cursor 객체
+            slow_query_ms : 이 시간(ms)을 넘는 쿼리는 경고 로그를 남긴다.
+    """
+
+    def __init__(self, cursor, slow_query_ms=DEFAULT_SLOW_QUERY_MS):
+        self.cursor = cursor
+        self.slow_query_ms = slow_query_ms
+
+    def __getattr__(self, name):
+        return getattr(self.cursor, name)
+
+    def __iter__(self):
+        return iter(self.cursor)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return self.cursor.__exit__(*exc_info)
+
+    def execute(self, query, args=None):
+        return self._measure(self.cursor.execute, query, args, args)
+
+    def executemany(self, query, args):
+        args = list(args)
+        return self._measure(self.cursor.executemany, query, args, args[0] if args else None)
+
+    def _measure(self, execute, query, args, sample_args):
+        method = caller_name()
+        error = None
+        start = time.perf_counter()
+
+        try:
+            return execute(query, args)
+        except Exception as e:
+            error = e
+            raise
+        finally:
+            elapsed = time.perf_counter() - start
+            statement = normalize_statement(query)
+            record_query(method, statement, elapsed, self.cursor.rowcount, error)
+
+            if elapsed * 1000 >= self.slow_query_ms:
+                logger.warning(
+                    'slow query %.1fms %s rows=%s sql=%s params=%s',
+                    elapsed * 1000,
+                    method,
+                    self.cursor.rowcount,
+                    statement,
+                    redact_params(sample_args)
+                )
@@ -0,0 +1,126 @@
+""" 목록 전체 개수 조회 전략
+
+관리자 목록의 SELECT COUNT(*) 는 페이지 조회와 같은 join 을 처음부터 끝까지 읽으므로 이력이 쌓일수록 느려진다.
+엔드포인트(혹은 요청)마다 전체 개수를 얻는 방법을 고를 수 있도록 한다.
+
+    exact    : 매번 COUNT(*) 를 실행한다. (기본값)
+    cached   : 같은 쿼리 / 파라미터의 결과를 COUNT_CACHE_TTL 동안 워커 메모리에 보관한다.
+    estimate : COUNT(*) 대신 EXPLAIN 의 테이블별 예상 row 수(rows * filtered)를 곱해 추정한다.
+               실행 계획만 만들므로 데이터 양과 관계없이 빠르지만 오차가 크다.
+
+COUNT_STRATEGY (app.config)  : 기본 전략 (기본 exact)
+COUNT_CACHE_TTL (app.config) : cached 전략의 보관 시간 (초, 기본 30)
+
+기본적인 사용 예시:
+    total_count, strategy = count_rows(connection, total_count_sql, data, data['count_strategy'])
+"""
+import threading
+
+import pymysql
+
+from cachetools import TTLCache
+from flask import current_app
+
+from utils.custom_exceptions import InvalidCountStrategy
+
+STRATEGY_EXACT    = 'exact'
+STRATEGY_CACHED   = 'cached'
+STRATEGY_ESTIMATE = 'estimate'
+
+STRATEGIES = (STRATEGY_EXACT, STRATEGY_CACHED, STRATEGY_ESTIMATE)
+
+DEFAULT_CACHE_TTL  = 30
+DEFAULT_CACHE_SIZE = 1024
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def resolve_strategy(strategy=None):
+    """ 요청한 전략 (None 이면 COUNT_STRATEGY)
+
+        Raises:
+            400, {'message': 'invalid_count_strategy', 'error_message': ...} : 알 수 없는 전략
+    """
+
+    strategy = strategy or current_app.config.get('COUNT_STRATEGY', STRATEGY_EXACT)
+
+    if strategy not in STRATEGIES:
+        raise InvalidCountStrategy('count 는 {} 중 하나여야 합니다.'.format(', '.join(STRATEGIES)))
+
+    return strategy
+
+
+def _get_cache():
+    global _cache
+
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = TTLCache(
+                    maxsize=DEFAULT_CACHE_SIZE,
+                    ttl=current_app.config.get('COUNT_CACHE_TTL', DEFAULT_CACHE_TTL)
+                )
+
+    return _cache
+
+
+def _exact(connection, sql, params):
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return cursor.fetchone()[0]
+
+
+def _estimate(connection, sql, params):
+    """ EXPLAIN 의 예상 row 수로 결과 개수 추정 (join 한 테이블별 rows * filtered / 100 의 곱) """
+
+    with connection.cursor(pymysql.cursors.DictCursor) as cursor:
+        cursor.execute('EXPLAIN ' + sql, params)
+        plan = cursor.fetchall()
+
+    estimate = 1.0
+    for row in plan:
+        if row.get('rows') is None:
+            continue
+        estimate *= row['rows'] * float(row.get('filtered') or 100) / 100
+
+    return int(round(estimate)) if plan else 0
+
+
+def count_rows(connection, sql, params, strategy=None):
+    """ 전략에 맞게 전체 개수 조회
+
+        Args:
+            connection : 데이터베이스 연결 객체
+            sql        : 첫 번째 컬럼이 개수인 SELECT COUNT(*) 쿼리
+            params     : 쿼리 파라미터 (dict)
+            strategy   : exact / cached / estimate (None 이면 COUNT_STRATEGY)
+
+        Returns:
+            (전체 개수, 사용한 전략)
+    """
+
+    strategy = resolve_strategy(strategy)
+
+    if strategy == STRATEGY_ESTIMATE:
+        return _estimate(connection, sql, params), strategy
+
+    if strategy == STRATEGY_EXACT:
+        return _exact(connection, sql, params), strategy
+
+    # 필터 조건이 같으면 같은 쿼리 문자열이 만들어지므로 실행할 쿼리 자체를 key 로 사용한다.
+    with connection.cursor() as cursor:
+        key = cursor.mogrify(sql, params)
+
+    cache = _get_cache()
+
+    # cachetools 캐시는 조회 중에도 만료된 항목을 삭제하므로 조회도 잠금 안에서 한다.
+    with _cache_lock:
+        total_count = cache.get(key)
+
+    if total_count is None:
+        total_count = _exact(connection, sql, params)
+        with _cache_lock:
+            cache[key] = total_count
+
+    return total_count, strategy
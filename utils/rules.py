@@ -405,3 +405,25 @@ class PageRule(AbstractRule):
         if value <= 0:
             errors.append('page cannot be less than 1')
         return value, errors
+
+
+class NumberListRule(AbstractRule):
+    """ 쉼표로 구분한 숫자 목록 (예: 1,2,3)
+
+    """
+    def validate(self, value):
+        errors = []
+        if not re.match('^[0-9]+(,[0-9]+)*$', value):
+            errors.append('accept only comma separated numbers')
+        return value, errors
+
+
+class IdListRule(AbstractRule):
+    """ 1 이상의 정수 id 목록 (예: [1, 2, 3])
+
+    """
+    def validate(self, value):
+        errors = []
+        if not value or not all(type(item) is int and item > 0 for item in value):
+            errors.append('accept only non-empty list of positive integer ids')
+        return value, errors
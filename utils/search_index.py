@@ -0,0 +1,283 @@
+""" 상품 검색용 n-gram 역색인 (프로세스 내)
+
+상품명과 셀러명을 글자 단위 n-gram(기본 2-gram)으로 색인한다. 한글은 띄어쓰기와 형태가 일정하지 않아
+형태소 분석 대신 음절 n-gram 을 사용하며, NFKC 정규화로 자모가 분리된 입력(NFD)과 호환 문자도 같은 글자로 맞춘다.
+
+    - 검색어의 n-gram 을 모두 포함하는 상품을 후보로 찾고, 정규화한 이름에 검색어가 실제로 포함되는지 다시 확인한다.
+      (LIKE '%검색어%' 와 같은 결과, 대소문자 구분 없음)
+    - 검색어가 n-gram 보다 짧거나 후보가 너무 많으면 None 을 반환한다. (호출한 쪽에서 같은 조건의 LIKE 쿼리 사용)
+    - 색인은 워커(프로세스)마다 백그라운드 스레드가 처음 전체를 만들고, SEARCH_INDEX_REFRESH_INTERVAL 마다
+      updated_at 기준으로 변경분을 다시 읽는다. 요청에서는 데이터베이스에 접근하지 않는다. (첫 색인 전에는 None)
+      상품 등록은 index_product_on_commit 으로 트랜잭션이 커밋된 뒤 바로 반영한다.
+
+SEARCH_INDEX_ENABLED (app.config)          : False 이면 색인을 사용하지 않는다. (기본 True)
+SEARCH_INDEX_REFRESH_INTERVAL (app.config) : 변경분 동기화 주기 (초, 기본 30)
+SEARCH_INDEX_MAX_CANDIDATES (app.config)   : 색인 결과를 사용하는 최대 후보 수 (기본 10000)
+
+기본적인 사용 예시:
+    product_ids = search_product_ids('니트', ProductListDao().get_search_index_rows_dao)
+
+    index_product_on_commit(product_id, product_name)
+"""
+import datetime
+import logging
+import os
+import threading
+import time
+import unicodedata
+
+from collections import defaultdict
+
+from flask import current_app
+
+from utils.connection import on_commit, unit_of_work
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_GRAM_SIZE        = 2
+DEFAULT_REFRESH_INTERVAL = 30
+DEFAULT_MAX_CANDIDATES   = 10000
+
+# 동기화 기준 시각을 이만큼 앞당겨 다시 읽는다. (복제 지연, 커밋 전에 updated_at 이 기록된 트랜잭션)
+SYNC_OVERLAP = datetime.timedelta(seconds=10)
+
+
+def normalize(text):
+    """ 색인 / 검색에 사용하는 정규화 (NFKC + 대소문자 통일) """
+
+    return unicodedata.normalize('NFKC', text or '').casefold()
+
+
+def ngrams(text, size=DEFAULT_GRAM_SIZE):
+    """ 정규화한 문자열의 n-gram 집합 (size 보다 짧으면 문자열 자체) """
+
+    if len(text) <= size:
+        return {text} if text else set()
+
+    return {text[index:index + size] for index in range(len(text) - size + 1)}
+
+
+class ProductSearchIndex:
+    """ 상품명 / 셀러명 n-gram 역색인
+
+        Attributes:
+            gram_size : n-gram 길이
+            names     : {상품 id: (정규화한 상품명, 정규화한 셀러명)}
+            postings  : {n-gram: 상품 id 집합}
+            synced_at : 마지막 동기화 시점의 데이터베이스 시각 (None 이면 아직 색인하지 않음)
+    """
+
+    def __init__(self, gram_size=DEFAULT_GRAM_SIZE):
+        self.gram_size = gram_size
+        self.names = {}
+        self.postings = defaultdict(set)
+        self.synced_at = None
+        self.lock = threading.RLock()
+
+    @property
+    def ready(self):
+        return self.synced_at is not None
+
+    def __len__(self):
+        return len(self.names)
+
+    def _grams(self, names):
+        return set().union(*(ngrams(name, self.gram_size) for name in names))
+
+    def add(self, product_id, product_name, seller_name=None):
+        """ 상품 색인 (이미 있으면 새 이름으로 교체, seller_name 이 None 이면 기존 셀러명 유지) """
+
+        with self.lock:
+            previous = self.names.get(product_id)
+
+            if seller_name is None and previous is not None:
+                names = (normalize(product_name), previous[1])
+            else:
+                names = (normalize(product_name), normalize(seller_name))
+
+            self._remove(product_id)
+            self.names[product_id] = names
+
+            for gram in self._grams(names):
+                self.postings[gram].add(product_id)
+
+    def remove(self, product_id):
+        with self.lock:
+            self._remove(product_id)
+
+    def _remove(self, product_id):
+        names = self.names.pop(product_id, None)
+
+        if names is None:
+            return
+
+        for gram in self._grams(names):
+            posting = self.postings.get(gram)
+            if posting is not None:
+                posting.discard(product_id)
+                if not posting:
+                    del self.postings[gram]
+
+    def clear(self):
+        with self.lock:
+            self.names.clear()
+            self.postings.clear()
+            self.synced_at = None
+
+    def search(self, query, max_candidates=DEFAULT_MAX_CANDIDATES):
+        """ 검색어를 상품명 혹은 셀러명에 포함하는 상품 id
+
+            Args:
+                query          : 검색어
+                max_candidates : 이보다 많이 찾으면 None
+
+            Returns:
+                상품 id 리스트, 색인을 사용할 수 없으면 None
+                (색인 전 / 검색어가 n-gram 보다 짧음 / 후보가 너무 많음)
+        """
+
+        query = normalize(query)
+
+        if not self.ready or len(query) < self.gram_size:
+            return None
+
+        with self.lock:
+            postings = []
+
+            for gram in ngrams(query, self.gram_size):
+                posting = self.postings.get(gram)
+                if not posting:
+                    return []
+                postings.append(posting)
+
+            postings.sort(key=len)
+            candidates = set(postings[0])
+
+            for posting in postings[1:]:
+                candidates &= posting
+                if not candidates:
+                    return []
+
+            product_ids = [
+                product_id for product_id in candidates
+                if query in self.names[product_id][0] or query in self.names[product_id][1]
+            ]
+
+        if len(product_ids) > max_candidates:
+            return None
+
+        return product_ids
+
+    def sync(self, fetch):
+        """ 데이터베이스 변경분 반영 (색인 전이면 전체 상품)
+
+            Args:
+                fetch : fetch(since) -> (데이터베이스 현재 시각, row iterable)
+                        since 가 None 이면 전체 상품, 아니면 그 이후 변경된 상품
+                        row 는 product_id, product_name, seller_name, is_deleted 를 가진 dict
+        """
+
+        since = self.synced_at - SYNC_OVERLAP if self.synced_at is not None else None
+        synced_at, rows = fetch(since)
+
+        for row in rows:
+            if row['is_deleted']:
+                self.remove(row['product_id'])
+            else:
+                self.add(row['product_id'], row['product_name'], row['seller_name'])
+
+        self.synced_at = synced_at
+
+
+product_search_index = ProductSearchIndex()
+
+
+class _Refresher:
+    """ 워커(프로세스)별 색인 동기화 스레드 """
+
+    def __init__(self):
+        self.pid = None
+        self.lock = threading.Lock()
+
+    def ensure_started(self, app, database, load):
+        if self.pid == os.getpid():
+            return
+
+        with self.lock:
+            if self.pid == os.getpid():
+                return
+
+            # fork 이전 프로세스의 색인은 버리지 않는다. (synced_at 이후 변경분부터 이어서 동기화)
+            self.pid = os.getpid()
+            thread = threading.Thread(
+                target=self._run, args=(app, database, load), name='search-index-refresher', daemon=True
+            )
+            thread.start()
+
+    def _run(self, app, database, load):
+        while True:
+            try:
+                sync_index(app, database, load)
+            except Exception:
+                logger.exception('search index sync failed')
+
+            time.sleep(app.config.get('SEARCH_INDEX_REFRESH_INTERVAL', DEFAULT_REFRESH_INTERVAL))
+
+
+_refresher = _Refresher()
+
+
+def sync_index(app, database, load):
+    """ 색인 동기화 (색인 전이면 전체 생성)
+
+        Args:
+            app      : Flask 앱
+            database : app.config['DB']
+            load     : load(connection, since) -> ProductSearchIndex.sync 의 fetch 반환 값
+    """
+
+    start = time.perf_counter()
+    building = not product_search_index.ready
+
+    with app.app_context():
+        with unit_of_work(database, read_only=True, replica=True) as connection:
+            product_search_index.sync(lambda since: load(connection, since))
+
+    if building:
+        logger.info('search index built: %s products, %.1fms',
+                    len(product_search_index), (time.perf_counter() - start) * 1000)
+
+
+def search_product_ids(query, load):
+    """ 검색어에 해당하는 상품 id (상품 검색 서비스, 데이터베이스에 접근하지 않는다.)
+
+        Args:
+            query : 검색어
+            load  : 색인 동기화에 사용할 조회 함수 (sync_index)
+
+        Returns:
+            상품 id 리스트, 색인을 사용할 수 없으면 None (같은 조건의 LIKE 검색 사용)
+    """
+
+    config = current_app.config
+
+    if not config.get('SEARCH_INDEX_ENABLED', True):
+        return None
+
+    _refresher.ensure_started(current_app._get_current_object(), config['DB'], load)
+
+    return product_search_index.search(query, config.get('SEARCH_INDEX_MAX_CANDIDATES', DEFAULT_MAX_CANDIDATES))
+
+
+def index_product_on_commit(product_id, product_name):
+    """ 현재 요청의 트랜잭션이 커밋된 뒤 등록한 상품을 색인에 반영 (셀러명은 다음 동기화에서 채운다.)
+
+        Notes:
+            rollback 되면 반영하지 않는다. 색인 전이면 전체 색인에 포함되므로 반영하지 않는다.
+    """
+
+    def index():
+        if product_search_index.ready:
+            product_search_index.add(product_id, product_name)
+
+    on_commit(index)
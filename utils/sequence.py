@@ -0,0 +1,119 @@
+""" 블록 단위 시퀀스 채번
+
+주문번호처럼 날짜별로 1부터 증가하는 번호를 발급한다.
+워커(프로세스)는 시퀀스 테이블(order_number_sequences, migrations/001_order_number_sequences.sql)에서
+SEQUENCE_BLOCK_SIZE 개의 번호를 한 번에 예약하고, 예약한 번호를 다 쓸 때까지 데이터베이스에 접근하지 않는다.
+
+    - 예약은 커넥션 풀과 분리된 워커 전용 autocommit 커넥션에서 한 문장으로 처리하므로
+      요청이 커넥션 풀을 모두 사용 중이어도 기다리지 않고, 시퀀스 row 의 잠금은 예약하는 순간에만 잡힌다.
+    - 날짜는 예약할 때 데이터베이스 시각(orders.created_at 과 같은 NOW())에서 가져오고,
+      데이터베이스 기준으로 날짜가 바뀌면 남은 번호를 버리고 새 날짜의 블록을 예약한다.
+    - 워커가 재시작되거나 주문이 rollback 되면 예약한 번호 중 일부는 사용되지 않는다. (번호가 연속이 아닐 수 있다.)
+    - 워커마다 다른 블록을 사용하므로 번호 순서와 주문 시각 순서는 일치하지 않을 수 있다.
+
+SEQUENCE_BLOCK_SIZE (app.config) : 한 번에 예약하는 번호 개수 (기본 10)
+
+기본적인 사용 예시:
+    day, sequence = next_daily_value(ORDER_NUMBER_SEQUENCE, store_order_dao.reserve_sequence_block_dao)
+"""
+import os
+import threading
+import time
+
+from flask import current_app
+
+from utils.connection import get_dedicated_connection
+
+ORDER_NUMBER_SEQUENCE = 'order'
+
+DEFAULT_BLOCK_SIZE = 10
+
+
+class SequenceAllocator:
+    """ 워커(프로세스)별 시퀀스 블록
+
+        Attributes:
+            blocks     : {시퀀스 이름: [날짜, 다음 값, 블록의 끝(미포함), 날짜가 바뀌는 시각(time.monotonic)]}
+            connection : 블록 예약에 사용하는 워커 전용 커넥션 (처음 예약할 때 연결)
+    """
+
+    def __init__(self):
+        self.blocks = {}
+        self.connection = None
+        self.pid = os.getpid()
+        self.lock = threading.Lock()
+
+    def next_value(self, name, reserve, database, block_size):
+        """ 다음 번호
+
+            Args:
+                name       : 시퀀스 이름
+                reserve    : reserve(connection, {'name': 이름, 'size': 개수}) -> {'day', 'start', 'expires_in'}
+                database   : app.config['DB']
+                block_size : 한 번에 예약할 번호 개수
+
+            Returns:
+                ('YYYYMMDD', 번호)
+        """
+
+        with self.lock:
+            # fork 이전 프로세스의 블록 / 커넥션을 이어서 쓰면 부모 / 자식 프로세스가 같은 번호를 발급한다.
+            if self.pid != os.getpid():
+                self.blocks = {}
+                self.connection = None
+                self.pid = os.getpid()
+
+            block = self.blocks.get(name)
+
+            if block is None or block[1] >= block[2] or time.monotonic() >= block[3]:
+                block = self.blocks[name] = self._reserve(name, reserve, database, block_size)
+
+            value = block[1]
+            block[1] += 1
+            return block[0], value
+
+    def _reserve(self, name, reserve, database, block_size):
+        try:
+            if self.connection is None:
+                self.connection = get_dedicated_connection(database)
+            else:
+                self.connection.ping(reconnect=True)
+
+            reserved = reserve(self.connection, {'name': name, 'size': block_size})
+        except Exception:
+            self._close()
+            raise
+
+        start = reserved['start']
+        return [reserved['day'], start, start + block_size, time.monotonic() + reserved['expires_in']]
+
+    def _close(self):
+        connection, self.connection = self.connection, None
+
+        if connection is not None:
+            try:
+                connection.close()
+            except Exception:
+                pass
+
+
+_allocator = SequenceAllocator()
+
+
+def next_daily_value(sequence, reserve):
+    """ 날짜별 시퀀스의 다음 번호
+
+        Args:
+            sequence : 시퀀스 이름 (ORDER_NUMBER_SEQUENCE 등)
+            reserve  : 블록 예약에 사용할 DAO 메소드 (SequenceAllocator.next_value)
+
+        Returns:
+            ('YYYYMMDD', 번호) 날짜는 데이터베이스 기준
+    """
+
+    return _allocator.next_value(
+        sequence,
+        reserve,
+        current_app.config['DB'],
+        current_app.config.get('SEQUENCE_BLOCK_SIZE', DEFAULT_BLOCK_SIZE)
+    )
@@ -0,0 +1,284 @@
+""" jsonify 용 JSON 직렬화
+
+app.json_encoder 로 사용하는 FastJSONEncoder 를 정의한다. 기존 app.CustomJSONEncoder 와 출력이 바이트 단위로 같다.
+
+    - Decimal, datetime, date 는 타입별로 미리 만들어 둔 변환 함수를 dict 에서 찾아 바로 변환한다.
+      (isinstance 검사와 iter() 시도를 객체마다 반복하지 않는다. 하위 클래스는 처음 한 번만 MRO 로 찾는다.)
+    - 들여쓰기 출력(app.debug)은 generator 대신 하나의 list 에 조각을 append 한 뒤 한 번에 join 한다.
+      들여쓰기가 없으면 표준 라이브러리의 C 인코더를 그대로 사용한다.
+
+JSON_ENCODER (app.config):
+    fast   : FastJSONEncoder (기본값)
+    legacy : app.CustomJSONEncoder
+
+기본적인 사용 예시:
+    app.json_encoder = get_json_encoder(app.config.get('JSON_ENCODER'), CustomJSONEncoder)
+
+Notes:
+    순환 참조 검사(check_circular)는 하지 않는다. 순환 참조가 있으면 ValueError 대신 RecursionError 가 발생한다.
+"""
+import datetime
+import decimal
+
+from json.encoder import encode_basestring, encode_basestring_ascii, INFINITY
+
+from flask.json import JSONEncoder
+from werkzeug.http import http_date
+
+ENCODER_FAST   = 'fast'
+ENCODER_LEGACY = 'legacy'
+
+
+def _encode_datetime(obj):
+    return obj.isoformat(sep=' ')
+
+
+def _encode_date(obj):
+    # CustomJSONEncoder 에서 date.isoformat(sep=' ') 는 TypeError 가 발생해 flask 의 JSONEncoder.default 로 넘어간다.
+    return http_date(obj.timetuple())
+
+
+# 순서가 중요하다. (datetime 은 date 의 하위 클래스)
+_CONVERTERS = {
+    datetime.datetime: _encode_datetime,
+    datetime.date    : _encode_date,
+    decimal.Decimal  : float,
+}
+
+
+class FastJSONEncoder(JSONEncoder):
+    """ 타입별 변환 함수를 미리 등록해 둔 JSONEncoder
+
+        Attributes:
+            converters : {타입: 변환 함수}, 등록되지 않은 타입은 처음 만났을 때 MRO 로 찾아 캐시한다.
+    """
+
+    converters = dict(_CONVERTERS)
+
+    def default(self, obj):
+        return self._converter(type(obj))(obj)
+
+    def _converter(self, cls):
+        converter = self.converters.get(cls)
+
+        if converter is None:
+            converter = next(
+                (self.converters[base] for base in cls.__mro__ if base in self.converters),
+                self._fallback
+            )
+            self.converters[cls] = converter
+
+        return converter
+
+    def _fallback(self, obj):
+        # 등록되지 않은 타입은 CustomJSONEncoder 와 같은 순서로 처리한다.
+        try:
+            iterable = iter(obj)
+        except TypeError:
+            pass
+        else:
+            return list(iterable)
+        return JSONEncoder.default(self, obj)
+
+    def encode(self, obj):
+        if self.indent is None:
+            # 들여쓰기가 없으면 표준 라이브러리의 C 인코더가 더 빠르다. (default 만 타입별 변환 함수 사용)
+            return super().encode(obj)
+
+        chunks = []
+        _make_encoder(self, chunks.append)(obj, 0)
+        return ''.join(chunks)
+
+
+def _make_encoder(encoder, append):
+    """ json.encoder._make_iterencode 와 같은 출력을 append 로 쓰는 함수 생성 """
+
+    default = encoder.default
+    allow_nan = encoder.allow_nan
+    skipkeys = encoder.skipkeys
+    sort_keys = encoder.sort_keys
+    item_separator = encoder.item_separator
+    key_separator = encoder.key_separator
+    encode_string = encode_basestring_ascii if encoder.ensure_ascii else encode_basestring
+
+    indent = encoder.indent
+    if indent is not None and not isinstance(indent, str):
+        indent = ' ' * indent
+
+    int_repr = int.__repr__
+    float_repr = float.__repr__
+
+    # 깊이별 들여쓰기 문자열 캐시
+    newlines = {}
+
+    def newline(level):
+        text = newlines.get(level)
+        if text is None:
+            text = newlines[level] = '\n' + indent * level
+        return text
+
+    def encode_float(obj):
+        if obj != obj:
+            text = 'NaN'
+        elif obj == INFINITY:
+            text = 'Infinity'
+        elif obj == -INFINITY:
+            text = '-Infinity'
+        else:
+            return float_repr(obj)
+
+        if not allow_nan:
+            raise ValueError('Out of range float values are not JSON compliant: ' + repr(obj))
+
+        return text
+
+    def encode_key(key):
+        if isinstance(key, str):
+            return key
+        if isinstance(key, float):
+            return encode_float(key)
+        if key is True:
+            return 'true'
+        if key is False:
+            return 'false'
+        if key is None:
+            return 'null'
+        if isinstance(key, int):
+            return int_repr(key)
+        if skipkeys:
+            return None
+        raise TypeError(f'keys must be str, int, float, bool or None, not {key.__class__.__name__}')
+
+    def encode_list(obj, level):
+        if not obj:
+            append('[]')
+            return
+
+        if indent is not None:
+            level += 1
+            separator = item_separator + newline(level)
+            append('[' + newline(level))
+        else:
+            separator = item_separator
+            append('[')
+
+        first = True
+        for value in obj:
+            if first:
+                first = False
+            else:
+                append(separator)
+
+            cls = type(value)
+            if cls is str:
+                append(encode_string(value))
+            elif cls is int:
+                append(int_repr(value))
+            elif value is None:
+                append('null')
+            else:
+                encode_value(value, level)
+
+        if indent is not None:
+            append(newline(level - 1))
+        append(']')
+
+    def encode_dict(obj, level):
+        if not obj:
+            append('{}')
+            return
+
+        if indent is not None:
+            level += 1
+            separator = item_separator + newline(level)
+            append('{' + newline(level))
+        else:
+            separator = item_separator
+            append('{')
+
+        first = True
+        for key, value in (sorted(obj.items()) if sort_keys else obj.items()):
+            if type(key) is not str:
+                key = encode_key(key)
+                if key is None:
+                    continue
+
+            if first:
+                first = False
+            else:
+                append(separator)
+
+            append(encode_string(key))
+            append(key_separator)
+
+            # 가장 흔한 값은 함수 호출 없이 바로 쓴다.
+            cls = type(value)
+            if cls is str:
+                append(encode_string(value))
+            elif cls is int:
+                append(int_repr(value))
+            elif value is None:
+                append('null')
+            else:
+                encode_value(value, level)
+
+        if indent is not None:
+            append(newline(level - 1))
+        append('}')
+
+    def encode_value(obj, level):
+        cls = type(obj)
+
+        if cls is str:
+            append(encode_string(obj))
+        elif obj is None:
+            append('null')
+        elif obj is True:
+            append('true')
+        elif obj is False:
+            append('false')
+        elif cls is int:
+            append(int_repr(obj))
+        elif cls is float:
+            append(encode_float(obj))
+        elif cls is dict:
+            encode_dict(obj, level)
+        elif cls is list or cls is tuple:
+            encode_list(obj, level)
+        elif isinstance(obj, str):
+            append(encode_string(obj))
+        elif isinstance(obj, int):
+            append(int_repr(obj))
+        elif isinstance(obj, float):
+            append(encode_float(obj))
+        elif isinstance(obj, (list, tuple)):
+            encode_list(obj, level)
+        elif isinstance(obj, dict):
+            encode_dict(obj, level)
+        else:
+            encode_value(default(obj), level)
+
+    return encode_value
+
+
+def get_json_encoder(name, legacy):
+    """ JSON_ENCODER 설정에 맞는 JSONEncoder 클래스
+
+        Args:
+            name   : app.config['JSON_ENCODER'] (None 이면 fast)
+            legacy : legacy 일 때 사용할 클래스 (app.CustomJSONEncoder)
+
+        Returns:
+            JSONEncoder 하위 클래스
+
+        Raises:
+            ValueError : 알 수 없는 이름
+    """
+
+    if name in (None, ENCODER_FAST):
+        return FastJSONEncoder
+
+    if name == ENCODER_LEGACY:
+        return legacy
+
+    raise ValueError('unknown JSON_ENCODER: {}'.format(name))
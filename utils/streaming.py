@@ -0,0 +1,194 @@
+""" 대용량 목록 응답 스트리밍
+
+관리자 목록 조회처럼 한 번에 수천 건을 반환하는 응답을 server-side cursor(SSDictCursor)로 읽으면서
+JSON 배열 조각 단위로 내보낸다. fetchall() 과 jsonify 로 전체 결과를 메모리에 올리지 않으므로
+페이지 크기와 관계없이 워커 메모리가 일정하다.
+
+    - 응답 본문의 형태는 jsonify 와 같다. (들여쓰기 없이 출력)
+    - 전체 개수는 본문과 X-Total-Count 헤더에 함께 담는다.
+    - 스트리밍 여부는 ?stream=true/false 로 지정하며, 생략하면 요청한 개수가 STREAM_THRESHOLD 이상일 때 스트리밍한다.
+
+STREAM_THRESHOLD (app.config) : 스트리밍을 시작하는 요청 개수 (기본 500)
+STREAM_BATCH_SIZE (app.config): 한 번에 fetch / 전송하는 row 수 (기본 200)
+
+기본적인 사용 예시:
+    if wants_stream(data['length']):
+        def build(connection):
+            result = self.service.get_orders_service(connection, data, stream=True)
+            return {'message': 'success', 'totalCount': result['total_count'], 'results': result['order_lists']}, \\
+                result['total_count']
+
+        return stream_json(self.database, build)
+
+Notes:
+    server-side cursor 는 결과를 모두 읽기 전까지 같은 커넥션으로 다른 쿼리를 실행할 수 없으므로
+    전체 개수 등 다른 쿼리는 iter_unbuffered 보다 먼저 실행해야 한다.
+    스트리밍이 시작된 뒤 발생한 에러는 상태 코드를 바꿀 수 없어 응답이 중간에 끊긴다. (로그로 확인)
+"""
+import itertools
+import json
+import logging
+import types
+
+import pymysql
+
+from flask import Response, current_app, request, stream_with_context
+
+from utils.connection import unit_of_work
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_STREAM_THRESHOLD  = 500
+DEFAULT_STREAM_BATCH_SIZE = 200
+
+TOTAL_COUNT_HEADER = 'X-Total-Count'
+
+# 본문에서 스트리밍할 목록의 위치 표시
+_ROWS_MARKER = '\x00streamed-rows\x00'
+
+
+def wants_stream(size):
+    """ 스트리밍 응답 여부
+
+        Args:
+            size : 요청한 목록 개수 (length, limit 등)
+
+        Returns:
+            ?stream 값 (지정한 경우) 혹은 size >= STREAM_THRESHOLD
+    """
+
+    flag = request.args.get('stream')
+
+    if flag is not None:
+        return flag.lower() in ('1', 'true')
+
+    try:
+        return int(size) >= current_app.config.get('STREAM_THRESHOLD', DEFAULT_STREAM_THRESHOLD)
+    except (TypeError, ValueError):
+        return False
+
+
+def iter_unbuffered(connection, sql, args=None):
+    """ server-side cursor 로 조회한 row 를 하나씩 반환
+
+        Args:
+            connection : 데이터베이스 연결 객체
+            sql        : 조회 쿼리
+            args       : 쿼리 파라미터
+
+        Returns:
+            dict row generator (첫 row 를 요청하는 시점에 쿼리를 실행한다.)
+    """
+
+    size = current_app.config.get('STREAM_BATCH_SIZE', DEFAULT_STREAM_BATCH_SIZE)
+
+    # cursor 를 닫을 때 읽지 않은 row 를 모두 버리므로 중간에 멈춰도 커넥션을 재사용할 수 있다.
+    with connection.cursor(pymysql.cursors.SSDictCursor) as cursor:
+        cursor.execute(sql, args)
+
+        while True:
+            rows = cursor.fetchmany(size)
+            if not rows:
+                return
+            yield from rows
+
+
+def _split_envelope(envelope, encoder):
+    """ 본문을 목록 앞 / 목록 / 목록 뒤로 나눈다. (목록은 본문에 하나만 있어야 한다.) """
+
+    found = []
+
+    def default(obj):
+        if not found and isinstance(obj, types.GeneratorType):
+            found.append(obj)
+            return _ROWS_MARKER
+        return encoder.default(obj)
+
+    text = json.dumps(
+        envelope,
+        cls=current_app.json_encoder,
+        default=default,
+        ensure_ascii=current_app.config['JSON_AS_ASCII'],
+        sort_keys=current_app.config['JSON_SORT_KEYS'],
+        separators=(',', ':')
+    )
+
+    if not found:
+        raise ValueError('streamed response has no row iterator')
+
+    head, tail = text.split(json.dumps(_ROWS_MARKER), 1)
+    return head + '[', found[0], ']' + tail
+
+
+def _generate(database, build, replica):
+    size = current_app.config.get('STREAM_BATCH_SIZE', DEFAULT_STREAM_BATCH_SIZE)
+    encoder = current_app.json_encoder(
+        ensure_ascii=current_app.config['JSON_AS_ASCII'],
+        sort_keys=current_app.config['JSON_SORT_KEYS'],
+        separators=(',', ':')
+    )
+
+    with unit_of_work(database, read_only=True, replica=replica) as connection:
+        envelope, total_count = build(connection)
+        head, rows, tail = _split_envelope(envelope, encoder)
+
+        try:
+            # 첫 조각을 만든 뒤에 응답을 시작한다. (쿼리 에러를 일반 에러 응답으로 반환)
+            batch = [encoder.encode(row) for row in itertools.islice(rows, size)]
+            yield head + ','.join(batch), total_count
+
+            while batch:
+                batch = [encoder.encode(row) for row in itertools.islice(rows, size)]
+                if batch:
+                    yield ',' + ','.join(batch)
+
+            yield tail
+        except GeneratorExit:
+            # 클라이언트가 연결을 끊은 경우 teardown 을 기다리지 않고 바로 반납한다.
+            # (app.debug 에서는 예외로 끝난 context 가 다음 요청 전까지 남아 있다.)
+            rows.close()
+            connection.close()
+            raise
+        finally:
+            # 커넥션을 반납하기 전에 server-side cursor 를 닫는다.
+            rows.close()
+
+
+def _resume(first, chunks):
+    try:
+        yield first
+        yield from chunks
+    except Exception:
+        logger.exception('streamed response aborted %s %s', request.method, request.path)
+        raise
+
+
+def stream_json(database, build, replica=False):
+    """ 목록을 조각 단위로 내보내는 JSON 응답
+
+        Args:
+            database : app.config['DB']
+            build    : build(connection) -> (응답 본문 dict, 전체 개수)
+                       본문에는 row generator 가 하나 있어야 하며, 그 위치에 JSON 배열을 쓴다.
+            replica  : True 이면 읽기 전용 복제본을 사용한다.
+
+        Returns:
+            200, application/json 스트리밍 응답 (X-Total-Count 헤더 포함)
+
+        Raises:
+            build 혹은 첫 조각을 만드는 중에 발생한 에러 (응답 시작 전이므로 일반 에러 응답으로 처리된다.)
+    """
+
+    chunks = _generate(database, build, replica)
+    first, total_count = next(chunks)
+
+    response = Response(
+        stream_with_context(_resume(first, chunks)),
+        status=200,
+        mimetype=current_app.config['JSONIFY_MIMETYPE']
+    )
+
+    if total_count is not None:
+        response.headers[TOTAL_COUNT_HEADER] = str(total_count)
+
+    return response
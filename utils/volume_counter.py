@@ -0,0 +1,52 @@
+""" 샤딩된 판매량 / 북마크 수 카운터
+
+bookmark_volumes.bookmark_count, product_sales_volumes.sales_count 를 요청마다 직접 갱신하면
+인기 상품의 row 하나에 잠금이 몰린다. 쓰기 요청은 상품당 VOLUME_COUNTER_SLOTS 개의 슬롯(volume_counter_shards,
+migrations/004_volume_counter_shards.sql) 중 무작위 하나에 증감만 누적하고, flask fold-volume-counters 가
+주기적으로 슬롯을 합산해 집계 컬럼에 반영한다.
+
+    - 조회(정렬 포함)는 지금처럼 집계 컬럼을 읽으므로 비용이 같다. 대신 반영 주기만큼 늦게 바뀐다.
+    - 슬롯의 delta 는 signed 이므로 감소가 먼저 기록되어도 오류가 나지 않는다.
+      (반영할 때 집계 컬럼은 0 미만이 되지 않도록 맞춘다.)
+    - 여러 슬롯을 한 문장으로 기록할 때는 (product_id, slot) 순서로 정렬해 잠금 순서를 맞춘다.
+
+VOLUME_COUNTER_SLOTS (app.config) : 상품당 슬롯 수 (기본 16)
+
+기본적인 사용 예시:
+    volume_counter_dao.add_volume_deltas_dao(connection, {'deltas': volume_deltas(BOOKMARK_VOLUME, {product_id: 1})})
+"""
+import random
+
+from flask import current_app
+
+BOOKMARK_VOLUME = 'bookmark'
+SALES_VOLUME    = 'sales'
+
+# {카운터 이름: (집계 테이블, 집계 컬럼)}
+VOLUME_TARGETS = {
+    BOOKMARK_VOLUME: ('bookmark_volumes', 'bookmark_count'),
+    SALES_VOLUME: ('product_sales_volumes', 'sales_count'),
+}
+
+DEFAULT_SLOTS = 16
+
+
+def volume_deltas(name, counts):
+    """ 슬롯에 기록할 증감 목록
+
+        Args:
+            name   : 카운터 이름 (BOOKMARK_VOLUME, SALES_VOLUME)
+            counts : {product_id: 증감}
+
+        Returns:
+            [{'name', 'product_id', 'slot', 'delta'}, ...] (product_id, slot 순서, 증감이 0 인 상품 제외)
+    """
+
+    slots = current_app.config.get('VOLUME_COUNTER_SLOTS', DEFAULT_SLOTS)
+
+    deltas = [
+        {'name': name, 'product_id': int(product_id), 'slot': random.randrange(slots), 'delta': delta}
+        for product_id, delta in counts.items() if delta
+    ]
+
+    return sorted(deltas, key=lambda item: (item['product_id'], item['slot']))
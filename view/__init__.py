@@ -10,12 +10,13 @@ create_endpoints 함수가 정의되어 있는 곳. 함수 안에 사용할 url
 
 # service
 from .store.user_view          import SignUpView, SignInView, GoogleSocialSignInView
-from .store.product_list_view  import ProductListView, ProductSearchView, ProductDetailView
+from .store.product_list_view  import ProductListView, ProductSearchView, ProductDetailView, ProductAutocompleteView, \
+    ProductBatchDetailView
 from .store.category_list_view import CategoryListView
 from .store.destination_view import DestinationView, DestinationDetailView
 from .store.cart_item_view import CartItemView, CartItemAddView
 from .store.sender_view import SenderView
-from .store.store_order_view import StoreOrderView, StoreOrderAddView
+from .store.store_order_view import StoreOrderView, StoreOrderAddView, StockReservationView
 from .store.bookmark_view import BookmarkView
 from .store.event_list_view import EventBannerListView, EventDetailInformationView, EventDetailProductListView, EventDetailButtonListView
 from .store.product_enquiry_view import ProductEnquiryListView, MyPageEnquiryListView
@@ -39,6 +40,8 @@ from .admin.product_view import (
     CreateProductView
 )
 
+from .metrics_view import MetricsView
+
 
 from utils.error_handler import error_handle
 
@@ -96,6 +99,14 @@ def create_endpoints(app, services, database):
                          product_list_service,
                          database
                      ))
+    # product_batch_detail
+    app.add_url_rule('/products/batch',
+                     view_func=ProductBatchDetailView.as_view(
+                         'product_batch_detail',
+                         product_list_service,
+                         database
+                     ))
+
     # product_search
     app.add_url_rule('/products/search',
                      view_func=ProductSearchView.as_view(
@@ -104,6 +115,14 @@ def create_endpoints(app, services, database):
                          database
                      ))
 
+    # product_autocomplete
+    app.add_url_rule('/products/autocomplete',
+                     view_func=ProductAutocompleteView.as_view(
+                         'product_autocomplete',
+                         product_list_service,
+                         database
+                     ))
+
     # destination 상세 정보 불러오기
     app.add_url_rule('/destination/<destination_id>',
                      view_func=DestinationDetailView.as_view(
@@ -250,6 +269,14 @@ def create_endpoints(app, services, database):
                         database
                     ))
 
+    # 결제 진행 중 재고 예약 / 해제 엔드포인트
+    app.add_url_rule('/checkout/reservation',
+                    view_func=StockReservationView.as_view(
+                        'stock_reservation_view',
+                        store_order_service,
+                        database
+                    ))
+
     # 셀러샵 셀러 정보 조회 엔드포인트
     app.add_url_rule('/shops/<int:seller_id>',
                     view_func=SellerShopView.as_view(
@@ -463,6 +490,14 @@ def create_endpoints(app, services, database):
 # 장재원 ◟( ˘ ³˘)◞ ♡
 # ----------------------------------------------------------------------------------------------------------------------
 
+# ----------------------------------------------------------------------------------------------------------------------
+# 공통
+# ----------------------------------------------------------------------------------------------------------------------
+    app.add_url_rule('/metrics',
+                     view_func=MetricsView.as_view(
+                         'metrics_view'
+                     ))
+
 # ----------------------------------------------------------------------------------------------------------------------
     # don't touch this
     error_handle(app)
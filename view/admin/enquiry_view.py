@@ -2,8 +2,8 @@ import json
 
 from flask import jsonify, request
 from flask.views import MethodView
-from utils.connection import get_connection
-from utils.custom_exceptions import DatabaseCloseFail, DateMissingOne, EventSearchTwoInput
+from utils.connection import unit_of_work
+from utils.custom_exceptions import DateMissingOne, EventSearchTwoInput
 
 from utils.rules import NumberRule, EventStatusRule, DateRule, PageRule
 from flask_request_validator import (
@@ -49,20 +49,10 @@ class EnquiryView(MethodView):
             'response_date': args[10]
         }
 
-        try:
-            connection = get_connection(self.database)
+        with unit_of_work(self.database) as connection:
             enquiries = self.service.get_enquiry_service(connection, data)
-            return jsonify({'message': 'success', 'result': enquiries})
 
-        except Exception as e:
-            raise e
-
-        finally:
-            try:
-                if connection:
-                    connection.close()
-            except Exception:
-                raise DatabaseCloseFail('database close fail')
+        return jsonify({'message': 'success', 'result': enquiries})
 
     @validate_params(
         Param('enquiry_id', JSON, int, required=True)
@@ -72,21 +62,10 @@ class EnquiryView(MethodView):
             'enquiry_id': args[0]
         }
 
-        try:
-            connection = get_connection(self.database)
+        with unit_of_work(self.database) as connection:
             self.service.delete_enquiry_service(connection, data)
-            connection.commit()
-            return {'message': 'success'}
-
-        except Exception as e:
-            raise e
 
-        finally:
-            try:
-                if connection:
-                    connection.close()
-            except Exception:
-                raise DatabaseCloseFail('database close fail')
+        return {'message': 'success'}
 
 
 class AnswerView(MethodView):
@@ -103,20 +82,10 @@ class AnswerView(MethodView):
             'enquiry_id': args[0]
         }
 
-        try:
-            connection = get_connection(self.database)
+        with unit_of_work(self.database) as connection:
             result = self.service.get_answer_service(connection, data)
-            return jsonify({'message': 'success', 'result': result})
 
-        except Exception as e:
-            raise e
-
-        finally:
-            try:
-                if connection:
-                    connection.close()
-            except Exception:
-                raise DatabaseCloseFail('database close fail')
+        return jsonify({'message': 'success', 'result': result})
 
     @validate_params(
         Param('enquiry_id', PATH, int),
@@ -127,19 +96,11 @@ class AnswerView(MethodView):
             'enquiry_id': args[0],
             'answer': args[1]
         }
-        try:
-            connection = get_connection(self.database)
+
+        with unit_of_work(self.database) as connection:
             self.service.post_answer_service(connection, data)
-            connection.commit()
-            return {'message': 'success'}
-        except Exception as e:
-            raise e
-        finally:
-            try:
-                if connection:
-                    connection.close()
-            except Exception:
-                raise DatabaseCloseFail('database close fail')
+
+        return {'message': 'success'}
 
     @validate_params(
         Param('enquiry_id', PATH, int),
@@ -151,19 +112,10 @@ class AnswerView(MethodView):
             'answer': args[1]
         }
 
-        try:
-            connection = get_connection(self.database)
+        with unit_of_work(self.database) as connection:
             self.service.put_answer_service(connection, data)
-            connection.commit()
-            return {'message': 'success'}
-        except Exception as e:
-            raise e
-        finally:
-            try:
-                if connection:
-                    connection.close()
-            except Exception:
-                raise DatabaseCloseFail('database close fail')
+
+        return {'message': 'success'}
 
     @validate_params(
         Param('enquiry_id', PATH, int),
@@ -173,16 +125,7 @@ class AnswerView(MethodView):
             'enquiry_id': args[0]
         }
 
-        try:
-            connection = get_connection(self.database)
+        with unit_of_work(self.database) as connection:
             self.service.delete_answer_service(connection, data)
-            connection.commit()
-            return {'message': 'success'}
-        except Exception as e:
-            raise e
-        finally:
-            try:
-                if connection:
-                    connection.close()
-            except Exception:
-                raise DatabaseCloseFail('database close fail')
+
+        return {'message': 'success'}
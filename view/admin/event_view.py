@@ -1,5 +1,4 @@
 import json
-import traceback
 from datetime import datetime
 
 from flask import jsonify, request, g
@@ -13,10 +12,9 @@ from flask_request_validator import (
     validate_params
 )
 
-from utils.connection import get_connection
+from utils.connection import unit_of_work
 from utils.decorator import signin_decorator
 from utils.custom_exceptions import (
-    DatabaseCloseFail,
     DateMissingOne,
     SearchTwoInput,
     FilterDoesNotMatch,
@@ -147,21 +145,10 @@ class EventView(MethodView):
         if data['name'] and data['number']:
             raise SearchTwoInput('search value accept only one of name or number')
 
-        try:
-            connection = get_connection(self.database)
+        with unit_of_work(self.database) as connection:
             events = self.service.get_events_service(connection, data)
-            return jsonify({'message': 'success', 'result': events})
 
-        except Exception as e:
-            traceback.print_exc()
-            raise e
-
-        finally:
-            try:
-                if connection:
-                    connection.close()
-            except Exception:
-                raise DatabaseCloseFail('database close fail')
+        return jsonify({'message': 'success', 'result': events})
 
     @signin_decorator()
     @validate_params(
@@ -274,25 +261,10 @@ class EventView(MethodView):
         if start >= end:
             raise StartAndEndDateContext('start and end datetime context error')
 
-        try:
-            connection = get_connection(self.database)
+        with unit_of_work(self.database) as connection:
             result = self.service.create_event_service(connection, data, buttons, products)
 
-            connection.commit()
-
-            return jsonify({'message': 'success', 'event_id': result}), 201
-
-        except Exception as e:
-            connection.rollback()
-            traceback.print_exc()
-            raise e
-
-        finally:
-            try:
-                if connection:
-                    connection.close()
-            except Exception:
-                raise DatabaseCloseFail('database close fail')
+        return jsonify({'message': 'success', 'event_id': result}), 201
 
 
 class EventDetailView(MethodView):
@@ -476,21 +448,10 @@ class EventDetailView(MethodView):
         if g.permission_type_id != 1:
             raise NoPermission('마스터 이용자만 사용 가능합니다')
 
-        try:
-            connection = get_connection(self.database)
+        with unit_of_work(self.database) as connection:
             result = self.service.get_event_detail_service(connection, data)
-            return jsonify({"message": "success", "result": result})
-
-        except Exception as e:
-            traceback.print_exc()
-            raise e
 
-        finally:
-            try:
-                if connection:
-                    connection.close()
-            except Exception:
-                raise DatabaseCloseFail('database close fail')
+        return jsonify({"message": "success", "result": result})
 
     @signin_decorator()
     @validate_params(
@@ -521,23 +482,10 @@ class EventDetailView(MethodView):
             'event_id': args[0]
         }
 
-        try:
-            connection = get_connection(self.database)
+        with unit_of_work(self.database) as connection:
             self.service.event_delete_service(connection, data)
-            connection.commit()
-            return jsonify({'message': 'success', 'deleted_event_id': data['event_id']})
-
-        except Exception as e:
-            connection.rollback()
-            traceback.print_exc()
-            raise e
 
-        finally:
-            try:
-                if connection:
-                    connection.close()
-            except Exception:
-                raise DatabaseCloseFail('database close fail')
+        return jsonify({'message': 'success', 'deleted_event_id': data['event_id']})
 
     @signin_decorator()
     @validate_params(
@@ -642,8 +590,7 @@ class EventDetailView(MethodView):
         if start >= end:
             raise StartAndEndDateContext('start and end datetime context error')
 
-        try:
-            connection = get_connection(self.database)
+        with unit_of_work(self.database) as connection:
 
             # 기획전 종류 체크
             data['event_kind_id'] = self.service.get_event_kind_id_service(connection, data['event_id'])
@@ -671,21 +618,7 @@ class EventDetailView(MethodView):
 
             self.service.modify_event_service(connection, data, buttons, products)
 
-            connection.commit()
-
-            return jsonify({'message': 'success', 'event_id': data['event_id']}), 200
-
-        except Exception as e:
-            traceback.print_exc()
-            connection.rollback()
-            raise e
-
-        finally:
-            try:
-                if connection:
-                    connection.close()
-            except Exception:
-                raise DatabaseCloseFail('database close fail')
+        return jsonify({'message': 'success', 'event_id': data['event_id']}), 200
 
 
 class EventProductsCategoryView(MethodView):
@@ -849,21 +782,10 @@ class EventProductsCategoryView(MethodView):
             if not data['menu_id'] or not data['first_category_id']:
                 raise FilterDoesNotMatch('error: filter does not match')
 
-        try:
-            connection = get_connection(self.database)
+        with unit_of_work(self.database) as connection:
             result = self.service.get_products_category_service(connection, data)
-            return jsonify({'message': 'success', 'result': result})
 
-        except Exception as e:
-            traceback.print_exc()
-            raise e
-
-        finally:
-            try:
-                if connection:
-                    connection.close()
-            except Exception:
-                raise DatabaseCloseFail('database close fail')
+        return jsonify({'message': 'success', 'result': result})
 
 
 class EventProductsToAddView(MethodView):
@@ -1000,18 +922,7 @@ class EventProductsToAddView(MethodView):
         if (data['start_date'] and not data['end_date']) or (not data['start_date'] and data['end_date']):
             raise DateMissingOne('start_date or end_date is missing')
 
-        try:
-            connection = get_connection(self.database)
+        with unit_of_work(self.database) as connection:
             products = self.service.get_products_to_post_service(connection, data)
-            return jsonify({'message': 'success', 'result': products})
-
-        except Exception as e:
-            traceback.print_exc()
-            raise e
-
-        finally:
-            try:
-                if connection:
-                    connection.close()
-            except Exception:
-                raise DatabaseCloseFail('database close fail')
+
+        return jsonify({'message': 'success', 'result': products})
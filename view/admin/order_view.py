@@ -1,10 +1,11 @@
 from flask import jsonify, g
 from flask.views import MethodView
 
-from utils.connection import get_connection
-from utils.custom_exceptions import DatabaseCloseFail
+from utils.connection import unit_of_work
+from utils.pagination import decode_cursor
+from utils.streaming import stream_json, wants_stream
 from utils.rules import SecondDateTimeRule, NumberRule, PhoneRule, PageRule, DateRule
-from utils.decorator import signin_decorator
+from utils.decorator import signin_decorator, query_budget
 
 from flask_request_validator import (
     Param,
@@ -33,8 +34,10 @@ class OrderView(MethodView):
         Param('end_date', GET, str, required=False, rules=[DateRule()]),
         Param('attributes', GET, list, required=False),
         Param('order_by', GET, str, required=False),
-        Param('page', GET, int, rules=[PageRule()]),
-        Param('length', GET, str, rules=[NumberRule()])
+        Param('page', GET, int, required=False, default=1, rules=[PageRule()]),
+        Param('length', GET, str, rules=[NumberRule()]),
+        Param('cursor', GET, str, required=False),
+        Param('count', GET, str, required=False)
     )
     def get(self, *args):
         data = {
@@ -54,14 +57,20 @@ class OrderView(MethodView):
             'attributes': args[9],
             'order_by': args[10],
             'page': args[11],
-            'length': args[12]
+            'length': args[12],
+            'cursor': decode_cursor(args[13], 1 if args[0] == 1 else 2),
+            'count_strategy': args[14]
         }
 
         """GET 메소드: 주문 정보 조회
         
         Args: 
             args = ('status', 'number', 'detail_number', 'sender_name', 'sender_phone', 'seller_name', 
-                'product_name', 'start_date', 'end_date', 'seller_attributes', 'order_by', 'page', 'length')
+                'product_name', 'start_date', 'end_date', 'seller_attributes', 'order_by', 'page', 'length',
+                'cursor', 'count')
+
+            cursor : 이전 응답의 nextCursor (있으면 page 대신 사용, 마지막 페이지이면 nextCursor 는 null)
+            count  : 전체 개수 조회 전략 exact / cached / estimate (생략하면 COUNT_STRATEGY, utils.row_count)
 
         Author: 김민서
 
@@ -102,7 +111,9 @@ class OrderView(MethodView):
                         "updated_at_date": "2020-12-30 10:05:19"
                     }
                 ],
-                "totalCount": 2
+                "nextCursor": "WyIyMDIwLTEyLTMwIDEwOjA1OjE5Iiw0XQ",
+                "totalCount": 2,
+                "totalCountType": "exact"
             }
 
         Raises:
@@ -136,18 +147,30 @@ class OrderView(MethodView):
             2020-01-03(김민서): 1차 수정
         """
 
-        try:
-            connection = get_connection(self.database)
+        # 큰 length 는 server-side cursor 로 읽으면서 조각 단위로 응답 (utils.streaming)
+        if wants_stream(data['length']):
+            def build(connection):
+                result = self.service.get_orders_service(connection, data, stream=True)
+                body = {
+                    'message': 'success',
+                    'totalCount': result['total_count'],
+                    'totalCountType': result['count_strategy'],
+                    'results': result['order_lists']
+                }
+                return body, result['total_count']
+
+            return stream_json(self.database, build)
+
+        with unit_of_work(self.database) as connection:
             result = self.service.get_orders_service(connection, data)
-            return jsonify({'message': 'success', 'totalCount': result['total_count'], 'results': result['order_lists']}), 200
-        except Exception as e:
-            raise e
-        finally:
-            try:
-                if connection:
-                    connection.close()
-            except Exception:
-                raise DatabaseCloseFail('database close fail')
+
+        return jsonify({
+            'message': 'success',
+            'totalCount': result['total_count'],
+            'totalCountType': result['count_strategy'],
+            'nextCursor': result['next_cursor'],
+            'results': result['order_lists']
+        }), 200
 
     @signin_decorator
     @validate_params(
@@ -194,21 +217,10 @@ class OrderView(MethodView):
             2021-01-01(김민서): 초기 생성    
         """
 
-        try:
-            connection = get_connection(self.database)
+        with unit_of_work(self.database) as connection:
             self.service.update_order_status_service(connection, data)
-            connection.commit()
-            return {'message': 'success'}
 
-        except Exception as e:
-            connection.rollback()
-            raise e
-        finally:
-            try:
-                if connection:
-                    connection.close()
-            except Exception:
-                raise DatabaseCloseFail('database close fail')
+        return {'message': 'success'}
 
 
 class OrderDetailView(MethodView):
@@ -216,6 +228,7 @@ class OrderDetailView(MethodView):
         self.service = service
         self.database = database
 
+    @query_budget(max_queries=6)
     @signin_decorator
     @validate_params(
         Param('order_item_id', PATH, int)
@@ -318,17 +331,10 @@ class OrderDetailView(MethodView):
             2021-01-01(김민서): 초기 생성    
         """
 
-        try:
-            connection = get_connection(self.database)
+        with unit_of_work(self.database) as connection:
             result = self.service.get_order_detail_service(connection, data)
-            return jsonify({"message": "success", "result": result}), 200
-        except Exception as e:
-            raise e
-        finally:
-            try:
-                connection.close()
-            except Exception:
-                raise DatabaseCloseFail('database close fail')
+
+        return jsonify({"message": "success", "result": result}), 200
 
     @signin_decorator
     @validate_params(
@@ -389,16 +395,7 @@ class OrderDetailView(MethodView):
             2021-01-01(김민서): 초기 생성    
         """
 
-        try:
-            connection = get_connection(self.database)
+        with unit_of_work(self.database) as connection:
             self.service.update_order_detail_service(connection, data)
-            connection.commit()
-            return jsonify({"message": "success"}), 200
-        except Exception as e:
-            connection.rollback()
-            raise e
-        finally:
-            try:
-                connection.close()
-            except Exception:
-                raise DatabaseCloseFail('database close fail')
+
+        return jsonify({"message": "success"}), 200
@@ -1,15 +1,13 @@
-import traceback
-
 from flask                          import jsonify, request, json, g
 from flask.views                    import MethodView
 from flask_request_validator.rules  import NotEmpty
 from flask_request_validator        import Param, GET, PATH, FORM, Enum, MaxLength, validate_params
 
-from utils.connection               import get_connection
+from utils.connection               import unit_of_work
 from utils.const                    import ACCOUNT_ADMIN
-from utils.custom_exceptions        import DatabaseCloseFail
 from utils.decorator                import signin_decorator
 from utils.rules                    import NumberRule, PageRule, DateRule, DefaultRule
+from utils.streaming                import stream_json, wants_stream
 
 
 class ProductRegistView(MethodView):
@@ -67,68 +65,64 @@ class ProductRegistView(MethodView):
                 2020-12-30(심원두): 초기생성
                 2021-01-15(심원두): 리펙토링 완료
         """
+
+        data = {
+            'seller_name'        : request.args.get('seller_name'),
+            'seller_id'          : request.args.get('seller_id'),
+            'main_category_id'   : request.args.get('main_category_id'),
+        }
         
-        connection = None
+        with unit_of_work(self.database) as connection:
+            result = self._get_regist_info(connection, data)
         
-        try:
-            connection = get_connection(self.database)
-            
-            data = {
-                'seller_name'        : request.args.get('seller_name'),
-                'seller_id'          : request.args.get('seller_id'),
-                'main_category_id'   : request.args.get('main_category_id'),
-            }
-            
-            result = dict()
-            
-            if data['seller_name']:
-                result['seller_list'] = self.service.\
-                    get_seller_list_by_name_service(
-                        connection,
-                        data,
-                        g.permission_type_id
-                    )
-                
-                return jsonify({'message': 'success', 'result': result}), 200
+        return jsonify({'message': 'success', 'result': result}), 200
+    
+    def _get_regist_info(self, connection, data):
+        """ 상품 등록 초기 화면 분기 처리
             
-            if data['seller_id']:
-                result['main_category_list'] = self.service.\
-                    get_main_category_list_service(
-                        connection
-                    )
-                
-                if g.permission_type_id is ACCOUNT_ADMIN:
-                    return jsonify({'message': 'success', 'result': result}), 200
+            Args:
+                connection : 데이터베이스 연결 객체
+                data       : seller_name, seller_id, main_category_id
             
-            if data['main_category_id']:
-                result['sub_category_list'] = self.service. \
-                    get_sub_category_list_service(
-                        connection,
-                        data
-                    )
-                
-                return jsonify({'message': 'success', 'result': result}), 200
+            Returns:
+                result - get() 의 분기 조건에 따른 조회 결과
+        """
+        
+        result = dict()
+        
+        if data['seller_name']:
+            result['seller_list'] = self.service.\
+                get_seller_list_by_name_service(
+                    connection,
+                    data,
+                    g.permission_type_id
+                )
             
-            result['product_origin_types'] = self.service.get_product_origin_types_service(connection)
-            result['color_list']           = self.service.get_color_list_service(connection)
-            result['size_list']            = self.service.get_size_list_service(connection)
+            return result
+        
+        if data['seller_id']:
+            result['main_category_list'] = self.service.\
+                get_main_category_list_service(
+                    connection
+                )
             
-            return jsonify({'message': 'success', 'result': result}), 200
+            if g.permission_type_id is ACCOUNT_ADMIN:
+                return result
         
-        except KeyError as e:
-            traceback.print_exc()
-            raise e
+        if data['main_category_id']:
+            result['sub_category_list'] = self.service. \
+                get_sub_category_list_service(
+                    connection,
+                    data
+                )
+            
+            return result
         
-        except Exception as e:
-            traceback.print_exc()
-            raise e
+        result['product_origin_types'] = self.service.get_product_origin_types_service(connection)
+        result['color_list']           = self.service.get_color_list_service(connection)
+        result['size_list']            = self.service.get_size_list_service(connection)
         
-        finally:
-            try:
-                if connection:
-                    connection.close()
-            except Exception:
-                raise DatabaseCloseFail('database close fail')
+        return result
 
 
 class ProductCreateGetSellerListView(MethodView):
@@ -141,14 +135,13 @@ class ProductCreateGetSellerListView(MethodView):
         Param('seller_name', GET, str, required=True, rules=[MaxLength(20)]),
     )
     def get(self, *args):
-        try:
-            data = {
-                'seller_name'        : request.args.get('seller_name'),
-                'permission_type_id' : g.permission_type_id
-            }
-            
-            connection = get_connection(self.database)
-            
+
+        data = {
+            'seller_name'        : request.args.get('seller_name'),
+            'permission_type_id' : g.permission_type_id
+        }
+
+        with unit_of_work(self.database) as connection:
             sellers = dict()
             
             if data['seller_name'] and g.permission_type_id == 1:
@@ -156,19 +149,8 @@ class ProductCreateGetSellerListView(MethodView):
                     connection,
                     data
                 )
-            
-            return jsonify({'message': 'success', 'result': sellers})
-        
-        except Exception as e:
-            traceback.print_exc()
-            raise e
-        
-        finally:
-            try:
-                if connection:
-                    connection.close()
-            except Exception:
-                raise DatabaseCloseFail('database close fail')
+
+        return jsonify({'message': 'success', 'result': sellers})
 
 
 class MainCategoriesListView(MethodView):
@@ -206,26 +188,11 @@ class MainCategoriesListView(MethodView):
             History:
                 2020-12-30(심원두): 초기생성
         """
-        try:
-            connection = get_connection(self.database)
+
+        with unit_of_work(self.database) as connection:
             result = self.service.main_category_list_service(connection)
-            
-            return jsonify({'message': 'success', 'result': result})
-        
-        except KeyError as e:
-            traceback.print_exc()
-            raise e
-        
-        except Exception as e:
-            traceback.print_exc()
-            raise e
-        
-        finally:
-            try:
-                if connection:
-                    connection.close()
-            except Exception:
-                raise DatabaseCloseFail('database close fail')
+
+        return jsonify({'message': 'success', 'result': result})
 
 
 class CreateProductView(MethodView):
@@ -284,64 +251,58 @@ class CreateProductView(MethodView):
                 2020-12-30(심원두): 초기생성
                 2021-01-06(심원두): 로그인 데코레이터 처리 추가. 관리자일 경우에만 셀러 검색 허용하도록 수정
         """
+
+        data = {
+            'seller_name'     : request.args.get('seller_name', None),
+            'main_category_id': request.args.get('main_category_id', None)
+        }
+
+        with unit_of_work(self.database) as connection:
+            result = self._get_create_info(connection, data)
         
-        try:
-            data = {
-                'seller_name'     : request.args.get('seller_name', None),
-                'main_category_id': request.args.get('main_category_id', None)
-            }
-            
-            connection = get_connection(self.database)
-            
-            if data['seller_name'] and g.permission_type_id == 1:
-                sellers = self.service.search_seller_list_service(
-                    connection,
-                    data
-                )
-                
-                return jsonify({'message': 'success', 'result': sellers})
-            
-            if data['main_category_id']:
-                sub_categories = self.service.get_sub_category_list_service(
-                    connection,
-                    data
-                )
-                
-                return jsonify({'message': 'success', 'result': sub_categories})
-            
-            result = dict()
-            
-            result['product_origin_types'] = \
-                self.service.get_product_origin_types_service(
-                    connection
-                )
-            
-            result['color_list'] = \
-                self.service.get_color_list_service(
-                    connection
-                )
+        return jsonify({'message': 'success', 'result': result})
+    
+    def _get_create_info(self, connection, data):
+        """ 상품 등록 초기 화면 분기 처리
             
-            result['size_list'] = \
-                self.service.get_size_list_service(
-                    connection
-                )
+            Args:
+                connection : 데이터베이스 연결 객체
+                data       : seller_name, main_category_id
             
-            return jsonify({'message': 'success', 'result': result})
+            Returns:
+                result - get() 의 분기 조건에 따른 조회 결과
+        """
         
-        except KeyError as e:
-            traceback.print_exc()
-            raise e
+        if data['seller_name'] and g.permission_type_id == 1:
+            return self.service.search_seller_list_service(
+                connection,
+                data
+            )
+        
+        if data['main_category_id']:
+            return self.service.get_sub_category_list_service(
+                connection,
+                data
+            )
         
-        except Exception as e:
-            traceback.print_exc()
-            raise e
+        result = dict()
+        
+        result['product_origin_types'] = \
+            self.service.get_product_origin_types_service(
+                connection
+            )
+        
+        result['color_list'] = \
+            self.service.get_color_list_service(
+                connection
+            )
+        
+        result['size_list'] = \
+            self.service.get_size_list_service(
+                connection
+            )
         
-        finally:
-            try:
-                if connection:
-                    connection.close()
-            except Exception:
-                raise DatabaseCloseFail('database close fail')
+        return result
     
     @signin_decorator()
     @validate_params(
@@ -482,35 +443,34 @@ class CreateProductView(MethodView):
                                     S3에 올라간 이미지는 롤백을 할 수 없는 이슈 반영.
                                    -북마크 테이블 초기 등록 처리 추가.
         """
+
+        data = {
+            'seller_id'             : request.form.get('seller_id'),
+            'account_id'            : g.account_id,
+            'is_sale'               : request.form.get('is_sale'),
+            'is_display'            : request.form.get('is_display'),
+            'main_category_id'      : request.form.get('main_category_id'),
+            'sub_category_id'       : request.form.get('sub_category_id'),
+            'is_product_notice'     : request.form.get('is_product_notice'),
+            'manufacturer'          : request.form.get('manufacturer'),
+            'manufacturing_date'    : request.form.get('manufacturing_date'),
+            'product_origin_type_id': request.form.get('product_origin_type_id'),
+            'product_name'          : request.form.get('product_name'),
+            'description'           : request.form.get('description'),
+            'detail_information'    : request.form.get('detail_information'),
+            'minimum_quantity'      : request.form.get('minimum_quantity'),
+            'maximum_quantity'      : request.form.get('maximum_quantity'),
+            'origin_price'          : request.form.get('origin_price'),
+            'discount_rate'         : request.form.get('discount_rate'),
+            'discounted_price'      : request.form.get('discounted_price'),
+            'discount_start_date'   : request.form.get('discount_start_date'),
+            'discount_end_date'     : request.form.get('discount_end_date')
+        }
         
-        try:
-            data = {
-                'seller_id'             : request.form.get('seller_id'),
-                'account_id'            : g.account_id,
-                'is_sale'               : request.form.get('is_sale'),
-                'is_display'            : request.form.get('is_display'),
-                'main_category_id'      : request.form.get('main_category_id'),
-                'sub_category_id'       : request.form.get('sub_category_id'),
-                'is_product_notice'     : request.form.get('is_product_notice'),
-                'manufacturer'          : request.form.get('manufacturer'),
-                'manufacturing_date'    : request.form.get('manufacturing_date'),
-                'product_origin_type_id': request.form.get('product_origin_type_id'),
-                'product_name'          : request.form.get('product_name'),
-                'description'           : request.form.get('description'),
-                'detail_information'    : request.form.get('detail_information'),
-                'minimum_quantity'      : request.form.get('minimum_quantity'),
-                'maximum_quantity'      : request.form.get('maximum_quantity'),
-                'origin_price'          : request.form.get('origin_price'),
-                'discount_rate'         : request.form.get('discount_rate'),
-                'discounted_price'      : request.form.get('discounted_price'),
-                'discount_start_date'   : request.form.get('discount_start_date'),
-                'discount_end_date'     : request.form.get('discount_end_date')
-            }
-            
-            product_images = request.files.getlist("image_files")
-            stocks = json.loads(request.form.get('options'))
-            connection = get_connection(self.database)
-            
+        product_images = request.files.getlist("image_files")
+        stocks = json.loads(request.form.get('options'))
+
+        with unit_of_work(self.database) as connection:
             product_id = self.service.create_product_service(
                 connection,
                 data
@@ -550,28 +510,8 @@ class CreateProductView(MethodView):
                 product_code,
                 product_images
             )
-            
-            connection.commit()
-            
-            return jsonify({'message': 'success'}), 200
-        
-        except KeyError as e:
-            traceback.print_exc()
-            connection.rollback()
-            raise e
-        
-        except Exception as e:
-            traceback.print_exc()
-            connection.rollback()
-            raise e
-        
-        finally:
-            try:
-                if connection:
-                    connection.close()
-            except Exception:
-                traceback.print_exc()
-                raise DatabaseCloseFail('database close fail')
+
+        return jsonify({'message': 'success'}), 200
 
 
 class ProductManageSearchView(MethodView):
@@ -644,45 +584,37 @@ class ProductManageSearchView(MethodView):
                 2020-12-31(심원두): 초기생성
                 2021-01-03(심원두): 상품 리스트 검색 기능 구현, Login Decorator 구현 예정
         """
+
+        search_condition = {
+            'seller_id'                 : g.account_id if g.permission_type_id == 2 else None,
+            'lookup_start_date'         : request.args.get('lookup_start_date', None),
+            'lookup_end_date'           : request.args.get('lookup_end_date', None),
+            'seller_name'               : request.args.get('seller_name', None),
+            'product_name'              : request.args.get('product_name', None),
+            'product_id'                : request.args.get('product_id', None),
+            'product_code'              : request.args.get('product_code', None),
+            'seller_attribute_type_ids' : json.loads(request.args.get('seller_attribute_type_id'))
+                                          if request.args.get('seller_attribute_type_id')
+                                          else None,
+            'is_sale'                   : request.args.get('is_sale', None),
+            'is_display'                : request.args.get('is_display', None),
+            'is_discount'               : request.args.get('is_discount', None),
+            'page_number'               : request.args.get('page_number'),
+            'limit'                     : request.args.get('limit')
+        }
+
+        # ?stream=true 이면 server-side cursor 로 읽으면서 조각 단위로 응답 (utils.streaming)
+        if wants_stream(search_condition['limit']):
+            def build(connection):
+                result = self.service.search_product_service(connection, search_condition, stream=True)
+                return {'message': 'success', 'result': result}, result['total_count']
+            
+            return stream_json(self.database, build)
         
-        try:
-            search_condition = {
-                'seller_id'                 : g.account_id if g.permission_type_id == 2 else None,
-                'lookup_start_date'         : request.args.get('lookup_start_date', None),
-                'lookup_end_date'           : request.args.get('lookup_end_date', None),
-                'seller_name'               : request.args.get('seller_name', None),
-                'product_name'              : request.args.get('product_name', None),
-                'product_id'                : request.args.get('product_id', None),
-                'product_code'              : request.args.get('product_code', None),
-                'seller_attribute_type_ids' : json.loads(request.args.get('seller_attribute_type_id'))
-                                              if request.args.get('seller_attribute_type_id')
-                                              else None,
-                'is_sale'                   : request.args.get('is_sale', None),
-                'is_display'                : request.args.get('is_display', None),
-                'is_discount'               : request.args.get('is_discount', None),
-                'page_number'               : request.args.get('page_number'),
-                'limit'                     : request.args.get('limit')
-            }
-            
-            connection = get_connection(self.database)
+        with unit_of_work(self.database) as connection:
             result     = self.service.search_product_service(connection, search_condition)
-            
-            return jsonify({'message': 'success', 'result': result})
-        
-        except KeyError as e:
-            traceback.print_exc()
-            raise e
-        
-        except Exception as e:
-            traceback.print_exc()
-            raise e
-        
-        finally:
-            try:
-                if connection:
-                    connection.close()
-            except Exception:
-                raise DatabaseCloseFail('database close fail')
+
+        return jsonify({'message': 'success', 'result': result})
 
 
 class ProductManageDetailView(MethodView):
@@ -729,23 +661,12 @@ class ProductManageDetailView(MethodView):
             History:
                 2021-01-02(심원두): 초기 작성
         """
-        
-        try:
-            data = {
-                'product_code' : request.view_args['product_code']
-            }
-            
-            connection = get_connection(self.database)
+
+        data = {
+            'product_code' : request.view_args['product_code']
+        }
+
+        with unit_of_work(self.database) as connection:
             result     = self.service.detail_product_service(connection, data)
-            
-            return jsonify({'message': 'success', 'result': result})
-        
-        except Exception as e:
-            raise e
-        
-        finally:
-            try:
-                if connection:
-                    connection.close()
-            except Exception:
-                raise DatabaseCloseFail('database close fail')
+
+        return jsonify({'message': 'success', 'result': result})
@@ -3,10 +3,8 @@ import json
 from flask                   import jsonify, request
 from flask.views             import MethodView
 
-from utils.connection        import get_connection
-from utils.custom_exceptions import (
-    DatabaseCloseFail
-)
+from utils.connection        import unit_of_work
+from utils.streaming         import stream_json, wants_stream
 from utils.rules             import (
     NumberRule,
     PasswordRule,
@@ -39,22 +37,21 @@ class SellerListView(MethodView):
 
     def get(self, *args):
 
-        connection = None
-        try:
-            offset = args[0]
-            connection = get_connection(self.database)
-            result = self.service.seller_list_service(connection, offset)
-            return jsonify({'message': 'success', 'result': result})
+        offset = args[0]
+
+        # 큰 offset 은 server-side cursor 로 읽으면서 조각 단위로 응답 (utils.streaming)
+        # 본문은 스트리밍 여부와 관계없이 {'message', 'result'} 이고, 전체 개수는 X-Total-Count 헤더로만 보낸다.
+        if wants_stream(offset):
+            def build(connection):
+                result = self.service.seller_list_service(connection, offset, stream=True)
+                return {'message': 'success', 'result': result['seller_list']}, result['total_count']
 
-        except Exception as e:
-            raise e
+            return stream_json(self.database, build)
+
+        with unit_of_work(self.database) as connection:
+            result = self.service.seller_list_service(connection, offset)
 
-        finally:
-            try:
-                if connection is not None:
-                    connection.close()
-            except Exception:
-                raise DatabaseCloseFail('서버에 알 수 없는 에러가 발생했습니다.')
+        return jsonify({'message': 'success', 'result': result})
 
 class SellerSearchView(MethodView):
   
@@ -80,37 +77,29 @@ class SellerSearchView(MethodView):
     )
 
     def get(self, *args):
-        try:
-            data = {
-                'account_id' : args[2],
-                'username' : args[3],
-                'seller_english_name' : args[4],
-                'seller_name': args[5],
-                'contact_name': args[6],
-                'contact_phone': args[7],
-                'contact_email': args[8],
-                'seller_attribute_type_name': args[9],
-                'seller_status_type_name': args[10],
-                'updated_at': args[11],
-                'start_date': args[12],
-                'end_date' : args[13]
-            }
-
-            page = request.args.get('page')
-            page_view = request.args.get('page_view')
-
-            connection = get_connection(self.database)
+
+        data = {
+            'account_id' : args[2],
+            'username' : args[3],
+            'seller_english_name' : args[4],
+            'seller_name': args[5],
+            'contact_name': args[6],
+            'contact_phone': args[7],
+            'contact_email': args[8],
+            'seller_attribute_type_name': args[9],
+            'seller_status_type_name': args[10],
+            'updated_at': args[11],
+            'start_date': args[12],
+            'end_date' : args[13]
+        }
+
+        page = request.args.get('page')
+        page_view = request.args.get('page_view')
+
+        with unit_of_work(self.database) as connection:
             result = self.service.seller_search_service(connection, data, page, page_view)
-            return jsonify({'message':'success', 'seller_list': result}),200
 
-        except Exception as e:
-            raise e
-        finally:
-            try:
-                if connection:
-                    connection.close()
-            except Exception:
-                raise DatabaseCloseFail('database close fail in seller_list_view')
+        return jsonify({'message':'success', 'seller_list': result}),200
 
 class SellerSignupView(MethodView):
 
@@ -139,23 +128,10 @@ class SellerSignupView(MethodView):
             'service_center_number': args[6],
         }
 
-        try:
-            connection = get_connection(self.database)
+        with unit_of_work(self.database) as connection:
             self.service.seller_signup_service(connection,data)
-            connection.commit()
-            return jsonify({'message': 'success'}), 200
 
-
-        except Exception as e:
-            connection.rollback()
-            raise e
-
-        finally:
-            try:
-                if connection:
-                    connection.close()
-            except Exception:
-                raise DatabaseCloseFail('database close fail')
+        return jsonify({'message': 'success'}), 200
 
 class SellerSigninView(MethodView):
 
@@ -174,21 +150,11 @@ class SellerSigninView(MethodView):
             'username': args[0],
             'password': args[1]
         }
-        connection = None
-        try:
-            connection = get_connection(self.database)
-            token = self.service.seller_signin_service(connection, data)
-            return jsonify({'message': 'success', 'token': token}), 200
 
-        except Exception as e:
-            raise e
+        with unit_of_work(self.database) as connection:
+            token = self.service.seller_signin_service(connection, data)
 
-        finally:
-            try:
-                if connection is not None:
-                    connection.close()
-            except Exception:
-                raise DatabaseCloseFail('서버에 알 수 없는 에러가 발생했습니다.')
+        return jsonify({'message': 'success', 'token': token}), 200
 
 class SellerInfoView(MethodView):
     """ Presentation Layer
@@ -236,20 +202,11 @@ class SellerInfoView(MethodView):
         data = {
             'account_id': args[0],
         }
-        try:
-            connection          = get_connection(self.database)
-            result              = self.service.get_seller_info(connection, data)
-            return jsonify({'message': 'success', 'result': result}), 200
 
-        except Exception as e:
-            raise e
+        with unit_of_work(self.database) as connection:
+            result              = self.service.get_seller_info(connection, data)
 
-        finally:
-            try:
-                if connection:
-                    connection.close()
-            except Exception:
-                raise DatabaseCloseFail('database close fail')
+        return jsonify({'message': 'success', 'result': result}), 200
 
     @validate_params(
         # required True
@@ -301,38 +258,38 @@ class SellerInfoView(MethodView):
             History:
                 2020-12-29(이영주): 초기 생성
         """
-        try:
-            add_contact = json.loads(request.form.get("add_contact", "1"))
-            data = {
-                'profile_image_url': request.form.get('profile_image_url'),
-                'background_image_url': request.form.get('background_image_url'),
-                'seller_title': request.form.get('seller_title'),
-                'seller_discription': request.form.get('seller_discription'),
-                'contact_name': request.form.get('contact_name'),
-                'contact_phone': request.form.get('contact_phone'),
-                'contact_email': request.form.get('contact_email'),
-                'post_number': request.form.get('post_number'),
-                'service_center_number': request.form.get('service_center_number'),
-                'address1': request.form.get('address1'),
-                'address2': request.form.get('address2'),
-                'operation_start_time': request.form.get('operation_start_time'),
-                'operation_end_time': request.form.get('operation_end_time'),
-                'is_weekend': request.form.get('is_weekend'),
-                'weekend_operation_start_time': request.form.get('weekend_operation_start_time'),
-                'weekend_operation_end_time': request.form.get('weekend_operation_end_time'),
-                'shipping_information': request.form.get('shipping_information'),
-                'exchange_information': request.form.get('exchange_information'),
-                'name': request.form.get('name'),
-                'english_name': request.form.get('english_name'),
-                'account_id': request.form.get('account_id'),
-                'permission_types': request.form.get('permission_types'),
-                'seller_status_type_id': request.form.get('seller_status_type_id'),
-                'seller_id': request.form.get('account_id'),
-                'updater_id': request.form.get('permission_types'),
-                'add_contact': add_contact
-            }
-            connection = get_connection(self.database)
 
+        add_contact = json.loads(request.form.get("add_contact", "1"))
+        data = {
+            'profile_image_url': request.form.get('profile_image_url'),
+            'background_image_url': request.form.get('background_image_url'),
+            'seller_title': request.form.get('seller_title'),
+            'seller_discription': request.form.get('seller_discription'),
+            'contact_name': request.form.get('contact_name'),
+            'contact_phone': request.form.get('contact_phone'),
+            'contact_email': request.form.get('contact_email'),
+            'post_number': request.form.get('post_number'),
+            'service_center_number': request.form.get('service_center_number'),
+            'address1': request.form.get('address1'),
+            'address2': request.form.get('address2'),
+            'operation_start_time': request.form.get('operation_start_time'),
+            'operation_end_time': request.form.get('operation_end_time'),
+            'is_weekend': request.form.get('is_weekend'),
+            'weekend_operation_start_time': request.form.get('weekend_operation_start_time'),
+            'weekend_operation_end_time': request.form.get('weekend_operation_end_time'),
+            'shipping_information': request.form.get('shipping_information'),
+            'exchange_information': request.form.get('exchange_information'),
+            'name': request.form.get('name'),
+            'english_name': request.form.get('english_name'),
+            'account_id': request.form.get('account_id'),
+            'permission_types': request.form.get('permission_types'),
+            'seller_status_type_id': request.form.get('seller_status_type_id'),
+            'seller_id': request.form.get('account_id'),
+            'updater_id': request.form.get('permission_types'),
+            'add_contact': add_contact
+        }
+
+        with unit_of_work(self.database) as connection:
             # master - update seller table
             self.service.patch_master_info(connection, data)
 
@@ -345,19 +302,7 @@ class SellerInfoView(MethodView):
             # update seller_histories
             self.service.patch_seller_history(connection, data)
 
-            connection.commit()
-            return jsonify({'message': 'success', 'result': data}), 200
-
-        except Exception as e:
-            connection.rollback()
-            raise e
-
-        finally:
-            try:
-                if connection:
-                    connection.close()
-            except Exception:
-                raise DatabaseCloseFail('database close fail')
+        return jsonify({'message': 'success', 'result': data}), 200
 
 
 class SellerStatusView(MethodView):
@@ -402,29 +347,19 @@ class SellerStatusView(MethodView):
         History:
             2021-01-03(이영주): 초기 생성
         """
-        try:
-            data = {
-                'account_id': args[0],
-                'seller_status_type_id': args[1],
-                'seller_id': args[2],
-                'updater_id': args[3]
-            }
-            connection = get_connection(self.database)
+
+        data = {
+            'account_id': args[0],
+            'seller_status_type_id': args[1],
+            'seller_id': args[2],
+            'updater_id': args[3]
+        }
+
+        with unit_of_work(self.database) as connection:
             self.service.patch_seller_status(connection, data)
             self.service.patch_seller_history(connection, data)
-            connection.commit()
-            return {'message': 'success'}
-
-        except Exception as e:
-            connection.rollback()
-            raise e
 
-        finally:
-            try:
-                if connection:
-                    connection.close()
-            except Exception:
-                raise DatabaseCloseFail('database close fail')
+        return {'message': 'success'}
 
 
 class SellerHistoryView(MethodView):
@@ -462,24 +397,11 @@ class SellerHistoryView(MethodView):
         data = {
             'account_id': args[0]
         }
-        try:
-            connection = get_connection(self.database)
-            seller_history = self.service.get_seller_history(connection, data)
-            return jsonify({'message' : 'success', 'result' : seller_history}), 200
-
-        except Exception as e:
-            raise e
 
-        except Exception as e:
-            raise e
-
-        finally:
-            try:
-                if connection:
-                    connection.close()
-            except Exception:
+        with unit_of_work(self.database) as connection:
+            seller_history = self.service.get_seller_history(connection, data)
 
-                raise DatabaseCloseFail('database close fail')
+        return jsonify({'message' : 'success', 'result' : seller_history}), 200
 
 
 class SellerPasswordView(MethodView):
@@ -523,22 +445,13 @@ class SellerPasswordView(MethodView):
         History:
             2021-01-04(이영주): 초기 생성
         """
-        try:
-            data = {
-                'account_id': args[0],
-                'password': args[1]
-            }
-            connection = get_connection(self.database)
+
+        data = {
+            'account_id': args[0],
+            'password': args[1]
+        }
+
+        with unit_of_work(self.database) as connection:
             self.service.patch_seller_password(connection, data)
-            return jsonify({'message': 'success', 'result': 'PasswordChange'}), 200
-
-        except Exception as e:
-            connection.rollback()
-            raise e
-
-        finally:
-            try:
-                if connection:
-                    connection.close()
-            except Exception:
-                raise DatabaseCloseFail('database close fail')
+
+        return jsonify({'message': 'success', 'result': 'PasswordChange'}), 200
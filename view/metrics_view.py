@@ -0,0 +1,21 @@
+from flask       import Response
+from flask.views import MethodView
+
+from utils.metrics import render
+
+
+class MetricsView(MethodView):
+    """ Presentation Layer
+
+        Notes:
+            Prometheus 가 수집하는 지표 엔드포인트 (text exposition format 0.0.4)
+    """
+
+    def get(self):
+        """ GET 메소드: 모든 worker 의 지표 조회
+
+            Returns:
+                200, Prometheus text 형식의 지표
+        """
+
+        return Response(render(), content_type='text/plain; version=0.0.4; charset=utf-8')
@@ -1,5 +1,3 @@
-import traceback
-
 from flask.views import MethodView
 from flask import jsonify, g
 
@@ -9,8 +7,7 @@ from flask_request_validator import (
     PATH
 )
 
-from utils.connection import get_connection
-from utils.custom_exceptions import DatabaseCloseFail
+from utils.connection import unit_of_work
 from utils.decorator import signin_decorator
 
 
@@ -63,28 +60,15 @@ class BookmarkView(MethodView):
             2020-01-07(김민구): 상품 존재 유무 체크 추가
         """
 
-        connection = None
-        try:
-            data = {
-                'product_id': args[0],
-                'account_id': g.account_id
-            }
-            connection = get_connection(self.database)
-            self.bookmark_service.post_bookmark_logic(connection, data)
-            connection.commit()
-            return jsonify({'message': 'success'}), 200
+        data = {
+            'product_id': args[0],
+            'account_id': g.account_id
+        }
 
-        except Exception as e:
-            traceback.print_exc()
-            connection.rollback()
-            raise e
+        with unit_of_work(self.database) as connection:
+            self.bookmark_service.post_bookmark_logic(connection, data)
 
-        finally:
-            try:
-                if connection is not None:
-                    connection.close()
-            except Exception:
-                raise DatabaseCloseFail('서버에 알 수 없는 에러가 발생했습니다.')
+        return jsonify({'message': 'success'}), 200
 
     @signin_decorator()
     @validate_params(
@@ -117,25 +101,12 @@ class BookmarkView(MethodView):
             2020-01-07(김민구): 상품 존재 유무 체크 추가
         """
 
-        connection = None
-        try:
-            data = {
-                'product_id': args[0],
-                'account_id': g.account_id
-            }
-            connection = get_connection(self.database)
+        data = {
+            'product_id': args[0],
+            'account_id': g.account_id
+        }
+
+        with unit_of_work(self.database) as connection:
             self.bookmark_service.delete_bookmark_logic(connection, data)
-            connection.commit()
-            return jsonify({'message': 'success'}), 200
-
-        except Exception as e:
-            traceback.print_exc()
-            connection.rollback()
-            raise e
-
-        finally:
-            try:
-                if connection is not None:
-                    connection.close()
-            except Exception:
-                raise DatabaseCloseFail('서버에 알 수 없는 에러가 발생했습니다.')
+
+        return jsonify({'message': 'success'}), 200
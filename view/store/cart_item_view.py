@@ -7,8 +7,7 @@ from flask_request_validator import (
     validate_params
 )
 
-from utils.connection import get_connection
-from utils.custom_exceptions import DatabaseCloseFail
+from utils.connection import unit_of_work
 from utils.rules import DecimalRule
 from utils.decorator import signin_decorator
 
@@ -90,19 +89,10 @@ class CartItemView(MethodView):
             "user_permission": g.permission_type_id
         }
 
-        try:
-            connection = get_connection(self.database)
+        with unit_of_work(self.database) as connection:
             cart_items = self.service.get_cart_item_service(connection, data)
-            return jsonify({'message': 'success', 'result': cart_items})
 
-        except Exception as e:
-            raise e
-        finally:
-            try:
-                if connection:
-                    connection.close()
-            except Exception:
-                raise DatabaseCloseFail('database close fail')
+        return jsonify({'message': 'success', 'result': cart_items})
 
 
 class CartItemAddView(MethodView):
@@ -169,19 +159,7 @@ class CartItemAddView(MethodView):
             'discounted_price': args[5]
         }
 
-        try:
-            connection = get_connection(self.database)
+        with unit_of_work(self.database) as connection:
             cart_id = self.service.post_cart_item_service(connection, data)
-            connection.commit()
-            return {'message': 'success', 'result': {"cart_id": cart_id}}, 201
-
-        except Exception as e:
-            connection.rollback()
-            raise e
-
-        finally:
-            try:
-                if connection:
-                    connection.close()
-            except Exception:
-                raise DatabaseCloseFail('database close fail')
+
+        return {'message': 'success', 'result': {"cart_id": cart_id}}, 201
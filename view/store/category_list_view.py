@@ -1,10 +1,7 @@
-import traceback
-
 from flask.views import MethodView
-from flask import jsonify
+from flask import current_app
 
-from utils.connection import get_connection
-from utils.custom_exceptions import DatabaseCloseFail
+from utils.decorator import http_cache
 
 
 class CategoryListView(MethodView):
@@ -24,6 +21,7 @@ class CategoryListView(MethodView):
         self.category_list_service = services.category_list_service
         self.database = database
 
+    @http_cache(max_age=300, shared_max_age=3600)
     def get(self):
         """ GET 메소드: 전체 카테고리 리스트 조회
 
@@ -71,21 +69,9 @@ class CategoryListView(MethodView):
 
             Notes:
                 menus, main_category, sub_category 총 3가지의 카테고리가 result 키의 값으로 반환
+                워커 메모리에 직렬화해 둔 응답을 그대로 반환한다. (CategoryListService.category_tree_service)
         """
 
-        connection = None
-        try:
-            connection = get_connection(self.database)
-            result = self.category_list_service.category_list_logic(connection)
-            return jsonify({'message': 'success', 'result': result})
-
-        except Exception as e:
-            traceback.print_exc()
-            raise e
+        body = self.category_list_service.category_tree_service(self.database)
 
-        finally:
-            try:
-                if connection is not None:
-                    connection.close()
-            except Exception:
-                raise DatabaseCloseFail('서버에 알 수 없는 에러가 발생했습니다.')
+        return current_app.response_class(body, mimetype=current_app.config['JSONIFY_MIMETYPE'])
@@ -1,5 +1,3 @@
-import traceback
-
 from flask.views import MethodView
 from flask import jsonify
 
@@ -10,8 +8,9 @@ from flask_request_validator import (
     PATH
 )
 
-from utils.connection import get_connection
-from utils.custom_exceptions import DatabaseCloseFail
+from utils.connection import unit_of_work
+from utils.decorator import http_cache
+from utils.pagination import decode_cursor, next_cursor
 from utils.rules import PositiveInteger
 
 
@@ -32,10 +31,12 @@ class EventBannerListView(MethodView):
         self.event_list_service = services.event_list_service
         self.database = database
 
+    @http_cache(max_age=60, shared_max_age=300)
     @validate_params(
         Param('offset', GET, int, required=False, default=0),
         Param('limit', GET, int, required=False, default=30),
-        Param('is_proceeding', GET, bool, required=False, default=1)
+        Param('is_proceeding', GET, bool, required=False, default=1),
+        Param('cursor', GET, str, required=False, default=None)
     )
     def get(self, *args):
         """ GET 메소드: 기획전 배너 리스트 조회
@@ -44,6 +45,7 @@ class EventBannerListView(MethodView):
                 offset = 0부터 시작
                 limit = 30단위
                 is_proceeding = 0 or 1
+                cursor = 이전 응답의 next_cursor (있으면 offset 대신 사용, 마지막 페이지이면 next_cursor 는 null)
 
             Author: 김민구
 
@@ -77,27 +79,21 @@ class EventBannerListView(MethodView):
                 is_proceeding이 0이면 종료된 기획전 배너 리스트르 반환, 1이면 진행중인 기획전 배너 리스트를 반환
         """
 
-        connection = None
-        try:
-            data = {
-                'offset': args[0],
-                'limit': args[1],
-                'is_proceeding': args[2]
-            }
-            connection = get_connection(self.database)
-            result = self.event_list_service.event_banner_list_logic(connection, data)
-            return jsonify({'message': 'success', 'result': result})
+        data = {
+            'offset': args[0],
+            'limit': args[1],
+            'is_proceeding': args[2],
+            'cursor': decode_cursor(args[3], 1)
+        }
 
-        except Exception as e:
-            traceback.print_exc()
-            raise e
+        with unit_of_work(self.database, replica=True) as connection:
+            result = self.event_list_service.event_banner_list_logic(connection, data)
 
-        finally:
-            try:
-                if connection is not None:
-                    connection.close()
-            except Exception:
-                raise DatabaseCloseFail('서버에 알 수 없는 에러가 발생했습니다.')
+        return jsonify({
+            'message': 'success',
+            'result': result,
+            'next_cursor': next_cursor(result, data['limit'], lambda row: [row['event_id']])
+        })
 
 
 class EventDetailInformationView(MethodView):
@@ -156,23 +152,12 @@ class EventDetailInformationView(MethodView):
                 2020-01-01(김민구): 초기 생성
         """
 
-        connection = None
-        try:
-            event_id = args[0]
-            connection = get_connection(self.database)
-            result = self.event_list_service.event_detail_information_logic(connection, event_id)
-            return jsonify({'message': 'success', 'result': result})
+        event_id = args[0]
 
-        except Exception as e:
-            traceback.print_exc()
-            raise e
+        with unit_of_work(self.database, replica=True) as connection:
+            result = self.event_list_service.event_detail_information_logic(connection, event_id)
 
-        finally:
-            try:
-                if connection is not None:
-                    connection.close()
-            except Exception:
-                raise DatabaseCloseFail('서버에 알 수 없는 에러가 발생했습니다.')
+        return jsonify({'message': 'success', 'result': result})
 
 
 class EventDetailButtonListView(MethodView):
@@ -230,23 +215,12 @@ class EventDetailButtonListView(MethodView):
                 2020-01-01(김민구): 초기 생성
         """
 
-        connection = None
-        try:
-            event_id = args[0]
-            connection = get_connection(self.database)
-            result = self.event_list_service.event_detail_button_list_logic(connection, event_id)
-            return jsonify({'message': 'success', 'result': result})
+        event_id = args[0]
 
-        except Exception as e:
-            traceback.print_exc()
-            raise e
+        with unit_of_work(self.database, replica=True) as connection:
+            result = self.event_list_service.event_detail_button_list_logic(connection, event_id)
 
-        finally:
-            try:
-                if connection is not None:
-                    connection.close()
-            except Exception:
-                raise DatabaseCloseFail('서버에 알 수 없는 에러가 발생했습니다.')
+        return jsonify({'message': 'success', 'result': result})
 
 
 class EventDetailProductListView(MethodView):
@@ -269,7 +243,8 @@ class EventDetailProductListView(MethodView):
     @validate_params(
         Param('offset', GET, int, required=False, default=0),
         Param('limit', GET, int, required=False, default=30),
-        Param('event_id', PATH, int, rules=[PositiveInteger()])
+        Param('event_id', PATH, int, rules=[PositiveInteger()]),
+        Param('cursor', GET, str, required=False, default=None)
     )
     def get(self, *args):
         """ GET 메소드: 기획전 상품 리스트 조회
@@ -278,6 +253,7 @@ class EventDetailProductListView(MethodView):
                 offset = 0부터 시작 (30 단위)
                 limit = 30단위
                 event_id = 기획전 아이디
+                cursor = 이전 응답의 next_cursor (있으면 offset 대신 사용, 마지막 페이지이면 next_cursor 는 null)
 
             Author: 김민구
 
@@ -316,24 +292,18 @@ class EventDetailProductListView(MethodView):
                 아니라면 button_id 컬럼이 없는 기획전 리스트
         """
 
-        connection = None
-        try:
-            data = {
-                'offset': args[0],
-                'limit': args[1],
-                'event_id': args[2]
-            }
-            connection = get_connection(self.database)
+        data = {
+            'offset': args[0],
+            'limit': args[1],
+            'event_id': args[2],
+            'cursor': decode_cursor(args[3], 1)
+        }
+
+        with unit_of_work(self.database, replica=True) as connection:
             result = self.event_list_service.event_detail_list_logic(connection, data)
-            return jsonify({'message': 'success', 'result': result})
-
-        except Exception as e:
-            traceback.print_exc()
-            raise e
-
-        finally:
-            try:
-                if connection is not None:
-                    connection.close()
-            except Exception:
-                raise DatabaseCloseFail('서버에 알 수 없는 에러가 발생했습니다.')
\ No newline at end of file
+
+        return jsonify({
+            'message': 'success',
+            'result': result,
+            'next_cursor': next_cursor(result, data['limit'], lambda row: [row['product_id']])
+        })
\ No newline at end of file
@@ -1,9 +1,8 @@
-import traceback
 import json
 
 from flask import g
-from utils.decorator import signin_decorator
-from utils.rules import SortTypeRule, NumberRule
+from utils.decorator import signin_decorator, query_budget, http_cache
+from utils.rules import SortTypeRule, NumberRule, NumberListRule
 
 from flask.views import MethodView
 from flask import jsonify
@@ -14,8 +13,7 @@ from flask_request_validator import (
     GET
 )
 
-from utils.connection import get_connection
-from utils.custom_exceptions import DatabaseCloseFail
+from utils.connection import unit_of_work
 
 
 class ProductDetailView(MethodView):
@@ -23,6 +21,8 @@ class ProductDetailView(MethodView):
         self.service = service
         self.database = database
     
+    @query_budget(max_queries=1)
+    @http_cache(max_age=30, vary_by_user=True)
     @signin_decorator(False)
     def get(self, product_id):
         """ GET 메소드: 상품 상세정보 조회
@@ -39,6 +39,7 @@ class ProductDetailView(MethodView):
         
         Raises:
             400, {'message': 'key error', 'errorMessage': '키 값이 일치하지 않습니다.'}
+            400, {'message': 'product does not exist', 'errorMessage': '해당 상품이 존재하지 않습니다.'}
             500, {'message': 'unable to close database', 'errorMessage': '커넥션 종료 실패'}
             500, {'message': 'internal server error', 'errorMessage': format(e)}): 서버 에러
         History:
@@ -47,27 +48,57 @@ class ProductDetailView(MethodView):
                 2021-01-01(김기용): 1차 구현
                 2021-01-02(김기용): 북마크에대한 정보를 추가해주었다.
         """
-        connection = None
 
-        try:
-            data = dict()
-            data['product_id'] = product_id
+        data = dict()
+        data['product_id'] = product_id
 
-            if 'account_id' in g:
-                data['account_id'] = g.account_id
+        if 'account_id' in g:
+            data['account_id'] = g.account_id
 
-            connection = get_connection(self.database)
+        with unit_of_work(self.database) as connection:
             result = self.service.product_detail_service(connection, data)
-            return jsonify({'message': 'success', 'result': result})
-        except Exception as e:
-            traceback.print_exc()
-            raise e
-        finally:
-            try:
-                if connection is not None:
-                    connection.close()
-            except Exception:
-                raise DatabaseCloseFail('서버에 알 수 없는 에러가 발생했습니다.')
+
+        return jsonify({'message': 'success', 'result': result})
+
+
+class ProductBatchDetailView(MethodView):
+    def __init__(self, service, database):
+        self.service = service
+        self.database = database
+
+    @query_budget(max_queries=5)
+    @http_cache(max_age=30, vary_by_user=True)
+    @signin_decorator(False)
+    @validate_params(
+            Param('ids', GET, str, required=True, rules=[NumberListRule()])
+            )
+    def get(self, *args):
+        """ GET 메소드: 여러 상품의 상세정보 조회
+
+        장바구니, 북마크, 기획전 화면처럼 여러 상품을 보여줄 때 /products/<product_id> 를 상품마다 호출하는 대신 사용한다.
+
+        Args:
+            ids : 쉼표로 구분한 상품 id (예: 1,2,3 최대 PRODUCT_BATCH_MAX_SIZE 개)
+
+        Returns:
+            200, {'message': 'success', 'result': [상품정보, ...]} : 요청한 순서, 없는 상품은 제외
+
+        Raises:
+            400, {'message': 'invalid_parameter', 'error_message': '[데이터]가(이) 유효하지 않습니다.'}
+            400, {'message': 'too_many_products', 'error_message': '한 번에 50개까지 조회할 수 있습니다.'}
+        """
+
+        data = {
+            'product_ids': [int(product_id) for product_id in args[0].split(',')]
+        }
+
+        if 'account_id' in g:
+            data['account_id'] = g.account_id
+
+        with unit_of_work(self.database) as connection:
+            result = self.service.product_batch_detail_service(connection, data)
+
+        return jsonify({'message': 'success', 'result': result})
 
 
 class ProductSearchView(MethodView):
@@ -108,24 +139,53 @@ class ProductSearchView(MethodView):
                 2021-01-02(김기용): Param 값에대한 Rule 을 정의해주었다.
         """
 
-        connection = None
-
-        try:
-            data = {
-                    'search': args[0],
-                    'limit': int(args[1]),
-                    'sort_type': args[2] 
-                    }
+        data = {
+                'search': args[0],
+                'limit': int(args[1]),
+                'sort_type': args[2] 
+                }
 
-            connection = get_connection(self.database)
+        with unit_of_work(self.database, replica=True) as connection:
             result = self.service.product_search_service(connection, data)
-            return jsonify({'message': 'success', 'result': result})
-        finally:
-            try:
-                if connection is not None:
-                    connection.close()
-            except Exception:
-                raise DatabaseCloseFail('서버에 알 수 없는 에러가 발생했습니다.')
+
+        return jsonify({'message': 'success', 'result': result})
+
+
+class ProductAutocompleteView(MethodView):
+    def __init__(self, service, database):
+        self.service = service
+        self.database = database
+
+    @http_cache(max_age=60, shared_max_age=300)
+    @validate_params(
+            Param('q', GET, str, required=True),
+            Param('limit', GET, str, required=False, default='10', rules=[NumberRule()])
+            )
+    def get(self, *args):
+        """ GET 메소드: 검색어 자동완성
+
+        입력한 접두어로 시작하는 상품이름, 셀러이름을 판매량 순으로 반환한다.
+        메모리의 자동완성 색인만 조회하며 데이터베이스 커넥션을 사용하지 않는다.
+
+        Args:
+            q     : 입력한 접두어
+            limit : 최대 개수 (기본 10, 최대 20)
+
+        Returns:
+            200, {'message': 'success', 'result': [{'keyword': '데일리 니트', 'type': 'product'}, ...]}
+
+        Raises:
+            400, {'message': 'invalid_parameter', 'error_message': '[데이터]가(이) 유효하지 않습니다.'}
+        """
+
+        data = {
+            'q'    : args[0],
+            'limit': int(args[1])
+        }
+
+        result = self.service.product_autocomplete_service(self.database, data)
+
+        return jsonify({'message': 'success', 'result': result})
 
 
 class ProductListView(MethodView):
@@ -202,23 +262,12 @@ class ProductListView(MethodView):
                 이벤트가 없을 시 빈 리스트 반환
         """
 
-        connection = None
-        try:
-            data = {
-                'offset': args[0],
-                'limit': args[1]
-            }
-            connection = get_connection(self.database)
+        data = {
+            'offset': args[0],
+            'limit': args[1]
+        }
+
+        with unit_of_work(self.database, replica=True) as connection:
             result = self.product_list_service.product_list_logic(connection, data)
-            return jsonify({'message': 'success', 'result': result})
-
-        except Exception as e:
-            traceback.print_exc()
-            raise e
-
-        finally:
-            try:
-                if connection is not None:
-                    connection.close()
-            except Exception:
-                raise DatabaseCloseFail('서버에 알 수 없는 에러가 발생했습니다.')
+
+        return jsonify({'message': 'success', 'result': result})
@@ -8,9 +8,9 @@ from flask_request_validator import (
     validate_params
 )
 
-from utils.connection import get_connection
-from utils.custom_exceptions import DatabaseCloseFail
-from utils.decorator import signin_decorator
+from utils.connection import unit_of_work
+from utils.decorator import signin_decorator, http_cache
+from utils.pagination import decode_cursor, next_cursor
 
 
 class SellerShopView(MethodView):
@@ -30,6 +30,7 @@ class SellerShopView(MethodView):
         self.service = service
         self.database = database
 
+    @http_cache(max_age=300, shared_max_age=600)
     @signin_decorator(False)
     @validate_params(
         Param('seller_id', PATH, int)
@@ -71,20 +72,10 @@ class SellerShopView(MethodView):
 
         account_id = args[0]
 
-        try:
-            connection = get_connection(self.database)
+        with unit_of_work(self.database, replica=True) as connection:
             seller_info = self.service.get_seller_info_service(connection, account_id)
-            return jsonify({'message': 'success', 'result': seller_info})
 
-        except Exception as e:
-            raise e
-
-        finally:
-            try:
-                if connection:
-                    connection.close()
-            except Exception:
-                raise DatabaseCloseFail('database close fail')
+        return jsonify({'message': 'success', 'result': seller_info})
 
 class SellerShopSearchView(MethodView):
     """ Presentation Layer
@@ -163,20 +154,10 @@ class SellerShopSearchView(MethodView):
             "limit": args[3]
         }
 
-        try:
-            connection = get_connection(self.database)
+        with unit_of_work(self.database, replica=True) as connection:
             search_product_list = self.service.get_seller_product_search_service(connection, data)
-            return jsonify({'message': 'success', 'result': search_product_list})
-
-        except Exception as e:
-            raise e
 
-        finally:
-            try:
-                if connection:
-                    connection.close()
-            except Exception:
-                raise DatabaseCloseFail('database close fail')
+        return jsonify({'message': 'success', 'result': search_product_list})
 
 
 class SellerShopCategoryView(MethodView):
@@ -238,20 +219,10 @@ class SellerShopCategoryView(MethodView):
             "seller_id": args[0]
         }
 
-        try:
-            connection = get_connection(self.database)
+        with unit_of_work(self.database, replica=True) as connection:
             category_list = self.service.get_seller_category_service(connection, data)
-            return jsonify({'message': 'success', 'result': category_list})
-
-        except Exception as e:
-            raise e
 
-        finally:
-            try:
-                if connection:
-                    connection.close()
-            except Exception:
-                raise DatabaseCloseFail('database close fail')
+        return jsonify({'message': 'success', 'result': category_list})
 
 
 class SellerShopProductListView(MethodView):
@@ -277,14 +248,16 @@ class SellerShopProductListView(MethodView):
         Param('category', GET, int, required=False, default=None),
         Param('offset', GET, int, required=False, default=0),
         Param('limit', GET, int, required=False, default=100),
-        Param('type', GET, str, required=False, default="latest")
+        Param('type', GET, str, required=False, default="latest"),
+        Param('cursor', GET, str, required=False, default=None)
     )
     def get(self, *args):
         """ GET 메소드: 해당 셀러의 상품 검색 결과 출력
 
         seller_id와 ,category, type에 해당되는 셀러 정보를 테이블에서 조회 후 가져옴
 
-        Args: args = ('seller_id', 'keyword', 'offset', 'limit', 'type')
+        Args: args = ('seller_id', 'category', 'offset', 'limit', 'type', 'cursor')
+            cursor : 이전 응답의 next_cursor (있으면 offset 대신 사용, 마지막 페이지이면 next_cursor 는 null)
 
         Author: 고수희
 
@@ -333,17 +306,19 @@ class SellerShopProductListView(MethodView):
             "type": args[4]
         }
 
-        try:
-            connection = get_connection(self.database)
-            product_list = self.service.get_seller_product_list_service(connection, data)
-            return jsonify({'message': 'success', 'result': product_list})
+        # 커서: 최신순은 [상품 id], 인기순은 [판매량, 상품 id]
+        if data['type'] == "latest":
+            data['cursor'] = decode_cursor(args[5], 1)
+            cursor_key = lambda row: [row['product_id']]
+        else:
+            data['cursor'] = decode_cursor(args[5], 2)
+            cursor_key = lambda row: [row['product_sales_count'] or 0, row['product_id']]
 
-        except Exception as e:
-            raise e
+        with unit_of_work(self.database, replica=True) as connection:
+            product_list = self.service.get_seller_product_list_service(connection, data)
 
-        finally:
-            try:
-                if connection:
-                    connection.close()
-            except Exception:
-                raise DatabaseCloseFail('database close fail')
+        return jsonify({
+            'message': 'success',
+            'result': product_list,
+            'next_cursor': next_cursor(product_list, data['limit'], cursor_key)
+        })
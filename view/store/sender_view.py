@@ -1,8 +1,7 @@
 from flask import jsonify, g
 from flask.views import MethodView
 
-from utils.connection import get_connection
-from utils.custom_exceptions import DatabaseCloseFail
+from utils.connection import unit_of_work
 from utils.decorator import signin_decorator
 
 
@@ -57,16 +56,7 @@ class SenderView(MethodView):
             "user_permission": g.permission_type_id
         }
 
-        try:
-            connection = get_connection(self.database)
+        with unit_of_work(self.database) as connection:
             sender_info = self.service.get_sender_info_service(connection, data)
-            return jsonify({'message': 'success', 'result': sender_info})
-
-        except Exception as e:
-            raise e
-        finally:
-            try:
-                if connection:
-                    connection.close()
-            except Exception:
-                raise DatabaseCloseFail('database close fail')
+
+        return jsonify({'message': 'success', 'result': sender_info})
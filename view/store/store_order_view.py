@@ -1,15 +1,21 @@
-from flask import jsonify, g
+import hashlib
+import json
+import re
+
+from flask import jsonify, g, request
 from flask.views import MethodView
 from flask_request_validator import (
+    GET,
     PATH,
     Param,
     JSON,
     validate_params
 )
 
-from utils.connection import get_connection
-from utils.custom_exceptions import DatabaseCloseFail
-from utils.rules import DecimalRule, EmailRule, PostalCodeRule, PhoneRule
+from utils.connection import unit_of_work
+from utils.const import IDEMPOTENCY_KEY_PATTERN
+from utils.custom_exceptions import InvalidIdempotencyKey
+from utils.rules import DecimalRule, EmailRule, IdListRule, NumberListRule, PostalCodeRule, PhoneRule
 from utils.decorator import signin_decorator
 
 
@@ -74,20 +80,11 @@ class StoreOrderView(MethodView):
             "user_id": g.account_id,
             "user_permission": g.permission_type_id
         }
-        
-        try:
-            connection = get_connection(self.database)
+
+        with unit_of_work(self.database) as connection:
             store_order_info = self.service.get_store_order_service(connection, data)
-            return jsonify({'message': 'success', 'result': store_order_info})
 
-        except Exception as e:
-            raise e
-        finally:
-            try:
-                if connection:
-                    connection.close()
-            except Exception:
-                raise DatabaseCloseFail('database close fail')
+        return jsonify({'message': 'success', 'result': store_order_info})
 
 
 class StoreOrderAddView(MethodView):
@@ -109,15 +106,16 @@ class StoreOrderAddView(MethodView):
 
     @signin_decorator(True)
     @validate_params(
-        Param('cartId', JSON, int),
-        Param('productId', JSON, int),
-        Param('stockId', JSON, int),
-        Param('quantity', JSON, int),
-        Param('originalPrice', JSON,int),
-        Param('sale', JSON, str, rules=[DecimalRule()]),
-        Param('discountedPrice', JSON, int),
-        Param('totalPrice', JSON, int),
-        Param('soldOut', JSON, bool),
+        Param('cartId', JSON, int, required=False),
+        Param('cartIds', JSON, list, required=False, rules=[IdListRule()]),
+        Param('productId', JSON, int, required=False),
+        Param('stockId', JSON, int, required=False),
+        Param('quantity', JSON, int, required=False),
+        Param('originalPrice', JSON, int, required=False),
+        Param('sale', JSON, str, required=False, rules=[DecimalRule()]),
+        Param('discountedPrice', JSON, int, required=False),
+        Param('totalPrice', JSON, int, required=False),
+        Param('soldOut', JSON, bool, required=False),
         Param('senderName', JSON, str),
         Param('senderPhone', JSON, str, rules=[PhoneRule()]),
         Param('senderEmail', JSON, str, rules=[EmailRule()]),
@@ -135,15 +133,7 @@ class StoreOrderAddView(MethodView):
         Args: args = (
         'user_id',
         'user_permission',
-        'cart_id',
-        'product_id',
-        'stock_id',
-        'quantity',
-        'original_price',
-        'sale',
-        'discounted_price',
-        'total_price',
-        'sold_out',
+        'cart_ids',
         'sender_name',
         'sender_phone',
         'sender_email',
@@ -159,14 +149,16 @@ class StoreOrderAddView(MethodView):
         Author: 고수희
 
         Returns:
-            200, {'message': 'success'} : 결제 성공
+            201, {'message': 'success', 'result': {'order_id': 주문 id}} : 결제 성공
+            같은 Idempotency-Key 로 다시 요청하면 처음 요청의 응답을 Idempotent-Replayed: true 헤더와 함께 반환한다.
 
         Raises:
             400, {'message': 'key error',
             'errorMessage': 'key_error'} : 잘못 입력된 키값
-
-
-
+            400, {'message': 'invalid_idempotency_key',
+            'errorMessage': 'invalid_idempotency_key'} : Idempotency-Key 헤더 형식 오류
+            422, {'message': 'idempotency_key_reused',
+            'errorMessage': 'idempotency_key_reused'} : 같은 Idempotency-Key 로 다른 요청을 보냄
             400, {'message': 'unable to close database',
             'errorMessage': 'unable_to_close_database'} : 커넥션 종료 실패
             403, {'message': 'customer permission denied',
@@ -176,45 +168,122 @@ class StoreOrderAddView(MethodView):
 
         History:
             2020-12-30(고수희): 초기 생성
+
+        Notes:
+            Idempotency-Key 헤더(선택)를 보내면 같은 키의 재요청은 주문을 다시 처리하지 않는다.
+            상품, 재고, 수량, 가격은 장바구니(cart_items)에 저장된 값으로 주문한다.
+            이전 요청 형식의 productId, stockId, quantity, 가격, soldOut 값은 검증만 하고 사용하지 않는다.
+            (JSON 파라미터만 선언한 경우 선언하지 않은 key 가 있으면 요청이 거부되므로 남겨둔다.)
         """
+        # 주문할 장바구니 상품 (cartIds 혹은 cartId, 둘 다 없으면 장바구니 전체)
+        if args[1] is not None:
+            cart_ids = tuple(set(args[1]))
+        elif args[0] is not None:
+            cart_ids = (args[0],)
+        else:
+            cart_ids = None
+
+        idempotency_key = request.headers.get('Idempotency-Key')
+        if idempotency_key is not None and not re.fullmatch(IDEMPOTENCY_KEY_PATTERN, idempotency_key):
+            raise InvalidIdempotencyKey('invalid_idempotency_key')
+
         data = {
             'user_id': g.account_id,
             'user_permission': g.permission_type_id,
-            'cart_id': args[0],
-            'product_id': args[1],
-            'stock_id': args[2],
-            'quantity': args[3],
-            'original_price': args[4],
-            'sale': args[5],
-            'discounted_price': args[6],
-            'total_price': args[7],
-            'sold_out': args[8],
-            'sender_name': args[9],
-            'sender_phone': args[10],
-            'sender_email': args[11],
-            'recipient_name': args[12],
-            'recipient_phone': args[13],
-            'address1': args[14],
-            'address2': args[15],
-            'post_number': args[16],
-            'delivery_memo_type_id': args[17],
-            'delivery_content': args[18],
+            'cart_ids': cart_ids,
+            'sender_name': args[10],
+            'sender_phone': args[11],
+            'sender_email': args[12],
+            'recipient_name': args[13],
+            'recipient_phone': args[14],
+            'address1': args[15],
+            'address2': args[16],
+            'post_number': args[17],
+            'delivery_memo_type_id': args[18],
+            'delivery_content': args[19],
+            'idempotency_key': idempotency_key,
+            'request_hash': hashlib.sha256(
+                json.dumps(request.get_json(), sort_keys=True, separators=(',', ':')).encode()
+            ).hexdigest(),
         }
 
-        try:
-            connection = get_connection(self.database)
-            order_id = self.service.post_order_service(connection, data)
-            connection.commit()
-            return {'message': 'success', 'result': {"order_id": order_id}}, 201
+        with unit_of_work(self.database) as connection:
+            response = self.service.post_idempotent_order_service(connection, data)
+
+        headers = {'Idempotent-Replayed': 'true'} if response['replayed'] else {}
+        return {'message': 'success', 'result': response['result']}, response['status_code'], headers
+
+
+class StockReservationView(MethodView):
+    """ Presentation Layer
+
+    Attributes:
+        database: app.config['DB']에 담겨있는 정보(데이터베이스 관련 정보)
+        service : StoreOrderService 클래스
+
+    Notes:
+        결제 화면에 진입하면 장바구니 상품의 재고를 예약(POST)하고, 결제를 취소하면 해제(DELETE)한다.
+        예약은 STOCK_RESERVATION_TTL 이 지나면 flask release-stock-reservations 가 해제한다.
+    """
+
+    def __init__(self, service, database):
+        self.service = service
+        self.database = database
+
+    @signin_decorator(True)
+    @validate_params(
+        Param('cartIds', GET, str, required=False, rules=[NumberListRule()]),
+    )
+    def post(self, *args):
+        """POST 메소드: 장바구니 상품 재고 예약
+
+        Args: args = ('cart_ids', ) : ?cartIds=1,2,3 (생략하면 장바구니 전체)
 
-        except Exception as e:
-            connection.rollback()
-            raise e
+        Returns:
+            201, {'message': 'success', 'result': {'cart_ids': 예약한 장바구니 상품 id 리스트, 'expires_at': 만료 시각}}
+
+        Raises:
+            400, {'message': 'cart item does not exist',
+            'errorMessage': 'cart_item_does_not_exist'} : 예약할 장바구니 상품이 없음
+            400, {'message': 'Not Enough Product',
+            'errorMessage': 'Not as many in stock as quantity'} : 재고 부족
+            403, {'message': 'customer permission denied',
+            'errorMessage': 'customer_permission_denied'} : 사용자 권한이 아님
+        """
+        data = {
+            'user_id': g.account_id,
+            'user_permission': g.permission_type_id,
+            'cart_ids': tuple({int(cart_id) for cart_id in args[0].split(',')}) if args[0] is not None else None,
+        }
+
+        with unit_of_work(self.database) as connection:
+            result = self.service.post_stock_reservation_service(connection, data)
+
+        return jsonify({'message': 'success', 'result': result}), 201
+
+    @signin_decorator(True)
+    @validate_params(
+        Param('cartIds', GET, str, required=False, rules=[NumberListRule()]),
+    )
+    def delete(self, *args):
+        """DELETE 메소드: 장바구니 상품 재고 예약 해제
+
+        Args: args = ('cart_ids', ) : ?cartIds=1,2,3 (생략하면 장바구니 전체)
+
+        Returns:
+            200, {'message': 'success', 'result': {'released': 해제한 예약 수}}
+
+        Raises:
+            403, {'message': 'customer permission denied',
+            'errorMessage': 'customer_permission_denied'} : 사용자 권한이 아님
+        """
+        data = {
+            'user_id': g.account_id,
+            'user_permission': g.permission_type_id,
+            'cart_ids': tuple({int(cart_id) for cart_id in args[0].split(',')}) if args[0] is not None else None,
+        }
 
-        finally:
-            try:
-                if connection:
-                    connection.close()
+        with unit_of_work(self.database) as connection:
+            released = self.service.delete_stock_reservation_service(connection, data)
 
-            except Exception:
-                raise DatabaseCloseFail('database close fail')
+        return jsonify({'message': 'success', 'result': {'released': released}})
@@ -1,5 +1,3 @@
-import traceback
-
 from flask.views import MethodView
 from flask import jsonify, request
 
@@ -12,8 +10,8 @@ from flask_request_validator import (
 from google.oauth2 import id_token
 from google.auth.transport import requests
 
-from utils.connection import get_connection
-from utils.custom_exceptions import InvalidToken, DatabaseCloseFail
+from utils.connection import unit_of_work
+from utils.custom_exceptions import InvalidToken
 from utils.rules import PasswordRule, EmailRule, UsernameRule, PhoneRule
 
 
@@ -72,31 +70,17 @@ class SignUpView(MethodView):
                 2021-01-02(김민구): 데이터 조작 에러 추가
         """
 
-        connection = None
-        try:
-            data = {
-                'username': args[0],
-                'password': args[1],
-                'phone': args[2],
-                'email': args[3]
-            }
-
-            connection = get_connection(self.database)
-            self.user_service.sign_up_logic(data, connection)
-            connection.commit()
-            return jsonify({'message': 'success'}), 200
+        data = {
+            'username': args[0],
+            'password': args[1],
+            'phone': args[2],
+            'email': args[3]
+        }
 
-        except Exception as e:
-            traceback.print_exc()
-            connection.rollback()
-            raise e
+        with unit_of_work(self.database) as connection:
+            self.user_service.sign_up_logic(data, connection)
 
-        finally:
-            try:
-                if connection is not None:
-                    connection.close()
-            except Exception:
-                raise DatabaseCloseFail('서버에 알 수 없는 에러가 발생했습니다.')
+        return jsonify({'message': 'success'}), 200
 
 
 class SignInView(MethodView):
@@ -150,26 +134,15 @@ class SignInView(MethodView):
                 2021-01-02(김민구): 데이터 조작 에러 추가
         """
 
-        connection = None
-        try:
-            data = {
-                'username': args[0],
-                'password': args[1]
-            }
-            connection = get_connection(self.database)
-            token = self.user_service.sign_in_logic(data, connection)
-            return jsonify({'message': 'success', 'token': token}), 200
+        data = {
+            'username': args[0],
+            'password': args[1]
+        }
 
-        except Exception as e:
-            traceback.print_exc()
-            raise e
+        with unit_of_work(self.database) as connection:
+            token = self.user_service.sign_in_logic(data, connection)
 
-        finally:
-            try:
-                if connection is not None:
-                    connection.close()
-            except Exception:
-                raise DatabaseCloseFail('서버에 알 수 없는 에러가 발생했습니다.')
+        return jsonify({'message': 'success', 'token': token}), 200
 
 
 class GoogleSocialSignInView(MethodView):
@@ -223,28 +196,14 @@ class GoogleSocialSignInView(MethodView):
                 2021-01-05(김민구): 기존 회원이 존재할 때 username이 달라서 생기는 이슈를 제거함
         """
 
-        connection = None
+        google_token = request.headers.get('Authorization')
+
         try:
-            google_token = request.headers.get('Authorization')
-            connection = get_connection(self.database)
             user_info = id_token.verify_oauth2_token(google_token, requests.Request())
-
-            token = self.user_service.social_sign_in_logic(connection, user_info)
-            connection.commit()
-            return jsonify({'message': 'success', 'token': token}), 200
-
-        except Exception as e:
-            traceback.print_exc()
-            connection.rollback()
-            raise e
-
         except ValueError:
-            connection.rollback()
             raise InvalidToken('구글 소셜 로그인에 실패하였습니다.')
 
-        finally:
-            try:
-                if connection is not None:
-                    connection.close()
-            except Exception:
-                raise DatabaseCloseFail('서버에 알 수 없는 에러가 발생했습니다.')
+        with unit_of_work(self.database) as connection:
+            token = self.user_service.social_sign_in_logic(connection, user_info)
+
+        return jsonify({'message': 'success', 'token': token}), 200